@@ -0,0 +1,88 @@
+"""add denormalized follow counts to users
+
+Revision ID: 9c3e5a7b1d42
+Revises: 7d6b8e4c2f10
+Create Date: 2026-04-02 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9c3e5a7b1d42"
+down_revision = "7d6b8e4c2f10"
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = "ix_users_follower_count"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    indexes = {index["name"] for index in inspector.get_indexes("users")}
+
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("users") as batch_op:
+            if "follower_count" not in columns:
+                batch_op.add_column(
+                    sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0")
+                )
+            if "following_count" not in columns:
+                batch_op.add_column(
+                    sa.Column("following_count", sa.Integer(), nullable=False, server_default="0")
+                )
+            if INDEX_NAME not in indexes:
+                batch_op.create_index(INDEX_NAME, ["follower_count"], unique=False)
+    else:
+        if "follower_count" not in columns:
+            op.add_column(
+                "users",
+                sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0"),
+            )
+        if "following_count" not in columns:
+            op.add_column(
+                "users",
+                sa.Column("following_count", sa.Integer(), nullable=False, server_default="0"),
+            )
+        if INDEX_NAME not in indexes:
+            op.create_index(INDEX_NAME, "users", ["follower_count"], unique=False)
+
+    # Backfill from the existing follow graph.
+    op.execute(
+        """
+        UPDATE users SET
+            follower_count = (
+                SELECT COUNT(*) FROM user_follows WHERE user_follows.followed_id = users.id
+            ),
+            following_count = (
+                SELECT COUNT(*) FROM user_follows WHERE user_follows.follower_id = users.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    indexes = {index["name"] for index in inspector.get_indexes("users")}
+
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("users") as batch_op:
+            if INDEX_NAME in indexes:
+                batch_op.drop_index(INDEX_NAME)
+            if "following_count" in columns:
+                batch_op.drop_column("following_count")
+            if "follower_count" in columns:
+                batch_op.drop_column("follower_count")
+    else:
+        if INDEX_NAME in indexes:
+            op.drop_index(INDEX_NAME, table_name="users")
+        if "following_count" in columns:
+            op.drop_column("users", "following_count")
+        if "follower_count" in columns:
+            op.drop_column("users", "follower_count")
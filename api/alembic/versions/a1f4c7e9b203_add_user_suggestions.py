@@ -0,0 +1,61 @@
+"""add user_suggestions table
+
+Revision ID: a1f4c7e9b203
+Revises: 9c3e5a7b1d42
+Create Date: 2026-04-06 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a1f4c7e9b203"
+down_revision = "9c3e5a7b1d42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "user_suggestions" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "user_suggestions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("uuid", sa.String(length=36), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("suggested_user_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("reason", sa.String(length=32), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["suggested_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "suggested_user_id", name="uq_user_suggestions_pair"),
+    )
+    op.create_index(op.f("ix_user_suggestions_uuid"), "user_suggestions", ["uuid"], unique=True)
+    op.create_index(
+        "ix_user_suggestions_user_score", "user_suggestions", ["user_id", "score"], unique=False
+    )
+    op.create_index(
+        op.f("ix_user_suggestions_suggested_user_id"),
+        "user_suggestions",
+        ["suggested_user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "user_suggestions" not in inspector.get_table_names():
+        return
+
+    op.drop_index(op.f("ix_user_suggestions_suggested_user_id"), table_name="user_suggestions")
+    op.drop_index("ix_user_suggestions_user_score", table_name="user_suggestions")
+    op.drop_index(op.f("ix_user_suggestions_uuid"), table_name="user_suggestions")
+    op.drop_table("user_suggestions")
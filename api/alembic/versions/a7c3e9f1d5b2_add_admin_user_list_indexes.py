@@ -0,0 +1,65 @@
+"""index users for admin list search and keyset pagination
+
+Revision ID: a7c3e9f1d5b2
+Revises: f4b8d2e6a1c3
+Create Date: 2026-04-23 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a7c3e9f1d5b2"
+down_revision = "f4b8d2e6a1c3"
+branch_labels = None
+depends_on = None
+
+
+# Admin user list ordering: (sort column, id) for keyset pagination.
+KEYSET_INDEXES = {
+    "ix_users_created_at_id": ["created_at", "id"],
+    "ix_users_last_login_id": ["last_login", "id"],
+    "ix_users_full_name_id": ["full_name", "id"],
+}
+# ILIKE '%term%' search; PostgreSQL only (pg_trgm).
+TRIGRAM_INDEXES = {
+    "ix_users_email_trgm": "email",
+    "ix_users_username_trgm": "username",
+    "ix_users_full_name_trgm": "full_name",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {index["name"] for index in inspector.get_indexes("users")}
+
+    for index_name, columns in KEYSET_INDEXES.items():
+        if index_name not in existing:
+            op.create_index(index_name, "users", columns, unique=False)
+
+    if bind.dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, column_name in TRIGRAM_INDEXES.items():
+        if index_name not in existing:
+            op.create_index(
+                index_name,
+                "users",
+                [column_name],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column_name: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {index["name"] for index in inspector.get_indexes("users")}
+
+    # The pg_trgm extension is left installed; other objects may use it.
+    for index_name in [*TRIGRAM_INDEXES, *KEYSET_INDEXES]:
+        if index_name in existing:
+            op.drop_index(index_name, table_name="users")
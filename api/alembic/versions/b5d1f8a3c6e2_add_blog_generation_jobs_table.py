@@ -0,0 +1,59 @@
+"""add blog_generation_jobs table
+
+Revision ID: b5d1f8a3c6e2
+Revises: a7c3e9f1d5b2
+Create Date: 2026-05-06 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b5d1f8a3c6e2"
+down_revision = "a7c3e9f1d5b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "blog_generation_jobs" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "blog_generation_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("uuid", sa.String(length=36), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("phase", sa.String(length=20), nullable=True),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("request", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("error_status", sa.Integer(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_blog_generation_jobs_uuid"), "blog_generation_jobs", ["uuid"], unique=True)
+    op.create_index(op.f("ix_blog_generation_jobs_user_id"), "blog_generation_jobs", ["user_id"], unique=False)
+    op.create_index(op.f("ix_blog_generation_jobs_status"), "blog_generation_jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "blog_generation_jobs" not in inspector.get_table_names():
+        return
+
+    op.drop_index(op.f("ix_blog_generation_jobs_status"), table_name="blog_generation_jobs")
+    op.drop_index(op.f("ix_blog_generation_jobs_user_id"), table_name="blog_generation_jobs")
+    op.drop_index(op.f("ix_blog_generation_jobs_uuid"), table_name="blog_generation_jobs")
+    op.drop_table("blog_generation_jobs")
@@ -0,0 +1,56 @@
+"""add slug prefix indexes for slug allocation
+
+Revision ID: b7d2e4f6a913
+Revises: a1f4c7e9b203
+Create Date: 2026-04-14 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7d2e4f6a913"
+down_revision = "a1f4c7e9b203"
+branch_labels = None
+depends_on = None
+
+
+# Unique slug indexes use the database collation, which PostgreSQL cannot use
+# for LIKE 'prefix%' lookups; pattern-ops indexes can.
+SLUG_PREFIX_INDEXES = {
+    "ix_posts_slug_prefix": "posts",
+    "ix_categories_slug_prefix": "categories",
+    "ix_tags_slug_prefix": "tags",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    inspector = sa.inspect(bind)
+    for index_name, table_name in SLUG_PREFIX_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name in existing:
+            continue
+        op.create_index(
+            index_name,
+            table_name,
+            ["slug"],
+            unique=False,
+            postgresql_ops={"slug": "varchar_pattern_ops"},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    inspector = sa.inspect(bind)
+    for index_name, table_name in SLUG_PREFIX_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name in existing:
+            op.drop_index(index_name, table_name=table_name)
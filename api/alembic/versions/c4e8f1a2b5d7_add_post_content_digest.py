@@ -0,0 +1,46 @@
+"""add content digest columns to posts
+
+Revision ID: c4e8f1a2b5d7
+Revises: b7d2e4f6a913
+Create Date: 2026-04-16 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4e8f1a2b5d7"
+down_revision = "b7d2e4f6a913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("posts")}
+
+    # Existing rows are derived lazily on read until they are next saved.
+    if "content_hash" not in columns:
+        op.add_column("posts", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    if "content_metadata" not in columns:
+        op.add_column("posts", sa.Column("content_metadata", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("posts")}
+
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("posts") as batch_op:
+            if "content_metadata" in columns:
+                batch_op.drop_column("content_metadata")
+            if "content_hash" in columns:
+                batch_op.drop_column("content_hash")
+    else:
+        if "content_metadata" in columns:
+            op.drop_column("posts", "content_metadata")
+        if "content_hash" in columns:
+            op.drop_column("posts", "content_hash")
@@ -0,0 +1,51 @@
+"""add derived content metric columns to posts
+
+Revision ID: d9a3b6c1e4f8
+Revises: c4e8f1a2b5d7
+Create Date: 2026-04-18 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d9a3b6c1e4f8"
+down_revision = "c4e8f1a2b5d7"
+branch_labels = None
+depends_on = None
+
+
+NEW_COLUMNS = (
+    ("word_count", sa.Integer),
+    ("image_count", sa.Integer),
+    ("heading_outline", sa.JSON),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("posts")}
+
+    # Filled on the next save of each post, or all at once with
+    # scripts/backfill_post_content_metrics.py.
+    for name, column_type in NEW_COLUMNS:
+        if name not in columns:
+            op.add_column("posts", sa.Column(name, column_type(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("posts")}
+
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("posts") as batch_op:
+            for name, _ in reversed(NEW_COLUMNS):
+                if name in columns:
+                    batch_op.drop_column(name)
+    else:
+        for name, _ in reversed(NEW_COLUMNS):
+            if name in columns:
+                op.drop_column("posts", name)
@@ -0,0 +1,42 @@
+"""index the columns that reference stored media files
+
+Revision ID: e6f2a9c4b8d1
+Revises: d9a3b6c1e4f8
+Create Date: 2026-04-20 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e6f2a9c4b8d1"
+down_revision = "d9a3b6c1e4f8"
+branch_labels = None
+depends_on = None
+
+
+# MediaStore counts a blob's references with equality lookups on these.
+MEDIA_REFERENCE_INDEXES = {
+    "ix_posts_featured_image": ("posts", "featured_image"),
+    "ix_media_file_path": ("media", "file_path"),
+    "ix_profiles_avatar": ("profiles", "avatar"),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for index_name, (table_name, column_name) in MEDIA_REFERENCE_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name not in existing:
+            op.create_index(index_name, table_name, [column_name], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for index_name, (table_name, _) in MEDIA_REFERENCE_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name in existing:
+            op.drop_index(index_name, table_name=table_name)
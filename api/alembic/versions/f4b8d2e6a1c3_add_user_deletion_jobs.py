@@ -0,0 +1,60 @@
+"""add user_deletion_jobs table
+
+Revision ID: f4b8d2e6a1c3
+Revises: e6f2a9c4b8d1
+Create Date: 2026-04-22 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4b8d2e6a1c3"
+down_revision = "e6f2a9c4b8d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "user_deletion_jobs" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "user_deletion_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("uuid", sa.String(length=36), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("requested_by_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("step", sa.String(length=50), nullable=True),
+        sa.Column("step_index", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("deleted_user", sa.JSON(), nullable=False),
+        sa.Column("deleted_counts", sa.JSON(), nullable=True),
+        sa.Column("file_paths", sa.JSON(), nullable=True),
+        sa.Column("failed_file_cleanup", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_user_deletion_jobs_uuid"), "user_deletion_jobs", ["uuid"], unique=True)
+    op.create_index(op.f("ix_user_deletion_jobs_user_id"), "user_deletion_jobs", ["user_id"], unique=False)
+    op.create_index(op.f("ix_user_deletion_jobs_status"), "user_deletion_jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "user_deletion_jobs" not in inspector.get_table_names():
+        return
+
+    op.drop_index(op.f("ix_user_deletion_jobs_status"), table_name="user_deletion_jobs")
+    op.drop_index(op.f("ix_user_deletion_jobs_user_id"), table_name="user_deletion_jobs")
+    op.drop_index(op.f("ix_user_deletion_jobs_uuid"), table_name="user_deletion_jobs")
+    op.drop_table("user_deletion_jobs")
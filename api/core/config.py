@@ -17,6 +17,39 @@ class Settings:
     DATABASE_URL = f'postgresql+asyncpg://{database_username}:{_encoded_password}@{database_host}:{database_port}/{database_name}'
     SYNC_DATABASE_URL = f'postgresql://{database_username}:{_encoded_password}@{database_host}:{database_port}/{database_name}'
 
+    # Optional read replica; shares credentials and database name with the primary.
+    database_replica_host: str = os.getenv("DB_REPLICA_HOST", "")
+    database_replica_port: str = os.getenv("DB_REPLICA_PORT", database_port)
+    DATABASE_REPLICA_URL = (
+        f'postgresql+asyncpg://{database_username}:{_encoded_password}@{database_replica_host}:{database_replica_port}/{database_name}'
+        if database_replica_host else ""
+    )
+
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    DB_BACKGROUND_POOL_SIZE: int = int(os.getenv("DB_BACKGROUND_POOL_SIZE", "2"))
+    DB_BACKGROUND_MAX_OVERFLOW: int = int(os.getenv("DB_BACKGROUND_MAX_OVERFLOW", "3"))
+    DB_ANALYTICS_POOL_SIZE: int = int(os.getenv("DB_ANALYTICS_POOL_SIZE", "2"))
+    DB_ANALYTICS_MAX_OVERFLOW: int = int(os.getenv("DB_ANALYTICS_MAX_OVERFLOW", "2"))
+    DB_REPLICA_POOL_SIZE: int = int(os.getenv("DB_REPLICA_POOL_SIZE", "5"))
+    DB_REPLICA_MAX_OVERFLOW: int = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", "10"))
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = float(
+        os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS", "10")
+    )
+    DB_REPLICA_STICKY_SECONDS: float = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "10"))
+
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    REQUEST_QUERY_COUNT_WARN_THRESHOLD: int = int(
+        os.getenv("REQUEST_QUERY_COUNT_WARN_THRESHOLD", "50")
+    )
+    QUERY_SERVER_TIMING_ENABLED: bool = (
+        os.getenv("QUERY_SERVER_TIMING_ENABLED", "true").lower() == "true"
+    )
+
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
@@ -55,6 +88,93 @@ class Settings:
         "BLOG_AGENT_V2_ROLLOUT", "production"
     ).lower()
     
+    TRENDING_HALF_LIFE_HOURS: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+    TRENDING_VIEW_WEIGHT: float = float(os.getenv("TRENDING_VIEW_WEIGHT", "1"))
+    TRENDING_LIKE_WEIGHT: float = float(os.getenv("TRENDING_LIKE_WEIGHT", "5"))
+
+    FOLLOW_GRAPH_CACHE_TTL_SECONDS: int = int(os.getenv("FOLLOW_GRAPH_CACHE_TTL_SECONDS", "300"))
+    FOLLOW_GRAPH_CACHE_MAX_ENTRIES: int = int(os.getenv("FOLLOW_GRAPH_CACHE_MAX_ENTRIES", "10000"))
+
+    USER_STATS_SNAPSHOT_TTL_SECONDS: int = int(os.getenv("USER_STATS_SNAPSHOT_TTL_SECONDS", "60"))
+    # Filtered admin user lists in "estimate" count mode stop counting here.
+    ADMIN_USER_COUNT_ESTIMATE_CAP: int = int(os.getenv("ADMIN_USER_COUNT_ESTIMATE_CAP", "10000"))
+
+    USER_DELETION_BATCH_SIZE: int = int(os.getenv("USER_DELETION_BATCH_SIZE", "500"))
+    USER_DELETION_FILE_WORKERS: int = int(os.getenv("USER_DELETION_FILE_WORKERS", "4"))
+    USER_DELETION_LEASE_SECONDS: int = int(os.getenv("USER_DELETION_LEASE_SECONDS", "300"))
+
+    POST_DETAIL_CACHE_TTL_SECONDS: int = int(os.getenv("POST_DETAIL_CACHE_TTL_SECONDS", "30"))
+    POST_DETAIL_CACHE_MAX_ENTRIES: int = int(os.getenv("POST_DETAIL_CACHE_MAX_ENTRIES", "1000"))
+    CONTENT_DIGEST_CACHE_MAX_ENTRIES: int = int(os.getenv("CONTENT_DIGEST_CACHE_MAX_ENTRIES", "512"))
+    UPLOAD_MAX_POST_IMAGE_BYTES: int = int(os.getenv("UPLOAD_MAX_POST_IMAGE_BYTES", str(5 * 1024 * 1024)))
+    UPLOAD_MAX_MEDIA_BYTES: int = int(os.getenv("UPLOAD_MAX_MEDIA_BYTES", str(25 * 1024 * 1024)))
+    UPLOAD_MAX_AVATAR_BYTES: int = int(os.getenv("UPLOAD_MAX_AVATAR_BYTES", str(2 * 1024 * 1024)))
+    MEDIA_BLOB_DIR: str = os.getenv("MEDIA_BLOB_DIR", "uploads/blobs")
+    MEDIA_BLOB_REUSE_GRACE_SECONDS: int = int(os.getenv("MEDIA_BLOB_REUSE_GRACE_SECONDS", "600"))
+    UPLOAD_GC_GRACE_SECONDS: int = int(os.getenv("UPLOAD_GC_GRACE_SECONDS", str(24 * 3600)))
+    UPLOAD_GC_QUARANTINE_SECONDS: int = int(os.getenv("UPLOAD_GC_QUARANTINE_SECONDS", str(7 * 24 * 3600)))
+    IMAGE_DERIVATIVES_ENABLED: bool = os.getenv("IMAGE_DERIVATIVES_ENABLED", "true").lower() == "true"
+    IMAGE_DERIVATIVE_WIDTHS: list[int] = [
+        int(w) for w in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "300,600,1200").split(",") if w.strip()
+    ]
+    # Preference order when the client accepts several; originals are the fallback.
+    IMAGE_DERIVATIVE_FORMATS: list[str] = [
+        f.strip().lower() for f in os.getenv("IMAGE_DERIVATIVE_FORMATS", "avif,webp").split(",") if f.strip()
+    ]
+    IMAGE_DERIVATIVE_QUALITY: int = int(os.getenv("IMAGE_DERIVATIVE_QUALITY", "75"))
+    IMAGE_DERIVATIVE_WORKERS: int = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", "2"))
+    # Legacy (non content-addressed) images are revalidated after this long.
+    IMAGE_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("IMAGE_CACHE_MAX_AGE_SECONDS", "3600"))
+    IMAGE_STAT_CACHE_TTL_SECONDS: int = int(os.getenv("IMAGE_STAT_CACHE_TTL_SECONDS", "30"))
+    IMAGE_STAT_CACHE_MAX_ENTRIES: int = int(os.getenv("IMAGE_STAT_CACHE_MAX_ENTRIES", "4096"))
+    # "", "x-accel-redirect" (nginx) or "x-sendfile" (Apache/lighttpd).
+    IMAGE_OFFLOAD_HEADER: str = os.getenv("IMAGE_OFFLOAD_HEADER", "").strip().lower()
+    IMAGE_ACCEL_REDIRECT_PREFIX: str = os.getenv("IMAGE_ACCEL_REDIRECT_PREFIX", "/internal-uploads/")
+    TAXONOMY_SNAPSHOT_TTL_SECONDS: int = int(os.getenv("TAXONOMY_SNAPSHOT_TTL_SECONDS", "300"))
+
+    AUTH_USER_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+    AUTH_USER_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "10000"))
+
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+    BLOG_JOB_WORKERS: int = int(os.getenv("BLOG_JOB_WORKERS", "2"))
+    BLOG_JOB_MAX_QUEUED: int = int(os.getenv("BLOG_JOB_MAX_QUEUED", "20"))
+    BLOG_JOB_MAX_ACTIVE_PER_USER: int = int(os.getenv("BLOG_JOB_MAX_ACTIVE_PER_USER", "2"))
+    # A job still running after this long is failed.
+    BLOG_JOB_TIMEOUT_SECONDS: int = int(os.getenv("BLOG_JOB_TIMEOUT_SECONDS", "900"))
+    # A running job whose worker has not checked in for this long is failed.
+    BLOG_JOB_LEASE_SECONDS: int = int(os.getenv("BLOG_JOB_LEASE_SECONDS", "60"))
+    # Queued jobs have no client waiting on them, so the editorial revision
+    # is only skipped after a much slower draft than on /ai/generate/blog.
+    BLOG_JOB_EDITORIAL_SKIP_AFTER_SECONDS: float = float(os.getenv("BLOG_JOB_EDITORIAL_SKIP_AFTER_SECONDS", "300"))
+    BLOG_JOB_EVENT_POLL_SECONDS: float = float(os.getenv("BLOG_JOB_EVENT_POLL_SECONDS", "2"))
+
+    # Addresses or CIDR ranges of reverse proxies whose CF-Connecting-IP,
+    # X-Forwarded-For and X-Real-IP headers are believed; empty trusts none.
+    TRUSTED_PROXIES: list[str] = [
+        p.strip() for p in os.getenv("TRUSTED_PROXIES", "").split(",") if p.strip()
+    ]
+
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # Shared buckets across workers; defaults to REDIS_URL, in-memory when unset.
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL") or os.getenv("REDIS_URL", "")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "50000"))
+    # Redis concurrency slots of a crashed worker are reclaimed after this long.
+    RATE_LIMIT_CONCURRENCY_LEASE_SECONDS: int = int(os.getenv("RATE_LIMIT_CONCURRENCY_LEASE_SECONDS", "900"))
+    # "<requests>/<second|minute|hour|day>"; "0" disables the bucket.
+    RATE_LIMIT_AI_BLOG: str = os.getenv("RATE_LIMIT_AI_BLOG", "10/hour")
+    RATE_LIMIT_AI_BLOG_CONCURRENCY: int = int(os.getenv("RATE_LIMIT_AI_BLOG_CONCURRENCY", "1"))
+    RATE_LIMIT_AI_BLOG_GLOBAL_CONCURRENCY: int = int(os.getenv("RATE_LIMIT_AI_BLOG_GLOBAL_CONCURRENCY", "4"))
+    RATE_LIMIT_AI_GENERATE: str = os.getenv("RATE_LIMIT_AI_GENERATE", "30/minute")
+    RATE_LIMIT_AI_GENERATE_CONCURRENCY: int = int(os.getenv("RATE_LIMIT_AI_GENERATE_CONCURRENCY", "2"))
+    RATE_LIMIT_AI_SEARCH_PREVIEW: str = os.getenv("RATE_LIMIT_AI_SEARCH_PREVIEW", "20/minute")
+    RATE_LIMIT_SEARCH: str = os.getenv("RATE_LIMIT_SEARCH", "60/minute")
+    RATE_LIMIT_POST_VIEW: str = os.getenv("RATE_LIMIT_POST_VIEW", "120/minute")
+    RATE_LIMIT_LOGIN: str = os.getenv("RATE_LIMIT_LOGIN", "10/minute")
+
     FREE_CHATGPT_TOKEN: str = os.getenv("FREE_CHATGPT_TOKEN", "")
     FREE_DEEPSEEK_TOKEN: str = os.getenv("FREE_DEEPSEEK_TOKEN", "")
 
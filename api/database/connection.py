@@ -1,32 +1,163 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy import text
 import logging
+import threading
+import time
 from core.config import settings
-from typing import AsyncGenerator, Any, List, Optional
+from typing import AsyncGenerator, Any, Dict, List, Optional
 from sqlalchemy.ext.declarative import declarative_base
+from database.instrumentation import install_query_instrumentation
+from database.routing import READ_ONLY, REPLICA_BIND, STICKY_KEY, WROTE, ReplicaRouter, RoutingSession
 
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True,
-)
+ENGINE_INTERACTIVE = "interactive"
+ENGINE_BACKGROUND = "background"
+ENGINE_ANALYTICS = "analytics"
+ENGINE_REPLICA = "replica"
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=True
-)
 
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection."""
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._metrics_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def recreate(self):
+        # Keep counters across engine.dispose(), which rebuilds the pool.
+        new_pool = super().recreate()
+        new_pool.checkouts = self.checkouts
+        new_pool.checkout_timeouts = self.checkout_timeouts
+        new_pool.total_wait_seconds = self.total_wait_seconds
+        new_pool.max_wait_seconds = self.max_wait_seconds
+        return new_pool
+
+
+# workload -> (pool size, max overflow); pool timeout, recycle and pre-ping are shared.
+POOL_SIZES = {
+    ENGINE_INTERACTIVE: (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+    ENGINE_BACKGROUND: (settings.DB_BACKGROUND_POOL_SIZE, settings.DB_BACKGROUND_MAX_OVERFLOW),
+    ENGINE_ANALYTICS: (settings.DB_ANALYTICS_POOL_SIZE, settings.DB_ANALYTICS_MAX_OVERFLOW),
+    ENGINE_REPLICA: (settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW),
+}
+
+_engines: Dict[str, AsyncEngine] = {}
+_sessionmakers: Dict[str, async_sessionmaker] = {}
+
+
+def create_engine_for(workload: str, url: Optional[str] = None) -> AsyncEngine:
+    pool_size, max_overflow = POOL_SIZES.get(workload, POOL_SIZES[ENGINE_INTERACTIVE])
+    return create_async_engine(
+        url or settings.DATABASE_URL,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def register_engine(workload: str, engine_: AsyncEngine) -> None:
+    """Install (or replace) the engine used for a workload."""
+    install_query_instrumentation(engine_)
+    _engines[workload] = engine_
+    _sessionmakers[workload] = async_sessionmaker(
+        bind=engine_,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        autoflush=True
+    )
+
+
+def get_engine(workload: str = ENGINE_INTERACTIVE) -> AsyncEngine:
+    """
+    Engine for a workload, created on first use. Without a configured
+    replica, the replica workload shares the interactive engine.
+    """
+    if workload not in _engines:
+        if workload == ENGINE_REPLICA and not settings.DATABASE_REPLICA_URL:
+            return get_engine(ENGINE_INTERACTIVE)
+        url = settings.DATABASE_REPLICA_URL if workload == ENGINE_REPLICA else None
+        register_engine(workload, create_engine_for(workload, url))
+    return _engines[workload]
+
+
+def get_sessionmaker(workload: str = ENGINE_INTERACTIVE) -> async_sessionmaker:
+    engine_ = get_engine(workload)
+    for name, registered in _engines.items():
+        if registered is engine_:
+            return _sessionmakers[name]
+    raise KeyError(workload)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Checkout, overflow and wait-time figures for every engine created so far."""
+    stats = {}
+    for name, engine_ in _engines.items():
+        pool = engine_.pool
+        entry: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        if isinstance(pool, MeteredQueuePool):
+            entry.update(
+                checkouts=pool.checkouts,
+                checkout_timeouts=pool.checkout_timeouts,
+                avg_wait_ms=round(pool.total_wait_seconds * 1000 / pool.checkouts, 3)
+                if pool.checkouts else 0.0,
+                max_wait_ms=round(pool.max_wait_seconds * 1000, 3),
+            )
+        stats[name] = entry
+    return stats
+
+
+engine = get_engine(ENGINE_INTERACTIVE)
+AsyncSessionLocal = get_sessionmaker(ENGINE_INTERACTIVE)
+
+
+def _sticky_key(request: Optional[Request]) -> Optional[str]:
+    if request is None:
+        return None
+    return ReplicaRouter.sticky_key(request.headers.get("authorization"))
+
+
+async def _session_scope(
+        factory: async_sessionmaker,
+        sticky_key: Optional[str] = None
+) -> AsyncGenerator[AsyncSession, None]:
+    async with factory() as session:
+        session.info[STICKY_KEY] = sticky_key
         try:
             yield session
             await session.commit()
@@ -34,9 +165,64 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
+            if session.info.get(WROTE):
+                # Read-after-write: keep this client on the primary for a while.
+                ReplicaRouter.mark_write(session.info.get(STICKY_KEY))
             await session.close()
 
 
+async def _enable_replica_reads(session: AsyncSession) -> None:
+    """
+    Mark a session read-only so RoutingSession sends its reads to the replica.
+    No-op without a separate replica engine or for a client that just wrote.
+    """
+    replica = get_engine(ENGINE_REPLICA)
+    if replica is get_engine(ENGINE_INTERACTIVE):
+        return
+    if ReplicaRouter.wrote_recently(session.info.get(STICKY_KEY)):
+        return
+    await ReplicaRouter.refresh_lag(replica)
+    session.info[READ_ONLY] = True
+    session.info[REPLICA_BIND] = replica.sync_engine
+
+
+async def get_db_session(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    async for session in _session_scope(AsyncSessionLocal, _sticky_key(request)):
+        yield session
+
+
+async def get_read_db_session(
+        session: AsyncSession = Depends(get_db_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    The request session with reads routed to the replica, for read-only routes.
+    Any write in the request still goes to the primary and pins the rest of
+    the session there.
+    """
+    await _enable_replica_reads(session)
+    try:
+        yield session
+    finally:
+        session.info.pop(READ_ONLY, None)
+        session.info.pop(REPLICA_BIND, None)
+
+
+async def get_background_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the background pool, for long-running work such as AI generation."""
+    async for session in _session_scope(get_sessionmaker(ENGINE_BACKGROUND)):
+        yield session
+
+
+async def get_analytics_db_session(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session on the analytics pool, for dashboard and statistics aggregations.
+    Reads go to the replica when one is configured and within lag tolerance.
+    """
+    async for session in _session_scope(get_sessionmaker(ENGINE_ANALYTICS), _sticky_key(request)):
+        await _enable_replica_reads(session)
+        yield session
+
+
 async def db_health_check() -> bool:
     try:
         async with AsyncSessionLocal() as session:
@@ -55,8 +241,9 @@ async def drop_all_tables() -> None:
 
 async def close_db() -> None:
     try:
-        await engine.dispose()
-        logger.info("Database engine closed")
+        for engine_ in _engines.values():
+            await engine_.dispose()
+        logger.info("Database engines closed")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
 
@@ -0,0 +1,90 @@
+import heapq
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_LIMIT = 500
+
+
+class QueryStats:
+    """Queries executed inside one ``track_queries`` block."""
+
+    SLOWEST_KEPT = 5
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: List[str] = []
+        self._slowest: List[Tuple[float, int, str]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements.append(statement)
+        entry = (seconds, self.count, statement)
+        if len(self._slowest) < self.SLOWEST_KEPT:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def slowest(self) -> List[Tuple[float, str]]:
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+# Every tracker active in the current context; nested trackers all see a query.
+_active_trackers: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_trackers", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _active_trackers.set(_active_trackers.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_trackers.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+
+    for stats in _active_trackers.get():
+        stats.record(statement, seconds)
+
+    if seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s",
+            seconds * 1000,
+            " ".join(statement.split())[:STATEMENT_LOG_LIMIT],
+        )
+
+
+def install_query_instrumentation(engine: Union[AsyncEngine, Engine]) -> None:
+    """Attach timing hooks to an engine; safe to call more than once."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
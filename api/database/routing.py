@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_ONLY = "read_only"
+REPLICA_BIND = "replica_bind"
+WROTE = "wrote"
+STICKY_KEY = "sticky_key"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica when it is marked read-only.
+
+    A session is routed to the replica only while ``info["read_only"]`` is set,
+    a replica bind is attached, nothing has been written in the session and
+    the replica is within the configured lag tolerance. Flushes and DML
+    statements always go to the primary, and once a session has written, every
+    later statement in it does too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[WROTE] = True
+        elif (
+            self.info.get(READ_ONLY)
+            and not self.info.get(WROTE)
+            and self.info.get(REPLICA_BIND) is not None
+            and ReplicaRouter.replica_usable()
+        ):
+            return self.info[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+class ReplicaRouter:
+    """
+    Process-wide replica state: the last measured replication lag and the
+    clients that wrote recently and must keep reading from the primary.
+    """
+
+    MAX_LAG_SECONDS = settings.DB_REPLICA_MAX_LAG_SECONDS
+    LAG_CHECK_INTERVAL_SECONDS = settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS
+    STICKY_SECONDS = settings.DB_REPLICA_STICKY_SECONDS
+    MAX_STICKY_ENTRIES = 10000
+
+    _lag_seconds: Optional[float] = None
+    _lag_checked_at: float = 0.0
+    _recent_writers: Dict[str, float] = {}
+
+    @staticmethod
+    def reset() -> None:
+        ReplicaRouter._lag_seconds = None
+        ReplicaRouter._lag_checked_at = 0.0
+        ReplicaRouter._recent_writers = {}
+
+    @staticmethod
+    def replica_usable() -> bool:
+        lag = ReplicaRouter._lag_seconds
+        return lag is not None and lag <= ReplicaRouter.MAX_LAG_SECONDS
+
+    @staticmethod
+    def record_lag(lag_seconds: Optional[float]) -> None:
+        ReplicaRouter._lag_seconds = lag_seconds
+        ReplicaRouter._lag_checked_at = time.monotonic()
+
+    @staticmethod
+    async def refresh_lag(replica: AsyncEngine) -> None:
+        """Re-measure replication lag when the last measurement is stale."""
+        if time.monotonic() - ReplicaRouter._lag_checked_at < ReplicaRouter.LAG_CHECK_INTERVAL_SECONDS:
+            return
+        try:
+            if replica.dialect.name != "postgresql":
+                ReplicaRouter.record_lag(0.0)
+                return
+            async with replica.connect() as connection:
+                lag = await connection.scalar(text(
+                    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                ))
+            ReplicaRouter.record_lag(float(lag or 0.0))
+        except Exception as exc:
+            # An unreachable replica is treated as infinitely behind.
+            logger.warning("Replica lag check failed; reading from primary: %s", exc)
+            ReplicaRouter.record_lag(None)
+
+    @staticmethod
+    def sticky_key(authorization: Optional[str]) -> Optional[str]:
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def mark_write(key: Optional[str]) -> None:
+        """Pin a client to the primary long enough for the replica to catch up."""
+        if not key:
+            return
+        now = time.monotonic()
+        if len(ReplicaRouter._recent_writers) >= ReplicaRouter.MAX_STICKY_ENTRIES:
+            ReplicaRouter._recent_writers = {
+                writer: expires
+                for writer, expires in ReplicaRouter._recent_writers.items()
+                if expires > now
+            }
+        ReplicaRouter._recent_writers[key] = now + ReplicaRouter.STICKY_SECONDS
+
+    @staticmethod
+    def wrote_recently(key: Optional[str]) -> bool:
+        if not key:
+            return False
+        expires = ReplicaRouter._recent_writers.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            ReplicaRouter._recent_writers.pop(key, None)
+            return False
+        return True
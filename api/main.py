@@ -3,19 +3,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from core.settings import get_settings
 from fastapi.responses import RedirectResponse
 from routers.v1 import router as v1_router
-from database.connection import db_health_check, get_db_session
-from fastapi.responses import FileResponse, HTMLResponse
+from database.connection import db_health_check, get_db_session, pool_stats
+from database.instrumentation import track_queries
+from fastapi.responses import HTMLResponse
 from sqlalchemy import select, or_
 from models import Post, User, Category
-from pathlib import Path
 import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+from services.image_derivatives import ImageDerivativeService
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
 from services.post.post import PostService
+from services.rate_limit import SCOPE_IP, RateLimiter, RateLimitPolicy, rate_limited
+from services.ai.blog_jobs import BlogGenerationJobService
 from services.share import SharePageService
+from services.user.deletion_job import UserDeletionJobService
+from services.user.password_hashing import PasswordHashPool
 
 # Initialize cached settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+SEARCH_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "search", settings.RATE_LIMIT_SEARCH, scope=SCOPE_IP
+))
+
 
 def include_routers(app: FastAPI) -> None:
     @app.get("/", include_in_schema=False)
@@ -31,9 +45,23 @@ def include_routers(app: FastAPI) -> None:
             "version": "1.0.0",
             "environment": "development",
             "database": "connected" if db_healthy else "disconnected",
+            "password_hashing": PasswordHashPool.stats(),
         }
 
-    @app.get("/search", tags=["Global Search"], summary="Global Search")
+    @app.get("/health/pools", tags=["Health"])
+    async def pool_health():
+        return {"pools": pool_stats()}
+
+    @app.get("/health/rate-limits", tags=["Health"])
+    async def rate_limit_health():
+        return RateLimiter.stats()
+
+    @app.get(
+        "/search",
+        tags=["Global Search"],
+        summary="Global Search",
+        dependencies=[SEARCH_LIMIT],
+    )
     async def global_search(
         q: str = Query(..., min_length=1),
         db=Depends(get_db_session),
@@ -78,9 +106,14 @@ def include_routers(app: FastAPI) -> None:
     )
     async def get_image(
         filename: str,
+        request: Request,
         folder: str = Query(
             ..., description="Folder category (e.g., 'posts', 'avatars')"
         ),
+        w: Optional[str] = Query(
+            None,
+            description="Width in pixels, or 'social' for the 1200x630 share crop",
+        ),
     ):
         if folder not in ["posts", "avatars", "media", "images"]:
             raise HTTPException(
@@ -93,16 +126,39 @@ def include_routers(app: FastAPI) -> None:
         folder_aliases = {"images": "posts"}
         actual_folder = folder_aliases.get(folder, folder)
         
-        directory = Path(f"uploads/{actual_folder}")
-        file_path = directory / filename
-        
-        if not file_path.exists():
+        file_path = MediaStore.resolve(actual_folder, filename)
+        stat_result = ImageServer.stat(file_path)
+        if stat_result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Image not found"
             )
-        
-        return FileResponse(file_path)
+
+        # Content-addressed names never change content, so they are immutable.
+        content_id = Path(filename).stem if MediaStore.blob_filename(filename) else None
+
+        if w is not None:
+            variant = ImageDerivativeService.parse_variant(w)
+            derived = await ImageDerivativeService.get(
+                filename, variant, request.headers.get("accept", "")
+            )
+            if derived is not None:
+                derived_path, media_type = derived
+                derived_stat = ImageServer.stat(derived_path)
+                if derived_stat is not None:
+                    return ImageServer.respond(
+                        request,
+                        derived_path,
+                        derived_stat,
+                        media_type=media_type,
+                        content_id=f"{content_id}-{derived_path.name}",
+                        vary="Accept",
+                    )
+            # The original stands in for a derivative that may exist later,
+            # so it must not be cached as immutable under this URL.
+            content_id = None
+
+        return ImageServer.respond(request, file_path, stat_result, content_id=content_id)
 
     @app.api_route(
         "/share/posts/{post_identifier}",
@@ -125,9 +181,7 @@ def include_routers(app: FastAPI) -> None:
         Render a share bridge page with crawler-visible metadata, then hand
         humans off to the canonical frontend article URL.
         """
-        post = await PostService.get_post_by_uuid(db, post_identifier)
-        if not post:
-            post = await PostService.get_post_by_slug(db, post_identifier)
+        post = await PostService.get_post_by_identifier(db, post_identifier)
 
         if not post or not post.is_published:
             raise HTTPException(
@@ -149,6 +203,16 @@ def include_routers(app: FastAPI) -> None:
     app.include_router(v1_router)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deletions interrupted by a restart continue where they stopped.
+    await UserDeletionJobService.resume_pending()
+    await BlogGenerationJobService.resume_pending()
+    yield
+    await BlogGenerationJobService.shutdown()
+    await UserDeletionJobService.shutdown()
+
+
 def create_application() -> FastAPI:
     app = FastAPI(
         title="CraftyXhub API",
@@ -160,7 +224,8 @@ def create_application() -> FastAPI:
         contact={
             "name": "CraftyXhub Support",
             "email": "support@craftyhub.com",
-        }
+        },
+        lifespan=lifespan,
     )
     allow_origins = settings.ALLOWED_ORIGINS
 
@@ -191,6 +256,27 @@ def create_application() -> FastAPI:
         **cors_kwargs
     )
 
+    @app.middleware("http")
+    async def query_instrumentation(request: Request, call_next):
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        if settings.QUERY_SERVER_TIMING_ENABLED:
+            response.headers.append("Server-Timing", stats.server_timing())
+        if stats.count >= settings.REQUEST_QUERY_COUNT_WARN_THRESHOLD:
+            logger.warning(
+                "%s %s ran %d queries in %.1f ms; slowest: %s",
+                request.method,
+                request.url.path,
+                stats.count,
+                stats.total_seconds * 1000,
+                [
+                    f"{seconds * 1000:.1f} ms {' '.join(statement.split())[:200]}"
+                    for seconds, statement in stats.slowest[:3]
+                ],
+            )
+        return response
+
     # Optional AI observability setup and runtime capability checks.
     try:
         from services.ai.observability import configure_observability
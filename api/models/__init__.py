@@ -1,10 +1,10 @@
 from .base import Base
-from .user import User, Profile, UserRoleChange, PasswordResetToken, EmailVerificationToken
+from .user import User, Profile, UserRoleChange, UserSuggestion, UserDeletionJob, PasswordResetToken, EmailVerificationToken
 from .post import Post, Category, Tag
 from .comment import Comment
 from .report import Report
 from .comment_report import CommentReport
-from .ai_draft import AIDraft, AIGenerationLog
+from .ai_draft import AIDraft, AIGenerationLog, BlogGenerationJob
 from .notification import Notification
 from .collection import ReadingList, ReadingListItem, ReadingHistory, Highlight
 
@@ -13,6 +13,8 @@ __all__ = [
     'User',
     'Profile',
     'UserRoleChange',
+    'UserSuggestion',
+    'UserDeletionJob',
     'PasswordResetToken',
     'EmailVerificationToken',
     'Post',
@@ -23,6 +25,7 @@ __all__ = [
     'CommentReport',
     'AIDraft',
     'AIGenerationLog',
+    'BlogGenerationJob',
     'Notification',
     'ReadingList',
     'ReadingListItem',
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, Float, ForeignKey, JSON, DateTime
 from sqlalchemy.orm import relationship
 from .base import BaseTable
 
@@ -31,3 +31,24 @@ class AIGenerationLog(BaseTable):
     user = relationship("User", back_populates="ai_generation_logs")
 
 
+class BlogGenerationJob(BaseTable):
+    """A queued blog generation, run by services/ai/blog_jobs.py."""
+    __tablename__ = "blog_generation_jobs"
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # queued, running, completed or failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    # research, outline, draft, editorial or saving while running
+    phase = Column(String(20), nullable=True)
+    # Phases entered so far: [{"phase": ..., "started_at": ...}]
+    progress = Column(JSON, nullable=True)
+    request = Column(JSON, nullable=False)
+    # BlogGenerateResponse of a completed job
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    # HTTP status the synchronous endpoint would have failed with
+    error_status = Column(Integer, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    # Refreshed by the worker while running; a stale one means it died.
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -34,13 +34,19 @@ class Post(BaseTable):
     content = Column(Text, nullable=False)
     content_blocks = Column(JSON, nullable=True)
     excerpt = Column(Text, nullable=True)
-    featured_image = Column(String(500), nullable=True)
+    featured_image = Column(String(500), nullable=True, index=True)
     author_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     category_id = Column(Integer, ForeignKey('categories.id'), nullable=True)
     is_published = Column(Boolean, default=False)
     is_featured = Column(Boolean, default=False)
     view_count = Column(Integer, default=0)
     reading_time = Column(Integer, nullable=True)
+    # Derived from content/content_blocks on write; see ContentProcessor.
+    word_count = Column(Integer, nullable=True)
+    image_count = Column(Integer, nullable=True)
+    heading_outline = Column(JSON, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    content_metadata = Column(JSON, nullable=True)
     meta_title = Column(String(200), nullable=True)
     meta_description = Column(String(300), nullable=True)
     published_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum, Float, Index, UniqueConstraint, JSON
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from .base import BaseTable, post_likes, post_bookmarks, user_follows
@@ -20,6 +20,14 @@ class UserRole(PyEnum):
 
 class User(BaseTable):
     __tablename__ = 'users'
+    # Keyset pagination of the admin user list (sort column, id). On
+    # PostgreSQL, migration a7c3e9f1d5b2 also adds pg_trgm GIN indexes for
+    # substring search on email, username and full_name.
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_last_login_id", "last_login", "id"),
+        Index("ix_users_full_name_id", "full_name", "id"),
+    )
     
     email = Column(String(255), unique=True, index=True, nullable=False)
     username = Column(String(50), unique=True, index=True, nullable=False)
@@ -30,6 +38,11 @@ class User(BaseTable):
     last_login = Column(DateTime, nullable=True)
     
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+
+    # Denormalized from user_follows; maintained by UserFollowService and
+    # repaired by scripts/reconcile_follow_counts.py.
+    follower_count = Column(Integer, default=0, server_default="0", nullable=False, index=True)
+    following_count = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     profile = relationship("Profile", back_populates="user", uselist=False, cascade="all, delete-orphan")
@@ -110,11 +123,49 @@ class UserRoleChange(BaseTable):
     user = relationship("User", foreign_keys=[user_id], backref="role_change_events")
     changed_by = relationship("User", foreign_keys=[changed_by_id])
 
+class UserSuggestion(BaseTable):
+    """Precomputed who-to-follow candidate, rebuilt by scripts/build_follow_suggestions.py."""
+    __tablename__ = "user_suggestions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "suggested_user_id", name="uq_user_suggestions_pair"),
+        Index("ix_user_suggestions_user_score", "user_id", "score"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    suggested_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False, default=0.0)
+    # Strongest signal behind the candidate: co_follow, reading_history or popular
+    reason = Column(String(32), nullable=False)
+
+    suggested_user = relationship("User", foreign_keys=[suggested_user_id])
+
+class UserDeletionJob(BaseTable):
+    """Progress of a permanent account deletion, run by services/user/deletion_job.py."""
+    __tablename__ = "user_deletion_jobs"
+
+    # Plain ids rather than foreign keys: the job outlives both users.
+    user_id = Column(Integer, nullable=False, index=True)
+    requested_by_id = Column(Integer, nullable=True)
+    # pending, running, completed or failed
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    step = Column(String(50), nullable=True)
+    # Steps before this one are finished; a resumed job continues here.
+    step_index = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    deleted_user = Column(JSON, nullable=False)
+    deleted_counts = Column(JSON, nullable=True)
+    # Files of deleted rows, removed once every row is gone.
+    file_paths = Column(JSON, nullable=True)
+    failed_file_cleanup = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
 class Profile(BaseTable):
     __tablename__ = 'profiles'
     
     user_id = Column(Integer, ForeignKey('users.id'), unique=True, nullable=False)
-    avatar = Column(String(500), nullable=True)
+    avatar = Column(String(500), nullable=True, index=True)
     bio = Column(Text, nullable=True)
     location = Column(String(100), nullable=True)
     twitter_handle = Column(String(100), nullable=True)
@@ -130,7 +181,7 @@ class Media(BaseTable):
     __tablename__ = 'media'
 
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False, index=True)
     file_name = Column(String(255), nullable=False)
     file_type = Column(Enum(MediaType), nullable=False)
     file_size = Column(Integer, nullable=False)  # Size in bytes
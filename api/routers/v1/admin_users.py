@@ -1,18 +1,23 @@
+import base64
+import json
 import math
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func, or_, select
+# The list filters take a parameter named ``status``.
+from fastapi import status as http_status
+from sqlalchemy import DateTime, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from database.connection import get_db_session
+from core.config import settings
+from database.connection import get_analytics_db_session, get_db_session
 from models import User
 from models.user import UserRole as DBUserRole, UserRoleChange
 from schemas.user import (
     AdminPasswordResetRequest,
-    AdminUserDeletionResponse,
+    AdminUserDeletionJobResponse,
     AdminUserListResponse,
     AdminUserResponse,
     AdminUserStatsResponse,
@@ -29,7 +34,10 @@ from services.user.auth import (
     get_current_admin_only,
 )
 from services.user.admin_user_management import AdminUserManagementService
+from services.user.auth_cache import AuthUserCache
+from services.user.deletion_job import UserDeletionJobService
 from services.user.role_change import RoleChangeService
+from services.user.stats import UserStatsService
 
 
 router = APIRouter(prefix="/admin/users", tags=["Admin Users"])
@@ -50,45 +58,51 @@ async def list_admin_users(
         None,
         description="Sort field, prefix with '-' for descending (created_at, last_login, full_name)",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of the previous page; replaces page for deep pagination",
+    ),
+    count: str = Query(
+        "exact",
+        pattern="^(exact|estimate)$",
+        description="'estimate' skips exact counting on large result sets",
+    ),
     session: AsyncSession = Depends(get_db_session),
     _: User = Depends(get_current_admin_or_moderator),
 ) -> AdminUserListResponse:
     filters = _build_user_filters(search, role, status)
+    sort_key = sort if sort in _SORT_COLUMNS else "-created_at"
 
-    total_stmt = select(func.count()).select_from(User)
-    if filters:
-        total_stmt = total_stmt.where(and_(*filters))
-
-    total = await session.scalar(total_stmt) or 0
-
-    query = (
-        select(User)
-        .options(selectinload(User.profile))
-        .offset((page - 1) * size)
-        .limit(size)
-    )
+    total, total_is_estimate = await _count_users(session, filters, estimate=count == "estimate")
 
+    query = select(User).options(selectinload(User.profile)).order_by(*_sort_order(sort_key))
     if filters:
         query = query.where(and_(*filters))
+    if cursor:
+        query = query.where(_after_cursor(sort_key, _decode_cursor(cursor, sort_key)))
+    else:
+        query = query.offset((page - 1) * size)
 
-    order_clause = _resolve_sort_clause(sort)
-    query = query.order_by(order_clause)
-
-    result = await session.execute(query)
-    users: List[User] = result.scalars().all()
+    # One extra row tells whether another page follows.
+    result = await session.execute(query.limit(size + 1))
+    users: List[User] = list(result.scalars().all())
+    has_more = len(users) > size
+    users = users[:size]
 
     pages = math.ceil(total / size) if total else 0
-    has_next = page < pages
-    has_prev = page > 1
+    has_next = has_more
+    has_prev = bool(cursor) or page > 1
 
     return AdminUserListResponse(
         users=users,
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         size=size,
         pages=pages,
         has_next=has_next,
         has_prev=has_prev,
+        next_cursor=_encode_cursor(sort_key, users[-1]) if has_more else None,
     )
 
 
@@ -98,44 +112,10 @@ async def list_admin_users(
     summary="Retrieve aggregate user statistics",
 )
 async def get_user_statistics(
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_analytics_db_session),
     _: User = Depends(get_current_admin_or_moderator),
 ) -> AdminUserStatsResponse:
-    total_users = await session.scalar(select(func.count()).select_from(User)) or 0
-    active_users = await session.scalar(
-        select(func.count()).select_from(User).where(User.is_active.is_(True))
-    ) or 0
-    inactive_users = total_users - active_users
-
-    role_counts_stmt = await session.execute(
-        select(User.role, func.count()).group_by(User.role)
-    )
-    role_counts = {
-        getattr(role, "value", role): count for role, count in role_counts_stmt.all()
-    }
-
-    admin_count = role_counts.get(SchemaUserRole.ADMIN.value, 0)
-    moderator_count = role_counts.get(SchemaUserRole.MODERATOR.value, 0)
-    user_count = role_counts.get(SchemaUserRole.USER.value, 0)
-
-    recent_threshold = (
-        datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
-    )
-    recent_registrations = await session.scalar(
-        select(func.count())
-        .select_from(User)
-        .where(User.created_at >= recent_threshold)
-    ) or 0
-
-    return AdminUserStatsResponse(
-        total_users=total_users,
-        active_users=active_users,
-        inactive_users=inactive_users,
-        admin_count=admin_count,
-        moderator_count=moderator_count,
-        user_count=user_count,
-        recent_registrations=recent_registrations,
-    )
+    return AdminUserStatsResponse(**await UserStatsService.get_snapshot(session))
 
 
 @router.get(
@@ -190,6 +170,7 @@ async def update_admin_user(
         user.is_verified = payload.is_verified
 
     await session.commit()
+    await AuthUserCache.invalidate(user_uuid)
     return await _get_user_or_404(session, user_uuid)
 
 
@@ -231,6 +212,8 @@ async def change_user_role(
     )
 
     await session.commit()
+    await AuthUserCache.invalidate(user_uuid)
+    UserStatsService.invalidate()
     return await _get_user_or_404(session, user_uuid)
 
 
@@ -255,6 +238,8 @@ async def toggle_user_status(
     user.is_active = payload.is_active
 
     await session.commit()
+    await AuthUserCache.invalidate(user_uuid)
+    UserStatsService.invalidate()
     return await _get_user_or_404(session, user_uuid)
 
 
@@ -281,6 +266,8 @@ async def deactivate_user(
 
     user.is_active = False
     await session.commit()
+    await AuthUserCache.invalidate(user_uuid)
+    UserStatsService.invalidate()
 
     return {"message": "User deactivated successfully"}
 
@@ -304,10 +291,11 @@ async def reset_user_password(
         action="reset the password for",
     )
 
-    user.password = AuthService.get_password_hash(payload.new_password)
+    user.password = await AuthService.get_password_hash_async(payload.new_password)
     user.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     await AuthService.invalidate_password_reset_tokens(session, user.id)
     await session.commit()
+    await AuthUserCache.invalidate(user_uuid)
 
     return PasswordResetResponse(
         message="User password reset successfully.",
@@ -315,17 +303,40 @@ async def reset_user_password(
     )
 
 
+@router.get(
+    "/deletion-jobs/{job_uuid}",
+    response_model=AdminUserDeletionJobResponse,
+    summary="Get the progress of a permanent user deletion",
+)
+async def get_user_deletion_job(
+    job_uuid: str,
+    session: AsyncSession = Depends(get_db_session),
+    _: User = Depends(get_current_admin_only),
+) -> AdminUserDeletionJobResponse:
+    job = await UserDeletionJobService.get_by_uuid(session, job_uuid)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deletion job not found",
+        )
+    return AdminUserDeletionJobResponse(**UserDeletionJobService.describe(job))
+
+
 @router.delete(
     "/{user_uuid}/permanent",
-    response_model=AdminUserDeletionResponse,
-    status_code=status.HTTP_200_OK,
+    response_model=AdminUserDeletionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Permanently delete a user account and owned content",
 )
 async def permanently_delete_user(
     user_uuid: str,
     session: AsyncSession = Depends(get_db_session),
     current_admin: User = Depends(get_current_admin_only),
-) -> AdminUserDeletionResponse:
+) -> AdminUserDeletionJobResponse:
+    """
+    Deactivate the account and delete it with its content in the background.
+    Poll ``/admin/users/deletion-jobs/{job_uuid}`` for progress.
+    """
     user = await _get_user_or_404(session, user_uuid)
     await AdminUserManagementService.ensure_can_manage_target(
         session,
@@ -334,16 +345,12 @@ async def permanently_delete_user(
         action="permanently delete",
     )
 
-    result = await AdminUserManagementService.permanently_delete_user(
+    job = await UserDeletionJobService.enqueue(
         session,
         user=user,
+        requested_by=current_admin,
     )
-    return AdminUserDeletionResponse(
-        message="User permanently deleted successfully.",
-        deleted_user_uuid=result["deleted_user"]["uuid"],
-        deleted_counts=result["deleted_counts"],
-        failed_file_cleanup=result["failed_file_cleanup"],
-    )
+    return AdminUserDeletionJobResponse(**UserDeletionJobService.describe(job))
 
 
 @router.get(
@@ -404,19 +411,27 @@ async def _get_user_or_404(session: AsyncSession, user_uuid: str) -> User:
     return user
 
 
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
 def _build_user_filters(
     search: Optional[str],
     role: Optional[SchemaUserRole],
     status: Optional[str],
 ) -> List:
     filters = []
-    if search:
-        term = f"%{search.strip()}%"
+    term = (search or "").strip()
+    if term:
+        # Served by the trigram indexes on PostgreSQL; terms shorter than
+        # three characters cannot use them and scan the table.
+        pattern = _like_pattern(term)
         filters.append(
             or_(
-                User.full_name.ilike(term),
-                User.username.ilike(term),
-                User.email.ilike(term),
+                User.full_name.ilike(pattern, escape="\\"),
+                User.username.ilike(pattern, escape="\\"),
+                User.email.ilike(pattern, escape="\\"),
             )
         )
 
@@ -427,7 +442,7 @@ def _build_user_filters(
         normalized = status.lower()
         if normalized not in {"active", "inactive"}:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=http_status.HTTP_400_BAD_REQUEST,
                 detail="Status filter must be 'active' or 'inactive'",
             )
         filters.append(User.is_active.is_(normalized == "active"))
@@ -435,13 +450,81 @@ def _build_user_filters(
     return filters
 
 
-def _resolve_sort_clause(sort: Optional[str]):
-    mapping = {
-        "created_at": User.created_at.asc(),
-        "-created_at": User.created_at.desc(),
-        "last_login": User.last_login.asc(),
-        "-last_login": User.last_login.desc(),
-        "full_name": User.full_name.asc(),
-        "-full_name": User.full_name.desc(),
-    }
-    return mapping.get(sort or "-created_at", User.created_at.desc())
+async def _count_users(session: AsyncSession, filters: List, estimate: bool) -> Tuple[int, bool]:
+    """The matching user count and whether it is approximate."""
+    cap = settings.ADMIN_USER_COUNT_ESTIMATE_CAP
+    if estimate and not filters:
+        return await UserStatsService.estimate_total(session, threshold=cap)
+
+    if estimate:
+        # Stop counting past the cap: "more than N" is all a pager needs.
+        capped = select(User.id).where(and_(*filters)).limit(cap + 1).subquery()
+        total = await session.scalar(select(func.count()).select_from(capped)) or 0
+        return min(total, cap), total > cap
+
+    total_stmt = select(func.count()).select_from(User)
+    if filters:
+        total_stmt = total_stmt.where(and_(*filters))
+    return await session.scalar(total_stmt) or 0, False
+
+
+# sort key -> (column, descending); ties are broken by id in the same direction.
+_SORT_COLUMNS = {
+    "created_at": (User.created_at, False),
+    "-created_at": (User.created_at, True),
+    "last_login": (User.last_login, False),
+    "-last_login": (User.last_login, True),
+    "full_name": (User.full_name, False),
+    "-full_name": (User.full_name, True),
+}
+
+
+def _sort_order(sort_key: str) -> list:
+    # NULLs sort last ascending and first descending, so both directions are
+    # a plain forward or backward scan of the (column, id) index.
+    column, descending = _SORT_COLUMNS[sort_key]
+    if descending:
+        return [column.desc().nulls_first(), User.id.desc()]
+    return [column.asc().nulls_last(), User.id.asc()]
+
+
+def _encode_cursor(sort_key: str, user: User) -> str:
+    column, _ = _SORT_COLUMNS[sort_key]
+    value = getattr(user, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"sort": sort_key, "value": value, "id": user.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["sort"] != sort_key:
+            raise ValueError("cursor was issued for another sort order")
+        value = payload["value"]
+        column, _ = _SORT_COLUMNS[sort_key]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        return value, int(payload["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from exc
+
+
+def _after_cursor(sort_key: str, position: Tuple[Any, int]):
+    """Rows after ``position`` in ``_sort_order``."""
+    column, descending = _SORT_COLUMNS[sort_key]
+    value, last_id = position
+    id_after = User.id < last_id if descending else User.id > last_id
+    if value is None:
+        if descending:
+            return or_(and_(column.is_(None), id_after), column.is_not(None))
+        return and_(column.is_(None), id_after)
+    after = or_(column < value if descending else column > value, and_(column == value, id_after))
+    if column.nullable and not descending:
+        return or_(after, column.is_(None))
+    return after
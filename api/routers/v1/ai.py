@@ -1,11 +1,15 @@
 import re
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.connection import get_db_session
-from services.user.auth import get_current_active_user
-from services.ai import AIGeneratorService, AIDraftService, BlogAgentService, WebSearchService
+from database.connection import get_background_db_session, get_db_session
+from services.user.auth import get_current_active_background_user, get_current_active_user
+from services.ai import AIGeneratorService, AIDraftService, WebSearchService
+from services.ai.blog_jobs import BlogGenerationJobService, generate_blog_post
 from services.post import PostService
+from services.rate_limit import RateLimitPolicy, rate_limited
+from core.config import settings
 from schemas.ai import (
     GenerateRequest,
     GenerateResponse,
@@ -17,15 +21,36 @@ from schemas.ai import (
     DraftListResponse,
     BlogGenerateRequest,
     BlogGenerateResponse,
+    BlogGenerationJobResponse,
     BlogPost,
 )
-from schemas.post import PostCreate, TagCreate
 from models import User
 from typing import List
-from datetime import datetime, timezone
 
 router = APIRouter(prefix="/ai", tags=["AI Content Generation"])
 
+# Per-user limits; blog generation holds an LLM for minutes, so it is also
+# capped in flight across all users.
+BLOG_GENERATION_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "ai.generate_blog",
+    settings.RATE_LIMIT_AI_BLOG,
+    concurrency=settings.RATE_LIMIT_AI_BLOG_CONCURRENCY,
+    global_concurrency=settings.RATE_LIMIT_AI_BLOG_GLOBAL_CONCURRENCY,
+))
+GENERATION_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "ai.generate",
+    settings.RATE_LIMIT_AI_GENERATE,
+    concurrency=settings.RATE_LIMIT_AI_GENERATE_CONCURRENCY,
+))
+# Submitting a job spends from the same bucket as a synchronous generation;
+# queued jobs are capped by BlogGenerationJobService instead of in flight.
+BLOG_JOB_SUBMIT_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "ai.generate_blog", settings.RATE_LIMIT_AI_BLOG
+))
+SEARCH_PREVIEW_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "ai.search_preview", settings.RATE_LIMIT_AI_SEARCH_PREVIEW
+))
+
 
 def _clean_generated_excerpt(raw_excerpt: str) -> str:
     excerpt = (raw_excerpt or "").strip()
@@ -107,7 +132,7 @@ async def test_chat(
         )
 
 
-@router.post("/generate", response_model=GenerateResponse)
+@router.post("/generate", response_model=GenerateResponse, dependencies=[GENERATION_LIMIT])
 async def generate_content(
     request: GenerateRequest,
     current_user: User = Depends(get_current_active_user),
@@ -136,7 +161,11 @@ async def generate_content(
         )
 
 
-@router.post("/generate/excerpt", response_model=ExcerptGenerateResponse)
+@router.post(
+    "/generate/excerpt",
+    response_model=ExcerptGenerateResponse,
+    dependencies=[GENERATION_LIMIT],
+)
 async def generate_excerpt(
     request: ExcerptGenerateRequest,
     current_user: User = Depends(get_current_active_user),
@@ -363,11 +392,11 @@ async def get_blog_options():
 # ============================================================================
 
 
-@router.post("/generate/blog", response_model=BlogGenerateResponse)
+@router.post("/generate/blog", response_model=BlogGenerateResponse, dependencies=[BLOG_GENERATION_LIMIT])
 async def generate_blog(
     request: BlogGenerateRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_active_background_user),
+    db: AsyncSession = Depends(get_background_db_session),
 ):
     """
     Generate a complete, structured blog post using the Blog Agent.
@@ -382,147 +411,12 @@ async def generate_blog(
     - save_draft: Save the generated content as an AI draft
     - publish_post: Create a post directly in the Posts system
     - use_web_search: Enable or disable DuckDuckGo grounding
+
+    The connection stays open for the whole generation; prefer
+    ``POST /ai/generate/blog/jobs``, which returns a job to follow instead.
     """
     try:
-        # Initialize the blog agent service
-        blog_agent = BlogAgentService()
-        use_web_search = request.use_web_search
-
-        # Generate the blog post
-        blog_post, generation_time, web_search_used, sources = await blog_agent.generate(
-            topic=request.topic,
-            blog_type=request.blog_type,
-            keywords=request.keywords,
-            audience=request.audience,
-            word_count=request.word_count or "medium",
-            tone=request.tone or "professional",
-            language=request.language or "en-US",
-            model=request.model,
-            creativity=request.creativity or 0.7,
-            use_web_search=use_web_search,
-        )
-
-        quality_report = blog_agent.build_quality_report(
-            blog_post=blog_post,
-            word_count=request.word_count or "medium",
-            keywords=request.keywords,
-            phase_metrics=blog_agent.get_last_phase_metrics(),
-        )
-
-        draft_id = None
-        post_id = None
-
-        # Save as AI draft if requested
-        if request.save_draft:
-            try:
-                # Convert blog post to markdown for draft content
-                draft_content = blog_agent.blog_post_to_markdown(blog_post)
-                
-                draft_data = DraftSaveRequest(
-                    name=blog_post.title,
-                    content=draft_content,
-                    tool_id="blog-agent",
-                    model_used=request.model,
-                    favorite=False,
-                    draft_metadata={
-                        "blog_type": request.blog_type,
-                        "seo_title": blog_post.seo_title,
-                        "seo_description": blog_post.seo_description,
-                        "tags": blog_post.tags,
-                        "slug": blog_post.slug,
-                        "use_web_search": use_web_search,
-                        "web_search_used": web_search_used,
-                        "phase_metrics": blog_agent.get_last_phase_metrics(),
-                        "quality_report": quality_report,
-                    },
-                )
-                saved_draft = await AIDraftService.create_draft(
-                    draft_data, current_user.id, db
-                )
-                draft_id = saved_draft.uuid
-            except Exception as draft_error:
-                # Log but don't fail the whole request
-                print(f"Warning: Failed to save draft: {draft_error}")
-
-        # Publish as post if requested
-        if request.publish_post:
-            try:
-                # Convert blog post to HTML for post content
-                html_content = blog_agent.blog_post_to_html(blog_post)
-
-                # Calculate reading time (average 200 words per minute)
-                word_count = sum(
-                    len(section.body_markdown.split())
-                    for section in blog_post.sections
-                )
-                reading_time = max(1, word_count // 200)
-
-                # Create tags if they don't exist and get their IDs
-                tag_ids = []
-                for tag_name in blog_post.tags[:5]:  # Limit to 5 tags
-                    try:
-                        # Try to create or get existing tag
-                        existing_tag = await PostService.get_tag_by_slug(
-                            db, tag_name.lower().replace(" ", "-")
-                        )
-                        if existing_tag:
-                            tag_ids.append(existing_tag.id)
-                        else:
-                            tag_data = TagCreate(name=tag_name)
-                            new_tag = await PostService.create_tag(db, tag_data)
-                            tag_ids.append(new_tag.id)
-                    except Exception:
-                        # Skip tag if creation fails
-                        pass
-
-                # Create the post
-                post_content_blocks = {
-                    "ai_generation": {
-                        "generator": "blog-agent",
-                        "model": request.model,
-                        "use_web_search": use_web_search,
-                        "web_search_used": web_search_used,
-                        "search_sources_count": len(sources or []),
-                        "generated_at": datetime.now(timezone.utc).isoformat(),
-                        "phase_metrics": blog_agent.get_last_phase_metrics(),
-                        "quality_report": quality_report,
-                    }
-                }
-
-                post_data = PostCreate(
-                    title=blog_post.title,
-                    slug=blog_post.slug,
-                    content=html_content,
-                    content_blocks=post_content_blocks,
-                    excerpt=blog_post.summary,
-                    meta_title=blog_post.seo_title,
-                    meta_description=blog_post.seo_description,
-                    category_id=request.category_id,
-                    tag_ids=tag_ids,
-                    reading_time=reading_time,
-                    is_published=request.is_published if request.is_published is not None else False,
-                    is_featured=False,
-                )
-
-                created_post = await PostService.create_post(
-                    db, post_data, current_user.id
-                )
-                post_id = created_post.uuid
-            except Exception as post_error:
-                # Log but don't fail the whole request
-                print(f"Warning: Failed to create post: {post_error}")
-
-        return BlogGenerateResponse(
-            blog_post=blog_post,
-            draft_id=draft_id,
-            post_id=post_id,
-            model_used=request.model,
-            generation_time=round(generation_time, 2),
-            web_search_used=web_search_used,
-            search_sources=sources if web_search_used else None,
-            quality_report=quality_report,
-        )
-
+        return await generate_blog_post(db, current_user.id, request)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -532,12 +426,62 @@ async def generate_blog(
         )
 
 
+@router.post(
+    "/generate/blog/jobs",
+    response_model=BlogGenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[BLOG_JOB_SUBMIT_LIMIT],
+)
+async def submit_blog_generation_job(
+    request: BlogGenerateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Queue a blog generation and return its job immediately.
+
+    Follow it with ``GET /ai/generate/blog/jobs/{job_id}`` or the
+    server-sent events at ``/ai/generate/blog/jobs/{job_id}/events``; the
+    job keeps running if the client goes away.
+    """
+    job = await BlogGenerationJobService.submit(db, current_user.id, request)
+    return BlogGenerationJobService.describe(job)
+
+
+@router.get("/generate/blog/jobs/{job_id}", response_model=BlogGenerationJobResponse)
+async def get_blog_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    job = await BlogGenerationJobService.get_for_user(db, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return BlogGenerationJobService.describe(job)
+
+
+@router.get("/generate/blog/jobs/{job_id}/events")
+async def stream_blog_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """Stream job progress as server-sent events until it completes or fails."""
+    if await BlogGenerationJobService.get_for_user(db, job_id, current_user.id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return StreamingResponse(
+        BlogGenerationJobService.events(job_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================================
 # Web Search Preview Endpoint
 # ============================================================================
 
 
-@router.get("/search/preview")
+@router.get("/search/preview", dependencies=[SEARCH_PREVIEW_LIMIT])
 async def preview_web_search(
     topic: str = Query(..., min_length=3, description="Topic to search for"),
     current_user: User = Depends(get_current_active_user),
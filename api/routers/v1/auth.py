@@ -11,6 +11,8 @@ from schemas.user import (
     PasswordResetRequestEmail, PasswordResetConfirm, EmailVerificationRequest, PasswordResetResponse
 )
 from services.user.auth import AuthService, get_current_active_user
+from services.user.auth_cache import AuthUserCache
+from services.rate_limit import SCOPE_IP, RateLimitPolicy, rate_limited
 from services.user.notification import NotificationService
 from schemas.notification import NotificationType
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +20,11 @@ from sqlalchemy import select, or_
 
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
+
+# Per address: every attempt costs a bcrypt verification.
+LOGIN_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "auth.login", settings.RATE_LIMIT_LOGIN, scope=SCOPE_IP
+))
 logger = logging.getLogger(__name__)
 
 
@@ -40,7 +47,7 @@ async def register(
             detail="Username already taken"
         )
 
-    hashed_password = AuthService.get_password_hash(user_data.password)
+    hashed_password = await AuthService.get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -85,7 +92,7 @@ async def register(
     return db_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[LOGIN_LIMIT])
 async def login(
         user_credentials: UserLogin,
         session: AsyncSession = Depends(get_db_session)
@@ -109,6 +116,7 @@ async def login(
 
     user.last_login = datetime.now(timezone.utc).replace(tzinfo=None)
     await session.commit()
+    await AuthUserCache.invalidate(user.uuid)
 
     access_token = AuthService._issue_jwt(user)
 
@@ -185,6 +193,7 @@ async def update_user_profile(
 
     user.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     await session.commit()
+    await AuthUserCache.invalidate(user.uuid)
     await session.refresh(user)
 
     return user
@@ -203,16 +212,19 @@ async def reset_password(
         current_user: User = Depends(get_current_active_user),
         session: AsyncSession = Depends(get_db_session)
 ):
-    if not AuthService.verify_password(request.current_password, current_user.password):
+    # Cached user snapshots never carry the password hash.
+    await session.refresh(current_user, attribute_names=["password"])
+    if not await AuthService.verify_password_async(request.current_password, current_user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
 
-    current_user.password = AuthService.get_password_hash(request.new_password)
+    current_user.password = await AuthService.get_password_hash_async(request.new_password)
     current_user.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     await AuthService.invalidate_password_reset_tokens(session, current_user.id)
     await session.commit()
+    await AuthUserCache.invalidate(current_user.uuid)
 
     return {"message": "Password updated successfully"}
 
@@ -311,11 +323,12 @@ async def confirm_password_reset(
         )
     
     # Update password
-    user.password = AuthService.get_password_hash(request_data.new_password)
+    user.password = await AuthService.get_password_hash_async(request_data.new_password)
     user.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
     
     await AuthService.invalidate_password_reset_tokens(session, user.id)
     await session.commit()
+    await AuthUserCache.invalidate(user.uuid)
     
     return PasswordResetResponse(
         message="Password has been reset successfully. You can now log in with your new password.",
@@ -367,6 +380,7 @@ async def verify_email(
     verification_token.used = True
     
     await session.commit()
+    await AuthUserCache.invalidate(user.uuid)
     
     return PasswordResetResponse(
         message="Email verified successfully!",
@@ -378,7 +392,7 @@ class GoogleTokenRequest(BaseModel):
     credential: str
 
 
-@router.post("/google/token", response_model=Token)
+@router.post("/google/token", response_model=Token, dependencies=[LOGIN_LIMIT])
 async def google_token_login(
     request: GoogleTokenRequest,
     db: AsyncSession = Depends(get_db_session)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_db_session
+from database.connection import get_analytics_db_session
 from models import User
 from schemas.dashboard import AdminDashboardResponse, UserDashboardResponse
 from services.dashboard import DashboardService
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
     summary="Get system-wide dashboard analytics for admins and moderators",
 )
 async def get_admin_dashboard(
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_analytics_db_session),
     current_user: User = Depends(get_current_admin_or_moderator),
 ) -> AdminDashboardResponse:
     """
@@ -41,7 +41,7 @@ async def get_admin_dashboard(
     summary="Get creator-focused dashboard analytics for the current user",
 )
 async def get_user_dashboard(
-    session: AsyncSession = Depends(get_db_session),
+    session: AsyncSession = Depends(get_analytics_db_session),
     current_user: User = Depends(get_current_active_user),
 ) -> UserDashboardResponse:
     """
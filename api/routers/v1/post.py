@@ -1,16 +1,20 @@
 import os
 import json
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy import func
 from sqlmodel import select
 from typing import Optional, List
 from pydantic import ValidationError
 
 from services.post.post import PostService, UPLOAD_DIR
+from services.post.detail_cache import PostDetailCache
+from services.post.taxonomy import TaxonomyService
+from services.loader import EntityLoader
+from services.rate_limit import SCOPE_IP, RateLimitPolicy, client_ip, rate_limited
 from services.user.auth import get_current_active_user, get_current_admin_only
-from database.connection import get_db_session
+from database.connection import get_analytics_db_session, get_db_session, get_read_db_session
 from schemas.post import (
     PostCreate,
     PostUpdate,
@@ -28,30 +32,25 @@ from schemas.post import (
     ReportCreate,
     ReportResponse
 )
-from models import User, Category, Tag, Post
+from models import User, Tag, Post
 from fastapi import Form, File, UploadFile
 from models.base import post_bookmarks
+from core.config import settings
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+VIEW_LIMIT = rate_limited(RateLimitPolicy.from_spec(
+    "posts.view", settings.RATE_LIMIT_POST_VIEW, scope=SCOPE_IP
+))
+
 
 def _resolve_client_fingerprint(request: Request) -> str:
     """
-    Build a proxy-aware client fingerprint for view deduplication.
-
-    IP precedence:
-      1) CF-Connecting-IP
-      2) X-Forwarded-For (first hop)
-      3) X-Real-IP
-      4) request.client.host
+    Build a proxy-aware client fingerprint for view deduplication; the
+    address comes from ``client_ip``, which only believes forwarding headers
+    sent by ``TRUSTED_PROXIES``.
     """
-    ip = (
-        request.headers.get("cf-connecting-ip")
-        or (request.headers.get("x-forwarded-for", "").split(",")[0].strip() or None)
-        or request.headers.get("x-real-ip")
-        or (request.client.host if request.client else None)
-        or "unknown"
-    )
+    ip = client_ip(request)
     user_agent = (request.headers.get("user-agent") or "").strip().lower()[:200]
     return f"{ip}|{user_agent}"
 
@@ -60,7 +59,7 @@ def _resolve_client_fingerprint(request: Request) -> str:
 async def get_trending_posts(
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1, le=100),
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     posts = await PostService.get_trending_posts(session, skip=skip, limit=limit)
     total = await PostService.get_posts_count(session, published_only=True)
@@ -76,7 +75,7 @@ async def get_trending_posts(
 async def get_featured_posts(
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1, le=100),
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     posts = await PostService.get_featured_posts(session, skip=skip, limit=limit)
     total = await PostService.get_posts_count(session, published_only=True, is_featured=True)
@@ -114,7 +113,7 @@ async def get_for_you_posts(
 async def get_recent_posts(
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1, le=100),
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     posts = await PostService.get_recent_posts(session, skip=skip, limit=limit)
     total = await PostService.get_posts_count(session, published_only=True)
@@ -130,7 +129,7 @@ async def get_recent_posts(
 async def get_popular_posts(
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1, le=100),
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     posts = await PostService.get_popular_posts(session, skip=skip, limit=limit)
     total = await PostService.get_posts_count(session, published_only=True)
@@ -146,7 +145,7 @@ async def get_popular_posts(
 async def get_related_posts(
         post_slug: str,
         limit: int = Query(12, ge=1, le=20),
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     """Get related posts by slug (public endpoint) - supports carousel display"""
     post = await PostService.get_post_by_slug(session, post_slug)
@@ -275,12 +274,11 @@ async def get_posts(
         author_uuid: Optional[str] = None,
         category_id: Optional[int] = None,
         tag_id: Optional[int] = None,
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     # If author_uuid provided, resolve to author_id
     if author_uuid and not author_id:
-        from services.user.auth import AuthService
-        author = await AuthService.get_user_by_uuid(session, author_uuid)
+        author = await EntityLoader.for_session(session).load(User, "uuid", author_uuid)
         if author:
             author_id = author.id
     
@@ -314,21 +312,27 @@ async def get_post(
         session: AsyncSession = Depends(get_db_session)
 ):
     """Get a post by slug or UUID (public endpoint)"""
-    # Try UUID first (for edit page), then fall back to slug (for public view)
-    post = await PostService.get_post_by_uuid(session, post_identifier)
-    if not post:
-        post = await PostService.get_post_by_slug(session, post_identifier)
-    
+    # Read from the primary: a payload loaded from a lagging replica would be
+    # cached and served to every reader until it expires.
+    cached = PostDetailCache.get(post_identifier)
+    if cached is not None:
+        return JSONResponse(content=cached)
+    generation = PostDetailCache.generation()
+
+    # UUID (edit page) or slug (public view), resolved in one query
+    post = await PostService.get_post_by_identifier(session, post_identifier)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
 
-    return await PostService.get_post_with_relationships(session, post.id)
+    payload = PostResponse.model_validate(post).model_dump(mode="json")
+    PostDetailCache.set(post.id, payload, generation)
+    return JSONResponse(content=payload)
 
 
-@router.post("/{post_uuid}/view")
+@router.post("/{post_uuid}/view", dependencies=[VIEW_LIMIT])
 async def record_post_view(
         post_uuid: str,
         request: Request,
@@ -353,7 +357,7 @@ async def upload_post_image(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No file provided"
         )
-    file_path = await PostService.save_uploaded_file(file, UPLOAD_DIR)
+    file_path = await PostService.save_uploaded_file(file)
     return {"file_path": file_path, "filename": os.path.basename(file_path)}
 
 
@@ -377,7 +381,7 @@ async def create_post(
 ):
     # Use uploaded file if provided, otherwise fall back to pre-uploaded path
     if featured_image and featured_image.filename:
-        featured_image_path = await PostService.save_uploaded_file(featured_image, UPLOAD_DIR)
+        featured_image_path = await PostService.save_uploaded_file(featured_image)
 
     parsed_tag_ids = []
     if tag_ids:
@@ -422,8 +426,8 @@ async def create_post(
             is_published=is_published or False
         )
     except ValidationError as e:
-        if featured_image_path and os.path.exists(featured_image_path):
-            os.remove(featured_image_path)
+        if featured_image_path:
+            await PostService.delete_image_file(session, featured_image_path, UPLOAD_DIR)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail={
@@ -440,11 +444,16 @@ async def create_post(
         )
 
     try:
-        post = await PostService.create_post(session, post_data, current_user.id)
+        post = await PostService.create_post(
+            session,
+            post_data,
+            current_user.id,
+            regenerate_slug_on_conflict=not slug,
+        )
         return post
     except Exception as e:
-        if featured_image_path and os.path.exists(featured_image_path):
-            os.remove(featured_image_path)
+        if featured_image_path:
+            await PostService.delete_image_file(session, featured_image_path, UPLOAD_DIR)
         raise e
 
 
@@ -477,7 +486,7 @@ async def update_post(
     old_image_path = existing_post.featured_image
 
     if featured_image and featured_image.filename:
-        featured_image_path = await PostService.save_uploaded_file(featured_image, UPLOAD_DIR)
+        featured_image_path = await PostService.save_uploaded_file(featured_image)
     elif featured_image_path:
         # Use the pre-uploaded image path from eager upload
         pass
@@ -532,7 +541,7 @@ async def update_post(
         post_data = PostUpdate(**update_data)
     except ValidationError as e:
         if featured_image_path and featured_image_path != existing_post.featured_image:
-            PostService.delete_image_file(featured_image_path, UPLOAD_DIR)
+            await PostService.delete_image_file(session, featured_image_path, UPLOAD_DIR)
 
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -551,12 +560,12 @@ async def update_post(
 
     try:
         updated_post = await PostService.update_post(session, post_uuid, post_data, current_user.id)
-        await PostService.cleanup_old_image(old_image_path, featured_image_path, UPLOAD_DIR)
+        await PostService.cleanup_old_image(session, old_image_path, featured_image_path, UPLOAD_DIR)
 
         return updated_post
     except Exception as e:
         if featured_image_path and featured_image_path != existing_post.featured_image:
-            PostService.delete_image_file(featured_image_path, UPLOAD_DIR)
+            await PostService.delete_image_file(session, featured_image_path, UPLOAD_DIR)
         raise e
 
 
@@ -582,28 +591,9 @@ async def toggle_post_like(
 # Categories endpoints
 @router.get("/categories/", response_model=CategoryListResponse)
 async def get_categories(
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
-    result = await session.execute(
-        select(Category)
-        .options(selectinload(Category.subcategories))
-        .where(Category.parent_id.is_(None))
-    )
-    categories = result.scalars().all()
-
-    counts_result = await session.execute(
-        select(Post.category_id, func.count(Post.id).label("post_count"))
-        .where(Post.deleted_at.is_(None), Post.category_id.is_not(None))
-        .group_by(Post.category_id)
-    )
-    post_counts = {category_id: post_count for category_id, post_count in counts_result.all()}
-
-    for category in categories:
-        category.post_count = post_counts.get(category.id, 0)
-        for subcategory in category.subcategories:
-            subcategory.post_count = post_counts.get(subcategory.id, 0)
-
-    return {"categories": categories}
+    return {"categories": await TaxonomyService.get_category_tree(session)}
 
 
 @router.post("/categories/", response_model=CategoryCreateResponse, status_code=status.HTTP_201_CREATED)
@@ -638,52 +628,18 @@ async def delete_category(
 @router.get("/tags/", response_model=TagListResponse)
 async def get_tags(
         category_id: Optional[int] = None,
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     """Get all tags, optionally filtered by category"""
-    query = select(Tag)
-    if category_id is not None:
-        query = query.where(Tag.category_id == category_id)
-    result = await session.execute(query)
-    tags = result.scalars().all()
-    return {"tags": tags}
+    return {"tags": await TaxonomyService.get_tags(session, category_id)}
 
 
 @router.get("/tags/grouped/")
 async def get_tags_grouped(
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_read_db_session)
 ):
     """Get tags grouped by category for easier selection when writing articles"""
-    # Get all parent categories
-    categories_result = await session.execute(
-        select(Category).where(Category.parent_id == None)
-    )
-    parent_categories = categories_result.scalars().all()
-    
-    groups = []
-    
-    for parent in parent_categories:
-        # Get subcategory IDs for this parent
-        subcats_result = await session.execute(
-            select(Category.id).where(Category.parent_id == parent.id)
-        )
-        subcat_ids = [row[0] for row in subcats_result.all()]
-        all_category_ids = [parent.id] + subcat_ids
-        
-        # Get tags for this category and its subcategories
-        tags_result = await session.execute(
-            select(Tag).where(Tag.category_id.in_(all_category_ids))
-        )
-        tags = tags_result.scalars().all()
-        
-        if tags:
-            groups.append({
-                "category_id": parent.id,
-                "category_name": parent.name,
-                "tags": [{"id": t.id, "name": t.name, "slug": t.slug, "category_id": t.category_id, "created_at": t.created_at, "post_count": 0} for t in tags]
-            })
-    
-    return {"groups": groups}
+    return {"groups": await TaxonomyService.get_tag_groups(session)}
 
 
 @router.post("/tags/", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
@@ -722,6 +678,8 @@ async def update_tag(
         tag.category_id = tag_data.category_id
     
     await session.commit()
+    PostDetailCache.reset()
+    TaxonomyService.invalidate()
     await session.refresh(tag)
     return tag
 
@@ -745,12 +703,14 @@ async def delete_tag(
     
     await session.delete(tag)
     await session.commit()
+    PostDetailCache.reset()
+    TaxonomyService.invalidate()
     return None
 
 
 @router.get("/stats/", response_model=PostStatsResponse)
 async def get_post_stats(
-        session: AsyncSession = Depends(get_db_session)
+        session: AsyncSession = Depends(get_analytics_db_session)
 ):
     stats = await PostService.get_post_stats(session)
     return stats
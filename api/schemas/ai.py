@@ -224,3 +224,25 @@ class BlogGenerateResponse(BaseModel):
         default=None,
         description="Deterministic quality analysis report (readability, SEO, style)",
     )
+
+
+class BlogGenerationJobResponse(BaseModel):
+    """State of a queued blog generation."""
+    job_id: str = Field(..., description="Job UUID")
+    status: Literal["queued", "running", "completed", "failed"]
+    phase: Optional[str] = Field(
+        default=None, description="research, outline, draft, editorial or saving while running"
+    )
+    progress: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Phases entered so far with their start times"
+    )
+    result: Optional[BlogGenerateResponse] = Field(
+        default=None, description="Generation result once completed"
+    )
+    error: Optional[str] = None
+    error_status: Optional[int] = Field(
+        default=None, description="HTTP status the synchronous endpoint would have returned"
+    )
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
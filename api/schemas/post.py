@@ -138,6 +138,9 @@ class PostResponse(BaseModel):
     is_featured: bool
     view_count: int
     reading_time: Optional[int]
+    word_count: Optional[int] = None
+    image_count: Optional[int] = None
+    heading_outline: Optional[List[Dict[str, Any]]] = None
     meta_title: Optional[str]
     meta_description: Optional[str]
     published_at: Optional[datetime]
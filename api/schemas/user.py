@@ -260,11 +260,15 @@ class AdminUserResponse(UserWithProfileResponse):
 class AdminUserListResponse(BaseModel):
     users: List[AdminUserResponse]
     total: int
+    # True when total came from the planner estimate or hit the count cap.
+    total_is_estimate: bool = False
     page: int
     size: int
     pages: int
     has_next: bool
     has_prev: bool
+    # Pass as ?cursor= for the next page; stable under concurrent inserts.
+    next_cursor: Optional[str] = None
 
 
 class AdminUserStatsResponse(BaseModel):
@@ -298,8 +302,16 @@ class UserRoleChangeListResponse(BaseModel):
     has_prev: bool
 
 
-class AdminUserDeletionResponse(BaseModel):
-    message: str
+class AdminUserDeletionJobResponse(BaseModel):
+    job_uuid: str
+    status: str
     deleted_user_uuid: str
-    deleted_counts: dict[str, int]
+    current_step: Optional[str] = None
+    steps_completed: int
+    total_steps: int
+    attempts: int
+    deleted_counts: dict[str, int] = Field(default_factory=dict)
     failed_file_cleanup: List[str] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Backfill derived content columns on posts: reading_time, word_count,
+image_count, heading_outline, content_hash and content_metadata.
+
+New and edited posts get these on write. Run this once after the migration
+(and again whenever ContentDigest.METADATA_VERSION changes) so list views
+can rely on them for older posts too. Posts whose stored digest is current
+are skipped.
+
+Run from /api:
+  source venv/bin/activate && PYTHONPATH=. python scripts/backfill_post_content_metrics.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from sqlalchemy import select
+
+from database.connection import ENGINE_BACKGROUND, close_db, get_sessionmaker
+from models import Post
+from services.post.content import ContentDigest, ContentProcessor
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compute derived content metrics for posts that lack them."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=200,
+        help="Posts loaded and committed per batch.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Count posts that need a backfill without writing any changes.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON.",
+    )
+    return parser
+
+
+def needs_backfill(post: Post) -> bool:
+    metadata = post.content_metadata
+    return (
+        post.word_count is None
+        or not isinstance(metadata, dict)
+        or metadata.get("version") != ContentDigest.METADATA_VERSION
+        or post.content_hash != ContentProcessor.content_hash(post.content, post.content_blocks)
+    )
+
+
+async def backfill(session, batch_size: int, dry_run: bool) -> dict:
+    report = {"checked": 0, "updated": 0}
+    last_id = 0
+    while True:
+        # Keyset pagination keeps each batch a cheap index range scan.
+        result = await session.execute(
+            select(Post).where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+        )
+        posts = result.scalars().all()
+        if not posts:
+            break
+
+        for post in posts:
+            report["checked"] += 1
+            if needs_backfill(post):
+                report["updated"] += 1
+                if not dry_run:
+                    ContentProcessor.apply_to_post(post)
+        last_id = posts[-1].id
+
+        if dry_run:
+            session.expunge_all()
+        else:
+            await session.commit()
+            session.expunge_all()
+        # Bodies are only needed once; keep the digest cache from growing.
+        ContentProcessor.reset()
+    return report
+
+
+async def run(batch_size: int, dry_run: bool) -> dict:
+    try:
+        async with get_sessionmaker(ENGINE_BACKGROUND)() as session:
+            return await backfill(session, batch_size, dry_run)
+    finally:
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.batch_size < 1:
+        print("error: --batch-size must be positive", file=sys.stderr)
+        return 2
+    report = asyncio.run(run(args.batch_size, args.dry_run))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Checked posts: {report['checked']}")
+        if args.dry_run:
+            print(f"Posts needing backfill: {report['updated']}")
+            print("Dry run: no changes written.")
+        else:
+            print(f"Updated posts: {report['updated']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop responsiveness during a login storm.
+
+A minimal FastAPI app exposes ``/ping`` (no work) and ``/login`` (one bcrypt
+verification). For each mode the script fires a burst of concurrent logins
+while a probe keeps calling ``/ping``, and reports the probe's latency
+percentiles:
+  - inline: bcrypt runs on the event loop (the previous behaviour)
+  - pool:   bcrypt runs on PasswordHashPool
+
+Run from /api:
+  source venv/bin/activate && PYTHONPATH=. python scripts/benchmark_password_hashing.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+
+from services.user.auth import AuthService, pwd_context
+from services.user.password_hashing import PasswordHashPool
+
+
+VALID_MODES = {"inline", "pool"}
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+def parse_modes(modes_csv: str) -> list[str]:
+    parsed = [mode.strip() for mode in modes_csv.split(",") if mode.strip()]
+    if not parsed:
+        raise ValueError("No modes provided")
+    invalid = [mode for mode in parsed if mode not in VALID_MODES]
+    if invalid:
+        raise ValueError(
+            "Invalid mode(s): "
+            f"{', '.join(invalid)}. Valid modes: {', '.join(sorted(VALID_MODES))}"
+        )
+    return list(dict.fromkeys(parsed))
+
+
+def percentile(values: Iterable[float], p: float) -> float | None:
+    items = sorted(float(v) for v in values)
+    n = len(items)
+    if n == 0:
+        return None
+    if n == 1:
+        return items[0]
+
+    rank = (n - 1) * (p / 100.0)
+    low = int(rank)
+    high = min(low + 1, n - 1)
+    frac = rank - low
+    return items[low] + (items[high] - items[low]) * frac
+
+
+def summarize_latencies(latencies_ms: list[float]) -> dict[str, Any]:
+    def rounded(value: float | None) -> float | None:
+        return round(value, 2) if value is not None else None
+
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": rounded(percentile(latencies_ms, 50)),
+        "p99_ms": rounded(percentile(latencies_ms, 99)),
+        "max_ms": rounded(max(latencies_ms)) if latencies_ms else None,
+    }
+
+
+def build_app(mode: str, hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            valid = pwd_context.verify(BENCHMARK_PASSWORD, hashed_password)
+        else:
+            valid = await AuthService.verify_password_async(BENCHMARK_PASSWORD, hashed_password)
+        if not valid:
+            raise HTTPException(status_code=401, detail="Incorrect password")
+        return {"ok": True}
+
+    return app
+
+
+async def run_mode(
+    mode: str,
+    hashed_password: str,
+    logins: int,
+    concurrency: int,
+    probe_interval_s: float,
+) -> dict[str, Any]:
+    app = build_app(mode, hashed_password)
+    PasswordHashPool.reset_metrics()
+
+    ping_latencies: list[float] = []
+    login_latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    limiter = asyncio.Semaphore(concurrency)
+    storm_done = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def one_login() -> None:
+            async with limiter:
+                started = time.perf_counter()
+                response = await client.post("/login")
+                login_latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def probe() -> None:
+            # Latency is measured from when the probe was due, not from when the
+            # loop got around to sending it, so event-loop stalls are counted.
+            due = time.perf_counter()
+            while not storm_done.is_set():
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/ping")
+                finished = time.perf_counter()
+                ping_latencies.append((finished - due) * 1000)
+                due = finished + probe_interval_s
+
+        started = time.perf_counter()
+        probe_task = asyncio.create_task(probe())
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        storm_done.set()
+        await probe_task
+        duration_s = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "concurrency": concurrency,
+        "duration_s": round(duration_s, 3),
+        "login_statuses": statuses,
+        "ping": summarize_latencies(ping_latencies),
+        "login": summarize_latencies(login_latencies),
+        "pool": PasswordHashPool.stats() if mode == "pool" else None,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    hasher = CryptContext(schemes=["bcrypt"], bcrypt__rounds=args.rounds)
+    hashed_password = hasher.hash(BENCHMARK_PASSWORD)
+    results = []
+    for mode in parse_modes(args.modes):
+        results.append(
+            await run_mode(
+                mode,
+                hashed_password,
+                logins=args.logins,
+                concurrency=args.concurrency,
+                probe_interval_s=args.probe_interval_ms / 1000.0,
+            )
+        )
+    PasswordHashPool.shutdown()
+    return results
+
+
+def print_report(results: list[dict[str, Any]]) -> None:
+    for result in results:
+        ping = result["ping"]
+        login = result["login"]
+        print(
+            f"[{result['mode']}] {result['logins']} logins in {result['duration_s']}s | "
+            f"/ping p50={ping['p50_ms']}ms p99={ping['p99_ms']}ms max={ping['max_ms']}ms "
+            f"(n={ping['count']}) | /login p99={login['p99_ms']}ms | "
+            f"statuses={result['login_statuses']}"
+        )
+        if result["pool"]:
+            print(f"    pool: {result['pool']}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="inline,pool", help="Comma-separated modes: inline,pool")
+    parser.add_argument("--logins", type=int, default=100, help="Logins per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent logins in flight")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor of the test hash")
+    parser.add_argument("--probe-interval-ms", type=float, default=5.0, help="Delay between /ping probes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        results = asyncio.run(run_benchmark(args))
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
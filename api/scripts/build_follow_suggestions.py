@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batch job that precomputes who-to-follow candidates into user_suggestions.
+
+Signals: co-follow ("people who follow X also follow Y"), authors from the
+user's reading history, and global popularity (users.follower_count).
+Schedule it (e.g. nightly via cron) so /v1/users/suggestions only reads
+precomputed rows.
+
+Run from /api:
+  source venv/bin/activate && PYTHONPATH=. python scripts/build_follow_suggestions.py --active-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from database.connection import ENGINE_BACKGROUND, close_db, get_sessionmaker
+from services.user.suggestions import FollowSuggestionService
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Precompute follow suggestions for active users."
+    )
+    parser.add_argument("--top-k", type=int, default=20, help="Suggestions stored per user.")
+    parser.add_argument(
+        "--active-days",
+        type=int,
+        default=None,
+        help="Only rebuild users who logged in within this many days.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Users processed (and committed) per batch.",
+    )
+    return parser
+
+
+async def run(top_k: int, active_days: int | None, batch_size: int) -> dict:
+    try:
+        async with get_sessionmaker(ENGINE_BACKGROUND)() as session:
+            return await FollowSuggestionService.rebuild_suggestions(
+                session,
+                top_k=top_k,
+                active_days=active_days,
+                batch_size=batch_size,
+            )
+    finally:
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.top_k < 1 or args.batch_size < 1:
+        print("--top-k and --batch-size must be positive", file=sys.stderr)
+        return 2
+    report = asyncio.run(run(args.top_k, args.active_days, args.batch_size))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Garbage-collect upload files that no post, media row or profile references.
+
+Orphans older than the grace period are moved to uploads/.quarantine/; files
+that have sat in quarantine for the quarantine period are deleted, and files
+referenced again are moved back. Abandoned staged uploads and derivatives of
+deleted blobs are removed directly. Run it from cron, e.g. nightly; start
+with --dry-run to review the report.
+
+Run from /api:
+  source venv/bin/activate && PYTHONPATH=. python scripts/gc_orphaned_uploads.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from database.connection import ENGINE_BACKGROUND, close_db, get_sessionmaker
+from services.upload_gc import UploadGarbageCollector
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Quarantine and delete upload files no row references."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Rows loaded and files examined per batch.",
+    )
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=None,
+        help="Leave orphans younger than this alone (default from UPLOAD_GC_GRACE_SECONDS).",
+    )
+    parser.add_argument(
+        "--quarantine-days",
+        type=float,
+        default=None,
+        help="Delete quarantined files after this long (default from UPLOAD_GC_QUARANTINE_SECONDS).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be quarantined or deleted without touching files.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON.",
+    )
+    return parser
+
+
+async def run(
+        batch_size: int,
+        dry_run: bool,
+        grace_seconds: int | None = None,
+        quarantine_seconds: int | None = None,
+) -> dict:
+    try:
+        async with get_sessionmaker(ENGINE_BACKGROUND)() as session:
+            return await UploadGarbageCollector.collect(
+                session,
+                batch_size=batch_size,
+                dry_run=dry_run,
+                grace_seconds=grace_seconds,
+                quarantine_seconds=quarantine_seconds,
+            )
+    finally:
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.batch_size < 1:
+        print("error: --batch-size must be positive", file=sys.stderr)
+        return 2
+    grace_seconds = None if args.grace_hours is None else int(args.grace_hours * 3600)
+    quarantine_seconds = None if args.quarantine_days is None else int(args.quarantine_days * 86400)
+    report = asyncio.run(run(args.batch_size, args.dry_run, grace_seconds, quarantine_seconds))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Referenced paths: {report['references']}")
+    print(
+        f"Scanned files: {report['scanned_files']} ({report['scanned_bytes']} bytes) "
+        f"in {report['elapsed_seconds']}s, {report['files_per_second']} files/s"
+    )
+    print(f"Orphans: {report['orphans']} ({report['orphan_bytes']} bytes), "
+          f"{report['skipped_recent']} more within the grace period")
+    for path in report["orphan_samples"]:
+        print(f"  {path}")
+    print(f"Quarantine: {report['deleted']} expired ({report['deleted_bytes']} bytes), "
+          f"{report['restored']} referenced again, {report['pending_in_quarantine']} pending")
+    print(f"Stale staged uploads: {report['staged_removed']}")
+    print(f"Derivatives without a blob: {report['derived_removed']}")
+    if report["errors"]:
+        print(f"Errors: {report['errors']} (see log)")
+    if args.dry_run:
+        print("Dry run: no files moved or deleted.")
+    else:
+        print(f"Quarantined now: {report['quarantined']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Reconcile the denormalized users.follower_count / users.following_count
+columns against the user_follows table.
+
+The counters are maintained transactionally by UserFollowService, so drift
+should only appear after manual SQL edits or partial restores. Run this
+periodically (or after such maintenance) to detect and repair it.
+
+Run from /api:
+  source venv/bin/activate && PYTHONPATH=. python scripts/reconcile_follow_counts.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from database.connection import ENGINE_BACKGROUND, close_db, get_sessionmaker
+from services.user.user_follow import UserFollowService
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Repair drifted follower/following counters on users."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report drifted rows without writing any changes.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the full report as JSON.",
+    )
+    return parser
+
+
+async def run(dry_run: bool) -> dict:
+    try:
+        async with get_sessionmaker(ENGINE_BACKGROUND)() as session:
+            return await UserFollowService.reconcile_follow_counts(session, dry_run=dry_run)
+    finally:
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(run(args.dry_run))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Checked users: {report['checked']}")
+        print(f"Drifted users: {len(report['drifted'])}")
+        for row in report["drifted"]:
+            print(
+                f"  user_id={row['id']} followers {row['previous_follower_count']} -> "
+                f"{row['follower_count']}, following {row['previous_following_count']} -> "
+                f"{row['following_count']}"
+            )
+        if args.dry_run:
+            print("Dry run: no changes written.")
+        else:
+            print(f"Repaired users: {report['repaired']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,7 +8,7 @@ import json
 import logging
 import re
 import time
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from pydantic_ai import Agent
 
@@ -25,6 +25,9 @@ from .web_search import WebSearchService
 
 logger = logging.getLogger(__name__)
 
+# Default for synchronous callers, well within the 300 s frontend timeout.
+EDITORIAL_SKIP_AFTER_S = 60.0
+
 
 class BlogAgentService:
     """
@@ -212,12 +215,13 @@ class BlogAgentService:
         word_count: str,
         keywords: Optional[list[str]],
         draft_elapsed_s: float = 0.0,
+        skip_after_s: Optional[float] = EDITORIAL_SKIP_AFTER_S,
     ) -> tuple[BlogPost, dict[str, Any] | None, bool]:
         """
         Editorial phase: deterministic quality checks and one corrective revision.
 
-        If draft_elapsed_s is already above 60 s we skip the editorial revision
-        to stay well within the 300 s frontend timeout.
+        If draft_elapsed_s is already above skip_after_s we skip the editorial
+        revision so a waiting client is not timed out; None never skips.
         """
         quality_issues = self._collect_quality_issues(
             blog_post=blog_post,
@@ -227,7 +231,7 @@ class BlogAgentService:
         if not quality_issues:
             return blog_post, None, False
 
-        if draft_elapsed_s >= 60.0:
+        if skip_after_s is not None and draft_elapsed_s >= skip_after_s:
             logger.warning(
                 "Skipping editorial revision — draft already took %.1fs (issues: %s)",
                 draft_elapsed_s,
@@ -747,6 +751,8 @@ class BlogAgentService:
         model: str = DEFAULT_MODEL,
         creativity: float = 0.7,
         use_web_search: bool = True,
+        editorial_skip_after_s: Optional[float] = EDITORIAL_SKIP_AFTER_S,
+        on_phase: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> tuple[BlogPost, float, bool, list[dict] | None]:
         """
         Generate a complete blog post with configurable web search.
@@ -754,6 +760,9 @@ class BlogAgentService:
         use_web_search:
             - False — no web search
             - True  — use DuckDuckGo context injection
+
+        on_phase is awaited with "research", "outline", "draft" and
+        "editorial" as each phase starts.
         
         Returns:
             Tuple of (BlogPost, generation_time, web_search_used, sources)
@@ -774,6 +783,8 @@ class BlogAgentService:
         }
 
         # ── Phase 1: Research ───────────────────────────────────────
+        if on_phase is not None:
+            await on_phase("research")
         phase_start = time.perf_counter()
         web_context, sources, ddg_used, ddg_attempted = self._research_phase(
             topic=topic,
@@ -788,6 +799,8 @@ class BlogAgentService:
         self._last_phase_metrics["web_grounding"]["ddg_used"] = ddg_used
 
         # ── Phase 2: Outline Guidance ───────────────────────────────
+        if on_phase is not None:
+            await on_phase("outline")
         phase_start = time.perf_counter()
         prompt = self._build_blog_prompt(
             topic=topic,
@@ -821,6 +834,8 @@ class BlogAgentService:
             (time.perf_counter() - phase_start) * 1000, 2
         )
 
+        if on_phase is not None:
+            await on_phase("draft")
         phase_start = time.perf_counter()
         draft_post, draft_usage = await self._draft_phase(
             pydantic_model=pydantic_model,
@@ -836,6 +851,8 @@ class BlogAgentService:
 
         # ── Phase 4: Editorial Review ───────────────────────────────
         draft_elapsed_s = time.perf_counter() - perf_start
+        if on_phase is not None:
+            await on_phase("editorial")
         phase_start = time.perf_counter()
         blog_post, editorial_usage, revision_applied = await self._editorial_phase(
             pydantic_model=pydantic_model,
@@ -846,6 +863,7 @@ class BlogAgentService:
             word_count=word_count,
             keywords=keywords,
             draft_elapsed_s=draft_elapsed_s,
+            skip_after_s=editorial_skip_after_s,
         )
         self._last_phase_metrics["timings_ms"]["editorial"] = round(
             (time.perf_counter() - phase_start) * 1000, 2
@@ -0,0 +1,551 @@
+"""
+Blog generation jobs - queue BlogAgentService runs on a bounded worker pool
+and persist their phase progress and result.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from database.connection import ENGINE_BACKGROUND, get_sessionmaker
+from models import BlogGenerationJob, User
+from schemas.ai import BlogGenerateRequest, BlogGenerateResponse, DraftSaveRequest
+from schemas.post import PostCreate, TagCreate
+from services.post import PostService
+from .blog_agent import EDITORIAL_SKIP_AFTER_S, BlogAgentService
+from .drafts import AIDraftService
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+SAVING_PHASE = "saving"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def generate_blog_post(
+    session: Optional[AsyncSession],
+    user_id: int,
+    request: BlogGenerateRequest,
+    *,
+    editorial_skip_after_s: Optional[float] = EDITORIAL_SKIP_AFTER_S,
+    on_phase: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> BlogGenerateResponse:
+    """
+    Generate a blog post and save it as a draft and/or post as requested.
+
+    Raises ValueError for requests the agent rejects; failing to save the
+    draft or post is logged and leaves the matching id empty.
+    """
+    blog_agent = BlogAgentService()
+    use_web_search = request.use_web_search
+
+    blog_post, generation_time, web_search_used, sources = await blog_agent.generate(
+        topic=request.topic,
+        blog_type=request.blog_type,
+        keywords=request.keywords,
+        audience=request.audience,
+        word_count=request.word_count or "medium",
+        tone=request.tone or "professional",
+        language=request.language or "en-US",
+        model=request.model,
+        creativity=request.creativity or 0.7,
+        use_web_search=use_web_search,
+        editorial_skip_after_s=editorial_skip_after_s,
+        on_phase=on_phase,
+    )
+
+    quality_report = blog_agent.build_quality_report(
+        blog_post=blog_post,
+        word_count=request.word_count or "medium",
+        keywords=request.keywords,
+        phase_metrics=blog_agent.get_last_phase_metrics(),
+    )
+
+    draft_id = None
+    post_id = None
+    save_draft, publish_post = request.save_draft, request.publish_post
+    if (save_draft or publish_post) and on_phase is not None:
+        await on_phase(SAVING_PHASE)
+    if (save_draft or publish_post) and session is not None and not await session.scalar(
+        select(User.is_active).where(User.id == user_id)
+    ):
+        # The account is being deleted; new drafts or posts would be written
+        # after the deletion job already cleared them.
+        logger.warning("Not saving generated blog for inactive user %s", user_id)
+        save_draft = publish_post = False
+
+    # Save as AI draft if requested
+    if save_draft:
+        try:
+            # Convert blog post to markdown for draft content
+            draft_content = blog_agent.blog_post_to_markdown(blog_post)
+
+            draft_data = DraftSaveRequest(
+                name=blog_post.title,
+                content=draft_content,
+                tool_id="blog-agent",
+                model_used=request.model,
+                favorite=False,
+                draft_metadata={
+                    "blog_type": request.blog_type,
+                    "seo_title": blog_post.seo_title,
+                    "seo_description": blog_post.seo_description,
+                    "tags": blog_post.tags,
+                    "slug": blog_post.slug,
+                    "use_web_search": use_web_search,
+                    "web_search_used": web_search_used,
+                    "phase_metrics": blog_agent.get_last_phase_metrics(),
+                    "quality_report": quality_report,
+                },
+            )
+            saved_draft = await AIDraftService.create_draft(draft_data, user_id, session)
+            draft_id = saved_draft.uuid
+        except Exception as draft_error:
+            logger.warning("Failed to save blog draft: %s", draft_error)
+
+    # Publish as post if requested
+    if publish_post:
+        try:
+            # Convert blog post to HTML for post content
+            html_content = blog_agent.blog_post_to_html(blog_post)
+
+            # Create tags if they don't exist and get their IDs
+            tag_ids = []
+            for tag_name in blog_post.tags[:5]:  # Limit to 5 tags
+                try:
+                    # Try to create or get existing tag
+                    existing_tag = await PostService.get_tag_by_slug(
+                        session, tag_name.lower().replace(" ", "-")
+                    )
+                    if existing_tag:
+                        tag_ids.append(existing_tag.id)
+                    else:
+                        tag_data = TagCreate(name=tag_name)
+                        new_tag = await PostService.create_tag(session, tag_data)
+                        tag_ids.append(new_tag.id)
+                except Exception:
+                    # Skip tag if creation fails
+                    pass
+
+            # Create the post
+            post_content_blocks = {
+                "ai_generation": {
+                    "generator": "blog-agent",
+                    "model": request.model,
+                    "use_web_search": use_web_search,
+                    "web_search_used": web_search_used,
+                    "search_sources_count": len(sources or []),
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "phase_metrics": blog_agent.get_last_phase_metrics(),
+                    "quality_report": quality_report,
+                }
+            }
+
+            post_data = PostCreate(
+                title=blog_post.title,
+                slug=blog_post.slug,
+                content=html_content,
+                content_blocks=post_content_blocks,
+                excerpt=blog_post.summary,
+                meta_title=blog_post.seo_title,
+                meta_description=blog_post.seo_description,
+                category_id=request.category_id,
+                tag_ids=tag_ids,
+                is_published=request.is_published if request.is_published is not None else False,
+                is_featured=False,
+            )
+
+            created_post = await PostService.create_post(
+                session, post_data, user_id, regenerate_slug_on_conflict=True
+            )
+            post_id = created_post.uuid
+        except Exception as post_error:
+            logger.warning("Failed to create post from generated blog: %s", post_error)
+
+    return BlogGenerateResponse(
+        blog_post=blog_post,
+        draft_id=draft_id,
+        post_id=post_id,
+        model_used=request.model,
+        generation_time=round(generation_time, 2),
+        web_search_used=web_search_used,
+        search_sources=sources if web_search_used else None,
+        quality_report=quality_report,
+    )
+
+
+class BlogGenerationJobService:
+    """
+    Runs blog generations as ``blog_generation_jobs`` rows instead of inside
+    the request that asked for them.
+
+    ``submit`` stores the request and returns at once; at most ``WORKERS``
+    jobs of a process generate concurrently and the rest wait their turn,
+    up to ``MAX_QUEUED``. The job owns its own session on the background
+    pool, so a client that disconnects, polls or streams ``events`` does not
+    affect it. Every phase change is committed and wakes this process's
+    event streams; streams served by other processes see it on their next
+    poll.
+
+    Jobs still queued when a process stops are picked up again on start.
+    A running job cannot be resumed mid-generation: its worker refreshes
+    ``heartbeat_at`` while it runs, and a sweep started by
+    ``resume_pending`` fails jobs whose heartbeat is older than
+    ``LEASE_SECONDS``. A job stopped after it began saving is failed rather
+    than queued again, so a restart never saves its draft or post twice.
+    """
+
+    WORKERS = max(settings.BLOG_JOB_WORKERS, 1)
+    MAX_QUEUED = max(settings.BLOG_JOB_MAX_QUEUED, 0)
+    MAX_ACTIVE_PER_USER = max(settings.BLOG_JOB_MAX_ACTIVE_PER_USER, 1)
+    TIMEOUT_SECONDS = settings.BLOG_JOB_TIMEOUT_SECONDS
+    LEASE_SECONDS = max(settings.BLOG_JOB_LEASE_SECONDS, 1)
+    EDITORIAL_SKIP_AFTER_S = settings.BLOG_JOB_EDITORIAL_SKIP_AFTER_SECONDS
+    EVENT_POLL_SECONDS = settings.BLOG_JOB_EVENT_POLL_SECONDS
+    # Overridden in tests; defaults to the background pool.
+    SESSION_FACTORY: Optional[async_sessionmaker] = None
+
+    _tasks: Set["asyncio.Task[None]"] = set()
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+    _changed: Dict[str, asyncio.Event] = {}
+    _sweeper: Optional["asyncio.Task[None]"] = None
+
+    @staticmethod
+    def _sessionmaker() -> async_sessionmaker:
+        return BlogGenerationJobService.SESSION_FACTORY or get_sessionmaker(ENGINE_BACKGROUND)
+
+    @staticmethod
+    def _get_semaphore() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if BlogGenerationJobService._semaphore_loop is not loop:
+            BlogGenerationJobService._semaphore = asyncio.Semaphore(BlogGenerationJobService.WORKERS)
+            BlogGenerationJobService._semaphore_loop = loop
+        return BlogGenerationJobService._semaphore
+
+    @staticmethod
+    async def shutdown() -> None:
+        """Stop running jobs; they are queued again for the next start."""
+        sweeper = BlogGenerationJobService._sweeper
+        BlogGenerationJobService._sweeper = None
+        if sweeper is not None:
+            sweeper.cancel()
+            await asyncio.gather(sweeper, return_exceptions=True)
+        tasks = list(BlogGenerationJobService._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def wait_for_jobs() -> None:
+        while BlogGenerationJobService._tasks:
+            await asyncio.gather(*list(BlogGenerationJobService._tasks), return_exceptions=True)
+
+    @staticmethod
+    def describe(job: BlogGenerationJob) -> Dict[str, Any]:
+        return {
+            "job_id": job.uuid,
+            "status": job.status,
+            "phase": job.phase,
+            "progress": job.progress or [],
+            "result": job.result,
+            "error": job.error,
+            "error_status": job.error_status,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    @staticmethod
+    async def get_for_user(session: AsyncSession, job_uuid: str, user_id: int) -> Optional[BlogGenerationJob]:
+        return await session.scalar(
+            select(BlogGenerationJob).where(
+                BlogGenerationJob.uuid == job_uuid,
+                BlogGenerationJob.user_id == user_id,
+            )
+        )
+
+    @staticmethod
+    async def submit(session: AsyncSession, user_id: int, request: BlogGenerateRequest) -> BlogGenerationJob:
+        if len(BlogGenerationJobService._tasks) >= BlogGenerationJobService.WORKERS + BlogGenerationJobService.MAX_QUEUED:
+            logger.warning("Blog generation queue is full; rejecting job")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Blog generation is busy, please retry shortly",
+                headers={"Retry-After": "30"},
+            )
+
+        active = await session.scalar(
+            select(func.count())
+            .select_from(BlogGenerationJob)
+            .where(
+                BlogGenerationJob.user_id == user_id,
+                BlogGenerationJob.status.in_([JOB_QUEUED, JOB_RUNNING]),
+            )
+        )
+        if active >= BlogGenerationJobService.MAX_ACTIVE_PER_USER:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many blog generations in progress",
+                headers={"Retry-After": "30"},
+            )
+
+        job = BlogGenerationJob(
+            user_id=user_id,
+            status=JOB_QUEUED,
+            progress=[],
+            request=request.model_dump(mode="json"),
+        )
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        BlogGenerationJobService.schedule(job.id)
+        return job
+
+    @staticmethod
+    def schedule(job_id: int) -> None:
+        async def runner() -> None:
+            async with BlogGenerationJobService._get_semaphore():
+                await BlogGenerationJobService.run(job_id)
+
+        task = asyncio.create_task(runner())
+        BlogGenerationJobService._tasks.add(task)
+        task.add_done_callback(BlogGenerationJobService._tasks.discard)
+
+    @staticmethod
+    async def fail_abandoned() -> int:
+        """Fail running jobs whose worker stopped sending heartbeats."""
+        stale = _utcnow() - timedelta(seconds=BlogGenerationJobService.LEASE_SECONDS)
+        abandoned_condition = and_(
+            BlogGenerationJob.status == JOB_RUNNING,
+            or_(
+                BlogGenerationJob.heartbeat_at < stale,
+                and_(BlogGenerationJob.heartbeat_at.is_(None), BlogGenerationJob.started_at < stale),
+            ),
+        )
+        async with BlogGenerationJobService._sessionmaker()() as session:
+            abandoned = (
+                await session.execute(
+                    select(BlogGenerationJob.id, BlogGenerationJob.uuid).where(abandoned_condition)
+                )
+            ).all()
+            if not abandoned:
+                return 0
+            # Re-checked in the update: the worker may have checked in since.
+            result = await session.execute(
+                update(BlogGenerationJob)
+                .where(BlogGenerationJob.id.in_([row.id for row in abandoned]), abandoned_condition)
+                .values(
+                    status=JOB_FAILED,
+                    phase=None,
+                    error="Generation was interrupted",
+                    error_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    finished_at=_utcnow(),
+                )
+            )
+            await session.commit()
+        for row in abandoned:
+            BlogGenerationJobService._notify(row.uuid)
+        return result.rowcount or 0
+
+    @staticmethod
+    async def _sweep() -> None:
+        while True:
+            await asyncio.sleep(BlogGenerationJobService.LEASE_SECONDS)
+            try:
+                await BlogGenerationJobService.fail_abandoned()
+            except Exception as exc:
+                logger.warning("Could not sweep abandoned blog generation jobs: %s", exc)
+
+    @staticmethod
+    async def resume_pending() -> int:
+        """
+        Queue jobs left queued by the last process, fail abandoned running
+        ones and keep sweeping for jobs abandoned later.
+        """
+        if BlogGenerationJobService._sweeper is None:
+            BlogGenerationJobService._sweeper = asyncio.create_task(BlogGenerationJobService._sweep())
+        try:
+            await BlogGenerationJobService.fail_abandoned()
+            async with BlogGenerationJobService._sessionmaker()() as session:
+                job_ids = list(
+                    (
+                        await session.execute(
+                            select(BlogGenerationJob.id)
+                            .where(BlogGenerationJob.status == JOB_QUEUED)
+                            .order_by(BlogGenerationJob.id)
+                        )
+                    ).scalars()
+                )
+        except Exception as exc:
+            logger.warning("Could not load queued blog generation jobs: %s", exc)
+            return 0
+        for job_id in job_ids:
+            BlogGenerationJobService.schedule(job_id)
+        return len(job_ids)
+
+    @staticmethod
+    def _notify(job_uuid: str) -> None:
+        event = BlogGenerationJobService._changed.pop(job_uuid, None)
+        if event is not None:
+            event.set()
+
+    @staticmethod
+    async def _wait_for_change(job_uuid: str, timeout: float) -> None:
+        event = BlogGenerationJobService._changed.setdefault(job_uuid, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    @staticmethod
+    async def _claim(session: AsyncSession, job_id: int) -> bool:
+        now = _utcnow()
+        result = await session.execute(
+            update(BlogGenerationJob)
+            .where(BlogGenerationJob.id == job_id, BlogGenerationJob.status == JOB_QUEUED)
+            .values(status=JOB_RUNNING, started_at=now, heartbeat_at=now)
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def _heartbeat(job_id: int) -> None:
+        # Its own session: the job's session is busy inside the generation.
+        while True:
+            await asyncio.sleep(BlogGenerationJobService.LEASE_SECONDS / 3)
+            try:
+                async with BlogGenerationJobService._sessionmaker()() as session:
+                    await session.execute(
+                        update(BlogGenerationJob)
+                        .where(BlogGenerationJob.id == job_id, BlogGenerationJob.status == JOB_RUNNING)
+                        .values(heartbeat_at=_utcnow())
+                    )
+                    await session.commit()
+            except Exception as exc:
+                logger.warning("Could not refresh blog generation job %s heartbeat: %s", job_id, exc)
+
+    @staticmethod
+    async def run(job_id: int) -> None:
+        """Run a queued job to completion unless another worker took it."""
+        async with BlogGenerationJobService._sessionmaker()() as session:
+            if not await BlogGenerationJobService._claim(session, job_id):
+                return
+            job = await session.get(BlogGenerationJob, job_id, populate_existing=True)
+            job_uuid = job.uuid
+            BlogGenerationJobService._notify(job_uuid)
+
+            async def enter_phase(phase: str) -> None:
+                job.phase = phase
+                # JSON columns only track reassignment, not in-place edits.
+                job.progress = [*(job.progress or []), {"phase": phase, "started_at": _utcnow().isoformat()}]
+                job.heartbeat_at = _utcnow()
+                await session.commit()
+                BlogGenerationJobService._notify(job_uuid)
+
+            heartbeat = asyncio.create_task(BlogGenerationJobService._heartbeat(job_id))
+            try:
+                response = await asyncio.wait_for(
+                    generate_blog_post(
+                        session,
+                        job.user_id,
+                        BlogGenerateRequest(**job.request),
+                        editorial_skip_after_s=BlogGenerationJobService.EDITORIAL_SKIP_AFTER_S,
+                        on_phase=enter_phase,
+                    ),
+                    timeout=BlogGenerationJobService.TIMEOUT_SECONDS,
+                )
+                job.status = JOB_COMPLETED
+                job.result = response.model_dump(mode="json")
+                job.phase = None
+                job.finished_at = _utcnow()
+                await session.commit()
+            except asyncio.CancelledError:
+                # Read before the rollback expires the job.
+                saving = job.phase == SAVING_PHASE
+                await session.rollback()
+                if saving:
+                    # The draft or post may already be saved; running the
+                    # job again would save a second one.
+                    values = dict(
+                        status=JOB_FAILED,
+                        phase=None,
+                        error="Generation was interrupted while saving; check your drafts and posts",
+                        error_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        finished_at=_utcnow(),
+                    )
+                else:
+                    # Shutdown: queue the job again so the next start runs it.
+                    values = dict(status=JOB_QUEUED, phase=None, progress=[], started_at=None, heartbeat_at=None)
+                await session.execute(
+                    update(BlogGenerationJob).where(BlogGenerationJob.id == job_id).values(**values)
+                )
+                await session.commit()
+                raise
+            except Exception as exc:
+                await session.rollback()
+                if isinstance(exc, ValueError):
+                    error_status, error = status.HTTP_400_BAD_REQUEST, str(exc)
+                elif isinstance(exc, asyncio.TimeoutError):
+                    error_status, error = status.HTTP_504_GATEWAY_TIMEOUT, "Blog generation timed out"
+                else:
+                    logger.exception("Blog generation job %s failed", job_id)
+                    error_status, error = status.HTTP_500_INTERNAL_SERVER_ERROR, f"Blog generation failed: {exc}"
+                await session.execute(
+                    update(BlogGenerationJob)
+                    .where(BlogGenerationJob.id == job_id)
+                    .values(
+                        status=JOB_FAILED,
+                        phase=None,
+                        error=error[:2000],
+                        error_status=error_status,
+                        finished_at=_utcnow(),
+                    )
+                )
+                await session.commit()
+            finally:
+                heartbeat.cancel()
+                BlogGenerationJobService._notify(job_uuid)
+
+    @staticmethod
+    async def events(job_uuid: str, user_id: int) -> AsyncIterator[str]:
+        """
+        Server-sent events for a job: ``progress`` whenever its state changes,
+        then one ``completed`` or ``failed`` event carrying the final state.
+        Each poll uses a short-lived session, so an open stream holds no
+        connection while it waits.
+        """
+        last = None
+        while True:
+            async with BlogGenerationJobService._sessionmaker()() as session:
+                job = await BlogGenerationJobService.get_for_user(session, job_uuid, user_id)
+                snapshot = BlogGenerationJobService.describe(job) if job is not None else None
+            if snapshot is None:
+                return
+            if snapshot != last:
+                event = snapshot["status"] if snapshot["status"] in FINISHED_STATUSES else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snapshot, default=str)}\n\n"
+                last = snapshot
+            else:
+                # Keeps proxies from closing an idle stream.
+                yield ": keep-alive\n\n"
+            if snapshot["status"] in FINISHED_STATUSES:
+                return
+            await BlogGenerationJobService._wait_for_change(
+                job_uuid, BlogGenerationJobService.EVENT_POLL_SECONDS
+            )
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from core.config import settings
 from .tools import ToolHandler
 from .llm_config import get_model
+from services.post.content import ContentProcessor
 import time
 from typing import Dict, List, Any, Optional
 
@@ -115,9 +116,10 @@ class AIGeneratorService:
                 )
 
                 content = result.output
-                word_count = len(content.split())
+                digest = ContentProcessor.digest(content, None)
+                word_count = digest.word_count
                 char_count = len(content)
-                reading_time = max(1, -(-word_count // 200))  # ceil division
+                reading_time = digest.reading_time
 
                 tokens_used = None
                 if hasattr(result, "usage") and callable(result.usage):
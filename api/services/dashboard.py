@@ -1,4 +1,3 @@
-from datetime import datetime, timedelta
 from typing import List
 
 from fastapi import HTTPException, status
@@ -21,6 +20,7 @@ from schemas.dashboard import (
 from schemas.notification import NotificationType
 from services.post.post import PostService
 from services.user.notification import NotificationService
+from services.user.stats import UserStatsService
 
 
 class DashboardService:
@@ -34,36 +34,8 @@ class DashboardService:
         Build the admin/moderator dashboard response with system-wide metrics.
         """
         try:
-            # --- User statistics (mirrors admin_users.get_user_statistics) ---
-            total_users = await session.scalar(select(func.count()).select_from(User)) or 0
-            active_users = (
-                await session.scalar(
-                    select(func.count()).select_from(User).where(User.is_active.is_(True))
-                )
-                or 0
-            )
-            inactive_users = total_users - active_users
-
-            role_counts_stmt = await session.execute(
-                select(User.role, func.count()).group_by(User.role)
-            )
-            role_counts = {
-                getattr(role, "value", role): count for role, count in role_counts_stmt.all()
-            }
-
-            admin_count = role_counts.get("admin", 0)
-            moderator_count = role_counts.get("moderator", 0)
-            user_count = role_counts.get("user", 0)
-
-            recent_threshold = datetime.utcnow() - timedelta(days=30)
-            recent_registrations = (
-                await session.scalar(
-                    select(func.count())
-                    .select_from(User)
-                    .where(User.created_at >= recent_threshold)
-                )
-                or 0
-            )
+            # --- User statistics (the snapshot behind /admin/users/stats) ---
+            user_stats = await UserStatsService.get_snapshot(session)
 
             # Posts that likely need moderation / review (reported posts)
             pending_reviews = (
@@ -145,13 +117,7 @@ class DashboardService:
                 total_posts=total_posts,
                 published_posts=published_posts,
                 draft_posts=draft_posts,
-                total_users=total_users,
-                active_users=active_users,
-                inactive_users=inactive_users,
-                admin_count=admin_count,
-                moderator_count=moderator_count,
-                user_count=user_count,
-                recent_registrations=recent_registrations,
+                **user_stats,
                 pending_reviews=int(pending_reviews),
             )
 
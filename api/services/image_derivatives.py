@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Derivatives are skipped and originals served.
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+SOCIAL_VARIANT = "social"
+SOCIAL_SIZE = (1200, 630)
+
+# Output formats: (Pillow format name, media type).
+_FORMATS = {
+    "avif": ("AVIF", "image/avif"),
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+}
+# Raster sources Pillow can decode without plugins. SVG, GIF (animation),
+# ICO and HEIC originals are always served as uploaded.
+_DERIVABLE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".avif", ".bmp", ".tiff", ".tif"}
+
+
+class ImageVariant(NamedTuple):
+    name: str
+    width: int
+    # Set for fixed-size crops; width-only variants keep the aspect ratio.
+    height: Optional[int] = None
+
+
+def _render(source: str, target: str, width: int, height: Optional[int], pil_format: str, quality: int) -> None:
+    """Resize ``source`` into ``target``; runs in a worker process."""
+    temp_path = f"{target}.{uuid.uuid4().hex}.part"
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            if height is not None:
+                image = ImageOps.fit(image, (width, height), method=Image.Resampling.LANCZOS)
+            elif image.width > width:
+                image = image.resize(
+                    (width, max(round(image.height * width / image.width), 1)),
+                    Image.Resampling.LANCZOS,
+                )
+
+            if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA")
+            image.save(temp_path, format=pil_format, quality=quality)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class ImageDerivativeService:
+    """
+    Resized and re-encoded copies of stored images, made on first request.
+
+    ``?w=<px>`` on the image route is snapped up to the nearest configured
+    width (never upscaling), and ``?w=social`` gives the exact 1200x630 crop
+    advertised on share pages. The format is negotiated from ``Accept`` in
+    ``FORMATS`` order, falling back to PNG for PNG sources and JPEG otherwise
+    (always JPEG for the social crop).
+
+    Derivatives are rendered in a process pool so resizing never blocks the
+    event loop, written next to the blob under ``MediaStore.derived_dir`` and
+    reused from disk afterwards; concurrent requests for the same derivative
+    share one render. Only content-addressed blobs have derivatives, since
+    their content cannot change under the same name. Without Pillow, or on
+    any render error, the original is served.
+    """
+
+    ENABLED = settings.IMAGE_DERIVATIVES_ENABLED
+    WIDTHS: List[int] = sorted({width for width in settings.IMAGE_DERIVATIVE_WIDTHS if width > 0})
+    FORMATS: List[str] = [name for name in settings.IMAGE_DERIVATIVE_FORMATS if name in _FORMATS]
+    QUALITY = settings.IMAGE_DERIVATIVE_QUALITY
+    MAX_WORKERS = max(settings.IMAGE_DERIVATIVE_WORKERS, 1)
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _in_flight: Dict[Path, "asyncio.Future[None]"] = {}
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        if ImageDerivativeService._executor is None:
+            # Spawned rather than forked: the parent holds database and
+            # executor threads whose locks must not be copied mid-use.
+            ImageDerivativeService._executor = ProcessPoolExecutor(
+                max_workers=ImageDerivativeService.MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return ImageDerivativeService._executor
+
+    @staticmethod
+    def shutdown() -> None:
+        executor = ImageDerivativeService._executor
+        ImageDerivativeService._executor = None
+        ImageDerivativeService._in_flight = {}
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def available() -> bool:
+        return ImageDerivativeService.ENABLED and Image is not None
+
+    @staticmethod
+    def can_derive(filename: str) -> bool:
+        return (
+            ImageDerivativeService.available()
+            and MediaStore.blob_filename(filename) is not None
+            and Path(filename).suffix.lower() in _DERIVABLE_EXTENSIONS
+        )
+
+    @staticmethod
+    def parse_variant(value: str) -> ImageVariant:
+        if value == SOCIAL_VARIANT:
+            return ImageVariant(SOCIAL_VARIANT, *SOCIAL_SIZE)
+        try:
+            requested = int(value)
+        except ValueError:
+            requested = 0
+        if requested <= 0 or not ImageDerivativeService.WIDTHS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"w must be a positive width or '{SOCIAL_VARIANT}'"
+            )
+        width = next(
+            (width for width in ImageDerivativeService.WIDTHS if width >= requested),
+            ImageDerivativeService.WIDTHS[-1],
+        )
+        return ImageVariant(f"w{width}", width)
+
+    @staticmethod
+    def _can_write(name: str) -> bool:
+        return name in ("jpeg", "png") or bool(features.check(name))
+
+    @staticmethod
+    def negotiate_format(accept: str, filename: str, variant: ImageVariant) -> str:
+        accept = accept.lower()
+        for name in ImageDerivativeService.FORMATS:
+            if _FORMATS[name][1] in accept and ImageDerivativeService._can_write(name):
+                return name
+        # Share cards are photos for crawlers: JPEG keeps them small.
+        if variant.name != SOCIAL_VARIANT and Path(filename).suffix.lower() == ".png":
+            return "png"
+        return "jpeg"
+
+    @staticmethod
+    async def _render_once(source: Path, target: Path, variant: ImageVariant, name: str) -> None:
+        future = ImageDerivativeService._in_flight.get(target)
+        if future is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(
+                ImageDerivativeService._get_executor(),
+                _render,
+                str(source),
+                str(target),
+                variant.width,
+                variant.height,
+                _FORMATS[name][0],
+                ImageDerivativeService.QUALITY,
+            ))
+            ImageDerivativeService._in_flight[target] = future
+            future.add_done_callback(lambda _: ImageDerivativeService._in_flight.pop(target, None))
+        # Shielded so a client disconnect does not cancel a render others await.
+        await asyncio.shield(future)
+
+    @staticmethod
+    async def get(filename: str, variant: ImageVariant, accept: str) -> Optional[Tuple[Path, str]]:
+        """
+        The derivative of the blob ``filename`` for ``variant`` as (path,
+        media type), rendering it if needed; None to serve the original.
+        """
+        if not ImageDerivativeService.can_derive(filename):
+            return None
+        source = MediaStore.blob_path(filename)
+        if ImageServer.stat(source) is None:
+            return None
+
+        name = ImageDerivativeService.negotiate_format(accept, filename, variant)
+        target = MediaStore.derived_dir(filename) / f"{variant.name}.{name}"
+        if ImageServer.stat(target) is None:
+            try:
+                await ImageDerivativeService._render_once(source, target, variant, name)
+            except Exception as exc:
+                logger.warning("Could not render %s of %s: %s", target.name, filename, exc)
+                return None
+        return target, _FORMATS[name][1]
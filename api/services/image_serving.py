@@ -0,0 +1,177 @@
+import os
+import stat
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from core.config import settings
+
+PathLike = Union[str, Path]
+
+
+class ImageServer:
+    """
+    Conditional, cacheable responses for files under ``uploads/``.
+
+    Content-addressed files (blobs and their derivatives) never change under
+    their name, so they get a strong ETag derived from the name and are
+    cached as ``immutable`` for a year; other files get an ETag from their
+    mtime and size and a short ``max-age``. ``If-None-Match`` and
+    ``If-Modified-Since`` are answered with 304, and ``Range``/``If-Range``
+    are handled by ``FileResponse`` from the same stat.
+
+    ``stat`` results are kept in a small TTL cache, keyed by absolute path,
+    so answering a revalidation costs no filesystem calls. A response with
+    a body re-stats the file first, so one deleted within the TTL, here or
+    by another worker, is a 404 rather than a 200 with no body. With
+    ``IMAGE_OFFLOAD_HEADER`` set, the body is left to the fronting proxy via
+    ``X-Accel-Redirect`` (nginx, an internal location mapped onto
+    ``uploads/``) or ``X-Sendfile`` (absolute path).
+    """
+
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    CACHE_MAX_AGE_SECONDS = settings.IMAGE_CACHE_MAX_AGE_SECONDS
+    STAT_TTL_SECONDS = settings.IMAGE_STAT_CACHE_TTL_SECONDS
+    STAT_MAX_ENTRIES = settings.IMAGE_STAT_CACHE_MAX_ENTRIES
+    OFFLOAD_HEADER = settings.IMAGE_OFFLOAD_HEADER
+    ACCEL_REDIRECT_PREFIX = settings.IMAGE_ACCEL_REDIRECT_PREFIX
+    UPLOADS_ROOT = Path("uploads")
+
+    _stats: "OrderedDict[str, Tuple[os.stat_result, float]]" = OrderedDict()
+
+    @staticmethod
+    def reset() -> None:
+        ImageServer._stats = OrderedDict()
+
+    @staticmethod
+    def invalidate(path: PathLike) -> None:
+        """Forget ``path`` and anything below it (a derivative directory)."""
+        prefix = os.path.abspath(path)
+        for key in [key for key in ImageServer._stats if key == prefix or key.startswith(prefix + os.sep)]:
+            ImageServer._stats.pop(key, None)
+
+    @staticmethod
+    def stat(path: PathLike) -> Optional[os.stat_result]:
+        """The stat of a regular file, or None. Misses are not cached."""
+        key = os.path.abspath(path)
+        now = time.monotonic()
+        cached = ImageServer._stats.get(key)
+        if cached is not None and now - cached[1] < ImageServer.STAT_TTL_SECONDS:
+            ImageServer._stats.move_to_end(key)
+            return cached[0]
+
+        try:
+            stat_result = os.stat(key)
+        except OSError:
+            ImageServer._stats.pop(key, None)
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        if ImageServer.STAT_MAX_ENTRIES > 0:
+            ImageServer._stats[key] = (stat_result, now)
+            ImageServer._stats.move_to_end(key)
+            while len(ImageServer._stats) > ImageServer.STAT_MAX_ENTRIES:
+                ImageServer._stats.popitem(last=False)
+        return stat_result
+
+    @staticmethod
+    def _etag(stat_result: os.stat_result, content_id: Optional[str]) -> str:
+        if content_id:
+            return f'"{content_id}"'
+        return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+    @staticmethod
+    def _headers(
+            stat_result: os.stat_result,
+            content_id: Optional[str],
+            vary: Optional[str]
+    ) -> Dict[str, str]:
+        headers = {
+            "ETag": ImageServer._etag(stat_result, content_id),
+            "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "Cache-Control": (
+                ImageServer.IMMUTABLE_CACHE_CONTROL
+                if content_id
+                else f"public, max-age={ImageServer.CACHE_MAX_AGE_SECONDS}"
+            ),
+        }
+        if vary:
+            headers["Vary"] = vary
+        return headers
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # Takes precedence over If-Modified-Since; compared weakly (RFC 9110).
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(stat_result.st_mtime) <= since
+        return False
+
+    @staticmethod
+    def _offload_headers(path: Path) -> Optional[Dict[str, str]]:
+        if ImageServer.OFFLOAD_HEADER == "x-sendfile":
+            return {"X-Sendfile": str(path.resolve())}
+        if ImageServer.OFFLOAD_HEADER == "x-accel-redirect":
+            try:
+                relative = path.resolve().relative_to(ImageServer.UPLOADS_ROOT.resolve())
+            except ValueError:
+                return None
+            prefix = ImageServer.ACCEL_REDIRECT_PREFIX.rstrip("/")
+            return {"X-Accel-Redirect": f"{prefix}/{relative.as_posix()}"}
+        return None
+
+    @staticmethod
+    def respond(
+            request: Request,
+            path: PathLike,
+            stat_result: os.stat_result,
+            media_type: Optional[str] = None,
+            content_id: Optional[str] = None,
+            vary: Optional[str] = None
+    ) -> Response:
+        """
+        Serve ``path`` (already stat-ed with ``stat``). ``content_id`` marks
+        the file as immutable and becomes its ETag.
+        """
+        headers = ImageServer._headers(stat_result, content_id, vary)
+        if ImageServer._not_modified(request, headers["ETag"], stat_result):
+            return Response(status_code=304, headers=headers)
+
+        path = Path(path)
+        offload = ImageServer._offload_headers(path)
+        if offload is not None:
+            # The proxy reads the file and handles ranges; send no body.
+            return Response(
+                status_code=200,
+                media_type=media_type or guess_type(path.name)[0] or "application/octet-stream",
+                headers={**headers, **offload},
+            )
+
+        # The cached stat may outlive the file, and FileResponse sends its
+        # headers before opening it, so check while a 404 is still possible.
+        try:
+            fresh = os.stat(path)
+        except OSError:
+            ImageServer.invalidate(path)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+        if (fresh.st_mtime_ns, fresh.st_size) != (stat_result.st_mtime_ns, stat_result.st_size):
+            ImageServer.invalidate(path)
+            stat_result = fresh
+            headers = ImageServer._headers(stat_result, content_id, vary)
+        return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+
+QueryTransform = Callable[[Any], Any]
+
+
+class EntityLoader:
+    """
+    Request-scoped batching loader and identity map (DataLoader-style).
+
+    One loader lives on ``session.info`` for the lifetime of the session, which
+    ``get_db_session`` scopes to a single request. Lookups by id, uuid or slug
+    are memoized; a batch of keys is resolved with a single ``IN`` query, and
+    keys queued with ``prime_keys`` are folded into the next query for the same
+    model and field. Loaded rows are indexed under every key column, so a post
+    fetched by uuid is also a hit when later requested by id or slug.
+
+    Misses are not memoized, so rows created later in the request are found.
+    A memoized object is also re-fetched when it was deleted or detached, when
+    its columns were expired, or when relationships the profile relies on are
+    no longer loaded (for example after ``session.refresh``).
+    """
+
+    SESSION_KEY = "entity_loader"
+    KEY_FIELDS = ("id", "uuid", "slug")
+    MAX_BATCH_SIZE = 500
+
+    # (model, profile) -> (query transform, attributes the transform loads)
+    _profiles: Dict[Tuple[type, str], Tuple[QueryTransform, Tuple[str, ...]]] = {}
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._memo: Dict[Tuple[type, str, str], Dict[Hashable, Any]] = defaultdict(dict)
+        self._queued: Dict[Tuple[type, str, str], set] = defaultdict(set)
+        self.query_count = 0
+
+    @classmethod
+    def for_session(cls, session: AsyncSession) -> "EntityLoader":
+        loader = session.info.get(cls.SESSION_KEY)
+        if loader is None:
+            loader = cls(session)
+            session.info[cls.SESSION_KEY] = loader
+        return loader
+
+    @classmethod
+    def register_profile(
+            cls,
+            model: type,
+            profile: str,
+            transform: QueryTransform,
+            loaded_attributes: Iterable[str] = ()
+    ) -> None:
+        """
+        Register eager-loading options for a named profile. ``loaded_attributes``
+        lists the relationships the transform populates; a memoized object
+        missing any of them is fetched again.
+        """
+        cls._profiles[(model, profile)] = (transform, tuple(loaded_attributes))
+
+    def _is_usable(self, model: type, profile: str, obj: Any) -> bool:
+        state = inspect(obj)
+        if state.deleted or state.was_deleted or state.detached:
+            return False
+        if not state.expired_attributes.isdisjoint(state.mapper.column_attrs.keys()):
+            return False
+        _transform, required = self._profiles.get((model, profile), (None, ()))
+        return not (state.unloaded & set(required))
+
+    def _key_fields(self, model: type) -> Tuple[str, ...]:
+        return tuple(field for field in self.KEY_FIELDS if hasattr(model, field))
+
+    def _index(self, model: type, profile: str, obj: Any) -> None:
+        for field in self._key_fields(model):
+            value = getattr(obj, field, None)
+            if value is not None:
+                self._memo[(model, profile, field)][value] = obj
+
+    def prime(self, obj: Any, profile: str = "default") -> None:
+        """Seed the identity map with an already-loaded object."""
+        self._index(type(obj), profile, obj)
+
+    def prime_keys(self, model: type, field: str, values: Iterable[Hashable], profile: str = "default") -> None:
+        """Queue keys so that the next lookup on ``(model, field)`` fetches them in the same query."""
+        memo = self._memo[(model, profile, field)]
+        self._queued[(model, profile, field)].update(
+            value for value in values if value is not None and value not in memo
+        )
+
+    def forget(self, obj: Any) -> None:
+        """Drop an object (e.g. after deleting it) from every profile and key index."""
+        for (model, _profile, field), memo in self._memo.items():
+            if isinstance(obj, model):
+                value = getattr(obj, field, None)
+                if memo.get(value) is obj:
+                    memo.pop(value, None)
+
+    async def load_many(
+            self,
+            model: type,
+            field: str,
+            values: Iterable[Hashable],
+            profile: str = "default"
+    ) -> Dict[Hashable, Any]:
+        """Resolve many keys at once; returns a mapping of found keys to objects."""
+        memo_key = (model, profile, field)
+        memo = self._memo[memo_key]
+        wanted = [value for value in dict.fromkeys(values) if value is not None]
+
+        for value in wanted:
+            if value in memo and not self._is_usable(model, profile, memo[value]):
+                del memo[value]
+
+        missing = set(value for value in wanted if value not in memo)
+        missing |= self._queued.pop(memo_key, set())
+        missing = [value for value in missing if value not in memo]
+
+        if missing:
+            column = getattr(model, field)
+            transform, _required = self._profiles.get((model, profile), (None, ()))
+            for start in range(0, len(missing), self.MAX_BATCH_SIZE):
+                chunk = missing[start:start + self.MAX_BATCH_SIZE]
+                query = select(model).where(column.in_(chunk))
+                if transform is not None:
+                    query = transform(query)
+                result = await self.session.execute(query)
+                self.query_count += 1
+                for obj in result.scalars().all():
+                    self._index(model, profile, obj)
+
+        return {value: memo[value] for value in wanted if value in memo}
+
+    async def load(
+            self,
+            model: type,
+            field: str,
+            value: Optional[Hashable],
+            profile: str = "default"
+    ) -> Optional[Any]:
+        if value is None:
+            return None
+        found = await self.load_many(model, field, [value], profile)
+        return found.get(value)
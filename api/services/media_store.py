@@ -0,0 +1,148 @@
+import logging
+import os
+import re
+import shutil
+import time
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models import Post, Profile
+from models.user import Media
+from services.image_serving import ImageServer
+from services.uploads import StoredUpload, UploadPipeline
+
+logger = logging.getLogger(__name__)
+
+_BLOB_FILENAME_RE = re.compile(r"^[0-9a-f]{64}(\.[A-Za-z0-9]+)?$")
+
+
+class MediaStore:
+    """
+    Content-addressed storage for uploaded files.
+
+    Each distinct file is stored once, named by its SHA-256, under
+    ``<ROOT>/<aa>/<bb>/<sha256><ext>`` so no directory grows unbounded.
+    Rows keep the logical path the frontend already understands,
+    ``uploads/<folder>/<sha256><ext>``; the image route maps it back to the
+    blob. Uploading a file that is already stored reuses the blob (and its
+    first extension), so the same logical name is handed out again.
+
+    A blob's reference count is the number of ``Post.featured_image``,
+    ``Media.file_path`` and ``Profile.avatar`` values naming it, counted from
+    those (indexed) columns when a reference is dropped rather than kept in a
+    separate counter. ``release`` deletes the blob once that count is zero.
+    Files stored before the blob store keep their uuid names and are handled
+    by the callers' existing per-file cleanup.
+    """
+
+    ROOT = Path(settings.MEDIA_BLOB_DIR)
+    LOGICAL_FOLDERS = ("posts", "images", "media", "avatars")
+    # A blob stored or re-uploaded this recently may be about to be referenced
+    # by a row that is not committed yet, so it is not deleted on release.
+    REUSE_GRACE_SECONDS = settings.MEDIA_BLOB_REUSE_GRACE_SECONDS
+
+    @staticmethod
+    def blob_filename(path: Optional[str]) -> Optional[str]:
+        """The blob name in a stored path, or None for legacy/external paths."""
+        if not path:
+            return None
+        name = PurePosixPath(path.replace("\\", "/")).name
+        return name if _BLOB_FILENAME_RE.match(name) else None
+
+    @staticmethod
+    def blob_path(filename: str) -> Path:
+        return MediaStore.ROOT / filename[:2] / filename[2:4] / filename
+
+    @staticmethod
+    def derived_dir(filename: str) -> Path:
+        """Where resized/re-encoded copies of a blob live; removed with it."""
+        return MediaStore.ROOT / "derived" / filename[:2] / filename[2:4] / Path(filename).stem
+
+    @staticmethod
+    def logical_path(folder: str, filename: str) -> str:
+        return f"uploads/{folder}/{filename}"
+
+    @staticmethod
+    def resolve(folder: str, filename: str) -> Path:
+        """The file on disk behind ``uploads/<folder>/<filename>``."""
+        if MediaStore.blob_filename(filename):
+            return MediaStore.blob_path(filename)
+        return Path("uploads") / folder / filename
+
+    @staticmethod
+    def find_blob(sha256: str) -> Optional[Path]:
+        shard = MediaStore.blob_path(sha256).parent
+        if not shard.is_dir():
+            return None
+        for candidate in shard.glob(f"{sha256}*"):
+            if MediaStore.blob_filename(candidate.name):
+                return candidate
+        return None
+
+    @staticmethod
+    async def store(
+            file: UploadFile,
+            category: str,
+            folder: str,
+            extension: str
+    ) -> StoredUpload:
+        """
+        Stream ``file`` into the store and return its logical path under
+        ``uploads/<folder>``. Size limits and errors are those of
+        ``UploadPipeline.save``.
+        """
+        # Staged inside the store so the final rename stays on one filesystem.
+        staged = await UploadPipeline.save(file, category, MediaStore.ROOT / "incoming", extension)
+        existing = MediaStore.find_blob(staged.sha256)
+        try:
+            if existing is not None:
+                os.utime(existing)
+                filename = existing.name
+            else:
+                filename = f"{staged.sha256}{extension.lower()}"
+                target = MediaStore.blob_path(filename)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged.path, target)
+        finally:
+            if os.path.exists(staged.path):
+                os.remove(staged.path)
+
+        return StoredUpload(MediaStore.logical_path(folder, filename), staged.size, staged.sha256)
+
+    @staticmethod
+    async def reference_count(session: AsyncSession, filename: str) -> int:
+        paths = [MediaStore.logical_path(folder, filename) for folder in MediaStore.LOGICAL_FOLDERS]
+        counts = [
+            select(func.count()).select_from(column.class_).where(column.in_(paths)).scalar_subquery()
+            for column in (Post.featured_image, Media.file_path, Profile.avatar)
+        ]
+        return int(await session.scalar(select(counts[0] + counts[1] + counts[2])) or 0)
+
+    @staticmethod
+    async def release(session: AsyncSession, path: Optional[str]) -> bool:
+        """
+        Delete the blob behind ``path`` if no row references it any more.
+        Call after the change that dropped the reference is committed.
+        Returns True when a file was removed.
+        """
+        filename = MediaStore.blob_filename(path)
+        if filename is None:
+            return False
+        blob = MediaStore.blob_path(filename)
+        if not blob.is_file():
+            return False
+        if await MediaStore.reference_count(session, filename) > 0:
+            return False
+        if time.time() - blob.stat().st_mtime < MediaStore.REUSE_GRACE_SECONDS:
+            logger.info("Keeping recently stored blob %s until the orphan sweep", filename)
+            return False
+        blob.unlink(missing_ok=True)
+        shutil.rmtree(MediaStore.derived_dir(filename), ignore_errors=True)
+        ImageServer.invalidate(blob)
+        ImageServer.invalidate(MediaStore.derived_dir(filename))
+        return True
@@ -1,4 +1,5 @@
 from .post import PostService
+from .detail_cache import PostDetailCache
 from models import Comment
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -49,6 +50,7 @@ class CommentService:
             )
             session.add(db_comment)
             await session.commit()
+            PostDetailCache.invalidate(db_post.id)
 
             result = await session.execute(
                 select(Comment)
@@ -225,6 +227,7 @@ class CommentService:
 
             session.add(db_comment)
             await session.commit()
+            PostDetailCache.invalidate(db_comment.post_id)
 
             result = await session.execute(
                 select(Comment).where(Comment.id == db_comment.id).options(
@@ -262,6 +265,7 @@ class CommentService:
             db_comment.is_approved = True
             session.add(db_comment)
             await session.commit()
+            PostDetailCache.invalidate(db_comment.post_id)
 
             result = await session.execute(
                 select(Comment).where(Comment.id == db_comment.id).options(
@@ -291,8 +295,10 @@ class CommentService:
             db_comment: Comment
     ) -> bool:
         try:
+            post_id = db_comment.post_id
             await session.delete(db_comment)
             await session.commit()
+            PostDetailCache.invalidate(post_id)
             return True
 
         except SQLAlchemyError as e:
@@ -358,6 +364,7 @@ class CommentService:
             
             session.add(db_comment)
             await session.commit()
+            PostDetailCache.invalidate(db_comment.post_id)
             
             return {"liked": liked, "likes_count": db_comment.likes_count}
 
@@ -0,0 +1,379 @@
+import hashlib
+import json
+import math
+import re
+from collections import OrderedDict
+from html import unescape
+from html.parser import HTMLParser
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from core.config import settings
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+RELATED_KEYWORD_STOP_WORDS = frozenset({
+    "about",
+    "after",
+    "also",
+    "and",
+    "article",
+    "best",
+    "build",
+    "building",
+    "complete",
+    "design",
+    "for",
+    "from",
+    "guide",
+    "how",
+    "into",
+    "its",
+    "more",
+    "over",
+    "that",
+    "the",
+    "their",
+    "this",
+    "tips",
+    "using",
+    "with",
+    "your",
+})
+
+
+_HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+
+class _HtmlScanner(HTMLParser):
+    """
+    Single pass over an HTML body collecting its text, first paragraph,
+    heading outline and image count. Every tag boundary becomes a space, as
+    in ``ContentProcessor.normalize_text``.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks: List[str] = []
+        self.first_paragraph = ""
+        self.outline: List[Dict[str, Any]] = []
+        self.image_count = 0
+        self._paragraph: Optional[List[str]] = None
+        self._heading: Optional[List[str]] = None
+        self._heading_level = 0
+
+    @staticmethod
+    def _collapse(chunks: List[str]) -> str:
+        return _WHITESPACE_RE.sub(" ", "".join(chunks)).strip()
+
+    def handle_starttag(self, tag, attrs):
+        self.chunks.append(" ")
+        if tag == "img":
+            self.image_count += 1
+        elif tag == "p" and not self.first_paragraph:
+            self._paragraph = []
+        elif tag in _HEADING_TAGS:
+            self._heading = []
+            self._heading_level = _HEADING_TAGS[tag]
+        if self._paragraph is not None:
+            self._paragraph.append(" ")
+        if self._heading is not None:
+            self._heading.append(" ")
+
+    def handle_endtag(self, tag):
+        self.chunks.append(" ")
+        if tag == "p" and self._paragraph is not None:
+            self.first_paragraph = self._collapse(self._paragraph)
+            self._paragraph = None
+        elif tag in _HEADING_TAGS and self._heading is not None:
+            text = self._collapse(self._heading)
+            if text:
+                self.outline.append({"level": self._heading_level, "text": text})
+            self._heading = None
+        if self._paragraph is not None:
+            self._paragraph.append(" ")
+        if self._heading is not None:
+            self._heading.append(" ")
+
+    def handle_data(self, data):
+        self.chunks.append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        if self._heading is not None:
+            self._heading.append(data)
+
+    @classmethod
+    def scan(cls, html: str) -> "_HtmlScanner":
+        scanner = cls()
+        scanner.feed(html)
+        scanner.close()
+        return scanner
+
+
+class ContentDigest:
+    """Everything derived from a post body, computed from one parse."""
+
+    METADATA_VERSION = 2
+
+    def __init__(
+            self,
+            content_hash: str,
+            plain_text: str,
+            first_paragraph: str,
+            word_count: int,
+            keywords: FrozenSet[str],
+            reading_time: int,
+            heading_outline: Optional[List[Dict[str, Any]]] = None,
+            image_count: int = 0,
+    ):
+        self.content_hash = content_hash
+        self.plain_text = plain_text
+        self.first_paragraph = first_paragraph
+        self.word_count = word_count
+        self.keywords = keywords
+        self.reading_time = reading_time
+        self.heading_outline = heading_outline or []
+        self.image_count = image_count
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """The JSON stored on the post; the full plain text is not kept."""
+        return {
+            "version": self.METADATA_VERSION,
+            "first_paragraph": self.first_paragraph,
+            "word_count": self.word_count,
+            "keywords": sorted(self.keywords),
+            "reading_time": self.reading_time,
+            "heading_outline": self.heading_outline,
+            "image_count": self.image_count,
+        }
+
+    @classmethod
+    def from_metadata(cls, content_hash: str, metadata: Any) -> Optional["ContentDigest"]:
+        if not isinstance(metadata, dict) or metadata.get("version") != cls.METADATA_VERSION:
+            return None
+        return cls(
+            content_hash=content_hash,
+            plain_text="",
+            first_paragraph=metadata.get("first_paragraph") or "",
+            word_count=int(metadata.get("word_count") or 0),
+            keywords=frozenset(metadata.get("keywords") or ()),
+            reading_time=int(metadata.get("reading_time") or 1),
+            heading_outline=list(metadata.get("heading_outline") or []),
+            image_count=int(metadata.get("image_count") or 0),
+        )
+
+
+class ContentProcessor:
+    """
+    Parses post bodies (HTML ``content`` or editor ``content_blocks``) into a
+    ``ContentDigest``.
+
+    Digests are keyed by a hash of the body and kept in a bounded LRU, so
+    validating and storing the same body in one request parses it once.
+    Posts carry their digest in ``content_hash``/``content_metadata``, written
+    by ``apply_to_post`` whenever the body changes; read paths use
+    ``digest_for_post`` and only re-derive rows written before the columns
+    existed.
+    """
+
+    WORDS_PER_MINUTE = 200
+    CACHE_MAX_ENTRIES = settings.CONTENT_DIGEST_CACHE_MAX_ENTRIES
+
+    _cache: "OrderedDict[str, ContentDigest]" = OrderedDict()
+
+    @staticmethod
+    def reset() -> None:
+        ContentProcessor._cache = OrderedDict()
+
+    @staticmethod
+    def normalize_text(value: Optional[str]) -> str:
+        if not value:
+            return ""
+        value = unescape(value)
+        value = _TAG_RE.sub(" ", value)
+        value = _WHITESPACE_RE.sub(" ", value)
+        return value.strip()
+
+    @staticmethod
+    def extract_keywords(*values: Optional[str]) -> set[str]:
+        keywords: set[str] = set()
+
+        for value in values:
+            normalized = ContentProcessor.normalize_text(value).lower()
+            if not normalized:
+                continue
+
+            for token in _TOKEN_RE.findall(normalized):
+                if len(token) < 3 or token in RELATED_KEYWORD_STOP_WORDS:
+                    continue
+                keywords.add(token)
+
+        return keywords
+
+    @staticmethod
+    def _flatten_block_items(items) -> str:
+        flattened: list[str] = []
+        for item in items or []:
+            if isinstance(item, str):
+                cleaned = ContentProcessor.normalize_text(item)
+                if cleaned:
+                    flattened.append(cleaned)
+                continue
+
+            if isinstance(item, dict):
+                cleaned = ContentProcessor.normalize_text(item.get("content") or item.get("text"))
+                if cleaned:
+                    flattened.append(cleaned)
+                children = item.get("items")
+                if isinstance(children, list):
+                    child_text = ContentProcessor._flatten_block_items(children)
+                    if child_text:
+                        flattened.append(child_text)
+
+        return " ".join(flattened).strip()
+
+    @staticmethod
+    def extract_block_text(block: dict) -> str:
+        if not isinstance(block, dict):
+            return ""
+
+        block_type = block.get("type")
+        data = block.get("data")
+        if not isinstance(data, dict):
+            return ""
+
+        if block_type in {"paragraph", "header", "quote"}:
+            return ContentProcessor.normalize_text(data.get("text") or data.get("caption"))
+
+        if block_type == "list":
+            return ContentProcessor._flatten_block_items(data.get("items") or [])
+
+        if block_type == "code":
+            return ContentProcessor.normalize_text(data.get("code"))
+
+        if block_type == "image":
+            return ContentProcessor.normalize_text(data.get("caption"))
+
+        values = [ContentProcessor.normalize_text(value) for value in data.values() if isinstance(value, str)]
+        return " ".join(value for value in values if value).strip()
+
+    @staticmethod
+    def _blocks(content_blocks: Optional[dict]) -> Optional[list]:
+        if isinstance(content_blocks, dict):
+            blocks = content_blocks.get("blocks")
+            if isinstance(blocks, list):
+                return blocks
+        return None
+
+    @staticmethod
+    def content_hash(content: Optional[str], content_blocks: Optional[dict]) -> str:
+        digest = hashlib.sha256()
+        digest.update((content or "").encode("utf-8"))
+        digest.update(b"\0")
+        if content_blocks is not None:
+            digest.update(
+                json.dumps(content_blocks, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+            )
+        return digest.hexdigest()
+
+    @staticmethod
+    def reading_time(word_count: int) -> int:
+        return max(1, math.ceil(word_count / ContentProcessor.WORDS_PER_MINUTE))
+
+    @staticmethod
+    def _parse(content_hash: str, content: Optional[str], content_blocks: Optional[dict]) -> ContentDigest:
+        plain_text = ""
+        first_paragraph = ""
+        outline: List[Dict[str, Any]] = []
+        image_count = 0
+
+        blocks = ContentProcessor._blocks(content_blocks)
+        if blocks is not None:
+            parts = []
+            for block in blocks:
+                if isinstance(block, dict) and block.get("type") == "image":
+                    image_count += 1
+                text = ContentProcessor.extract_block_text(block)
+                if not text:
+                    continue
+                parts.append(text)
+                if block.get("type") == "header":
+                    data = block.get("data") or {}
+                    outline.append({"level": int(data.get("level") or 2), "text": text})
+                elif not first_paragraph and block.get("type") == "paragraph":
+                    first_paragraph = text
+            plain_text = " ".join(parts).strip()
+
+        if content and (not plain_text or not first_paragraph):
+            # Blocks are authoritative for structure; the HTML body is used
+            # for whatever they did not provide.
+            scanned = _HtmlScanner.scan(content)
+            if not plain_text:
+                plain_text = _HtmlScanner._collapse(scanned.chunks)
+                outline = scanned.outline
+                image_count = scanned.image_count
+            if not first_paragraph:
+                first_paragraph = scanned.first_paragraph
+
+        word_count = len(plain_text.split())
+        return ContentDigest(
+            content_hash=content_hash,
+            plain_text=plain_text,
+            first_paragraph=first_paragraph,
+            word_count=word_count,
+            keywords=frozenset(ContentProcessor.extract_keywords(first_paragraph)),
+            reading_time=ContentProcessor.reading_time(word_count),
+            heading_outline=outline,
+            image_count=image_count,
+        )
+
+    @staticmethod
+    def digest(content: Optional[str], content_blocks: Optional[dict]) -> ContentDigest:
+        content_hash = ContentProcessor.content_hash(content, content_blocks)
+        cached = ContentProcessor._cache.get(content_hash)
+        if cached is not None:
+            ContentProcessor._cache.move_to_end(content_hash)
+            return cached
+
+        digest = ContentProcessor._parse(content_hash, content, content_blocks)
+        if ContentProcessor.CACHE_MAX_ENTRIES > 0:
+            ContentProcessor._cache[content_hash] = digest
+            while len(ContentProcessor._cache) > ContentProcessor.CACHE_MAX_ENTRIES:
+                ContentProcessor._cache.popitem(last=False)
+        return digest
+
+    @staticmethod
+    def digest_for_post(post) -> ContentDigest:
+        """
+        The post's stored digest, without reading its body. ``plain_text`` is
+        empty on stored digests; use ``digest`` when the full text is needed.
+        """
+        if post.content_hash:
+            stored = ContentDigest.from_metadata(post.content_hash, post.content_metadata)
+            if stored is not None:
+                return stored
+        return ContentProcessor.digest(post.content, post.content_blocks)
+
+    @staticmethod
+    def apply_to_post(post) -> ContentDigest:
+        """
+        Store the digest of the post's current body on the post, along with
+        the metrics list views read from columns (reading time, word count,
+        image count, heading outline). Reading time is always derived here,
+        never taken from the client.
+        """
+        digest = ContentProcessor.digest(post.content, post.content_blocks)
+        metadata = post.content_metadata
+        if (
+            post.content_hash != digest.content_hash
+            or not isinstance(metadata, dict)
+            or metadata.get("version") != ContentDigest.METADATA_VERSION
+        ):
+            post.content_hash = digest.content_hash
+            post.content_metadata = digest.to_metadata()
+        post.reading_time = digest.reading_time
+        post.word_count = digest.word_count
+        post.image_count = digest.image_count
+        post.heading_outline = digest.heading_outline
+        return digest
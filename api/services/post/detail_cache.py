@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+
+class PostDetailCache:
+    """
+    Process-local cache of serialized post detail payloads.
+
+    The public detail endpoint is dominated by a small set of hot articles, and
+    each miss loads the full relationship graph (comments, replies, likers and
+    bookmarkers). Entries hold the JSON-ready ``PostResponse`` for one post and
+    are reachable by both its uuid and its slug.
+
+    Writes that change the payload (edits, comments, likes, bookmarks, flags,
+    publishing) invalidate the post explicitly. Every invalidation bumps the
+    generation, so a payload loaded while one happened is returned but not
+    stored. View counts are not invalidated and may lag by up to
+    ``TTL_SECONDS``.
+    """
+
+    TTL_SECONDS = settings.POST_DETAIL_CACHE_TTL_SECONDS
+    MAX_ENTRIES = settings.POST_DETAIL_CACHE_MAX_ENTRIES
+
+    # post id -> (stored_at, payload, identifiers)
+    _entries: "OrderedDict[int, tuple]" = OrderedDict()
+    # uuid or slug -> post id
+    _aliases: Dict[str, int] = {}
+    _generation = 0
+
+    @staticmethod
+    def reset() -> None:
+        PostDetailCache._generation += 1
+        PostDetailCache._entries = OrderedDict()
+        PostDetailCache._aliases = {}
+
+    @staticmethod
+    def generation() -> int:
+        """Take before loading a payload and pass to ``set``."""
+        return PostDetailCache._generation
+
+    @staticmethod
+    def get(identifier: str) -> Optional[Dict[str, Any]]:
+        if PostDetailCache.TTL_SECONDS <= 0:
+            return None
+        post_id = PostDetailCache._aliases.get(identifier)
+        if post_id is None:
+            return None
+        cached = PostDetailCache._entries.get(post_id)
+        if cached is None or time.monotonic() - cached[0] >= PostDetailCache.TTL_SECONDS:
+            PostDetailCache._drop(post_id)
+            return None
+        PostDetailCache._entries.move_to_end(post_id)
+        return cached[1]
+
+    @staticmethod
+    def set(post_id: int, payload: Dict[str, Any], generation: int) -> None:
+        if PostDetailCache.TTL_SECONDS <= 0 or generation != PostDetailCache._generation:
+            return
+        PostDetailCache._drop(post_id)
+        identifiers = tuple(
+            value for value in (payload.get("uuid"), payload.get("slug")) if value
+        )
+        PostDetailCache._entries[post_id] = (time.monotonic(), payload, identifiers)
+        for identifier in identifiers:
+            PostDetailCache._aliases[identifier] = post_id
+
+        while len(PostDetailCache._entries) > PostDetailCache.MAX_ENTRIES:
+            evicted_id = next(iter(PostDetailCache._entries))
+            PostDetailCache._drop(evicted_id)
+
+    @staticmethod
+    def invalidate(post_id: Optional[int]) -> None:
+        if post_id is None:
+            return
+        PostDetailCache._generation += 1
+        PostDetailCache._drop(post_id)
+
+    @staticmethod
+    def _drop(post_id: int) -> None:
+        cached = PostDetailCache._entries.pop(post_id, None)
+        if cached is None:
+            return
+        for identifier in cached[2]:
+            if PostDetailCache._aliases.get(identifier) == post_id:
+                del PostDetailCache._aliases[identifier]
@@ -3,11 +3,9 @@ from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
-from datetime import datetime, timedelta
-from html import unescape
+from datetime import datetime
 import hashlib
 import time
-import re
 from models import Post, Category, Tag, User, Report, Comment
 from models.base import post_likes, post_bookmarks
 from schemas.post import (
@@ -18,12 +16,19 @@ from schemas.post import (
     TagCreate,
     ReportCreate
 )
-from utils.slug_generator import generate_slug, generate_random_slug
 from services.user.notification import NotificationService
+from services.post.trending import TrendingService
+from services.post.content import RELATED_KEYWORD_STOP_WORDS, ContentProcessor
+from services.post.detail_cache import PostDetailCache
+from services.post.taxonomy import NO_POST, TaxonomyService
+from services.slug_allocator import SlugAllocator
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+from services.uploads import UPLOAD_POST_IMAGE
+from services.loader import EntityLoader
+from core.config import settings
 from fastapi import HTTPException, status, UploadFile
 from pathlib import Path
-import uuid
-import aiofiles
 import os
 import logging
 
@@ -32,49 +37,17 @@ logger = logging.getLogger(__name__)
 UPLOAD_DIR = Path("uploads/posts")
 # UPLOAD_DIR = Path("/tmp/uploads/posts")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+MAX_FILE_SIZE = settings.UPLOAD_MAX_POST_IMAGE_BYTES
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".avif", ".bmp", ".tiff", ".tif", ".ico", ".heic", ".heif"}
 
 class PostService:
     EXCERPT_MIN_CHARACTERS = 70
     EXCERPT_MIN_WORDS = 10
-    RELATED_KEYWORD_STOP_WORDS = {
-        "about",
-        "after",
-        "also",
-        "and",
-        "article",
-        "best",
-        "build",
-        "building",
-        "complete",
-        "design",
-        "for",
-        "from",
-        "guide",
-        "how",
-        "into",
-        "its",
-        "more",
-        "over",
-        "that",
-        "the",
-        "their",
-        "this",
-        "tips",
-        "using",
-        "with",
-        "your",
-    }
+    RELATED_KEYWORD_STOP_WORDS = RELATED_KEYWORD_STOP_WORDS
 
     @staticmethod
     def normalize_text(value: Optional[str]) -> str:
-        if not value:
-            return ""
-        value = unescape(value)
-        value = re.sub(r"<[^>]+>", " ", value)
-        value = re.sub(r"\s+", " ", value)
-        return value.strip()
+        return ContentProcessor.normalize_text(value)
 
     @staticmethod
     def normalize_excerpt(excerpt: Optional[str]) -> Optional[str]:
@@ -83,104 +56,21 @@ class PostService:
 
     @staticmethod
     def extract_related_keywords(*values: Optional[str]) -> set[str]:
-        keywords: set[str] = set()
-
-        for value in values:
-            normalized = PostService.normalize_text(value).lower()
-            if not normalized:
-                continue
-
-            for token in re.findall(r"[a-z0-9]+", normalized):
-                if len(token) < 3 or token in PostService.RELATED_KEYWORD_STOP_WORDS:
-                    continue
-                keywords.add(token)
-
-        return keywords
-
-    @staticmethod
-    def _flatten_block_items(items) -> str:
-        flattened: list[str] = []
-        for item in items or []:
-            if isinstance(item, str):
-                cleaned = PostService.normalize_text(item)
-                if cleaned:
-                    flattened.append(cleaned)
-                continue
-
-            if isinstance(item, dict):
-                cleaned = PostService.normalize_text(item.get("content") or item.get("text"))
-                if cleaned:
-                    flattened.append(cleaned)
-                children = item.get("items")
-                if isinstance(children, list):
-                    child_text = PostService._flatten_block_items(children)
-                    if child_text:
-                        flattened.append(child_text)
-
-        return " ".join(flattened).strip()
-
-    @staticmethod
-    def _extract_block_text(block: dict) -> str:
-        if not isinstance(block, dict):
-            return ""
-
-        block_type = block.get("type")
-        data = block.get("data")
-        if not isinstance(data, dict):
-            return ""
-
-        if block_type in {"paragraph", "header", "quote"}:
-            return PostService.normalize_text(data.get("text") or data.get("caption"))
-
-        if block_type == "list":
-            return PostService._flatten_block_items(data.get("items") or [])
-
-        if block_type == "code":
-            return PostService.normalize_text(data.get("code"))
-
-        if block_type == "image":
-            return PostService.normalize_text(data.get("caption"))
-
-        values = [PostService.normalize_text(value) for value in data.values() if isinstance(value, str)]
-        return " ".join(value for value in values if value).strip()
+        return ContentProcessor.extract_keywords(*values)
 
     @staticmethod
     def extract_plain_text_content(
         content: Optional[str],
         content_blocks: Optional[dict],
     ) -> str:
-        if isinstance(content_blocks, dict):
-            blocks = content_blocks.get("blocks")
-            if isinstance(blocks, list):
-                parts = [PostService._extract_block_text(block) for block in blocks]
-                plain_text = " ".join(part for part in parts if part).strip()
-                if plain_text:
-                    return plain_text
-
-        return PostService.normalize_text(content)
+        return ContentProcessor.digest(content, content_blocks).plain_text
 
     @staticmethod
     def extract_first_paragraph(
         content: Optional[str],
         content_blocks: Optional[dict],
     ) -> str:
-        if isinstance(content_blocks, dict):
-            blocks = content_blocks.get("blocks")
-            if isinstance(blocks, list):
-                for block in blocks:
-                    if isinstance(block, dict) and block.get("type") == "paragraph":
-                        first_paragraph = PostService._extract_block_text(block)
-                        if first_paragraph:
-                            return first_paragraph
-
-        if content:
-            matches = re.findall(r"<p[^>]*>(.*?)</p>", content, flags=re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                paragraph = PostService.normalize_text(match)
-                if paragraph:
-                    return paragraph
-
-        return ""
+        return ContentProcessor.digest(content, content_blocks).first_paragraph
 
     @staticmethod
     def build_legacy_excerpt_candidates(
@@ -188,24 +78,20 @@ class PostService:
         content_blocks: Optional[dict],
     ) -> set[str]:
         candidates: set[str] = set()
-        sources = [
-            PostService.extract_first_paragraph(content, content_blocks),
-            PostService.extract_plain_text_content(content, content_blocks),
-        ]
-
-        for source in sources:
-            normalized_source = PostService.normalize_text(source)
-            if not normalized_source:
+        digest = ContentProcessor.digest(content, content_blocks)
+
+        for source in (digest.first_paragraph, digest.plain_text):
+            if not source:
                 continue
 
             for max_length in (150, 160):
-                snippet = normalized_source[:max_length].strip()
+                snippet = source[:max_length].strip()
                 if snippet:
                     candidates.add(snippet)
-                    if len(normalized_source) > max_length:
+                    if len(source) > max_length:
                         candidates.add(f"{snippet}...")
 
-        return {candidate for candidate in candidates if candidate}
+        return candidates
 
     @staticmethod
     def validate_excerpt_for_publish(
@@ -321,29 +207,10 @@ class PostService:
             title: str,
             model: Post | Category | Tag,
             max_length: int = 50,
-            random_slug_length: int = 50,
-            max_attempts: int = 5
+            exclude_id: Optional[int] = None
     ) -> str:
         try:
-            for _ in range(max_attempts):
-                candidate_slug = generate_slug(title, max_length=max_length, add_random_suffix=False)
-                existing = await session.execute(
-                    select(model).where(model.slug == candidate_slug)
-                )
-                if not existing.scalar_one_or_none():
-                    return candidate_slug
-
-            for _ in range(5):
-                random_slug = generate_random_slug(length=random_slug_length)
-                existing = await session.execute(
-                    select(model).where(model.slug == random_slug)
-                )
-                if not existing.scalar_one_or_none():
-                    return random_slug
-
-            timestamp = str(int(time.time()))
-            base_slug = generate_slug(title, max_length=max_length - len(timestamp) - 1, add_random_suffix=False)
-            return f"{base_slug}_{timestamp}"
+            return await SlugAllocator.allocate(session, title, model, max_length, exclude_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -364,6 +231,32 @@ class PostService:
                 detail=f"Failed to get post by slug: {str(e)}"
             )
 
+    @staticmethod
+    async def get_post_by_identifier(
+            session: AsyncSession,
+            identifier: str,
+            include_deleted: bool = False
+    ) -> Optional[Post]:
+        """
+        Resolve a post by UUID or slug in a single query. A UUID match wins if
+        the identifier happens to match one post's UUID and another's slug.
+        """
+        try:
+            query = select(Post).where(or_(Post.uuid == identifier, Post.slug == identifier))
+            query = PostService._apply_post_relationships(query)
+            query = PostService._add_soft_delete_filter(query, include_deleted)
+            result = await session.execute(query)
+            posts = result.scalars().all()
+            for post in posts:
+                if post.uuid == identifier:
+                    return post
+            return posts[0] if posts else None
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to get post: {str(e)}"
+            )
+
     @staticmethod
     async def get_post_for_display(session: AsyncSession, slug: str, include_deleted: bool = False) -> Optional[Post]:
         """
@@ -409,23 +302,28 @@ class PostService:
             include_deleted: bool = False
     ) -> List[Post]:
         try:
-            like_count_subquery = (
-                select(post_likes.c.post_id, func.count(post_likes.c.user_id).label("like_count"))
-                .group_by(post_likes.c.post_id)
-                .subquery()
-            )
-
-            query = select(Post).where(Post.is_published == True)
-            query = PostService._apply_post_relationships(query)
-            query = PostService._add_soft_delete_filter(query, include_deleted)
-            # Use timezone-naive datetimes to match the database column type
-            query = query.where(Post.created_at >= datetime.utcnow() - timedelta(days=7))
-            query = query.outerjoin(like_count_subquery, Post.id == like_count_subquery.c.post_id)
-            query = query.order_by((Post.view_count + func.coalesce(like_count_subquery.c.like_count, 0)).desc())
-            query = query.offset(skip).limit(limit)
-
-            result = await session.execute(query)
-            return result.scalars().all()
+            await TrendingService.ensure_seeded(session)
+
+            wanted = skip + limit
+            batch_size = max(wanted * 2, 20)
+            ranked_ids = TrendingService.top_ids(batch_size)
+            posts: List[Post] = []
+            fetched = 0
+            while fetched < len(ranked_ids) and len(posts) < wanted:
+                chunk = ranked_ids[fetched:fetched + batch_size]
+                fetched += len(chunk)
+
+                query = select(Post).where(Post.id.in_(chunk), Post.is_published == True)
+                query = PostService._apply_post_relationships(query)
+                query = PostService._add_soft_delete_filter(query, include_deleted)
+                result = await session.execute(query)
+                by_id = {post.id: post for post in result.scalars().all()}
+                posts.extend(by_id[post_id] for post_id in chunk if post_id in by_id)
+
+                if fetched >= len(ranked_ids) and len(posts) < wanted:
+                    ranked_ids = TrendingService.top_ids(len(ranked_ids) + batch_size)
+
+            return posts[skip:wanted]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -621,8 +519,7 @@ class PostService:
             current_keywords = PostService.extract_related_keywords(
                 db_post.title,
                 db_post.excerpt,
-                PostService.extract_first_paragraph(db_post.content, db_post.content_blocks),
-            )
+            ) | ContentProcessor.digest_for_post(db_post).keywords
 
             scored_candidates: list[tuple[int, datetime, Post]] = []
             for candidate in candidates:
@@ -630,8 +527,7 @@ class PostService:
                 candidate_keywords = PostService.extract_related_keywords(
                     candidate.title,
                     candidate.excerpt,
-                    PostService.extract_first_paragraph(candidate.content, candidate.content_blocks),
-                )
+                ) | ContentProcessor.digest_for_post(candidate).keywords
 
                 shared_tags = len(current_tag_ids & candidate_tag_ids)
                 shared_keywords = len(current_keywords & candidate_keywords)
@@ -687,9 +583,13 @@ class PostService:
                 db_post.content,
                 db_post.content_blocks,
             )
+            before = TaxonomyService.footprint(db_post)
             db_post.is_published = True
             db_post.published_at = datetime.utcnow()
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            PostDetailCache.invalidate(db_post.id)
             await session.refresh(db_post)
             
             await NotificationService.notify_followers_new_post(
@@ -723,9 +623,14 @@ class PostService:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                     detail="Not authorized to unpublish this post")
 
+            before = TaxonomyService.footprint(db_post)
             db_post.is_published = False
             db_post.published_at = None
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            TrendingService.discard(db_post.id)
+            PostDetailCache.invalidate(db_post.id)
             await session.refresh(db_post)
             return db_post
         except HTTPException:
@@ -754,6 +659,7 @@ class PostService:
 
             db_post.is_featured = feature
             await session.commit()
+            PostDetailCache.invalidate(db_post.id)
             await session.refresh(db_post)
             return db_post
         except HTTPException:
@@ -800,8 +706,12 @@ class PostService:
             if not db_post:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
-            user = await session.execute(select(User).where(User.id == user_id))
-            user = user.scalar_one()
+            user = await EntityLoader.for_session(session).load(User, "id", user_id)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
 
             if user in db_post.bookmarked_by:
                 db_post.bookmarked_by.remove(user)
@@ -811,6 +721,7 @@ class PostService:
                 bookmarked = True
 
             await session.commit()
+            PostDetailCache.invalidate(db_post.id)
             return bookmarked
         except HTTPException:
             raise
@@ -1004,16 +915,10 @@ class PostService:
     async def create_post(
             session: AsyncSession,
             post_data: PostCreate,
-            author_id: int
+            author_id: int,
+            regenerate_slug_on_conflict: bool = False
     ) -> Post:
         try:
-            existing_post = await PostService.get_post_by_slug(session, post_data.slug, include_deleted=True)
-            if existing_post:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Post with this slug already exists"
-                )
-
             normalized_excerpt = PostService.normalize_excerpt(post_data.excerpt)
             if post_data.is_published:
                 normalized_excerpt = PostService.validate_excerpt_for_publish(
@@ -1038,8 +943,17 @@ class PostService:
                 tags = await PostService.get_tags_by_ids(session, post_data.tag_ids)
                 db_post.tags.extend(tags)
 
-            session.add(db_post)
-            await session.commit()
+            ContentProcessor.apply_to_post(db_post)
+
+            after = TaxonomyService.footprint(db_post)
+            # The slug's unique constraint is the uniqueness check.
+            await SlugAllocator.commit_with_retry(
+                session,
+                db_post,
+                post_data.title,
+                regenerate=regenerate_slug_on_conflict,
+            )
+            TaxonomyService.record_post_change(NO_POST, after)
             return await PostService.get_post_with_relationships(session, db_post.id)
         except HTTPException:
             raise
@@ -1071,6 +985,7 @@ class PostService:
                     detail="Not authorized to update this post"
                 )
 
+            before = TaxonomyService.footprint(db_post)
             update_data = post_data.model_dump(exclude_unset=True, exclude={"tag_ids"})
             if "excerpt" in update_data:
                 update_data["excerpt"] = PostService.normalize_excerpt(update_data["excerpt"])
@@ -1096,6 +1011,7 @@ class PostService:
 
             for field, value in update_data.items():
                 setattr(db_post, field, value)
+            ContentProcessor.apply_to_post(db_post)
 
             # Handle publish state toggle
             if post_data.is_published is not None:
@@ -1107,7 +1023,10 @@ class PostService:
                     db_post.published_at = None
 
             db_post.updated_at = datetime.utcnow()
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            PostDetailCache.invalidate(db_post.id)
             await session.refresh(db_post)
             return db_post
         except HTTPException:
@@ -1140,8 +1059,13 @@ class PostService:
                     detail="Not authorized to delete this post"
                 )
 
+            post_id = db_post.id
+            before = TaxonomyService.footprint(db_post)
             await session.delete(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, NO_POST)
+            TrendingService.discard(post_id)
+            PostDetailCache.invalidate(post_id)
             return True
         except HTTPException:
             raise
@@ -1173,8 +1097,13 @@ class PostService:
                     detail="Not authorized to delete this post"
                 )
 
+            before = TaxonomyService.footprint(db_post)
             db_post.soft_delete()
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            TrendingService.discard(db_post.id)
+            PostDetailCache.invalidate(db_post.id)
             return {"message": "Post deleted successfully"}
         except HTTPException:
             raise
@@ -1211,8 +1140,12 @@ class PostService:
                     detail="Not authorized to restore this post"
                 )
 
+            before = TaxonomyService.footprint(db_post)
             db_post.restore()
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            PostDetailCache.invalidate(db_post.id)
             return db_post
         except HTTPException:
             raise
@@ -1343,6 +1276,7 @@ class PostService:
 
             db_post.view_count = (db_post.view_count or 0) + 1
             await session.commit()
+            TrendingService.record_view(db_post.id)
             return True
         except Exception:
             await session.rollback()
@@ -1362,8 +1296,12 @@ class PostService:
                     detail="Post not found"
                 )
 
-            user = await session.execute(select(User).where(User.id == user_id))
-            user = user.scalar_one()
+            user = await EntityLoader.for_session(session).load(User, "id", user_id)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
 
             if user in db_post.liked_by:
                 db_post.liked_by.remove(user)
@@ -1379,6 +1317,8 @@ class PostService:
                 )
 
             await session.commit()
+            TrendingService.record_like(db_post.id, liked, user_id=user_id)
+            PostDetailCache.invalidate(db_post.id)
             return liked
         except HTTPException:
             raise
@@ -1407,6 +1347,7 @@ class PostService:
             if not db_post:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
+            before = TaxonomyService.footprint(db_post)
             db_post.is_flagged = flag
             if flag:
                 db_post.is_published = False
@@ -1418,7 +1359,12 @@ class PostService:
                     admin_id=current_user.id
                 )
             
+            after = TaxonomyService.footprint(db_post)
             await session.commit()
+            TaxonomyService.record_post_change(before, after)
+            if flag:
+                TrendingService.discard(db_post.id)
+            PostDetailCache.invalidate(db_post.id)
             await session.refresh(db_post)
             return db_post
         except HTTPException:
@@ -1456,8 +1402,13 @@ class PostService:
                 description=category_data.description
             )
 
-            session.add(db_category)
-            await session.commit()
+            await SlugAllocator.commit_with_retry(
+                session,
+                db_category,
+                category_data.name,
+                regenerate=not (category_data.slug and category_data.slug.strip()),
+            )
+            TaxonomyService.invalidate()
             await session.refresh(db_category)
             return db_category
         except HTTPException:
@@ -1493,7 +1444,9 @@ class PostService:
                 
                 # Generate new slug if name changed and no slug provided
                 if category_data.slug is None:
-                    generated_slug = await PostService.generate_unique_slug(session, category_data.name, Category)
+                    generated_slug = await PostService.generate_unique_slug(
+                        session, category_data.name, Category, exclude_id=category_id
+                    )
                     db_category.slug = generated_slug
             
             if category_data.slug is not None:
@@ -1544,6 +1497,9 @@ class PostService:
                     db_category.parent_id = None
 
             await session.commit()
+            # Post detail payloads embed the category.
+            PostDetailCache.reset()
+            TaxonomyService.invalidate()
             await session.refresh(db_category)
             return db_category
         except HTTPException:
@@ -1594,6 +1550,7 @@ class PostService:
 
             await session.delete(db_category)
             await session.commit()
+            TaxonomyService.invalidate()
         except HTTPException:
             raise
         except Exception as e:
@@ -1609,12 +1566,8 @@ class PostService:
             tag_id: int
     ) -> Optional[Tag]:
         try:
-            result = await session.execute(
-                select(Tag)
-                .where(Tag.id == tag_id)
-                .options(selectinload(Tag.posts))
-            )
-            return result.scalar_one_or_none()
+            tags = await TaxonomyService.attach_tags(session, [tag_id])
+            return tags[0] if tags else None
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1627,12 +1580,7 @@ class PostService:
             slug: str
     ) -> Optional[Tag]:
         try:
-            result = await session.execute(
-                select(Tag)
-                .where(Tag.slug == slug)
-                .options(selectinload(Tag.posts))
-            )
-            return result.scalar_one_or_none()
+            return await TaxonomyService.attach_tag_by_slug(session, slug)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1645,11 +1593,7 @@ class PostService:
             tag_ids: List[int]
     ) -> List[Tag]:
         try:
-            result = await session.execute(
-                select(Tag)
-                .where(Tag.id.in_(tag_ids))
-            )
-            return result.scalars().all()
+            return await TaxonomyService.attach_tags(session, tag_ids)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1682,8 +1626,13 @@ class PostService:
                 category_id=tag_data.category_id
             )
 
-            session.add(db_tag)
-            await session.commit()
+            await SlugAllocator.commit_with_retry(
+                session,
+                db_tag,
+                tag_data.name,
+                regenerate=not (tag_data.slug and tag_data.slug.strip()),
+            )
+            TaxonomyService.invalidate()
             await session.refresh(db_tag)
             return db_tag
         except HTTPException:
@@ -1757,10 +1706,7 @@ class PostService:
             )
 
     @staticmethod
-    async def save_uploaded_file(
-            file: UploadFile,
-            upload_dir: Path
-    ) -> str:
+    async def save_uploaded_file(file: UploadFile) -> str:
         try:
             file_extension = Path(file.filename).suffix.lower()
             if file_extension not in ALLOWED_EXTENSIONS:
@@ -1769,23 +1715,8 @@ class PostService:
                     detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
                 )
 
-            file_size = 0
-            content = await file.read()
-            file_size = len(content)
-
-            if file_size > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024 * 1024):.1f}MB"
-                )
-
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = upload_dir / unique_filename
-
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
-
-            return f"uploads/posts/{unique_filename}"
+            stored = await MediaStore.store(file, UPLOAD_POST_IMAGE, "posts", file_extension)
+            return stored.path
         except HTTPException:
             raise
         except Exception as e:
@@ -1796,6 +1727,7 @@ class PostService:
 
     @staticmethod
     async def cleanup_old_image(
+            session: AsyncSession,
             old_image_path: Optional[str],
             new_image_path: Optional[str],
             upload_dir: Path
@@ -1807,7 +1739,7 @@ class PostService:
             if old_image_path == new_image_path:
                 return True
 
-            return await PostService.delete_image_file(old_image_path, upload_dir)
+            return await PostService.delete_image_file(session, old_image_path, upload_dir)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1816,13 +1748,22 @@ class PostService:
 
     @staticmethod
     async def delete_image_file(
+            session: AsyncSession,
             image_path: Optional[str],
             upload_dir: Path
     ) -> bool:
+        """
+        Drop an image no longer used by a post. Content-addressed images are
+        only deleted once nothing else references them; legacy uuid-named
+        files are removed directly.
+        """
         try:
             if not image_path:
                 return False
 
+            if MediaStore.blob_filename(image_path):
+                return await MediaStore.release(session, image_path)
+
             if os.path.isabs(image_path):
                 file_path = Path(image_path)
             else:
@@ -1830,6 +1771,7 @@ class PostService:
 
             if file_path.exists() and file_path.is_file():
                 os.remove(file_path)
+                ImageServer.invalidate(file_path)
                 return True
             return False
         except Exception as e:
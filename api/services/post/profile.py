@@ -7,13 +7,12 @@ from database.connection import get_db_session
 from sqlmodel import select
 
 import os
-import uuid
-import aiofiles
 from pathlib import Path
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+from services.uploads import UPLOAD_AVATAR
 
 class ProfileService:
-    UPLOAD_DIR = "uploads/avatars"
-
     @staticmethod
     async def get_profile(db: get_db_session, user_uuid: str):
         try:
@@ -62,6 +61,8 @@ class ProfileService:
             if avatar:
                 try:
                     avatar_url = await ProfileService._save_avatar(avatar)
+                except HTTPException:
+                    raise
                 except Exception as avatar_error:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
@@ -88,12 +89,12 @@ class ProfileService:
 
         except HTTPException:
             if avatar_url:
-                ProfileService._delete_avatar(avatar_url)
+                await ProfileService._delete_avatar(db, avatar_url)
             raise
         except IntegrityError as e:
             await db.rollback()
             if avatar_url:
-                ProfileService._delete_avatar(avatar_url)
+                await ProfileService._delete_avatar(db, avatar_url)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Profile data violates database constraints"
@@ -101,7 +102,7 @@ class ProfileService:
         except SQLAlchemyError as e:
             await db.rollback()
             if avatar_url:
-                ProfileService._delete_avatar(avatar_url)
+                await ProfileService._delete_avatar(db, avatar_url)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database error occurred while creating profile"
@@ -109,7 +110,7 @@ class ProfileService:
         except Exception as e:
             await db.rollback()
             if avatar_url:
-                ProfileService._delete_avatar(avatar_url)
+                await ProfileService._delete_avatar(db, avatar_url)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An unexpected error occurred while creating profile"
@@ -149,6 +150,8 @@ class ProfileService:
                     old_avatar_path = profile.avatar  # Store old path before updating
                     new_avatar_path = await ProfileService._save_avatar(avatar)
                     profile.avatar = new_avatar_path
+                except HTTPException:
+                    raise
                 except Exception as avatar_error:
                     logger.error(f"Error saving avatar for user {user_uuid}: {str(avatar_error)}")
                     raise HTTPException(
@@ -164,18 +167,18 @@ class ProfileService:
             await db.refresh(profile)
 
             if avatar and old_avatar_path:
-                ProfileService._delete_avatar(old_avatar_path)
+                await ProfileService._delete_avatar(db, old_avatar_path)
 
             return ProfileResponse.from_orm(profile)
 
         except HTTPException:
             if new_avatar_path:
-                ProfileService._delete_avatar(new_avatar_path)
+                await ProfileService._delete_avatar(db, new_avatar_path)
             raise
         except IntegrityError as e:
             await db.rollback()
             if new_avatar_path:
-                ProfileService._delete_avatar(new_avatar_path)
+                await ProfileService._delete_avatar(db, new_avatar_path)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Profile data violates database constraints"
@@ -183,7 +186,7 @@ class ProfileService:
         except SQLAlchemyError as e:
             await db.rollback()
             if new_avatar_path:
-                ProfileService._delete_avatar(new_avatar_path)
+                await ProfileService._delete_avatar(db, new_avatar_path)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database error occurred while updating profile"
@@ -191,7 +194,7 @@ class ProfileService:
         except Exception as e:
             await db.rollback()
             if new_avatar_path:
-                ProfileService._delete_avatar(new_avatar_path)
+                await ProfileService._delete_avatar(db, new_avatar_path)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An unexpected error occurred while updating profile"
@@ -221,7 +224,7 @@ class ProfileService:
             await db.commit()
 
             if avatar_path:
-                ProfileService._delete_avatar(avatar_path)
+                await ProfileService._delete_avatar(db, avatar_path)
 
             return True
 
@@ -246,24 +249,14 @@ class ProfileService:
             if not avatar.filename:
                 raise ValueError("No filename provided")
 
-            os.makedirs(ProfileService.UPLOAD_DIR, exist_ok=True)
-
             file_extension = Path(avatar.filename).suffix
             if not file_extension:
                 raise ValueError("File has no extension")
 
-            file_name = f"{uuid.uuid4()}{file_extension}"
-            file_path = os.path.join(ProfileService.UPLOAD_DIR, file_name)
-
-            async with aiofiles.open(file_path, 'wb') as out_file:
-                content = await avatar.read()
-                if not content:
-                    raise ValueError("File is empty")
-                await out_file.write(content)
-
-            return file_path
+            stored = await MediaStore.store(avatar, UPLOAD_AVATAR, "avatars", file_extension)
+            return stored.path
 
-        except ValueError as e:
+        except (ValueError, HTTPException):
             raise
         except OSError as e:
             raise Exception(f"Failed to save avatar: File system error")
@@ -271,6 +264,9 @@ class ProfileService:
             raise Exception(f"Failed to save avatar: {str(e)}")
 
     @staticmethod
-    def _delete_avatar(file_path: str):
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
\ No newline at end of file
+    async def _delete_avatar(db: get_db_session, file_path: str):
+        if MediaStore.blob_filename(file_path):
+            await MediaStore.release(db, file_path)
+        elif file_path and os.path.exists(file_path):
+            os.remove(file_path)
+            ImageServer.invalidate(file_path)
\ No newline at end of file
@@ -0,0 +1,310 @@
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import select
+
+from core.config import settings
+from models import Category, Post, Tag
+from models.base import post_tags
+
+
+class PostFootprint(NamedTuple):
+    """What a post contributes to taxonomy post counts."""
+
+    category_id: Optional[int]
+    tag_ids: FrozenSet[int]
+    # Counted in its category: not soft-deleted (drafts included).
+    live: bool
+    # Counted in its tags: live, published and not flagged.
+    visible: bool
+
+
+# The footprint of a post that does not exist (before create, after hard delete).
+NO_POST = PostFootprint(None, frozenset(), False, False)
+
+
+class TaxonomySnapshot:
+    """
+    Every category and tag, indexed for lookups, with their post counts.
+
+    Category and tag entries are plain dicts shared by every index, so a
+    count adjusted in place is seen by the tree, the tag lists and the groups.
+    """
+
+    def __init__(
+            self,
+            generation: int,
+            categories: List[Dict[str, Any]],
+            tags: List[Dict[str, Any]],
+    ):
+        self.generation = generation
+        self.loaded_at = time.monotonic()
+        self.categories: Dict[int, Dict[str, Any]] = {
+            category["id"]: category for category in categories
+        }
+        self.children: Dict[int, List[Dict[str, Any]]] = {}
+        for category in categories:
+            if category["parent_id"] is not None:
+                self.children.setdefault(category["parent_id"], []).append(category)
+        self.tags: Dict[int, Dict[str, Any]] = {tag["id"]: tag for tag in tags}
+        self.tag_ids_by_slug: Dict[str, int] = {tag["slug"]: tag["id"] for tag in tags}
+        self.tag_groups = self._group_tags(categories, tags)
+
+    @staticmethod
+    def _group_tags(
+            categories: List[Dict[str, Any]],
+            tags: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        # Tags attached to a subcategory are listed under its top-level parent.
+        root_of = {
+            category["id"]: category["parent_id"] or category["id"]
+            for category in categories
+        }
+        tags_by_root: Dict[int, List[Dict[str, Any]]] = {}
+        for tag in tags:
+            root_id = root_of.get(tag["category_id"])
+            if root_id is not None:
+                tags_by_root.setdefault(root_id, []).append(tag)
+
+        return [
+            {
+                "category_id": category["id"],
+                "category_name": category["name"],
+                "tags": tags_by_root[category["id"]],
+            }
+            for category in categories
+            if category["parent_id"] is None and category["id"] in tags_by_root
+        ]
+
+    def apply(self, footprint: PostFootprint, delta: int) -> None:
+        if footprint.live and footprint.category_id in self.categories:
+            category = self.categories[footprint.category_id]
+            category["post_count"] = max(category["post_count"] + delta, 0)
+        if footprint.visible:
+            for tag_id in footprint.tag_ids:
+                tag = self.tags.get(tag_id)
+                if tag is not None:
+                    tag["post_count"] = max(tag["post_count"] + delta, 0)
+
+
+class TaxonomyService:
+    """
+    Process-wide snapshot of the category/tag taxonomy and its post counts.
+
+    The taxonomy changes rarely but is read on every editor load and every
+    post write, so it is loaded with two set-based queries (categories with
+    their post counts, tags with their visible post counts) and served from
+    memory:
+
+      - category and tag writes call ``invalidate`` after committing;
+      - post writes call ``record_post_change`` with the post's footprint
+        before and after the change, which adjusts counts in place.
+
+    Every change bumps the generation, so a load that raced with a write is
+    returned but not stored. Other workers' writes are picked up when the
+    snapshot expires after ``TTL_SECONDS``.
+    """
+
+    TTL_SECONDS = settings.TAXONOMY_SNAPSHOT_TTL_SECONDS
+
+    _generation = 0
+    _snapshot: Optional[TaxonomySnapshot] = None
+
+    @staticmethod
+    def reset() -> None:
+        TaxonomyService._generation += 1
+        TaxonomyService._snapshot = None
+
+    @staticmethod
+    def invalidate() -> None:
+        TaxonomyService.reset()
+
+    @staticmethod
+    def _is_fresh(snapshot: Optional[TaxonomySnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == TaxonomyService._generation
+            and time.monotonic() - snapshot.loaded_at < TaxonomyService.TTL_SECONDS
+        )
+
+    @staticmethod
+    async def _load(session: AsyncSession, generation: int) -> TaxonomySnapshot:
+        category_count = func.count(Post.id).label("post_count")
+        category_rows = await session.execute(
+            select(
+                Category.id,
+                Category.name,
+                Category.slug,
+                Category.description,
+                Category.parent_id,
+                Category.created_at,
+                category_count,
+            )
+            .select_from(Category)
+            .outerjoin(
+                Post,
+                and_(Post.category_id == Category.id, Post.deleted_at.is_(None)),
+            )
+            .group_by(Category.id)
+            .order_by(Category.id)
+        )
+        categories = [dict(row._mapping) for row in category_rows.all()]
+
+        tag_count = func.count(Post.id).label("post_count")
+        tag_rows = await session.execute(
+            select(*Tag.__table__.columns, tag_count)
+            .select_from(Tag)
+            .outerjoin(post_tags, post_tags.c.tag_id == Tag.id)
+            .outerjoin(
+                Post,
+                and_(
+                    Post.id == post_tags.c.post_id,
+                    Post.is_published.is_(True),
+                    Post.deleted_at.is_(None),
+                    Post.is_flagged.is_(False),
+                ),
+            )
+            .group_by(Tag.id)
+            .order_by(Tag.id)
+        )
+        tags = [dict(row._mapping) for row in tag_rows.all()]
+        return TaxonomySnapshot(generation, categories, tags)
+
+    @staticmethod
+    async def get_snapshot(session: AsyncSession) -> TaxonomySnapshot:
+        snapshot = TaxonomyService._snapshot
+        if TaxonomyService._is_fresh(snapshot):
+            return snapshot
+
+        generation = TaxonomyService._generation
+        snapshot = await TaxonomyService._load(session, generation)
+        if generation == TaxonomyService._generation:
+            TaxonomyService._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    async def get_tag_groups(session: AsyncSession) -> List[Dict[str, Any]]:
+        snapshot = await TaxonomyService.get_snapshot(session)
+        return snapshot.tag_groups
+
+    @staticmethod
+    async def get_category_tree(session: AsyncSession) -> List[Dict[str, Any]]:
+        """Top-level categories, each with its subcategories."""
+        snapshot = await TaxonomyService.get_snapshot(session)
+        return [
+            {**category, "subcategories": snapshot.children.get(category["id"], [])}
+            for category in snapshot.categories.values()
+            if category["parent_id"] is None
+        ]
+
+    @staticmethod
+    async def get_tags(
+            session: AsyncSession,
+            category_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        snapshot = await TaxonomyService.get_snapshot(session)
+        if category_id is None:
+            return list(snapshot.tags.values())
+        return [tag for tag in snapshot.tags.values() if tag["category_id"] == category_id]
+
+    @staticmethod
+    async def get_tag(
+            session: AsyncSession,
+            tag_id: Optional[int] = None,
+            slug: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        snapshot = await TaxonomyService.get_snapshot(session)
+        if tag_id is None and slug is not None:
+            tag_id = snapshot.tag_ids_by_slug.get(slug)
+        return snapshot.tags.get(tag_id) if tag_id is not None else None
+
+    @staticmethod
+    async def attach_tags(session: AsyncSession, tag_ids: Iterable[int]) -> List[Tag]:
+        """
+        Return session-attached ``Tag`` instances for the existing ids in
+        ``tag_ids``; unknown ids are dropped, as an ``IN`` query would.
+
+        Which ids exist is always read from the table (ids only), since the
+        snapshot may predate tags another worker created or deleted. Rows the
+        snapshot holds are built from it; the others are loaded, and either
+        kind of mismatch drops the snapshot.
+        """
+        wanted = list(dict.fromkeys(tag_ids))
+        if not wanted:
+            return []
+        snapshot = await TaxonomyService.get_snapshot(session)
+        existing = set((await session.execute(select(Tag.id).where(Tag.id.in_(wanted)))).scalars())
+
+        missing = [tag_id for tag_id in wanted if tag_id in existing and tag_id not in snapshot.tags]
+        loaded: Dict[int, Tag] = {}
+        if missing:
+            loaded = {
+                tag.id: tag
+                for tag in (await session.execute(select(Tag).where(Tag.id.in_(missing)))).scalars()
+            }
+        if missing or any(tag_id in snapshot.tags for tag_id in set(wanted) - existing):
+            TaxonomyService.invalidate()
+
+        column_keys = {column_attr.key for column_attr in inspect(Tag).column_attrs}
+        tags = []
+        for tag_id in wanted:
+            if tag_id not in existing:
+                continue
+            if tag_id in loaded:
+                tags.append(loaded[tag_id])
+                continue
+            entry = snapshot.tags[tag_id]
+            tag = Tag(**{key: value for key, value in entry.items() if key in column_keys})
+            make_transient_to_detached(tag)
+            tags.append(await session.merge(tag, load=False))
+        return tags
+
+    @staticmethod
+    async def attach_tag_by_slug(session: AsyncSession, slug: str) -> Optional[Tag]:
+        """Like ``attach_tags`` for one slug, querying slugs the snapshot lacks."""
+        snapshot = await TaxonomyService.get_snapshot(session)
+        tag_id = snapshot.tag_ids_by_slug.get(slug)
+        if tag_id is None:
+            tag = await session.scalar(select(Tag).where(Tag.slug == slug))
+            if tag is not None:
+                TaxonomyService.invalidate()
+            return tag
+        tags = await TaxonomyService.attach_tags(session, [tag_id])
+        return tags[0] if tags else None
+
+    @staticmethod
+    def footprint(post: Post) -> Optional[PostFootprint]:
+        """
+        Capture a post's contribution to post counts, or None when its tags
+        are not loaded and the contribution cannot be known without a query.
+        """
+        state = inspect(post)
+        if "tags" in state.unloaded and state.has_identity:
+            return None
+        return PostFootprint(
+            category_id=post.category_id,
+            tag_ids=frozenset(tag.id for tag in post.tags),
+            live=post.deleted_at is None,
+            visible=bool(post.is_published) and post.deleted_at is None and not post.is_flagged,
+        )
+
+    @staticmethod
+    def record_post_change(
+            before: Optional[PostFootprint],
+            after: Optional[PostFootprint]
+    ) -> None:
+        """Move a committed post's counts from ``before`` to ``after``."""
+        if before == after:
+            return
+        snapshot = TaxonomyService._snapshot
+        fresh = TaxonomyService._is_fresh(snapshot)
+        TaxonomyService._generation += 1
+        if before is None or after is None or not fresh:
+            TaxonomyService._snapshot = None
+            return
+        snapshot.apply(before, -1)
+        snapshot.apply(after, 1)
+        snapshot.generation = TaxonomyService._generation
@@ -0,0 +1,239 @@
+import heapq
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from core.config import settings
+from models import Post
+from models.base import post_likes
+
+logger = logging.getLogger(__name__)
+
+
+class TrendingService:
+    """
+    In-process trending engine backed by exponentially decayed hotness scores.
+
+    Scores use forward decay: every event adds ``weight * 2 ** ((t - epoch) / half_life)``
+    so that an event never has to touch the other posts' scores. Ordering by the
+    stored value is therefore equivalent to ordering by the decayed score at any
+    instant. The epoch is periodically moved forward (a bulk re-decay), which
+    rescales every score and prunes posts that have cooled down.
+
+    Each worker tracks the events it serves; with load-balanced traffic the
+    rankings converge, and a cold worker seeds itself from the database.
+
+    An unlike removes exactly what its like added, using the like time this
+    worker recorded; likes it never saw (other workers, before a restart)
+    contributed nothing it can attribute, so their unlikes remove nothing.
+    """
+
+    HALF_LIFE_SECONDS = max(settings.TRENDING_HALF_LIFE_HOURS, 0.1) * 3600
+    VIEW_WEIGHT = settings.TRENDING_VIEW_WEIGHT
+    LIKE_WEIGHT = settings.TRENDING_LIKE_WEIGHT
+    REDECAY_INTERVAL_SECONDS = 3600
+    RANKING_TTL_SECONDS = 5
+    MIN_SCORE = 0.01
+    MAX_TRACKED_POSTS = 10000
+    MAX_TRACKED_LIKES = 100000
+    SEED_WINDOW_DAYS = 7
+
+    _scores: dict = {}
+    # (post_id, user_id) -> when the like was recorded, least recent first.
+    _like_times: "OrderedDict[Tuple[int, Optional[int]], float]" = OrderedDict()
+    _epoch: Optional[float] = None
+    _ranking: List[int] = []
+    _ranking_built_at: float = 0.0
+    _ranking_dirty = True
+    _seeded = False
+
+    @staticmethod
+    def reset() -> None:
+        TrendingService._scores = {}
+        TrendingService._like_times = OrderedDict()
+        TrendingService._epoch = None
+        TrendingService._ranking = []
+        TrendingService._ranking_built_at = 0.0
+        TrendingService._ranking_dirty = True
+        TrendingService._seeded = False
+
+    @staticmethod
+    def _growth(now: float) -> float:
+        if TrendingService._epoch is None:
+            TrendingService._epoch = now
+        return 2 ** ((now - TrendingService._epoch) / TrendingService.HALF_LIFE_SECONDS)
+
+    @staticmethod
+    def _add(post_id: int, weight: float, at: Optional[float] = None) -> None:
+        now = time.time() if at is None else at
+        TrendingService._maybe_redecay(now)
+        current = TrendingService._scores.get(post_id, 0.0)
+        updated = current + weight * TrendingService._growth(now)
+        if updated <= 0:
+            TrendingService._scores.pop(post_id, None)
+        else:
+            TrendingService._scores[post_id] = updated
+        TrendingService._ranking_dirty = True
+
+    @staticmethod
+    def record_view(post_id: int, at: Optional[float] = None) -> None:
+        TrendingService._add(post_id, TrendingService.VIEW_WEIGHT, at)
+
+    @staticmethod
+    def record_like(
+            post_id: int,
+            liked: bool = True,
+            at: Optional[float] = None,
+            user_id: Optional[int] = None
+    ) -> None:
+        now = time.time() if at is None else at
+        key = (post_id, user_id)
+        if liked:
+            TrendingService._like_times[key] = now
+            TrendingService._like_times.move_to_end(key)
+            if len(TrendingService._like_times) > TrendingService.MAX_TRACKED_LIKES:
+                TrendingService._like_times.popitem(last=False)
+            TrendingService._add(post_id, TrendingService.LIKE_WEIGHT, now)
+            return
+
+        liked_at = TrendingService._like_times.pop(key, None)
+        if liked_at is None:
+            return
+        # Subtract the like's own forward-decayed term rather than a
+        # full-strength like from now; rounding must not leave a residue.
+        TrendingService._maybe_redecay(now)
+        contribution = TrendingService.LIKE_WEIGHT * TrendingService._growth(liked_at)
+        updated = TrendingService._scores.get(post_id, 0.0) - contribution
+        if updated <= contribution * 1e-9:
+            TrendingService._scores.pop(post_id, None)
+        else:
+            TrendingService._scores[post_id] = updated
+        TrendingService._ranking_dirty = True
+
+    @staticmethod
+    def discard(post_id: int) -> None:
+        """Drop a post that is no longer eligible (unpublished, flagged or deleted)."""
+        if TrendingService._scores.pop(post_id, None) is not None:
+            TrendingService._ranking_dirty = True
+
+    @staticmethod
+    def score(post_id: int, at: Optional[float] = None) -> float:
+        """Current decayed score for a post."""
+        stored = TrendingService._scores.get(post_id)
+        if not stored:
+            return 0.0
+        now = time.time() if at is None else at
+        return stored / TrendingService._growth(now)
+
+    @staticmethod
+    def _maybe_redecay(now: float) -> None:
+        if TrendingService._epoch is None:
+            TrendingService._epoch = now
+            return
+        if now - TrendingService._epoch >= TrendingService.REDECAY_INTERVAL_SECONDS:
+            TrendingService.redecay(now)
+
+    @staticmethod
+    def redecay(at: Optional[float] = None) -> int:
+        """
+        Rebase every score onto a new epoch in a single pass and prune posts whose
+        decayed score fell below ``MIN_SCORE``. Returns the number of pruned posts.
+        """
+        now = time.time() if at is None else at
+        factor = 1.0 / TrendingService._growth(now)
+        rebased = {}
+        for post_id, stored in TrendingService._scores.items():
+            value = stored * factor
+            if value >= TrendingService.MIN_SCORE:
+                rebased[post_id] = value
+
+        if len(rebased) > TrendingService.MAX_TRACKED_POSTS:
+            rebased = dict(
+                heapq.nlargest(
+                    TrendingService.MAX_TRACKED_POSTS,
+                    rebased.items(),
+                    key=lambda item: item[1],
+                )
+            )
+
+        pruned = len(TrendingService._scores) - len(rebased)
+        TrendingService._scores = rebased
+        TrendingService._epoch = now
+        TrendingService._ranking_dirty = True
+        return pruned
+
+    @staticmethod
+    def top_ids(limit: int, at: Optional[float] = None) -> List[int]:
+        """Post ids ordered by hotness, served from a short-lived sorted snapshot."""
+        now = time.time() if at is None else at
+        TrendingService._maybe_redecay(now)
+
+        stale = now - TrendingService._ranking_built_at >= TrendingService.RANKING_TTL_SECONDS
+        if TrendingService._ranking_dirty and (stale or not TrendingService._ranking):
+            TrendingService._ranking = [
+                post_id
+                for post_id, _ in sorted(
+                    TrendingService._scores.items(),
+                    key=lambda item: (item[1], item[0]),
+                    reverse=True,
+                )
+            ]
+            TrendingService._ranking_built_at = now
+            TrendingService._ranking_dirty = False
+        return TrendingService._ranking[:limit]
+
+    @staticmethod
+    async def ensure_seeded(session: AsyncSession) -> None:
+        """
+        Seed a cold engine from recent published posts so that a fresh worker does
+        not serve an empty list until events arrive.
+        """
+        if TrendingService._seeded:
+            return
+        TrendingService._seeded = True
+
+        like_count_subquery = (
+            select(post_likes.c.post_id, func.count(post_likes.c.user_id).label("like_count"))
+            .group_by(post_likes.c.post_id)
+            .subquery()
+        )
+        since = datetime.utcnow() - timedelta(days=TrendingService.SEED_WINDOW_DAYS)
+        query = (
+            select(
+                Post.id,
+                Post.view_count,
+                func.coalesce(like_count_subquery.c.like_count, 0),
+                func.coalesce(Post.published_at, Post.created_at),
+            )
+            .outerjoin(like_count_subquery, Post.id == like_count_subquery.c.post_id)
+            .where(
+                Post.is_published.is_(True),
+                Post.deleted_at.is_(None),
+                Post.is_flagged.is_(False),
+                func.coalesce(Post.published_at, Post.created_at) >= since,
+            )
+        )
+        try:
+            rows = (await session.execute(query)).all()
+        except Exception as exc:
+            TrendingService._seeded = False
+            logger.warning("Failed to seed trending engine: %s", exc)
+            return
+
+        utc_now = datetime.utcnow()
+        for post_id, view_count, like_count, published_at in rows:
+            weight = (
+                (view_count or 0) * TrendingService.VIEW_WEIGHT
+                + (like_count or 0) * TrendingService.LIKE_WEIGHT
+            )
+            if weight <= 0:
+                continue
+            # Historical engagement is treated as if it happened when the post went live.
+            age = max((utc_now - published_at).total_seconds(), 0.0) if published_at else 0.0
+            TrendingService._add(post_id, weight * 2 ** (-age / TrendingService.HALF_LIFE_SECONDS))
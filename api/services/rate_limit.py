@@ -0,0 +1,422 @@
+import ipaddress
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from jose import JWTError, jwt
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+SCOPE_USER = "user"
+SCOPE_IP = "ip"
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Throttling rules for one group of routes.
+
+    ``limit`` requests per ``period_seconds`` refill a token bucket that also
+    allows a burst of ``limit``. ``concurrency`` caps in-flight requests per
+    client and ``global_concurrency`` across all clients; 0 means no cap.
+    Routes sharing a policy share its buckets.
+    """
+
+    name: str
+    limit: int
+    period_seconds: int
+    scope: str = SCOPE_USER
+    concurrency: int = 0
+    global_concurrency: int = 0
+
+    @classmethod
+    def from_spec(cls, name: str, spec: str, **kwargs: Any) -> "RateLimitPolicy":
+        """Build a policy from a ``"30/minute"`` setting; ``"0"`` disables the bucket."""
+        spec = (spec or "0").strip().lower()
+        count, _, period = spec.partition("/")
+        try:
+            limit = int(count)
+            period_seconds = PERIODS[period.strip() or "minute"]
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid rate limit for {name!r}: {spec!r}")
+        return cls(name=name, limit=max(limit, 0), period_seconds=period_seconds, **kwargs)
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.limit / self.period_seconds
+
+
+class MemoryRateLimitBackend:
+    """
+    Process-local buckets and concurrency slots.
+
+    Used when Redis is not configured, when it fails, and in tests, which
+    can replace ``clock``. At most ``max_keys`` buckets are kept; the least
+    recently used is dropped, which only ever makes a client's bucket full.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int, clock=time.monotonic):
+        self.max_keys = max(max_keys, 1)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._slots: Dict[str, int] = {}
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float, float]:
+        with self._lock:
+            now = self.clock()
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + max(now - updated_at, 0.0) * refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after == 0.0, tokens, retry_after
+
+    def acquire(self, key: str, limit: int, lease_seconds: int) -> Optional[str]:
+        # Holders always release in-process, so no lease is needed here.
+        with self._lock:
+            in_flight = self._slots.get(key, 0)
+            if in_flight >= limit:
+                return None
+            self._slots[key] = in_flight + 1
+            return key
+
+    def release(self, key: str, holder: str) -> None:
+        with self._lock:
+            in_flight = self._slots.get(key, 0) - 1
+            if in_flight > 0:
+                self._slots[key] = in_flight
+            else:
+                self._slots.pop(key, None)
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._slots)
+
+
+# Refill and take in one round trip, on Redis' clock so workers agree.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {tostring(tokens), tostring(retry_after)}
+"""
+
+# Slots are members of a sorted set scored by their lease deadline, so a
+# holder that never releases (a crashed worker) drops out on its own even
+# while other holders keep the key alive.
+_ACQUIRE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local lease = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + lease, ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.ceil(lease) + 1)
+return 1
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets and concurrency slots shared by every worker through Redis."""
+
+    name = "redis"
+    PREFIX = "rate_limit"
+
+    def __init__(self, client):
+        self._client = client
+        self._take = client.register_script(_TAKE_SCRIPT)
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float, float]:
+        tokens, retry_after = await self._take(
+            keys=[f"{self.PREFIX}:bucket:{key}"], args=[capacity, refill_per_second]
+        )
+        retry_after = float(retry_after)
+        return retry_after == 0.0, float(tokens), retry_after
+
+    async def acquire(self, key: str, limit: int, lease_seconds: int) -> Optional[str]:
+        holder = uuid.uuid4().hex
+        acquired = await self._acquire(
+            keys=[f"{self.PREFIX}:slots:{key}"], args=[limit, lease_seconds, holder]
+        )
+        return holder if acquired else None
+
+    async def release(self, key: str, holder: str) -> None:
+        await self._client.zrem(f"{self.PREFIX}:slots:{key}", holder)
+
+
+TRUSTED_PROXY_NETWORKS = [
+    ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES
+]
+
+
+def _is_trusted_proxy(address: Optional[str]) -> bool:
+    if not address or not TRUSTED_PROXY_NETWORKS:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXY_NETWORKS)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Proxy-aware client address.
+
+    Forwarding headers are only believed when the socket peer is one of
+    ``TRUSTED_PROXIES``; anyone else could send a new value with every
+    request. From a trusted peer the precedence is CF-Connecting-IP, the
+    nearest X-Forwarded-For hop that is not itself a trusted proxy, then
+    X-Real-IP.
+    """
+    peer = request.client.host if request.client else None
+    if _is_trusted_proxy(peer):
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        # Proxies append, so only the hops after the last untrusted one were added by us.
+        forwarded_client = next((hop for hop in reversed(forwarded) if not _is_trusted_proxy(hop)), None)
+        return (
+            request.headers.get("cf-connecting-ip")
+            or forwarded_client
+            or request.headers.get("x-real-ip")
+            or peer
+        )
+    return peer or "unknown"
+
+
+class RateLimiter:
+    """
+    Token-bucket throttling and admission control for expensive routes.
+
+    Routers declare a ``RateLimitPolicy`` and attach ``rate_limited(policy)``
+    as a route dependency. Clients are identified by the subject of a valid
+    bearer token, or by address for anonymous requests and ``SCOPE_IP``
+    policies; the token is only verified, not looked up, so throttling
+    costs no query. Buckets live in Redis when ``RATE_LIMIT_REDIS_URL`` (or
+    ``REDIS_URL``) is reachable and in process otherwise; a Redis error
+    falls back to the local buckets rather than failing the request. Redis
+    is reached through the asyncio client, so a slow Redis never blocks the
+    event loop.
+    """
+
+    ENABLED = settings.RATE_LIMIT_ENABLED
+    LEASE_SECONDS = settings.RATE_LIMIT_CONCURRENCY_LEASE_SECONDS
+
+    _memory = MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+    _redis: Optional[RedisRateLimitBackend] = None
+    _redis_checked = False
+    _lock = threading.Lock()
+    _metrics: Dict[str, Dict[str, int]] = {}
+    _backend_errors = 0
+
+    @staticmethod
+    def reset() -> None:
+        RateLimiter._memory = MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+        with RateLimiter._lock:
+            RateLimiter._metrics = {}
+            RateLimiter._backend_errors = 0
+
+    @staticmethod
+    async def _get_redis_backend() -> Optional[RedisRateLimitBackend]:
+        if RateLimiter._redis_checked:
+            return RateLimiter._redis
+
+        RateLimiter._redis_checked = True
+        if not settings.RATE_LIMIT_REDIS_URL:
+            return None
+
+        try:
+            import redis.asyncio as redis_asyncio  # type: ignore
+
+            client = redis_asyncio.Redis.from_url(
+                settings.RATE_LIMIT_REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=0.2,
+                socket_timeout=0.2,
+            )
+            await client.ping()
+            RateLimiter._redis = RedisRateLimitBackend(client)
+            logger.info("Rate limiting using Redis backend")
+        except Exception as exc:
+            RateLimiter._redis = None
+            logger.warning("Rate limit Redis unavailable; falling back to in-memory buckets: %s", exc)
+        return RateLimiter._redis
+
+    @staticmethod
+    def _record_backend_error(method: str, exc: Exception) -> None:
+        with RateLimiter._lock:
+            RateLimiter._backend_errors += 1
+        logger.warning("Rate limit Redis %s failed; using in-memory buckets: %s", method, exc)
+
+    @staticmethod
+    async def _call(method: str, *args: Any) -> Tuple[Any, Any]:
+        """Run ``method`` on Redis, or locally if it is unset or fails; return (backend, result)."""
+        backend = await RateLimiter._get_redis_backend()
+        if backend is not None:
+            try:
+                return backend, await getattr(backend, method)(*args)
+            except Exception as exc:
+                RateLimiter._record_backend_error(method, exc)
+        return RateLimiter._memory, getattr(RateLimiter._memory, method)(*args)
+
+    @staticmethod
+    def _count(policy: RateLimitPolicy, outcome: str) -> None:
+        with RateLimiter._lock:
+            counters = RateLimiter._metrics.setdefault(
+                policy.name, {"allowed": 0, "throttled": 0, "concurrency_rejected": 0}
+            )
+            counters[outcome] += 1
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        backend = RateLimiter._redis if RateLimiter._redis is not None else RateLimiter._memory
+        with RateLimiter._lock:
+            return {
+                "enabled": RateLimiter.ENABLED,
+                "backend": backend.name,
+                "backend_errors": RateLimiter._backend_errors,
+                "policies": {name: dict(counters) for name, counters in RateLimiter._metrics.items()},
+                "in_flight": RateLimiter._memory.in_flight(),
+            }
+
+    @staticmethod
+    def identity(request: Request, policy: RateLimitPolicy) -> str:
+        if policy.scope == SCOPE_USER:
+            authorization = request.headers.get("authorization", "")
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                    subject = payload.get("sub") or payload.get("email")
+                    if subject:
+                        return f"user:{subject}"
+                except JWTError:
+                    pass
+        return f"ip:{client_ip(request)}"
+
+    @staticmethod
+    def _reject(policy: RateLimitPolicy, status_code: int, detail: str, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={
+                "Retry-After": str(max(math.ceil(retry_after), 1)),
+                "X-RateLimit-Limit": str(policy.limit),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+
+    @staticmethod
+    async def acquire(policy: RateLimitPolicy, identity: str) -> Tuple[Tuple[Any, str, str], ...]:
+        """
+        Take the policy's concurrency slots for ``identity`` and return them
+        for ``release``, or raise 429 (per client) / 503 (global).
+        """
+        held = []
+        caps = []
+        if policy.global_concurrency > 0:
+            caps.append((
+                f"{policy.name}:*", policy.global_concurrency,
+                status.HTTP_503_SERVICE_UNAVAILABLE, "This service is busy, please retry shortly",
+            ))
+        if policy.concurrency > 0:
+            caps.append((
+                f"{policy.name}:{identity}", policy.concurrency,
+                status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests in progress",
+            ))
+        for key, limit, status_code, detail in caps:
+            backend, holder = await RateLimiter._call("acquire", key, limit, RateLimiter.LEASE_SECONDS)
+            if holder is None:
+                await RateLimiter.release(tuple(held))
+                RateLimiter._count(policy, "concurrency_rejected")
+                raise RateLimiter._reject(policy, status_code, detail, 1)
+            held.append((backend, key, holder))
+        return tuple(held)
+
+    @staticmethod
+    async def release(held: Tuple[Tuple[Any, str, str], ...]) -> None:
+        # Each slot goes back to the backend that granted it.
+        for backend, key, holder in held:
+            if backend is RateLimiter._memory:
+                backend.release(key, holder)
+                continue
+            try:
+                await backend.release(key, holder)
+            except Exception as exc:
+                # The slot's lease reclaims it.
+                RateLimiter._record_backend_error("release", exc)
+
+    @staticmethod
+    async def check(policy: RateLimitPolicy, identity: str) -> int:
+        """Spend one token for ``identity``; return the tokens left or raise 429."""
+        if policy.limit <= 0:
+            return 0
+        _, (allowed, tokens, retry_after) = await RateLimiter._call(
+            "take", f"{policy.name}:{identity}", policy.limit, policy.refill_per_second
+        )
+        if not allowed:
+            RateLimiter._count(policy, "throttled")
+            raise RateLimiter._reject(
+                policy, status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", retry_after
+            )
+        return int(tokens)
+
+
+def rate_limited(policy: RateLimitPolicy):
+    """Route dependency enforcing ``policy``, for ``dependencies=[...]``."""
+
+    async def enforce(request: Request, response: Response):
+        if not RateLimiter.ENABLED:
+            yield
+            return
+
+        identity = RateLimiter.identity(request, policy)
+        held = await RateLimiter.acquire(policy, identity)
+        try:
+            remaining = await RateLimiter.check(policy, identity)
+        except HTTPException:
+            await RateLimiter.release(held)
+            raise
+        RateLimiter._count(policy, "allowed")
+        if policy.limit > 0:
+            response.headers["X-RateLimit-Limit"] = str(policy.limit)
+            response.headers["X-RateLimit-Remaining"] = str(remaining)
+        try:
+            yield
+        finally:
+            await RateLimiter.release(held)
+
+    return Depends(enforce)
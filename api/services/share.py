@@ -10,6 +10,7 @@ from fastapi import Request
 
 from core.config import settings
 from models import Post
+from services.image_derivatives import SOCIAL_VARIANT, ImageDerivativeService
 
 
 @dataclass(frozen=True)
@@ -242,7 +243,11 @@ class SharePageService:
             pure_path = PurePosixPath(trimmed)
             filename = pure_path.name
             folder = pure_path.parent.name or "posts"
-            return cls._build_api_image_url(filename, folder)
+            image_url = cls._build_api_image_url(filename, folder)
+            if ImageDerivativeService.can_derive(filename):
+                # Served as the exact IMAGE_WIDTH x IMAGE_HEIGHT crop.
+                image_url += f"&w={SOCIAL_VARIANT}"
+            return image_url
 
         default_image_url = getattr(settings, "DEFAULT_SHARE_IMAGE_URL", "") or ""
         if default_image_url:
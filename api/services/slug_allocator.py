@@ -0,0 +1,152 @@
+from typing import Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from utils.slug_generator import generate_random_slug, generate_slug
+
+
+class SlugAllocator:
+    """
+    Allocates unique slugs with one prefix query per title.
+
+    All existing slugs that share the candidate's prefix are fetched in a
+    single ``LIKE 'prefix%'`` query on the slug column alone (served from the
+    slug index), and the first free ``<base>``, ``<base>_2``, ``<base>_3``...
+    is picked locally. Allocation does not lock anything: two writers can
+    still pick the same slug, so inserts go through ``commit_with_retry``,
+    which relies on the unique constraint and re-allocates on conflict.
+    """
+
+    DEFAULT_MAX_LENGTH = 50
+    # Room kept at the end of a truncated base for a ``_<n>`` suffix.
+    SUFFIX_RESERVE = 6
+    MAX_ATTEMPTS = 3
+    BULK_PREFIX_BATCH = 100
+
+    @staticmethod
+    def _max_length(model, max_length: int) -> int:
+        column_length = getattr(model.__table__.c.slug.type, "length", None)
+        return min(max_length, column_length) if column_length else max_length
+
+    @staticmethod
+    def _base(title: str, max_length: int) -> str:
+        return generate_slug(title, max_length=max_length, add_random_suffix=False)
+
+    @staticmethod
+    def _prefix(base: str, max_length: int) -> str:
+        return base[:max(max_length - SlugAllocator.SUFFIX_RESERVE, 1)]
+
+    @staticmethod
+    def _pick(base: str, taken: Set[str], max_length: int) -> str:
+        if base not in taken:
+            return base
+        for number in range(2, len(taken) + 3):
+            suffix = f"_{number}"
+            candidate = f"{base[:max_length - len(suffix)].rstrip('_')}{suffix}"
+            if candidate not in taken:
+                return candidate
+        return generate_random_slug(length=min(max_length, 16))
+
+    @staticmethod
+    async def _taken(
+            session: AsyncSession,
+            model,
+            prefixes: Iterable[str],
+            exclude_id: Optional[int] = None
+    ) -> Set[str]:
+        taken: Set[str] = set()
+        prefixes = list(dict.fromkeys(prefixes))
+        for start in range(0, len(prefixes), SlugAllocator.BULK_PREFIX_BATCH):
+            batch = prefixes[start:start + SlugAllocator.BULK_PREFIX_BATCH]
+            query = select(model.slug).where(
+                or_(*(model.slug.startswith(prefix, autoescape=True) for prefix in batch))
+            )
+            if exclude_id is not None:
+                query = query.where(model.id != exclude_id)
+            result = await session.execute(query)
+            taken.update(result.scalars().all())
+        return taken
+
+    @staticmethod
+    async def allocate(
+            session: AsyncSession,
+            title: str,
+            model,
+            max_length: int = DEFAULT_MAX_LENGTH,
+            exclude_id: Optional[int] = None
+    ) -> str:
+        """
+        Return a slug for ``title`` that is free in ``model``'s table.
+        ``exclude_id`` ignores the row being renamed, so it can keep its slug.
+        """
+        max_length = SlugAllocator._max_length(model, max_length)
+        base = SlugAllocator._base(title, max_length)
+        taken = await SlugAllocator._taken(
+            session, model, [SlugAllocator._prefix(base, max_length)], exclude_id
+        )
+        return SlugAllocator._pick(base, taken, max_length)
+
+    @staticmethod
+    async def allocate_many(
+            session: AsyncSession,
+            titles: List[str],
+            model,
+            max_length: int = DEFAULT_MAX_LENGTH
+    ) -> List[str]:
+        """
+        Allocate one slug per title for bulk imports, in order. Existing slugs
+        for every title are fetched in batched prefix queries, and slugs
+        handed out earlier in the batch count as taken.
+        """
+        max_length = SlugAllocator._max_length(model, max_length)
+        bases = [SlugAllocator._base(title, max_length) for title in titles]
+        taken = await SlugAllocator._taken(
+            session, model, [SlugAllocator._prefix(base, max_length) for base in bases]
+        )
+        slugs = []
+        for base in bases:
+            slug = SlugAllocator._pick(base, taken, max_length)
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    @staticmethod
+    async def is_taken(session: AsyncSession, model, slug: str) -> bool:
+        result = await session.execute(select(model.id).where(model.slug == slug).limit(1))
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    async def commit_with_retry(
+            session: AsyncSession,
+            instance,
+            title: str,
+            regenerate: bool = True,
+            max_length: int = DEFAULT_MAX_LENGTH
+    ) -> None:
+        """
+        Add ``instance`` and commit, re-allocating its slug if another writer
+        took it first. With ``regenerate=False`` (a caller-chosen slug) a
+        conflict is reported as 400 instead. Other integrity errors propagate.
+        """
+        model = type(instance)
+        for attempt in range(SlugAllocator.MAX_ATTEMPTS):
+            session.add(instance)
+            try:
+                await session.commit()
+                return
+            except IntegrityError:
+                await session.rollback()
+                if not await SlugAllocator.is_taken(session, model, instance.slug):
+                    raise
+                if not regenerate:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"{model.__name__} with this slug already exists"
+                    )
+                if attempt == SlugAllocator.MAX_ATTEMPTS - 1:
+                    raise
+                instance.slug = await SlugAllocator.allocate(session, title, model, max_length)
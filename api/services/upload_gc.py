@@ -0,0 +1,308 @@
+import logging
+import os
+import shutil
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models import Post, Profile
+from models.user import Media
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+
+logger = logging.getLogger(__name__)
+
+
+class UploadReferences:
+    """Every stored path the database points at, split the way files are named."""
+
+    def __init__(self):
+        self.blobs: Set[str] = set()
+        # Legacy files are matched by name alone: rows have stored them as
+        # relative, absolute and "uploads/images/" aliased paths over time,
+        # and their uuid names do not collide across folders.
+        self.legacy_names: Set[str] = set()
+
+    def add(self, path: str) -> None:
+        blob = MediaStore.blob_filename(path)
+        if blob is not None:
+            self.blobs.add(blob)
+        else:
+            self.legacy_names.add(PurePosixPath(path.replace("\\", "/")).name)
+
+    def is_referenced(self, label: str, name: str) -> bool:
+        return name in (self.blobs if label == UploadGarbageCollector.BLOB_LABEL else self.legacy_names)
+
+    def __len__(self) -> int:
+        return len(self.blobs) + len(self.legacy_names)
+
+
+class UploadGarbageCollector:
+    """
+    Removes upload files that no row references, in two steps.
+
+    A run loads every referenced path from ``Post.featured_image``,
+    ``Media.file_path`` and ``Profile.avatar`` into sets, then walks the
+    legacy upload folders and the blob store with ``os.scandir`` in batches.
+    Unreferenced files older than the grace period are moved into
+    ``uploads/.quarantine/<root>/`` (404 to readers, but recoverable); a
+    later run deletes them once they have sat there for the quarantine
+    period, or moves them back if a row references them again by then.
+
+    Regenerable leftovers are deleted directly: derivatives of blobs that no
+    longer exist and staged uploads abandoned in ``incoming/``.
+    """
+
+    UPLOADS_ROOT = Path("uploads")
+    LEGACY_FOLDERS = ("posts", "media", "avatars")
+    BLOB_LABEL = "blobs"
+    QUARANTINE_DIRNAME = ".quarantine"
+    GRACE_SECONDS = settings.UPLOAD_GC_GRACE_SECONDS
+    QUARANTINE_SECONDS = settings.UPLOAD_GC_QUARANTINE_SECONDS
+    SAMPLE_LIMIT = 50
+
+    @staticmethod
+    def _roots() -> Dict[str, Path]:
+        roots = {
+            folder: UploadGarbageCollector.UPLOADS_ROOT / folder
+            for folder in UploadGarbageCollector.LEGACY_FOLDERS
+        }
+        roots[UploadGarbageCollector.BLOB_LABEL] = MediaStore.ROOT
+        return roots
+
+    @staticmethod
+    def _quarantine_root() -> Path:
+        return UploadGarbageCollector.UPLOADS_ROOT / UploadGarbageCollector.QUARANTINE_DIRNAME
+
+    @staticmethod
+    async def load_references(session: AsyncSession, batch_size: int) -> UploadReferences:
+        references = UploadReferences()
+        for column in (Post.featured_image, Media.file_path, Profile.avatar):
+            model = column.class_
+            last_id = 0
+            while True:
+                rows = (
+                    await session.execute(
+                        select(model.id, column)
+                        .where(model.id > last_id, column.is_not(None))
+                        .order_by(model.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+                for _, path in rows:
+                    if path:
+                        references.add(path)
+                last_id = rows[-1][0]
+        return references
+
+    @staticmethod
+    def scan(root: Path, batch_size: int, skip_dirs: Set[str] = frozenset()) -> Iterator[List[os.DirEntry]]:
+        """Yield regular files under ``root`` in batches; ``skip_dirs`` are top-level names."""
+        stack = [str(root)]
+        batch: List[os.DirEntry] = []
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (directory == str(root) and entry.name in skip_dirs):
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            batch.append(entry)
+                            if len(batch) >= batch_size:
+                                yield batch
+                                batch = []
+            except FileNotFoundError:
+                continue
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _new_report(dry_run: bool) -> Dict[str, Any]:
+        return {
+            "dry_run": dry_run,
+            "references": 0,
+            "scanned_files": 0,
+            "scanned_bytes": 0,
+            "skipped_recent": 0,
+            "orphans": 0,
+            "orphan_bytes": 0,
+            "quarantined": 0,
+            "restored": 0,
+            "pending_in_quarantine": 0,
+            "deleted": 0,
+            "deleted_bytes": 0,
+            "derived_removed": 0,
+            "staged_removed": 0,
+            "errors": 0,
+            "orphan_samples": [],
+            "elapsed_seconds": 0.0,
+            "files_per_second": 0.0,
+        }
+
+    @staticmethod
+    def _move(source: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), str(target))
+        ImageServer.invalidate(source)
+        ImageServer.invalidate(target)
+
+    @staticmethod
+    def _process_quarantine(
+            references: UploadReferences,
+            report: Dict[str, Any],
+            batch_size: int,
+            quarantine_seconds: int,
+            dry_run: bool,
+            now: float
+    ) -> None:
+        quarantine_root = UploadGarbageCollector._quarantine_root()
+        for label, root in UploadGarbageCollector._roots().items():
+            label_root = quarantine_root / label
+            for batch in UploadGarbageCollector.scan(label_root, batch_size):
+                for entry in batch:
+                    path = Path(entry.path)
+                    try:
+                        stat_result = entry.stat(follow_symlinks=False)
+                        if references.is_referenced(label, entry.name):
+                            report["restored"] += 1
+                            if not dry_run:
+                                UploadGarbageCollector._move(path, root / path.relative_to(label_root))
+                        elif now - stat_result.st_mtime >= quarantine_seconds:
+                            report["deleted"] += 1
+                            report["deleted_bytes"] += stat_result.st_size
+                            if not dry_run:
+                                path.unlink()
+                        else:
+                            report["pending_in_quarantine"] += 1
+                    except OSError as exc:
+                        report["errors"] += 1
+                        logger.warning("Upload GC could not process %s: %s", path, exc)
+
+    @staticmethod
+    async def _sweep_root(
+            session: AsyncSession,
+            label: str,
+            root: Path,
+            references: UploadReferences,
+            report: Dict[str, Any],
+            batch_size: int,
+            grace_seconds: int,
+            dry_run: bool,
+            now: float
+    ) -> None:
+        is_blob_root = label == UploadGarbageCollector.BLOB_LABEL
+        skip_dirs = {"incoming", "derived"} if is_blob_root else set()
+        if is_blob_root:
+            grace_seconds = max(grace_seconds, MediaStore.REUSE_GRACE_SECONDS)
+        quarantine_root = UploadGarbageCollector._quarantine_root() / label
+
+        for batch in UploadGarbageCollector.scan(root, batch_size, skip_dirs):
+            for entry in batch:
+                path = Path(entry.path)
+                try:
+                    stat_result = entry.stat(follow_symlinks=False)
+                    report["scanned_files"] += 1
+                    report["scanned_bytes"] += stat_result.st_size
+                    if is_blob_root and MediaStore.blob_filename(entry.name) is None:
+                        continue
+                    if references.is_referenced(label, entry.name):
+                        continue
+                    if now - stat_result.st_mtime < grace_seconds:
+                        report["skipped_recent"] += 1
+                        continue
+                    # Referenced by a row written since the references were loaded.
+                    if is_blob_root and await MediaStore.reference_count(session, entry.name) > 0:
+                        continue
+
+                    report["orphans"] += 1
+                    report["orphan_bytes"] += stat_result.st_size
+                    if len(report["orphan_samples"]) < UploadGarbageCollector.SAMPLE_LIMIT:
+                        report["orphan_samples"].append(str(path))
+                    if not dry_run:
+                        target = quarantine_root / path.relative_to(root)
+                        UploadGarbageCollector._move(path, target)
+                        # The quarantine clock starts now, not at the upload.
+                        os.utime(target)
+                        report["quarantined"] += 1
+                except OSError as exc:
+                    report["errors"] += 1
+                    logger.warning("Upload GC could not process %s: %s", path, exc)
+            logger.info(
+                "Upload GC %s: %d files scanned, %d orphans so far",
+                label,
+                report["scanned_files"],
+                report["orphans"],
+            )
+
+    @staticmethod
+    def _sweep_leftovers(
+            report: Dict[str, Any],
+            batch_size: int,
+            grace_seconds: int,
+            dry_run: bool,
+            now: float
+    ) -> None:
+        for batch in UploadGarbageCollector.scan(MediaStore.ROOT / "incoming", batch_size):
+            for entry in batch:
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime >= grace_seconds:
+                        report["staged_removed"] += 1
+                        if not dry_run:
+                            os.remove(entry.path)
+                except OSError as exc:
+                    report["errors"] += 1
+                    logger.warning("Upload GC could not remove staged %s: %s", entry.path, exc)
+
+        # derived/<aa>/<bb>/<sha256>/
+        for derived_dir in (MediaStore.ROOT / "derived").glob("*/*/*"):
+            if derived_dir.is_dir() and MediaStore.find_blob(derived_dir.name) is None:
+                report["derived_removed"] += 1
+                if not dry_run:
+                    shutil.rmtree(derived_dir, ignore_errors=True)
+                    ImageServer.invalidate(derived_dir)
+
+    @staticmethod
+    async def collect(
+            session: AsyncSession,
+            batch_size: int = 500,
+            dry_run: bool = False,
+            grace_seconds: Optional[int] = None,
+            quarantine_seconds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one collection pass and return its report. With ``dry_run`` the
+        report says what would be moved or deleted and nothing is touched.
+        """
+        grace_seconds = UploadGarbageCollector.GRACE_SECONDS if grace_seconds is None else grace_seconds
+        quarantine_seconds = (
+            UploadGarbageCollector.QUARANTINE_SECONDS if quarantine_seconds is None else quarantine_seconds
+        )
+        started = time.perf_counter()
+        now = time.time()
+        report = UploadGarbageCollector._new_report(dry_run)
+
+        references = await UploadGarbageCollector.load_references(session, batch_size)
+        report["references"] = len(references)
+
+        # Quarantine first, so files moved there in this run keep their full period.
+        UploadGarbageCollector._process_quarantine(
+            references, report, batch_size, quarantine_seconds, dry_run, now
+        )
+        for label, root in UploadGarbageCollector._roots().items():
+            await UploadGarbageCollector._sweep_root(
+                session, label, root, references, report, batch_size, grace_seconds, dry_run, now
+            )
+        UploadGarbageCollector._sweep_leftovers(report, batch_size, grace_seconds, dry_run, now)
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["files_per_second"] = round(report["scanned_files"] / elapsed, 1) if elapsed > 0 else 0.0
+        return report
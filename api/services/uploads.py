@@ -0,0 +1,103 @@
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Union
+
+import aiofiles
+from fastapi import HTTPException, UploadFile, status
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_POST_IMAGE = "post_image"
+UPLOAD_MEDIA = "media"
+UPLOAD_AVATAR = "avatar"
+
+
+class StoredUpload:
+    """A file that has been written to its final location."""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+
+class UploadPipeline:
+    """
+    Streams an upload to disk in fixed-size chunks.
+
+    Each chunk is size-checked and fed to a SHA-256 before it is written to a
+    temporary file next to the destination; only a complete upload is renamed
+    into place, so readers never see a partial file and a rejected upload
+    leaves nothing behind. Memory use is bounded by ``CHUNK_SIZE`` regardless
+    of the upload's size.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    LIMITS: Dict[str, int] = {
+        UPLOAD_POST_IMAGE: settings.UPLOAD_MAX_POST_IMAGE_BYTES,
+        UPLOAD_MEDIA: settings.UPLOAD_MAX_MEDIA_BYTES,
+        UPLOAD_AVATAR: settings.UPLOAD_MAX_AVATAR_BYTES,
+    }
+
+    @staticmethod
+    def _too_large(limit: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {limit / (1024 * 1024):.1f}MB"
+        )
+
+    @staticmethod
+    async def save(
+            file: UploadFile,
+            category: str,
+            upload_dir: Union[str, Path],
+            extension: str
+    ) -> StoredUpload:
+        """
+        Write ``file`` under ``upload_dir`` with a fresh name ending in
+        ``extension``. Raises 413 once the category's limit is exceeded and
+        400 for an empty file.
+        """
+        limit = UploadPipeline.LIMITS[category]
+        # Reject early when the client declared the size.
+        if file.size is not None and file.size > limit:
+            raise UploadPipeline._too_large(limit)
+
+        upload_dir = Path(upload_dir)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = upload_dir / f".{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            async with aiofiles.open(temp_path, "wb") as out_file:
+                while True:
+                    chunk = await file.read(UploadPipeline.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > limit:
+                        raise UploadPipeline._too_large(limit)
+                    digest.update(chunk)
+                    await out_file.write(chunk)
+
+            if size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File is empty"
+                )
+
+            final_path = upload_dir / f"{uuid.uuid4()}{extension}"
+            os.replace(temp_path, final_path)
+            return StoredUpload(final_path.as_posix(), size, digest.hexdigest())
+        finally:
+            if temp_path.exists():
+                try:
+                    temp_path.unlink()
+                except OSError as exc:
+                    logger.warning("Failed to remove partial upload %s: %s", temp_path, exc)
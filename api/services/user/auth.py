@@ -15,8 +15,10 @@ from sqlmodel import select
 from models import User
 from models.user import PasswordResetToken
 from schemas.user import TokenData
-from database.connection import get_db_session
+from database.connection import get_background_db_session, get_db_session
 from core.config import settings
+from services.user.auth_cache import AuthUserCache
+from services.user.password_hashing import PasswordHashPool
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -31,6 +33,16 @@ class AuthService:
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
 
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Verify on the password hashing pool instead of the event loop."""
+        return await PasswordHashPool.run(pwd_context.verify, plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """Hash on the password hashing pool instead of the event loop."""
+        return await PasswordHashPool.run(pwd_context.hash, password)
+
     @staticmethod
     def generate_password_reset_token() -> str:
         return secrets.token_urlsafe(32)
@@ -85,7 +97,7 @@ class AuthService:
         user = await AuthService.get_user_by_email(session, email)
         if not user:
             return None
-        if not AuthService.verify_password(password, user.password):
+        if not await AuthService.verify_password_async(password, user.password):
             return None
         return user
 
@@ -111,7 +123,7 @@ class AuthService:
                 email=email,
                 username=username,
                 full_name=full_name,
-                password=AuthService.get_password_hash(secrets.token_urlsafe(32)),
+                password=await AuthService.get_password_hash_async(secrets.token_urlsafe(32)),
                 provider=provider,
                 is_verified=True
             )
@@ -129,6 +141,7 @@ class AuthService:
                 user.full_name = name
             user.last_login = datetime.now(timezone.utc).replace(tzinfo=None)
             await session.commit()
+            await AuthUserCache.invalidate(user.uuid)
             await session.refresh(user)
 
         token = AuthService._issue_jwt(user)
@@ -150,10 +163,7 @@ class AuthService:
         }
         return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_db_session)
-) -> User:
+async def _resolve_current_user(credentials: HTTPAuthorizationCredentials, session: AsyncSession) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -166,21 +176,47 @@ async def get_current_user(
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
+        subject = payload.get("sub")
     except JWTError:
         raise credentials_exception
 
+    user = await AuthUserCache.get(session, subject, token_data.email)
+    if user is not None:
+        return user
+
     user = await AuthService.get_user_by_email(session, email=token_data.email)
     if user is None:
         raise credentials_exception
 
+    if subject and str(user.uuid) == subject:
+        await AuthUserCache.set(user)
     return user
 
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_db_session)
+) -> User:
+    return await _resolve_current_user(credentials, session)
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
+async def get_current_active_background_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_background_db_session)
+) -> User:
+    """
+    ``get_current_active_user`` resolved on the background pool's session,
+    for long-running endpoints: it would otherwise keep an interactive
+    connection checked out until the response is sent.
+    """
+    return await get_current_active_user(await _resolve_current_user(credentials, session))
+
+
 async def get_current_admin_or_moderator(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum as PyEnum
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime, Enum, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.config import settings
+from models import User
+
+logger = logging.getLogger(__name__)
+
+
+class AuthUserCache:
+    """
+    Bounded TTL cache of authenticated user snapshots keyed by the JWT subject
+    (the user's uuid).
+
+    A snapshot holds the user's column values, never the password hash. On a
+    hit the user is rebuilt and attached to the request session with
+    ``merge(load=False)``, so no query is issued and the object behaves like a
+    freshly loaded row. Callers that need the password hash refresh it.
+
+    When ``REDIS_URL`` is set and reachable, snapshots live in Redis so that an
+    invalidation is seen by every worker; otherwise a process-local LRU is used.
+    Redis is reached through the asyncio client, so a slow Redis never blocks
+    the event loop.
+    Account changes that affect authentication or authorization (role,
+    activation, password, profile fields, deletion) must call ``invalidate``
+    after committing.
+    """
+
+    TTL_SECONDS = settings.AUTH_USER_CACHE_TTL_SECONDS
+    MAX_ENTRIES = settings.AUTH_USER_CACHE_MAX_ENTRIES
+    REDIS_PREFIX = "auth_user"
+    EXCLUDED_COLUMNS = frozenset({"password"})
+
+    _entries: "OrderedDict[str, tuple]" = OrderedDict()
+    _redis_client = None
+    _redis_checked = False
+
+    @staticmethod
+    def reset() -> None:
+        AuthUserCache._entries = OrderedDict()
+
+    @staticmethod
+    async def _get_redis_client():
+        if AuthUserCache._redis_checked:
+            return AuthUserCache._redis_client
+
+        AuthUserCache._redis_checked = True
+        redis_url = os.getenv("REDIS_URL") or os.getenv("REDIS_CACHE_URL")
+        if not redis_url:
+            return None
+
+        try:
+            import redis.asyncio as redis_asyncio  # type: ignore
+
+            client = redis_asyncio.Redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_connect_timeout=0.2,
+                socket_timeout=0.2,
+            )
+            await client.ping()
+            AuthUserCache._redis_client = client
+            logger.info("Auth user cache using Redis backend")
+        except Exception as exc:
+            AuthUserCache._redis_client = None
+            logger.warning(
+                "Auth user cache Redis unavailable; falling back to in-memory cache: %s",
+                exc,
+            )
+        return AuthUserCache._redis_client
+
+    @staticmethod
+    def _columns():
+        return [
+            column_attr
+            for column_attr in inspect(User).column_attrs
+            if column_attr.key not in AuthUserCache.EXCLUDED_COLUMNS
+        ]
+
+    @staticmethod
+    def _snapshot(user: User) -> Dict[str, Any]:
+        state = inspect(user)
+        return {
+            column_attr.key: state.dict[column_attr.key]
+            for column_attr in AuthUserCache._columns()
+            if column_attr.key in state.dict
+        }
+
+    @staticmethod
+    def _encode(snapshot: Dict[str, Any]) -> str:
+        def default(value):
+            if isinstance(value, datetime):
+                return value.isoformat()
+            if isinstance(value, PyEnum):
+                return value.value
+            raise TypeError(f"Unsupported snapshot value: {value!r}")
+
+        return json.dumps(snapshot, default=default)
+
+    @staticmethod
+    def _decode(raw: str) -> Dict[str, Any]:
+        data = json.loads(raw)
+        for column_attr in AuthUserCache._columns():
+            value = data.get(column_attr.key)
+            if value is None:
+                continue
+            column_type = column_attr.columns[0].type
+            if isinstance(column_type, DateTime):
+                data[column_attr.key] = datetime.fromisoformat(value)
+            elif isinstance(column_type, Enum) and column_type.enum_class is not None:
+                data[column_attr.key] = column_type.enum_class(value)
+        return data
+
+    @staticmethod
+    async def _read(subject: str) -> Optional[Dict[str, Any]]:
+        redis_client = await AuthUserCache._get_redis_client()
+        if redis_client is not None:
+            try:
+                raw = await redis_client.get(f"{AuthUserCache.REDIS_PREFIX}:{subject}")
+                return AuthUserCache._decode(raw) if raw else None
+            except Exception as exc:
+                logger.warning("Auth user cache Redis read failed: %s", exc)
+                return None
+
+        cached = AuthUserCache._entries.get(subject)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= AuthUserCache.TTL_SECONDS:
+            AuthUserCache._entries.pop(subject, None)
+            return None
+        AuthUserCache._entries.move_to_end(subject)
+        return cached[1]
+
+    @staticmethod
+    async def get(session: AsyncSession, subject: str, email: str) -> Optional[User]:
+        """
+        Return the cached user for ``subject`` attached to ``session``, or None on
+        a miss. A snapshot whose email no longer matches the token is ignored.
+        """
+        if AuthUserCache.TTL_SECONDS <= 0 or not subject:
+            return None
+        snapshot = await AuthUserCache._read(subject)
+        if snapshot is None or snapshot.get("email") != email:
+            return None
+
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    @staticmethod
+    async def set(user: User) -> None:
+        if AuthUserCache.TTL_SECONDS <= 0 or user.uuid is None:
+            return
+        snapshot = AuthUserCache._snapshot(user)
+
+        redis_client = await AuthUserCache._get_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    f"{AuthUserCache.REDIS_PREFIX}:{user.uuid}",
+                    AuthUserCache._encode(snapshot),
+                    ex=AuthUserCache.TTL_SECONDS,
+                )
+            except Exception as exc:
+                logger.warning("Auth user cache Redis write failed: %s", exc)
+            return
+
+        AuthUserCache._entries[user.uuid] = (time.monotonic(), snapshot)
+        AuthUserCache._entries.move_to_end(user.uuid)
+        while len(AuthUserCache._entries) > AuthUserCache.MAX_ENTRIES:
+            AuthUserCache._entries.popitem(last=False)
+
+    @staticmethod
+    async def invalidate(user_uuid: Optional[str]) -> None:
+        if not user_uuid:
+            return
+        AuthUserCache._entries.pop(user_uuid, None)
+
+        redis_client = await AuthUserCache._get_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.delete(f"{AuthUserCache.REDIS_PREFIX}:{user_uuid}")
+            except Exception as exc:
+                logger.warning("Auth user cache Redis invalidation failed: %s", exc)
@@ -0,0 +1,635 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+
+from sqlalchemy import and_, delete, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from database.connection import ENGINE_BACKGROUND, get_sessionmaker
+from models import Comment, CommentReport, Notification, Post, Report, User, UserDeletionJob
+from models.ai_draft import AIDraft, AIGenerationLog, BlogGenerationJob
+from models.base import comment_likes, post_bookmarks, post_likes, post_tags, user_follows
+from models.collection import Highlight, ReadingHistory, ReadingList, ReadingListItem
+from models.user import (
+    EmailVerificationToken,
+    Media,
+    PasswordResetToken,
+    Profile,
+    UserRoleChange,
+    UserSuggestion,
+)
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+from services.post.taxonomy import TaxonomyService
+from services.user.auth_cache import AuthUserCache
+from services.user.follow_graph import FollowGraphCache
+from services.user.stats import UserStatsService
+
+logger = logging.getLogger(__name__)
+API_ROOT = Path(__file__).resolve().parents[2]
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+FILE_CLEANUP_STEP = "files"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _post_ids(user_id: int):
+    return select(Post.id).where(Post.author_id == user_id)
+
+
+def _comment_ids(user_id: int):
+    return select(Comment.id).where(
+        or_(Comment.author_id == user_id, Comment.post_id.in_(_post_ids(user_id)))
+    )
+
+
+async def _delete_rows(
+        session: AsyncSession,
+        model,
+        condition,
+        limit: int,
+        path_column=None,
+        paths: Optional[List[str]] = None
+) -> int:
+    """Delete up to ``limit`` rows matching ``condition`` by primary key."""
+    columns = [model.id] if path_column is None else [model.id, path_column]
+    rows = (
+        await session.execute(select(*columns).where(condition).order_by(model.id).limit(limit))
+    ).all()
+    if not rows:
+        return 0
+    if path_column is not None and paths is not None:
+        paths.extend(row[1] for row in rows if row[1])
+    await session.execute(delete(model).where(model.id.in_([row[0] for row in rows])))
+    return len(rows)
+
+
+async def _delete_links(session: AsyncSession, table, condition, limit: int) -> int:
+    """Delete up to ``limit`` rows of an association table by composite key."""
+    keys = list(table.primary_key.columns)
+    rows = (await session.execute(select(*keys).where(condition).limit(limit))).all()
+    if not rows:
+        return 0
+    await session.execute(
+        delete(table).where(tuple_(*keys).in_([tuple(row) for row in rows]))
+    )
+    return len(rows)
+
+
+async def _update_rows(session: AsyncSession, model, condition, values: Dict[str, Any], limit: int) -> int:
+    """Update up to ``limit`` rows; ``values`` must make them stop matching ``condition``."""
+    ids = list(
+        (await session.execute(select(model.id).where(condition).order_by(model.id).limit(limit))).scalars()
+    )
+    if not ids:
+        return 0
+    await session.execute(update(model).where(model.id.in_(ids)).values(**values))
+    return len(ids)
+
+
+async def _drop_follows(session: AsyncSession, user_id: int, limit: int, outgoing: bool) -> Dict[str, int]:
+    # Counter adjustment and row deletion share a batch, so a crash between
+    # batches never decrements a counter twice.
+    own, other = (
+        (user_follows.c.follower_id, user_follows.c.followed_id)
+        if outgoing
+        else (user_follows.c.followed_id, user_follows.c.follower_id)
+    )
+    counter = User.follower_count if outgoing else User.following_count
+    other_ids = list((await session.execute(select(other).where(own == user_id).limit(limit))).scalars())
+    if not other_ids:
+        return {}
+    adjusted = await session.execute(
+        update(User)
+        .where(User.id.in_(other_ids), counter > 0)
+        .values({counter: counter - 1})
+    )
+    await session.execute(delete(user_follows).where(own == user_id, other.in_(other_ids)))
+    counter_key = "follower_counts_adjusted" if outgoing else "following_counts_adjusted"
+    return {counter_key: max(adjusted.rowcount or 0, 0), "user_follows": len(other_ids)}
+
+
+async def _delete_comments(session: AsyncSession, user_id: int, limit: int) -> int:
+    ids = list(
+        (
+            await session.execute(
+                select(Comment.id)
+                .where(or_(Comment.author_id == user_id, Comment.post_id.in_(_post_ids(user_id))))
+                .order_by(Comment.id)
+                .limit(limit)
+            )
+        ).scalars()
+    )
+    if not ids:
+        return 0
+    # Replies in a later batch must not point at rows deleted in this one.
+    await session.execute(update(Comment).where(Comment.parent_id.in_(ids)).values(parent_id=None))
+    await session.execute(delete(Comment).where(Comment.id.in_(ids)))
+    return len(ids)
+
+
+async def _delete_posts(session: AsyncSession, user_id: int, limit: int, paths: List[str]) -> Dict[str, int]:
+    rows = (
+        await session.execute(
+            select(Post.id, Post.featured_image)
+            .where(Post.author_id == user_id)
+            .order_by(Post.id)
+            .limit(limit)
+        )
+    ).all()
+    if not rows:
+        return {}
+    ids = [row[0] for row in rows]
+    paths.extend(row[1] for row in rows if row[1])
+
+    # Likes, comments and reports written after the earlier steps ran would
+    # otherwise block the delete, so each batch takes its dependents along.
+    comment_ids = select(Comment.id).where(Comment.post_id.in_(ids))
+    dependents = [
+        ("comment_reports", delete(CommentReport).where(CommentReport.comment_id.in_(comment_ids))),
+        ("comment_likes", delete(comment_likes).where(comment_likes.c.comment_id.in_(comment_ids))),
+        (
+            "notifications",
+            delete(Notification).where(
+                or_(Notification.post_id.in_(ids), Notification.comment_id.in_(comment_ids))
+            ),
+        ),
+        ("reports", delete(Report).where(Report.post_id.in_(ids))),
+        ("post_likes", delete(post_likes).where(post_likes.c.post_id.in_(ids))),
+        ("post_bookmarks", delete(post_bookmarks).where(post_bookmarks.c.post_id.in_(ids))),
+        ("post_tags", delete(post_tags).where(post_tags.c.post_id.in_(ids))),
+        ("reading_list_items", delete(ReadingListItem).where(ReadingListItem.post_id.in_(ids))),
+        ("reading_history", delete(ReadingHistory).where(ReadingHistory.post_id.in_(ids))),
+        ("highlights", delete(Highlight).where(Highlight.post_id.in_(ids))),
+    ]
+    counts: Dict[str, int] = {}
+    for name, statement in dependents:
+        deleted = (await session.execute(statement)).rowcount or 0
+        if deleted > 0:
+            counts[name] = deleted
+    await session.execute(update(Comment).where(Comment.post_id.in_(ids)).values(parent_id=None))
+    deleted = (await session.execute(delete(Comment).where(Comment.post_id.in_(ids)))).rowcount or 0
+    if deleted > 0:
+        counts["comments"] = deleted
+    await session.execute(delete(Post).where(Post.id.in_(ids)))
+    counts["posts"] = len(ids)
+    return counts
+
+
+StepRunner = Callable[[AsyncSession, int, int, List[str]], Awaitable[Dict[str, int]]]
+
+
+class DeletionStep(NamedTuple):
+    name: str
+    run: StepRunner
+
+
+def _rows_step(name: str, model, condition_for, path_column=None) -> DeletionStep:
+    async def run(session: AsyncSession, user_id: int, limit: int, paths: List[str]) -> Dict[str, int]:
+        count = await _delete_rows(session, model, condition_for(user_id), limit, path_column, paths)
+        return {name: count}
+    return DeletionStep(name, run)
+
+
+def _links_step(name: str, table, condition_for) -> DeletionStep:
+    async def run(session: AsyncSession, user_id: int, limit: int, paths: List[str]) -> Dict[str, int]:
+        return {name: await _delete_links(session, table, condition_for(user_id), limit)}
+    return DeletionStep(name, run)
+
+
+def _update_step(name: str, model, condition_for, values: Dict[str, Any]) -> DeletionStep:
+    async def run(session: AsyncSession, user_id: int, limit: int, paths: List[str]) -> Dict[str, int]:
+        return {name: await _update_rows(session, model, condition_for(user_id), values, limit)}
+    return DeletionStep(name, run)
+
+
+async def _run_outgoing_follows(session, user_id, limit, paths):
+    return await _drop_follows(session, user_id, limit, outgoing=True)
+
+
+async def _run_incoming_follows(session, user_id, limit, paths):
+    return await _drop_follows(session, user_id, limit, outgoing=False)
+
+
+async def _run_comments(session, user_id, limit, paths):
+    return {"comments": await _delete_comments(session, user_id, limit)}
+
+
+async def _run_posts(session, user_id, limit, paths):
+    return await _delete_posts(session, user_id, limit, paths)
+
+
+# Dependents before the rows they reference. Jobs persist their position as
+# an index into this list, so do not reorder steps while jobs are unfinished.
+DELETION_STEPS: List[DeletionStep] = [
+    _update_step(
+        "notifications_sender_nullified",
+        Notification,
+        lambda uid: Notification.sender_id == uid,
+        {"sender_id": None},
+    ),
+    _update_step(
+        "comment_children_reparented",
+        Comment,
+        lambda uid: Comment.parent_id.in_(select(Comment.id).where(Comment.author_id == uid)),
+        {"parent_id": None},
+    ),
+    _rows_step(
+        "comment_reports",
+        CommentReport,
+        lambda uid: or_(CommentReport.user_id == uid, CommentReport.comment_id.in_(_comment_ids(uid))),
+    ),
+    _links_step(
+        "comment_likes",
+        comment_likes,
+        lambda uid: or_(comment_likes.c.user_id == uid, comment_likes.c.comment_id.in_(_comment_ids(uid))),
+    ),
+    _rows_step(
+        "notifications",
+        Notification,
+        lambda uid: or_(
+            Notification.recipient_id == uid,
+            Notification.post_id.in_(_post_ids(uid)),
+            Notification.comment_id.in_(_comment_ids(uid)),
+        ),
+    ),
+    _rows_step(
+        "reports",
+        Report,
+        lambda uid: or_(Report.user_id == uid, Report.post_id.in_(_post_ids(uid))),
+    ),
+    _links_step(
+        "post_likes",
+        post_likes,
+        lambda uid: or_(post_likes.c.user_id == uid, post_likes.c.post_id.in_(_post_ids(uid))),
+    ),
+    _links_step(
+        "post_bookmarks",
+        post_bookmarks,
+        lambda uid: or_(post_bookmarks.c.user_id == uid, post_bookmarks.c.post_id.in_(_post_ids(uid))),
+    ),
+    _links_step("post_tags", post_tags, lambda uid: post_tags.c.post_id.in_(_post_ids(uid))),
+    _rows_step(
+        "reading_list_items",
+        ReadingListItem,
+        lambda uid: or_(
+            ReadingListItem.list_id.in_(select(ReadingList.id).where(ReadingList.user_id == uid)),
+            ReadingListItem.post_id.in_(_post_ids(uid)),
+        ),
+    ),
+    _rows_step(
+        "reading_history",
+        ReadingHistory,
+        lambda uid: or_(ReadingHistory.user_id == uid, ReadingHistory.post_id.in_(_post_ids(uid))),
+    ),
+    _rows_step(
+        "highlights",
+        Highlight,
+        lambda uid: or_(Highlight.user_id == uid, Highlight.post_id.in_(_post_ids(uid))),
+    ),
+    _rows_step("password_reset_tokens", PasswordResetToken, lambda uid: PasswordResetToken.user_id == uid),
+    _rows_step(
+        "email_verification_tokens",
+        EmailVerificationToken,
+        lambda uid: EmailVerificationToken.user_id == uid,
+    ),
+    _rows_step("ai_generation_logs", AIGenerationLog, lambda uid: AIGenerationLog.user_id == uid),
+    _rows_step("ai_drafts", AIDraft, lambda uid: AIDraft.user_id == uid),
+    _rows_step("blog_generation_jobs", BlogGenerationJob, lambda uid: BlogGenerationJob.user_id == uid),
+    _rows_step("media", Media, lambda uid: Media.user_id == uid, path_column=Media.file_path),
+    DeletionStep("following", _run_outgoing_follows),
+    DeletionStep("followers", _run_incoming_follows),
+    _rows_step(
+        "user_suggestions",
+        UserSuggestion,
+        lambda uid: or_(UserSuggestion.user_id == uid, UserSuggestion.suggested_user_id == uid),
+    ),
+    _rows_step(
+        "user_role_changes",
+        UserRoleChange,
+        lambda uid: or_(UserRoleChange.user_id == uid, UserRoleChange.changed_by_id == uid),
+    ),
+    DeletionStep("comments", _run_comments),
+    DeletionStep("posts", _run_posts),
+    _rows_step("reading_lists", ReadingList, lambda uid: ReadingList.user_id == uid),
+    _rows_step("profiles", Profile, lambda uid: Profile.user_id == uid, path_column=Profile.avatar),
+    _rows_step("users", User, lambda uid: User.id == uid),
+]
+
+
+def _legacy_path(raw_path: str) -> Path:
+    candidate = Path(raw_path)
+    return candidate if candidate.is_absolute() else API_ROOT / candidate
+
+
+def _remove_file(raw_path: str) -> bool:
+    resolved = _legacy_path(raw_path)
+    try:
+        if resolved.exists():
+            os.remove(resolved)
+    except OSError:
+        return False
+    return True
+
+
+class UserDeletionJobService:
+    """
+    Permanent account deletion as a resumable background job.
+
+    The request only records a ``UserDeletionJob`` and deactivates the
+    account; a task on the background pool then works through
+    ``DELETION_STEPS`` in bounded batches. Each batch selects at most
+    ``BATCH_SIZE`` keys, deletes (or updates) exactly those rows and commits
+    together with the job's progress, so no lock is held for longer than one
+    batch and a restarted job continues from its last committed step.
+
+    A running job refreshes ``heartbeat_at`` on every batch; jobs left
+    ``running`` by a crashed worker are taken over once the heartbeat is
+    older than ``LEASE_SECONDS``, at startup via ``resume_pending`` or when
+    the deletion is requested again. Files of the deleted rows are removed at
+    the end, legacy files concurrently in a small thread pool.
+    """
+
+    BATCH_SIZE = max(settings.USER_DELETION_BATCH_SIZE, 1)
+    FILE_WORKERS = max(settings.USER_DELETION_FILE_WORKERS, 1)
+    LEASE_SECONDS = settings.USER_DELETION_LEASE_SECONDS
+    # Overridden in tests; defaults to the background pool.
+    SESSION_FACTORY: Optional[async_sessionmaker] = None
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _tasks: Set["asyncio.Task[None]"] = set()
+
+    @staticmethod
+    def _sessionmaker() -> async_sessionmaker:
+        return UserDeletionJobService.SESSION_FACTORY or get_sessionmaker(ENGINE_BACKGROUND)
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        if UserDeletionJobService._executor is None:
+            UserDeletionJobService._executor = ThreadPoolExecutor(
+                max_workers=UserDeletionJobService.FILE_WORKERS,
+                thread_name_prefix="user-deletion-files",
+            )
+        return UserDeletionJobService._executor
+
+    @staticmethod
+    async def shutdown() -> None:
+        """Stop running jobs (they resume on the next start) and the file pool."""
+        tasks = list(UserDeletionJobService._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        executor = UserDeletionJobService._executor
+        UserDeletionJobService._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    async def wait_for_jobs() -> None:
+        while UserDeletionJobService._tasks:
+            await asyncio.gather(*list(UserDeletionJobService._tasks), return_exceptions=True)
+
+    @staticmethod
+    def describe(job: UserDeletionJob) -> Dict[str, Any]:
+        return {
+            "job_uuid": job.uuid,
+            "status": job.status,
+            "deleted_user_uuid": (job.deleted_user or {}).get("uuid"),
+            "current_step": job.step,
+            "steps_completed": job.step_index,
+            "total_steps": len(DELETION_STEPS),
+            "attempts": job.attempts,
+            "deleted_counts": job.deleted_counts or {},
+            "failed_file_cleanup": job.failed_file_cleanup or [],
+            "error": job.error,
+            "created_at": job.created_at,
+            "finished_at": job.finished_at,
+        }
+
+    @staticmethod
+    async def get_by_uuid(session: AsyncSession, job_uuid: str) -> Optional[UserDeletionJob]:
+        return await session.scalar(select(UserDeletionJob).where(UserDeletionJob.uuid == job_uuid))
+
+    @staticmethod
+    async def enqueue(session: AsyncSession, *, user: User, requested_by: User) -> UserDeletionJob:
+        """
+        Record a deletion job for ``user`` and start it. Requesting the same
+        deletion again returns the open job, restarting it if it failed.
+
+        The user's posts are unpublished and soft-deleted right away so
+        readers stop liking, bookmarking or commenting on them meanwhile.
+        """
+        job = await session.scalar(
+            select(UserDeletionJob)
+            .where(UserDeletionJob.user_id == user.id, UserDeletionJob.status != JOB_COMPLETED)
+            .order_by(UserDeletionJob.id.desc())
+            .limit(1)
+        )
+        if job is None:
+            job = UserDeletionJob(
+                user_id=user.id,
+                requested_by_id=requested_by.id,
+                status=JOB_PENDING,
+                step_index=0,
+                attempts=0,
+                deleted_user={
+                    "id": user.id,
+                    "uuid": user.uuid,
+                    "email": user.email,
+                    "username": user.username,
+                    "full_name": user.full_name,
+                    "role": getattr(user.role, "value", str(user.role)),
+                },
+                deleted_counts={},
+                file_paths=[],
+            )
+            session.add(job)
+        elif job.status == JOB_FAILED:
+            # Rows written after an earlier step ran (a late comment, a post
+            # saved by a generation job) are what usually fails a job, and
+            # every step is safe to repeat, so start over from the first one.
+            job.status = JOB_PENDING
+            job.step_index = 0
+            job.error = None
+
+        # Signed out for good from now on, even while rows are still being removed.
+        user.is_active = False
+        await session.execute(
+            update(Post)
+            .where(Post.author_id == user.id, Post.deleted_at.is_(None))
+            .values(is_published=False, deleted_at=_utcnow())
+        )
+        await session.commit()
+        await session.refresh(job)
+        await AuthUserCache.invalidate(user.uuid)
+        TaxonomyService.invalidate()
+        UserStatsService.invalidate()
+
+        if job.status == JOB_PENDING:
+            UserDeletionJobService.schedule(job.id)
+        elif job.status == JOB_RUNNING:
+            UserDeletionJobService.schedule(job.id, delay=UserDeletionJobService._lease_remaining(job))
+        return job
+
+    @staticmethod
+    def _lease_remaining(job: UserDeletionJob) -> float:
+        if job.heartbeat_at is None:
+            return 0.0
+        expires = job.heartbeat_at + timedelta(seconds=UserDeletionJobService.LEASE_SECONDS)
+        return max((expires - _utcnow()).total_seconds(), 0.0)
+
+    @staticmethod
+    def schedule(job_id: int, delay: float = 0.0) -> None:
+        async def runner() -> None:
+            if delay:
+                await asyncio.sleep(delay)
+            await UserDeletionJobService.run(job_id)
+
+        task = asyncio.create_task(runner())
+        UserDeletionJobService._tasks.add(task)
+        task.add_done_callback(UserDeletionJobService._tasks.discard)
+
+    @staticmethod
+    async def resume_pending() -> int:
+        """Schedule jobs that were pending or running when the process stopped."""
+        try:
+            async with UserDeletionJobService._sessionmaker()() as session:
+                jobs = list(
+                    (
+                        await session.execute(
+                            select(UserDeletionJob).where(
+                                UserDeletionJob.status.in_([JOB_PENDING, JOB_RUNNING])
+                            )
+                        )
+                    ).scalars()
+                )
+        except Exception as exc:
+            logger.warning("Could not load unfinished user deletion jobs: %s", exc)
+            return 0
+        for job in jobs:
+            UserDeletionJobService.schedule(job.id, delay=UserDeletionJobService._lease_remaining(job))
+        return len(jobs)
+
+    @staticmethod
+    async def _claim(session: AsyncSession, job_id: int) -> bool:
+        now = _utcnow()
+        stale = now - timedelta(seconds=UserDeletionJobService.LEASE_SECONDS)
+        result = await session.execute(
+            update(UserDeletionJob)
+            .where(
+                UserDeletionJob.id == job_id,
+                or_(
+                    UserDeletionJob.status == JOB_PENDING,
+                    and_(
+                        UserDeletionJob.status == JOB_RUNNING,
+                        or_(UserDeletionJob.heartbeat_at.is_(None), UserDeletionJob.heartbeat_at < stale),
+                    ),
+                ),
+            )
+            .values(status=JOB_RUNNING, heartbeat_at=now, attempts=UserDeletionJob.attempts + 1)
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def run(job_id: int) -> None:
+        """Run (or resume) a job to completion unless another worker holds it."""
+        async with UserDeletionJobService._sessionmaker()() as session:
+            if not await UserDeletionJobService._claim(session, job_id):
+                return
+            job = await session.get(UserDeletionJob, job_id, populate_existing=True)
+            try:
+                await UserDeletionJobService._run_steps(session, job)
+                job.step = FILE_CLEANUP_STEP
+                job.heartbeat_at = _utcnow()
+                await session.commit()
+
+                failed = await UserDeletionJobService._cleanup_files(session, job.file_paths or [])
+                job.failed_file_cleanup = failed
+                job.status = JOB_COMPLETED
+                job.step = None
+                job.finished_at = _utcnow()
+                await session.commit()
+            except asyncio.CancelledError:
+                # Shutdown: leave the job running so the next start takes it over.
+                await session.rollback()
+                raise
+            except Exception as exc:
+                # Read before the rollback expires the job.
+                step = job.step
+                await session.rollback()
+                logger.exception("User deletion job %s failed at step %s", job_id, step)
+                await session.execute(
+                    update(UserDeletionJob)
+                    .where(UserDeletionJob.id == job_id)
+                    .values(status=JOB_FAILED, error=str(exc)[:2000])
+                )
+                await session.commit()
+                return
+
+        user_id = job.deleted_user["id"]
+        FollowGraphCache.invalidate_user(user_id)
+        await AuthUserCache.invalidate(job.deleted_user["uuid"])
+        # Their posts were removed in bulk, outside the per-post count hooks.
+        TaxonomyService.invalidate()
+        UserStatsService.invalidate()
+
+    @staticmethod
+    async def _run_steps(session: AsyncSession, job: UserDeletionJob) -> None:
+        for index in range(job.step_index, len(DELETION_STEPS)):
+            step = DELETION_STEPS[index]
+            job.step = step.name
+            while True:
+                paths: List[str] = []
+                counts = await step.run(session, job.user_id, UserDeletionJobService.BATCH_SIZE, paths)
+                if not any(counts.values()):
+                    break
+                # JSON columns only track reassignment, not in-place edits.
+                merged = dict(job.deleted_counts or {})
+                for key, value in counts.items():
+                    merged[key] = merged.get(key, 0) + value
+                job.deleted_counts = merged
+                if paths:
+                    job.file_paths = [*(job.file_paths or []), *paths]
+                job.heartbeat_at = _utcnow()
+                await session.commit()
+            job.step_index = index + 1
+            job.heartbeat_at = _utcnow()
+            await session.commit()
+
+    @staticmethod
+    async def _cleanup_files(session: AsyncSession, paths: List[str]) -> List[str]:
+        failed: List[str] = []
+        unique = sorted({path for path in paths if path})
+        legacy = [path for path in unique if not MediaStore.blob_filename(path)]
+
+        # Blob releases count references on the session, so they run in turn.
+        for raw_path in unique:
+            if MediaStore.blob_filename(raw_path):
+                try:
+                    await MediaStore.release(session, raw_path)
+                except OSError:
+                    failed.append(raw_path)
+
+        loop = asyncio.get_running_loop()
+        executor = UserDeletionJobService._get_executor()
+        removed = await asyncio.gather(
+            *(loop.run_in_executor(executor, _remove_file, raw_path) for raw_path in legacy)
+        )
+        failed.extend(raw_path for raw_path, ok in zip(legacy, removed) if not ok)
+        # On the loop rather than in the workers: the stat cache is not locked.
+        for raw_path in legacy:
+            ImageServer.invalidate(_legacy_path(raw_path))
+        return failed
@@ -0,0 +1,115 @@
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from core.config import settings
+from models.base import user_follows
+
+FollowIdSet = Union[FrozenSet[int], array]
+
+
+class FollowGraphCache:
+    """
+    Process-local cache of follower/following id sets keyed by user.
+
+    Small accounts are held as frozensets; accounts at or above
+    ``COMPACT_THRESHOLD`` ids are stored as sorted ``array('q')`` buffers
+    (8 bytes per id) and probed with binary search. Entries expire after
+    ``TTL_SECONDS`` and are invalidated whenever a follow edge changes.
+    """
+
+    TTL_SECONDS = settings.FOLLOW_GRAPH_CACHE_TTL_SECONDS
+    MAX_ENTRIES = settings.FOLLOW_GRAPH_CACHE_MAX_ENTRIES
+    COMPACT_THRESHOLD = 1024
+
+    FOLLOWING = "following"
+    FOLLOWERS = "followers"
+
+    _entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    @staticmethod
+    def reset() -> None:
+        FollowGraphCache._entries = OrderedDict()
+
+    @staticmethod
+    def _compact(ids: Iterable[int]) -> FollowIdSet:
+        unique = set(ids)
+        if len(unique) >= FollowGraphCache.COMPACT_THRESHOLD:
+            return array("q", sorted(unique))
+        return frozenset(unique)
+
+    @staticmethod
+    def contains(ids: FollowIdSet, user_id: int) -> bool:
+        if isinstance(ids, array):
+            index = bisect_left(ids, user_id)
+            return index < len(ids) and ids[index] == user_id
+        return user_id in ids
+
+    @staticmethod
+    async def _load(session: AsyncSession, direction: str, user_id: int) -> FollowIdSet:
+        key = (direction, user_id)
+        now = time.monotonic()
+        cached = FollowGraphCache._entries.get(key)
+        if cached is not None and now - cached[0] < FollowGraphCache.TTL_SECONDS:
+            FollowGraphCache._entries.move_to_end(key)
+            return cached[1]
+
+        if direction == FollowGraphCache.FOLLOWING:
+            query = select(user_follows.c.followed_id).where(user_follows.c.follower_id == user_id)
+        else:
+            query = select(user_follows.c.follower_id).where(user_follows.c.followed_id == user_id)
+        result = await session.execute(query)
+        ids = FollowGraphCache._compact(result.scalars().all())
+
+        FollowGraphCache._entries[key] = (now, ids)
+        FollowGraphCache._entries.move_to_end(key)
+        while len(FollowGraphCache._entries) > FollowGraphCache.MAX_ENTRIES:
+            FollowGraphCache._entries.popitem(last=False)
+        return ids
+
+    @staticmethod
+    async def get_following_ids(session: AsyncSession, user_id: int) -> FollowIdSet:
+        return await FollowGraphCache._load(session, FollowGraphCache.FOLLOWING, user_id)
+
+    @staticmethod
+    async def get_follower_ids(session: AsyncSession, user_id: int) -> FollowIdSet:
+        return await FollowGraphCache._load(session, FollowGraphCache.FOLLOWERS, user_id)
+
+    @staticmethod
+    async def is_following(session: AsyncSession, follower_id: int, followed_id: int) -> bool:
+        following = await FollowGraphCache.get_following_ids(session, follower_id)
+        return FollowGraphCache.contains(following, followed_id)
+
+    @staticmethod
+    async def following_flags(
+            session: AsyncSession,
+            follower_id: int,
+            candidate_ids: Iterable[int]
+    ) -> Dict[int, bool]:
+        """Membership of every candidate in ``follower_id``'s following set, in one lookup."""
+        following = await FollowGraphCache.get_following_ids(session, follower_id)
+        if isinstance(following, array):
+            return {
+                candidate_id: FollowGraphCache.contains(following, candidate_id)
+                for candidate_id in candidate_ids
+            }
+        return {candidate_id: candidate_id in following for candidate_id in candidate_ids}
+
+    @staticmethod
+    def invalidate(follower_id: int, followed_id: int) -> None:
+        """Drop the two entries touched by a follow edge change."""
+        FollowGraphCache._entries.pop((FollowGraphCache.FOLLOWING, follower_id), None)
+        FollowGraphCache._entries.pop((FollowGraphCache.FOLLOWERS, followed_id), None)
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """
+        Drop every entry that may mention ``user_id``. Reverse edges are not
+        indexed, so removing a user clears the whole cache.
+        """
+        FollowGraphCache.reset()
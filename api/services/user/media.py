@@ -2,9 +2,10 @@ from fastapi import HTTPException, status
 from fastapi import UploadFile
 from typing import List, Optional
 import os
-import uuid
-import aiofiles
 from models.user import Media, MediaType
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+from services.uploads import UPLOAD_MEDIA
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select  
 from uuid import UUID
@@ -13,8 +14,6 @@ from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 
 class MediaService:
-    upload_dir = "uploads/media"
-
     @staticmethod
     async def upload_media(db_session: AsyncSession, user_id: int, file: UploadFile,
                            description: Optional[str] = None) -> Media:
@@ -27,23 +26,15 @@ class MediaService:
             file_ext = file.filename.split('.')[-1].lower()
             media_type = MediaService._determine_media_type(mime_type, file_ext)
 
-            unique_filename = f"{uuid.uuid4()}.{file_ext}"
-            file_path = os.path.join(MediaService.upload_dir, unique_filename)
-
-            os.makedirs(MediaService.upload_dir, exist_ok=True)
-
-            async with aiofiles.open(file_path, 'wb') as out_file:
-                content = await file.read()
-                if not content:
-                    raise ValueError("File is empty")
-                await out_file.write(content)
+            stored = await MediaStore.store(file, UPLOAD_MEDIA, "media", f".{file_ext}")
+            file_path = stored.path
 
             media = Media(
                 user_id=user_id,
                 file_path=file_path,
                 file_name=file.filename,
                 file_type=media_type,
-                file_size=len(content),
+                file_size=stored.size,
                 mime_type=mime_type,
                 description=description
             )
@@ -54,32 +45,26 @@ class MediaService:
             return media
 
         except HTTPException:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise
         except ValueError as e:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except OSError as e:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save file")
         except IntegrityError as e:
             await db_session.rollback()
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail="Media data violates database constraints")
         except SQLAlchemyError as e:
             await db_session.rollback()
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error occurred")
         except Exception as e:
             await db_session.rollback()
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 detail="An unexpected error occurred")
 
@@ -150,8 +135,7 @@ class MediaService:
             await db_session.delete(media)
             await db_session.commit()
 
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            await MediaService._discard_file(db_session, file_path)
 
         except HTTPException:
             raise
@@ -165,6 +149,17 @@ class MediaService:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 detail="An unexpected error occurred")
 
+    @staticmethod
+    async def _discard_file(db_session: AsyncSession, file_path: Optional[str]) -> None:
+        """Remove a file no media row points at; shared blobs stay while referenced."""
+        if not file_path:
+            return
+        if MediaStore.blob_filename(file_path):
+            await MediaStore.release(db_session, file_path)
+        elif os.path.exists(file_path):
+            os.remove(file_path)
+            ImageServer.invalidate(file_path)
+
     @staticmethod
     def _determine_media_type(mime_type: str, file_ext: str) -> MediaType:
         try:
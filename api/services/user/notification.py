@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy import select, func, and_, or_, delete
+from sqlalchemy import select, func, and_, or_, delete, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from datetime import datetime
@@ -9,11 +9,18 @@ import logging
 from models import Notification, User, Post, Comment
 from models.base import user_follows
 from models.notification import NotificationType
+from services.loader import EntityLoader
 
 logger = logging.getLogger(__name__)
 
 
 class NotificationService:
+    @staticmethod
+    def _prime_post_author(session: AsyncSession, post: Post) -> None:
+        """Reuse an eagerly loaded post author as the notification recipient."""
+        if "author" not in inspect(post).unloaded and post.author is not None:
+            EntityLoader.for_session(session).prime(post.author)
+
     @staticmethod
     def _apply_notification_relationships(query):
         """Apply eager loading for notification relationships"""
@@ -43,10 +50,10 @@ class NotificationService:
         action_url: Optional[str] = None
     ) -> Notification:
         try:
-            recipient_result = await session.execute(
-                select(User).where(User.id == recipient_id)
+            users = await EntityLoader.for_session(session).load_many(
+                User, "id", [recipient_id, sender_id]
             )
-            recipient = recipient_result.scalar_one_or_none()
+            recipient = users.get(recipient_id)
             if not recipient:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -54,10 +61,7 @@ class NotificationService:
                 )
 
             if sender_id:
-                sender_result = await session.execute(
-                    select(User).where(User.id == sender_id)
-                )
-                sender = sender_result.scalar_one_or_none()
+                sender = users.get(sender_id)
                 if not sender:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
@@ -411,18 +415,12 @@ class NotificationService:
             if parent_comment.author_id == replier_id:
                 return
 
-            replier_result = await session.execute(
-                select(User).where(User.id == replier_id)
-            )
-            replier = replier_result.scalar_one_or_none()
+            replier = await EntityLoader.for_session(session).load(User, "id", replier_id)
             if not replier:
                 return
 
             # Get post for UUID
-            post_result = await session.execute(
-                select(Post).where(Post.id == parent_comment.post_id)
-            )
-            post = post_result.scalar_one_or_none()
+            post = await EntityLoader.for_session(session).load(Post, "id", parent_comment.post_id)
             if not post:
                 return
 
@@ -449,13 +447,11 @@ class NotificationService:
     ) -> None:
         """Notify the post author about a new comment"""
         try:
+            NotificationService._prime_post_author(session, post)
             if post.author_id == commenter_id:
                 return
 
-            commenter_result = await session.execute(
-                select(User).where(User.id == commenter_id)
-            )
-            commenter = commenter_result.scalar_one_or_none()
+            commenter = await EntityLoader.for_session(session).load(User, "id", commenter_id)
             if not commenter:
                 return
             
@@ -482,13 +478,11 @@ class NotificationService:
     ) -> None:
         """Notify the post author about a like"""
         try:
+            NotificationService._prime_post_author(session, post)
             if post.author_id == liker_id:
                 return
 
-            liker_result = await session.execute(
-                select(User).where(User.id == liker_id)
-            )
-            liker = liker_result.scalar_one_or_none()
+            liker = await EntityLoader.for_session(session).load(User, "id", liker_id)
             if not liker:
                 return
 
@@ -513,10 +507,7 @@ class NotificationService:
         author_id: int
     ) -> None:
         try:
-            author_result = await session.execute(
-                select(User).where(User.id == author_id)
-            )
-            author = author_result.scalar_one_or_none()
+            author = await EntityLoader.for_session(session).load(User, "id", author_id)
             if not author:
                 return
 
@@ -528,17 +519,19 @@ class NotificationService:
             followers_result = await session.execute(followers_query)
             follower_ids = [row[0] for row in followers_result.all()]
 
-            for follower_id in follower_ids:
-                await NotificationService.create_notification(
-                    session=session,
+            session.add_all([
+                Notification(
                     recipient_id=follower_id,
                     sender_id=author_id,
-                    notification_type=NotificationType.POST_PUBLISHED, 
+                    notification_type=NotificationType.POST_PUBLISHED,
                     title="New Post from Someone You Follow",
                     message=f"{author.username} published a new post: {post.title}",
                     post_id=post.id,
-                    action_url=f"/posts/{post.uuid}"
+                    action_url=f"/posts/{post.uuid}",
+                    is_read=False
                 )
+                for follower_id in follower_ids
+            ])
 
             await session.commit()
 
@@ -555,10 +548,7 @@ class NotificationService:
     ) -> None:
         """Notify admins/moderators about a reported post"""
         try:
-            reporter_result = await session.execute(
-                select(User).where(User.id == reporter_id)
-            )
-            reporter = reporter_result.scalar_one_or_none()
+            reporter = await EntityLoader.for_session(session).load(User, "id", reporter_id)
             if not reporter:
                 return
 
@@ -567,6 +557,7 @@ class NotificationService:
             )
             admins_result = await session.execute(admins_query)
             admin_ids = [row[0] for row in admins_result.all()]
+            EntityLoader.for_session(session).prime_keys(User, "id", admin_ids)
 
             for admin_id in admin_ids:
                 await NotificationService.create_notification(
@@ -590,10 +581,8 @@ class NotificationService:
     ) -> None:
         """Notify post author that their post was flagged"""
         try:
-            admin_result = await session.execute(
-                select(User).where(User.id == admin_id)
-            )
-            admin = admin_result.scalar_one_or_none()
+            NotificationService._prime_post_author(session, post)
+            admin = await EntityLoader.for_session(session).load(User, "id", admin_id)
             if not admin:
                 return
 
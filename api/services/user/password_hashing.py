@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    A bcrypt round costs 100-300ms of CPU; run inline it blocks the event loop
+    and every other request on the worker. bcrypt releases the GIL while
+    hashing, so a small thread pool keeps the loop responsive without the
+    pickling overhead of a process pool. ``MAX_WORKERS`` caps how many hashes
+    run at once and ``MAX_QUEUE`` caps how many may wait; beyond that requests
+    are rejected with 503 instead of piling up behind a login storm.
+    """
+
+    MAX_WORKERS = max(settings.PASSWORD_HASH_WORKERS, 1)
+    MAX_QUEUE = max(settings.PASSWORD_HASH_MAX_QUEUE, 0)
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    _pending = 0
+    _running = 0
+    _completed = 0
+    _rejected = 0
+    _max_queue_depth = 0
+    _total_wait_seconds = 0.0
+    _total_run_seconds = 0.0
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        if PasswordHashPool._executor is None:
+            PasswordHashPool._executor = ThreadPoolExecutor(
+                max_workers=PasswordHashPool.MAX_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        return PasswordHashPool._executor
+
+    @staticmethod
+    def reset_metrics() -> None:
+        with PasswordHashPool._lock:
+            PasswordHashPool._completed = 0
+            PasswordHashPool._rejected = 0
+            PasswordHashPool._max_queue_depth = 0
+            PasswordHashPool._total_wait_seconds = 0.0
+            PasswordHashPool._total_run_seconds = 0.0
+
+    @staticmethod
+    def shutdown() -> None:
+        executor = PasswordHashPool._executor
+        PasswordHashPool._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def queue_depth() -> int:
+        return max(PasswordHashPool._pending - PasswordHashPool._running, 0)
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        with PasswordHashPool._lock:
+            completed = PasswordHashPool._completed
+            return {
+                "workers": PasswordHashPool.MAX_WORKERS,
+                "max_queue": PasswordHashPool.MAX_QUEUE,
+                "running": PasswordHashPool._running,
+                "queued": PasswordHashPool.queue_depth(),
+                "max_queue_depth": PasswordHashPool._max_queue_depth,
+                "completed": completed,
+                "rejected": PasswordHashPool._rejected,
+                "avg_wait_ms": round(
+                    PasswordHashPool._total_wait_seconds * 1000 / completed, 2
+                ) if completed else 0.0,
+                "avg_run_ms": round(
+                    PasswordHashPool._total_run_seconds * 1000 / completed, 2
+                ) if completed else 0.0,
+            }
+
+    @staticmethod
+    async def run(func: Callable[..., Any], *args: Any) -> Any:
+        with PasswordHashPool._lock:
+            if PasswordHashPool._pending >= PasswordHashPool.MAX_WORKERS + PasswordHashPool.MAX_QUEUE:
+                PasswordHashPool._rejected += 1
+                logger.warning("Password hashing queue is full; rejecting request")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            PasswordHashPool._pending += 1
+            PasswordHashPool._max_queue_depth = max(
+                PasswordHashPool._max_queue_depth,
+                PasswordHashPool.queue_depth(),
+            )
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            with PasswordHashPool._lock:
+                PasswordHashPool._running += 1
+                PasswordHashPool._total_wait_seconds += started_at - submitted_at
+            try:
+                return func(*args)
+            finally:
+                with PasswordHashPool._lock:
+                    PasswordHashPool._running -= 1
+                    PasswordHashPool._total_run_seconds += time.perf_counter() - started_at
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(PasswordHashPool._get_executor(), task)
+        finally:
+            with PasswordHashPool._lock:
+                PasswordHashPool._pending -= 1
+                PasswordHashPool._completed += 1
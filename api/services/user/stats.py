@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models import User
+from models.user import UserRole
+
+RECENT_REGISTRATION_DAYS = 30
+
+
+class UserStatsService:
+    """
+    Aggregate user counts shared by ``/admin/users/stats`` and the admin
+    dashboard.
+
+    All figures come from one conditional-aggregate scan of ``users`` and
+    are kept for ``TTL_SECONDS``; admin writes that change them call
+    ``invalidate``. A load that raced with an invalidation is returned but
+    not stored, as in TaxonomyService.
+    """
+
+    TTL_SECONDS = settings.USER_STATS_SNAPSHOT_TTL_SECONDS
+
+    _generation = 0
+    _snapshot: Optional[Dict[str, int]] = None
+    _loaded_at = 0.0
+
+    @staticmethod
+    def reset() -> None:
+        UserStatsService._generation += 1
+        UserStatsService._snapshot = None
+        UserStatsService._loaded_at = 0.0
+
+    @staticmethod
+    def invalidate() -> None:
+        UserStatsService.reset()
+
+    @staticmethod
+    async def _load(session: AsyncSession) -> Dict[str, int]:
+        recent_threshold = (
+            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=RECENT_REGISTRATION_DAYS)
+        )
+
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        row = (
+            await session.execute(
+                select(
+                    func.count().label("total_users"),
+                    count_where(User.is_active.is_(True)).label("active_users"),
+                    count_where(User.role == UserRole.ADMIN).label("admin_count"),
+                    count_where(User.role == UserRole.MODERATOR).label("moderator_count"),
+                    count_where(User.role == UserRole.USER).label("user_count"),
+                    count_where(User.created_at >= recent_threshold).label("recent_registrations"),
+                ).select_from(User)
+            )
+        ).one()
+        stats = {key: int(value or 0) for key, value in row._mapping.items()}
+        stats["inactive_users"] = stats["total_users"] - stats["active_users"]
+        return stats
+
+    @staticmethod
+    async def get_snapshot(session: AsyncSession) -> Dict[str, int]:
+        snapshot = UserStatsService._snapshot
+        if snapshot is not None and time.monotonic() - UserStatsService._loaded_at < UserStatsService.TTL_SECONDS:
+            return snapshot
+
+        generation = UserStatsService._generation
+        snapshot = await UserStatsService._load(session)
+        if generation == UserStatsService._generation:
+            UserStatsService._snapshot = snapshot
+            UserStatsService._loaded_at = time.monotonic()
+        return snapshot
+
+    @staticmethod
+    async def estimate_total(session: AsyncSession, threshold: int) -> Tuple[int, bool]:
+        """
+        The number of users and whether it is an estimate. On PostgreSQL a
+        table the planner believes holds at least ``threshold`` rows is not
+        counted at all; smaller tables and other databases use the snapshot.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            estimate = await session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+            )
+            # reltuples is -1 until the table has been analyzed.
+            if estimate is not None and estimate >= threshold:
+                return int(estimate), True
+        return (await UserStatsService.get_snapshot(session))["total_users"], False
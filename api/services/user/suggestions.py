@@ -0,0 +1,262 @@
+import math
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, func, insert, not_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from models import Post, User, UserSuggestion
+from models.base import user_follows
+from models.collection import ReadingHistory
+from models.user import UserRole
+from services.user.follow_graph import FollowGraphCache
+
+EXCLUDED_ROLES = [UserRole.SUPER_ADMIN, UserRole.ADMIN, UserRole.MODERATOR]
+
+
+class FollowSuggestionService:
+    """
+    Offline who-to-follow candidate generation.
+
+    ``rebuild_suggestions`` runs as a batch job and stores the top-K candidates
+    per active user in ``user_suggestions``. Request-time reads only look at
+    that table, the requester's cached following set and a cached global
+    popularity list.
+    """
+
+    CO_FOLLOW_WEIGHT = 3.0
+    READING_WEIGHT = 2.0
+    POPULARITY_WEIGHT = 1.0
+    # Cap on how many followers of each followed account are sampled per user,
+    # so that following a very large account stays cheap.
+    MAX_CO_FOLLOWERS_PER_ACCOUNT = 200
+    POPULAR_POOL_SIZE = 100
+    POPULAR_CACHE_TTL_SECONDS = 600
+
+    _popular_ids: List[int] = []
+    _popular_loaded_at: float = 0.0
+
+    @staticmethod
+    def reset() -> None:
+        FollowSuggestionService._popular_ids = []
+        FollowSuggestionService._popular_loaded_at = 0.0
+
+    @staticmethod
+    def _eligible_users_query():
+        return select(User.id, User.follower_count).where(
+            User.is_active == True,
+            not_(User.role.in_(EXCLUDED_ROLES)),
+        )
+
+    @staticmethod
+    async def get_popular_user_ids(session: AsyncSession) -> List[int]:
+        """Global popularity list (indexed on follower_count), cached per process."""
+        now = time.monotonic()
+        if (
+            FollowSuggestionService._popular_ids
+            and now - FollowSuggestionService._popular_loaded_at
+            < FollowSuggestionService.POPULAR_CACHE_TTL_SECONDS
+        ):
+            return FollowSuggestionService._popular_ids
+
+        result = await session.execute(
+            FollowSuggestionService._eligible_users_query()
+            .order_by(User.follower_count.desc(), User.id)
+            .limit(FollowSuggestionService.POPULAR_POOL_SIZE)
+        )
+        FollowSuggestionService._popular_ids = [user_id for user_id, _ in result.all()]
+        FollowSuggestionService._popular_loaded_at = now
+        return FollowSuggestionService._popular_ids
+
+    @staticmethod
+    def score_candidates(
+            user_id: int,
+            following: Dict[int, Set[int]],
+            followers: Dict[int, Set[int]],
+            reading_authors: Counter,
+            popularity: Dict[int, int],
+            popular_ids: Iterable[int],
+            top_k: int,
+    ) -> List[dict]:
+        """Blend co-follow, reading-history and popularity signals for one user."""
+        followed = following.get(user_id, set())
+
+        co_follow: Counter = Counter()
+        for account_id in followed:
+            sampled = 0
+            for co_follower_id in followers.get(account_id, ()):
+                if co_follower_id == user_id:
+                    continue
+                co_follow.update(following.get(co_follower_id, ()))
+                sampled += 1
+                if sampled >= FollowSuggestionService.MAX_CO_FOLLOWERS_PER_ACCOUNT:
+                    break
+
+        candidates = set(co_follow) | set(reading_authors) | set(popular_ids)
+        candidates.discard(user_id)
+        candidates -= followed
+        candidates &= popularity.keys()
+        if not candidates:
+            return []
+
+        max_co_follow = max((co_follow[c] for c in candidates), default=0) or 1
+        max_reads = max((reading_authors[c] for c in candidates), default=0) or 1
+        max_popularity = math.log1p(max(popularity[c] for c in candidates)) or 1.0
+
+        scored = []
+        for candidate_id in candidates:
+            signals = {
+                "co_follow": FollowSuggestionService.CO_FOLLOW_WEIGHT
+                * co_follow[candidate_id] / max_co_follow,
+                "reading_history": FollowSuggestionService.READING_WEIGHT
+                * reading_authors[candidate_id] / max_reads,
+                "popular": FollowSuggestionService.POPULARITY_WEIGHT
+                * math.log1p(popularity[candidate_id]) / max_popularity,
+            }
+            scored.append({
+                "suggested_user_id": candidate_id,
+                "score": round(sum(signals.values()), 6),
+                "reason": max(signals, key=signals.get),
+            })
+
+        scored.sort(key=lambda row: (-row["score"], row["suggested_user_id"]))
+        return scored[:top_k]
+
+    @staticmethod
+    async def rebuild_suggestions(
+            session: AsyncSession,
+            top_k: int = 20,
+            active_days: Optional[int] = None,
+            user_ids: Optional[List[int]] = None,
+            batch_size: int = 500,
+    ) -> dict:
+        """
+        Recompute and store follow suggestions for active users.
+
+        The follow graph is read once; reading history and writes are processed
+        in batches of ``batch_size`` users, each committed independently.
+        """
+        started = time.perf_counter()
+
+        edges = (await session.execute(
+            select(user_follows.c.follower_id, user_follows.c.followed_id)
+        )).all()
+        following: Dict[int, Set[int]] = defaultdict(set)
+        followers: Dict[int, Set[int]] = defaultdict(set)
+        for follower_id, followed_id in edges:
+            following[follower_id].add(followed_id)
+            followers[followed_id].add(follower_id)
+
+        popularity = dict((await session.execute(
+            FollowSuggestionService._eligible_users_query()
+        )).all())
+        popular_ids = [
+            user_id
+            for user_id, _ in sorted(popularity.items(), key=lambda item: (-item[1], item[0]))
+        ][:FollowSuggestionService.POPULAR_POOL_SIZE]
+
+        targets_query = select(User.id).where(User.is_active == True).order_by(User.id)
+        if active_days is not None:
+            targets_query = targets_query.where(
+                User.last_login >= datetime.utcnow() - timedelta(days=active_days)
+            )
+        if user_ids is not None:
+            targets_query = targets_query.where(User.id.in_(user_ids))
+        targets = list((await session.execute(targets_query)).scalars().all())
+
+        written = 0
+        for start in range(0, len(targets), batch_size):
+            batch = targets[start:start + batch_size]
+
+            reading_rows = (await session.execute(
+                select(ReadingHistory.user_id, Post.author_id, func.count())
+                .join(Post, Post.id == ReadingHistory.post_id)
+                .where(ReadingHistory.user_id.in_(batch), Post.deleted_at.is_(None))
+                .group_by(ReadingHistory.user_id, Post.author_id)
+            )).all()
+            reading_by_user: Dict[int, Counter] = defaultdict(Counter)
+            for reader_id, author_id, reads in reading_rows:
+                reading_by_user[reader_id][author_id] += reads
+
+            rows = []
+            for user_id in batch:
+                for candidate in FollowSuggestionService.score_candidates(
+                    user_id,
+                    following,
+                    followers,
+                    reading_by_user.get(user_id, Counter()),
+                    popularity,
+                    popular_ids,
+                    top_k,
+                ):
+                    rows.append({"user_id": user_id, **candidate})
+
+            await session.execute(
+                delete(UserSuggestion).where(UserSuggestion.user_id.in_(batch))
+            )
+            if rows:
+                await session.execute(insert(UserSuggestion), rows)
+            await session.commit()
+            written += len(rows)
+
+        FollowSuggestionService.reset()
+        return {
+            "users": len(targets),
+            "suggestions": written,
+            "duration_s": round(time.perf_counter() - started, 3),
+        }
+
+    @staticmethod
+    async def get_suggestions(
+            session: AsyncSession,
+            user_id: int,
+            limit: int = 5,
+    ) -> List[User]:
+        """
+        Precomputed candidates for ``user_id``, minus accounts followed since the
+        last batch run, topped up from the cached global popular list.
+        """
+        following = await FollowGraphCache.get_following_ids(session, user_id)
+
+        def is_new(candidate_id: int) -> bool:
+            return candidate_id != user_id and not FollowGraphCache.contains(following, candidate_id)
+
+        result = await session.execute(
+            select(User)
+            .join(UserSuggestion, UserSuggestion.suggested_user_id == User.id)
+            .where(
+                UserSuggestion.user_id == user_id,
+                User.is_active == True,
+                not_(User.role.in_(EXCLUDED_ROLES)),
+            )
+            .order_by(UserSuggestion.score.desc(), User.id)
+            .limit(limit * 3)
+            .options(selectinload(User.profile))
+        )
+        suggested = [user for user in result.scalars().all() if is_new(user.id)][:limit]
+
+        if len(suggested) < limit:
+            chosen = {user.id for user in suggested}
+            popular_ids = [
+                candidate_id
+                for candidate_id in await FollowSuggestionService.get_popular_user_ids(session)
+                if candidate_id not in chosen and is_new(candidate_id)
+            ][:limit - len(suggested)]
+            if popular_ids:
+                popular_result = await session.execute(
+                    select(User)
+                    .where(
+                        User.id.in_(popular_ids),
+                        User.is_active == True,
+                        not_(User.role.in_(EXCLUDED_ROLES)),
+                    )
+                    .options(selectinload(User.profile))
+                )
+                by_id = {user.id: user for user in popular_result.scalars().all()}
+                suggested.extend(by_id[candidate_id] for candidate_id in popular_ids if candidate_id in by_id)
+
+        return suggested
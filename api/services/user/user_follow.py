@@ -1,11 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import and_, func, not_, distinct
-from models import User, Post
-from models.user import UserRole
+from sqlalchemy import and_, func, update
+from models import User
 from models.base import user_follows
-from models.collection import ReadingHistory
+from services.user.follow_graph import FollowGraphCache
+from services.user.suggestions import FollowSuggestionService
 from schemas.user import FollowActionResponse, UserFollowersResponse, UserFollowingResponse, UserResponse, UserSuggestionsResponse
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
@@ -30,22 +30,23 @@ class UserFollowService:
                     detail="You cannot follow yourself"
                 )
 
-            if await UserFollowService.is_following(session, follower_id, followed_user.id):
+            # Decided on the table, not FollowGraphCache: another worker's
+            # follow may not have reached this process's cache yet.
+            created = await UserFollowService._create_follow_relationship(session, follower_id, followed_user.id)
+            await session.refresh(followed_user)
+            if not created:
                 return FollowActionResponse(
                     success=False,
                     message="Already following this user",
                     is_following=True,
-                    follower_count=await UserFollowService.count_followers(session, followed_user.id)
+                    follower_count=followed_user.follower_count
                 )
 
-            await UserFollowService._create_follow_relationship(session, follower_id, followed_user.id)
-            await session.refresh(followed_user)
-
             return FollowActionResponse(
                 success=True,
                 message="Successfully followed user",
                 is_following=True,
-                follower_count=await UserFollowService.count_followers(session, followed_user.id)
+                follower_count=followed_user.follower_count
             )
         except HTTPException:
             raise
@@ -77,22 +78,21 @@ class UserFollowService:
         try:
             followed_user = await UserFollowService._get_user_by_uuid(session, followed_uuid)
 
-            if not await UserFollowService.is_following(session, follower_id, followed_user.id):
+            deleted = await UserFollowService._delete_follow_relationship(session, follower_id, followed_user.id)
+            await session.refresh(followed_user)
+            if not deleted:
                 return FollowActionResponse(
                     success=False,
                     message="Not following this user",
                     is_following=False,
-                    follower_count=await UserFollowService.count_followers(session, followed_user.id)
+                    follower_count=followed_user.follower_count
                 )
 
-            await UserFollowService._delete_follow_relationship(session, follower_id, followed_user.id)
-            await session.refresh(followed_user)
-
             return FollowActionResponse(
                 success=True,
                 message="Successfully unfollowed user",
                 is_following=False,
-                follower_count=await UserFollowService.count_followers(session, followed_user.id)
+                follower_count=followed_user.follower_count
             )
         except HTTPException:
             raise
@@ -202,15 +202,7 @@ class UserFollowService:
             followed_id: int
     ) -> bool:
         try:
-            result = await session.execute(
-                select(user_follows).where(
-                    and_(
-                        user_follows.c.follower_id == follower_id,
-                        user_follows.c.followed_id == followed_id
-                    )
-                )
-            )
-            return result.first() is not None
+            return await FollowGraphCache.is_following(session, follower_id, followed_id)
         except SQLAlchemyError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -226,9 +218,9 @@ class UserFollowService:
     async def count_followers(session: AsyncSession, user_id: int) -> int:
         try:
             result = await session.execute(
-                select(func.count()).where(user_follows.c.followed_id == user_id)
+                select(User.follower_count).where(User.id == user_id)
             )
-            return result.scalar()
+            return result.scalar() or 0
         except SQLAlchemyError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -240,22 +232,45 @@ class UserFollowService:
                 detail="An unexpected error occurred"
             )
 
+    @staticmethod
+    async def _follow_exists(session: AsyncSession, follower_id: int, followed_id: int) -> bool:
+        result = await session.execute(
+            select(user_follows.c.follower_id).where(
+                and_(
+                    user_follows.c.follower_id == follower_id,
+                    user_follows.c.followed_id == followed_id
+                )
+            )
+        )
+        return result.first() is not None
+
     @staticmethod
     async def _create_follow_relationship(
             session: AsyncSession,
             follower_id: int,
             followed_id: int
-    ) -> None:
+    ) -> bool:
+        """Insert the edge and adjust counts; False when it already exists."""
         try:
+            if await UserFollowService._follow_exists(session, follower_id, followed_id):
+                FollowGraphCache.invalidate(follower_id, followed_id)
+                return False
             await session.execute(
                 user_follows.insert().values(
                     follower_id=follower_id,
                     followed_id=followed_id
                 )
             )
+            await UserFollowService._adjust_follow_counts(session, follower_id, followed_id, 1)
             await session.commit()
+            FollowGraphCache.invalidate(follower_id, followed_id)
+            return True
         except IntegrityError as e:
             await session.rollback()
+            # A concurrent request inserted the same edge first.
+            if await UserFollowService._follow_exists(session, follower_id, followed_id):
+                FollowGraphCache.invalidate(follower_id, followed_id)
+                return False
             raise
         except SQLAlchemyError as e:
             await session.rollback()
@@ -269,9 +284,10 @@ class UserFollowService:
             session: AsyncSession,
             follower_id: int,
             followed_id: int
-    ) -> None:
+    ) -> bool:
+        """Delete the edge and adjust counts; False when there was none."""
         try:
-            await session.execute(
+            result = await session.execute(
                 user_follows.delete().where(
                     and_(
                         user_follows.c.follower_id == follower_id,
@@ -279,7 +295,11 @@ class UserFollowService:
                     )
                 )
             )
+            if result.rowcount:
+                await UserFollowService._adjust_follow_counts(session, follower_id, followed_id, -1)
             await session.commit()
+            FollowGraphCache.invalidate(follower_id, followed_id)
+            return bool(result.rowcount)
         except SQLAlchemyError as e:
             await session.rollback()
             raise
@@ -287,6 +307,92 @@ class UserFollowService:
             await session.rollback()
             raise
 
+    @staticmethod
+    async def _adjust_follow_counts(
+            session: AsyncSession,
+            follower_id: int,
+            followed_id: int,
+            delta: int
+    ) -> None:
+        """Apply a follow edge change to the denormalized counters in the same transaction."""
+        await session.execute(
+            update(User)
+            .where(User.id == followed_id, User.follower_count + delta >= 0)
+            .values(follower_count=User.follower_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            update(User)
+            .where(User.id == follower_id, User.following_count + delta >= 0)
+            .values(following_count=User.following_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def reconcile_follow_counts(
+            session: AsyncSession,
+            dry_run: bool = False
+    ) -> dict:
+        """
+        Recompute follower/following counts from ``user_follows`` and repair
+        any drifted rows. Returns a summary of the users that were out of sync.
+        """
+        follower_totals = dict(
+            (
+                await session.execute(
+                    select(user_follows.c.followed_id, func.count())
+                    .group_by(user_follows.c.followed_id)
+                )
+            ).all()
+        )
+        following_totals = dict(
+            (
+                await session.execute(
+                    select(user_follows.c.follower_id, func.count())
+                    .group_by(user_follows.c.follower_id)
+                )
+            ).all()
+        )
+
+        users = (
+            await session.execute(
+                select(User.id, User.follower_count, User.following_count)
+            )
+        ).all()
+
+        drifted = []
+        for user_id, follower_count, following_count in users:
+            expected_followers = follower_totals.get(user_id, 0)
+            expected_following = following_totals.get(user_id, 0)
+            if follower_count != expected_followers or following_count != expected_following:
+                drifted.append({
+                    "id": user_id,
+                    "follower_count": expected_followers,
+                    "following_count": expected_following,
+                    "previous_follower_count": follower_count,
+                    "previous_following_count": following_count,
+                })
+
+        if drifted and not dry_run:
+            await session.execute(
+                update(User),
+                [
+                    {
+                        "id": row["id"],
+                        "follower_count": row["follower_count"],
+                        "following_count": row["following_count"],
+                    }
+                    for row in drifted
+                ],
+            )
+            await session.commit()
+
+        return {
+            "checked": len(users),
+            "drifted": drifted,
+            "repaired": 0 if dry_run else len(drifted),
+        }
+
     @staticmethod
     async def _get_followers_data(
             session: AsyncSession,
@@ -308,7 +414,7 @@ class UserFollowService:
             users = result.scalars().all()
 
             count = await session.scalar(
-                select(func.count()).where(user_follows.c.followed_id == user_id)
+                select(User.follower_count).where(User.id == user_id)
             )
 
             return users, count
@@ -338,7 +444,7 @@ class UserFollowService:
             users = result.scalars().all()
 
             count = await session.scalar(
-                select(func.count()).where(user_follows.c.follower_id == user_id)
+                select(User.following_count).where(User.id == user_id)
             )
 
             return users, count
@@ -354,11 +460,13 @@ class UserFollowService:
             current_user_id: int
     ) -> List[UserResponse]:
         try:
+            following_flags = await FollowGraphCache.following_flags(
+                session, current_user_id, [user.id for user in users]
+            )
+
             responses = []
             for user in users:
-                is_following = await UserFollowService.is_following(
-                    session, current_user_id, user.id
-                )
+                is_following = following_flags[user.id]
 
                 user_data = {
                     "uuid": user.uuid,
@@ -417,65 +525,18 @@ class UserFollowService:
             limit: int = 5
     ) -> UserSuggestionsResponse:
         """
-        Get suggested users to follow based on:
-        1. Authors of posts user has read (from reading history)
-        2. Popular users (by follower count)
-        Excludes current user and already followed users.
+        Get suggested users to follow from the precomputed ``user_suggestions``
+        candidates (co-follow, reading history and popularity), falling back to
+        the cached global popular list. Excludes the current user, already
+        followed users and admin roles.
         """
         try:
-            # Get IDs of users current user already follows
-            followed_subq = (
-                select(user_follows.c.followed_id)
-                .where(user_follows.c.follower_id == current_user_id)
-            )
-            
-            # Get authors from reading history (posts user has read)
-            reading_authors_subq = (
-                select(distinct(Post.author_id))
-                .join(ReadingHistory, ReadingHistory.post_id == Post.id)
-                .where(ReadingHistory.user_id == current_user_id)
+            suggested_users = await FollowSuggestionService.get_suggestions(
+                session, current_user_id, limit
             )
-            
-            # Count followers for each user (for sorting)
-            follower_count_subq = (
-                select(
-                    user_follows.c.followed_id.label('user_id'),
-                    func.count(user_follows.c.follower_id).label('follower_count')
-                )
-                .group_by(user_follows.c.followed_id)
-                .subquery()
-            )
-            
-            # Main query: get users not followed, prioritize reading history authors
-            # Exclude admin roles - only suggest regular users
-            excluded_roles = [UserRole.SUPER_ADMIN, UserRole.ADMIN, UserRole.MODERATOR]
-            
-            query = (
-                select(User, func.coalesce(follower_count_subq.c.follower_count, 0).label('fcount'))
-                .outerjoin(follower_count_subq, User.id == follower_count_subq.c.user_id)
-                .where(
-                    and_(
-                        User.id != current_user_id,
-                        User.is_active == True,
-                        not_(User.id.in_(followed_subq)),
-                        not_(User.role.in_(excluded_roles))  # Exclude admin roles
-                    )
-                )
-                .order_by(
-                    # Prioritize authors from reading history
-                    User.id.in_(reading_authors_subq).desc(),
-                    # Then by follower count
-                    func.coalesce(follower_count_subq.c.follower_count, 0).desc()
-                )
-                .limit(limit)
-                .options(selectinload(User.profile))
-            )
-            
-            result = await session.execute(query)
-            users_with_counts = result.all()
-            
+
             user_responses = []
-            for user, fcount in users_with_counts:
+            for user in suggested_users:
                 user_data = {
                     "uuid": user.uuid,
                     "email": user.email,
@@ -1,6 +1,7 @@
 import os
 import sys
 import pathlib
+from contextlib import contextmanager
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -12,18 +13,83 @@ API_DIR = pathlib.Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(API_DIR))
 
 from main import create_application  # type: ignore
-from database.connection import get_db_session  # type: ignore
-from services.user.auth import get_current_active_user  # type: ignore
+from database.connection import (  # type: ignore
+    get_analytics_db_session,
+    get_background_db_session,
+    get_db_session,
+)
+from services.user.auth import get_current_active_background_user, get_current_active_user  # type: ignore
 from models.base import Base as ModelsBase  # type: ignore
 from models.user import User, UserRole  # type: ignore
+from services.post.trending import TrendingService  # type: ignore
+from services.post.content import ContentProcessor  # type: ignore
+from services.post.detail_cache import PostDetailCache  # type: ignore
+from services.post.taxonomy import TaxonomyService  # type: ignore
+from services.user.auth_cache import AuthUserCache  # type: ignore
+from database.routing import ReplicaRouter  # type: ignore
+from database.instrumentation import install_query_instrumentation, track_queries  # type: ignore
+from services.user.follow_graph import FollowGraphCache  # type: ignore
+from services.user.suggestions import FollowSuggestionService  # type: ignore
+from services.image_serving import ImageServer  # type: ignore
+from services.user.stats import UserStatsService  # type: ignore
+from services.rate_limit import RateLimiter  # type: ignore
 
 
 TEST_DB_URL = "sqlite+aiosqlite:///./test_api.sqlite3"
 
 
+@pytest.fixture(autouse=True)
+def reset_in_process_caches():
+    # Row ids are reused after every table reset, so process-wide caches must be too.
+    TrendingService.reset()
+    FollowGraphCache.reset()
+    FollowSuggestionService.reset()
+    PostDetailCache.reset()
+    ContentProcessor.reset()
+    TaxonomyService.reset()
+    AuthUserCache.reset()
+    ReplicaRouter.reset()
+    ImageServer.reset()
+    UserStatsService.reset()
+    RateLimiter.reset()
+    yield
+    TrendingService.reset()
+    FollowGraphCache.reset()
+    FollowSuggestionService.reset()
+    PostDetailCache.reset()
+    ContentProcessor.reset()
+    TaxonomyService.reset()
+    AuthUserCache.reset()
+    ReplicaRouter.reset()
+    ImageServer.reset()
+    UserStatsService.reset()
+    RateLimiter.reset()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail when the wrapped block runs more than ``limit`` SQL statements::
+
+        with assert_max_queries(3):
+            await client.get("/v1/posts/some-slug")
+    """
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"Expected at most {limit} queries, ran {stats.count}:\n"
+            + "\n".join(f"  {statement}" for statement in stats.statements)
+        )
+
+    return _assert_max_queries
+
+
 @pytest_asyncio.fixture(scope="session")
 async def test_engine():
     engine = create_async_engine(TEST_DB_URL, future=True)
+    install_query_instrumentation(engine)
     async with engine.begin() as conn:
         await conn.run_sync(ModelsBase.metadata.create_all)
     yield engine
@@ -110,17 +176,28 @@ def make_db_override(session: AsyncSession):
     return _override
 
 
+def _override_db_sessions(app, session: AsyncSession) -> None:
+    # Every workload pool resolves to the single test database.
+    for dependency in (get_db_session, get_background_db_session, get_analytics_db_session):
+        app.dependency_overrides[dependency] = make_db_override(session)
+
+
 def _make_auth_override(user: User):
     async def _override():
         return user
     return _override
 
 
+def _override_current_user(app, user: User) -> None:
+    for dependency in (get_current_active_user, get_current_active_background_user):
+        app.dependency_overrides[dependency] = _make_auth_override(user)
+
+
 @pytest_asyncio.fixture
 async def client_author(test_session: AsyncSession, author_user: User):
     app = create_application()
-    app.dependency_overrides[get_db_session] = make_db_override(test_session)
-    app.dependency_overrides[get_current_active_user] = _make_auth_override(author_user)
+    _override_db_sessions(app, test_session)
+    _override_current_user(app, author_user)
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
@@ -131,8 +208,8 @@ async def client_author(test_session: AsyncSession, author_user: User):
 @pytest_asyncio.fixture
 async def client_admin(test_session: AsyncSession, admin_user: User):
     app = create_application()
-    app.dependency_overrides[get_db_session] = make_db_override(test_session)
-    app.dependency_overrides[get_current_active_user] = _make_auth_override(admin_user)
+    _override_db_sessions(app, test_session)
+    _override_current_user(app, admin_user)
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
@@ -143,10 +220,8 @@ async def client_admin(test_session: AsyncSession, admin_user: User):
 @pytest_asyncio.fixture
 async def client_super_admin(test_session: AsyncSession, super_admin_user: User):
     app = create_application()
-    app.dependency_overrides[get_db_session] = make_db_override(test_session)
-    app.dependency_overrides[get_current_active_user] = _make_auth_override(
-        super_admin_user
-    )
+    _override_db_sessions(app, test_session)
+    _override_current_user(app, super_admin_user)
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
@@ -157,7 +232,7 @@ async def client_super_admin(test_session: AsyncSession, super_admin_user: User)
 @pytest_asyncio.fixture
 async def client_public(test_session: AsyncSession):
     app = create_application()
-    app.dependency_overrides[get_db_session] = make_db_override(test_session)
+    _override_db_sessions(app, test_session)
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
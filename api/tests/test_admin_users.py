@@ -1,12 +1,29 @@
+from datetime import datetime, timedelta
+
 import pytest
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from models import Notification, Post
+from core.config import settings
+from models import Comment, Notification, Post, UserDeletionJob
+from models.base import post_bookmarks, post_likes, user_follows
 from models.ai_draft import AIDraft
 from models.user import Media, MediaType, Profile, User, UserRole, UserRoleChange
 from schemas.notification import NotificationType
 from services.user.auth import AuthService
+from services.user.deletion_job import DELETION_STEPS, UserDeletionJobService
+
+
+@pytest.fixture
+def deletion_jobs(test_session: AsyncSession, monkeypatch):
+    """Run deletion jobs against the test database, a few rows per batch."""
+    monkeypatch.setattr(
+        UserDeletionJobService,
+        "SESSION_FACTORY",
+        async_sessionmaker(test_session.bind, expire_on_commit=False),
+    )
+    monkeypatch.setattr(UserDeletionJobService, "BATCH_SIZE", 1)
+    return UserDeletionJobService
 
 
 @pytest.mark.asyncio
@@ -220,6 +237,124 @@ async def test_admin_user_stats_endpoint(client_admin, test_session: AsyncSessio
         assert key in data
 
 
+async def _page_through(client_admin, params):
+    names = []
+    cursor = None
+    while True:
+        page_params = {**params, "size": 2}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = await client_admin.get("/v1/admin/users", params=page_params)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        names.extend(user["full_name"] for user in data["users"])
+        cursor = data["next_cursor"]
+        assert data["has_next"] == (cursor is not None)
+        if cursor is None:
+            return names, data
+
+
+@pytest.mark.asyncio
+async def test_admin_user_list_keyset_pages_search_and_estimated_counts(
+    client_admin, test_session: AsyncSession, monkeypatch
+):
+    test_session.add_all([
+        User(
+            email=f"keyset{index}@example.com",
+            username=f"keyset{index}",
+            full_name=f"Keyset Member {index}",
+            password="hashed",
+            role=UserRole.USER,
+            is_active=True,
+            # Members 2-4 never logged in.
+            last_login=datetime(2026, 1, 1 + index) if index < 2 else None,
+        )
+        for index in range(5)
+    ] + [
+        User(
+            email="percent@example.com",
+            username="percent",
+            full_name="Hundred % Sure",
+            password="hashed",
+            role=UserRole.USER,
+            is_active=True,
+        )
+    ])
+    await test_session.commit()
+
+    names, data = await _page_through(client_admin, {"sort": "-full_name", "search": "keyset"})
+    assert data["total"] == 5
+    assert names == [f"Keyset Member {index}" for index in range(4, -1, -1)]
+
+    # NULLs come last ascending and first descending, each tied by id.
+    names, _ = await _page_through(client_admin, {"sort": "last_login", "search": "keyset"})
+    assert names == [f"Keyset Member {index}" for index in (0, 1, 2, 3, 4)]
+    names, _ = await _page_through(client_admin, {"sort": "-last_login", "search": "keyset"})
+    assert names == [f"Keyset Member {index}" for index in (4, 3, 2, 1, 0)]
+
+    first_page = await client_admin.get(
+        "/v1/admin/users", params={"size": 2, "sort": "-full_name", "search": "keyset"}
+    )
+    cursor = first_page.json()["next_cursor"]
+    wrong_sort = await client_admin.get("/v1/admin/users", params={"cursor": cursor, "sort": "full_name"})
+    assert wrong_sort.status_code == 400
+
+    literal = await client_admin.get("/v1/admin/users", params={"search": "% S"})
+    assert [user["username"] for user in literal.json()["users"]] == ["percent"]
+    # Short terms still match anywhere in the name, username or email.
+    prefix = await client_admin.get("/v1/admin/users", params={"search": "ke"})
+    assert prefix.json()["total"] == 5
+    infix = await client_admin.get("/v1/admin/users", params={"search": "ey"})
+    assert infix.json()["total"] == 5
+
+    monkeypatch.setattr(settings, "ADMIN_USER_COUNT_ESTIMATE_CAP", 3)
+    capped = await client_admin.get(
+        "/v1/admin/users", params={"search": "keyset", "count": "estimate"}
+    )
+    assert capped.json()["total"] == 3
+    assert capped.json()["total_is_estimate"] is True
+    unfiltered = await client_admin.get("/v1/admin/users", params={"count": "estimate"})
+    # Small tables are counted (from the stats snapshot) rather than estimated.
+    assert unfiltered.json()["total_is_estimate"] is False
+    assert unfiltered.json()["total"] == 7
+
+
+@pytest.mark.asyncio
+async def test_user_stats_snapshot_is_cached_until_an_admin_change(
+    client_admin, test_session: AsyncSession
+):
+    target = User(
+        email="snapshot@example.com",
+        username="snapshotuser",
+        full_name="Snapshot User",
+        password="hashed",
+        role=UserRole.USER,
+        is_active=True,
+    )
+    test_session.add(target)
+    await test_session.commit()
+
+    first = (await client_admin.get("/v1/admin/users/stats")).json()
+    assert first["active_users"] == 2
+    assert first["user_count"] == 1
+
+    test_session.add(User(
+        email="unseen@example.com",
+        username="unseenuser",
+        full_name="Unseen User",
+        password="hashed",
+        role=UserRole.USER,
+        is_active=True,
+    ))
+    await test_session.commit()
+    assert (await client_admin.get("/v1/admin/users/stats")).json() == first
+
+    await client_admin.patch(f"/v1/admin/users/{target.uuid}/status", json={"is_active": False})
+    after = (await client_admin.get("/v1/admin/users/stats")).json()
+    assert after["total_users"] == 3
+    assert after["inactive_users"] == 1
+
+
 @pytest.mark.asyncio
 async def test_admin_cannot_deactivate_admin_account(
     client_admin, test_session: AsyncSession
@@ -320,6 +455,7 @@ async def test_admin_can_permanently_delete_regular_user_and_owned_content(
     client_admin,
     test_session: AsyncSession,
     admin_user: User,
+    deletion_jobs,
     tmp_path,
 ):
     avatar_path = tmp_path / "avatar.png"
@@ -376,9 +512,17 @@ async def test_admin_can_permanently_delete_regular_user_and_owned_content(
     await test_session.refresh(post)
 
     response = await client_admin.delete(f"/v1/admin/users/{target.uuid}/permanent")
-    assert response.status_code == 200
-    body = response.json()
-    assert body["deleted_user_uuid"] == target.uuid
+    assert response.status_code == 202
+    job = response.json()
+    assert job["deleted_user_uuid"] == target.uuid
+    assert job["status"] == "pending"
+
+    await deletion_jobs.wait_for_jobs()
+    status_response = await client_admin.get(f"/v1/admin/users/deletion-jobs/{job['job_uuid']}")
+    assert status_response.status_code == 200
+    body = status_response.json()
+    assert body["status"] == "completed"
+    assert body["steps_completed"] == body["total_steps"]
     assert body["deleted_counts"]["users"] == 1
     assert body["deleted_counts"]["posts"] == 1
     assert body["deleted_counts"]["ai_drafts"] == 1
@@ -390,12 +534,168 @@ async def test_admin_can_permanently_delete_regular_user_and_owned_content(
     assert not media_path.exists()
     assert not featured_path.exists()
 
-    deleted_user = await test_session.get(User, target.id)
-    assert deleted_user is None
+    remaining_users = await test_session.scalar(
+        select(func.count()).select_from(User).where(User.id == target.id)
+    )
+    assert remaining_users == 0
     posts = (await test_session.execute(select(Post).where(Post.author_id == target.id))).scalars().all()
     assert posts == []
 
 
+@pytest.mark.asyncio
+async def test_interrupted_deletion_job_resumes_once_its_lease_expires(
+    test_session: AsyncSession,
+    admin_user: User,
+    deletion_jobs,
+):
+    target = User(
+        email="resume-user@example.com",
+        username="resumeuser",
+        full_name="Resume User",
+        password="hashed",
+        role=UserRole.USER,
+        is_active=False,
+        follower_count=1,
+    )
+    test_session.add(target)
+    await test_session.commit()
+    await test_session.refresh(target)
+    target_id = target.id
+    post = Post(title="Resume Post", slug="resume-post", content="content", author_id=admin_user.id)
+    test_session.add(post)
+    await test_session.commit()
+    await test_session.execute(insert(post_likes).values(user_id=target_id, post_id=post.id))
+    await test_session.execute(insert(user_follows).values(follower_id=target_id, followed_id=admin_user.id))
+    await test_session.execute(insert(user_follows).values(follower_id=admin_user.id, followed_id=target_id))
+    await test_session.execute(
+        update(User)
+        .where(User.id == admin_user.id)
+        .values(follower_count=1, following_count=1)
+    )
+
+    # A worker died after finishing the first two steps.
+    job = UserDeletionJob(
+        user_id=target_id,
+        requested_by_id=admin_user.id,
+        status="running",
+        step_index=2,
+        attempts=1,
+        deleted_user={"id": target_id, "uuid": target.uuid},
+        deleted_counts={"notifications_sender_nullified": 3},
+        file_paths=[],
+        heartbeat_at=datetime.utcnow() - timedelta(seconds=deletion_jobs.LEASE_SECONDS - 60),
+    )
+    test_session.add(job)
+    await test_session.commit()
+    job_id = job.id
+
+    # Still leased: another worker may be on it.
+    await deletion_jobs.run(job_id)
+    status_row = (
+        await test_session.execute(
+            select(UserDeletionJob.status, UserDeletionJob.attempts).where(UserDeletionJob.id == job_id)
+        )
+    ).one()
+    assert tuple(status_row) == ("running", 1)
+
+    await test_session.execute(
+        update(UserDeletionJob)
+        .where(UserDeletionJob.id == job_id)
+        .values(heartbeat_at=datetime.utcnow() - timedelta(seconds=deletion_jobs.LEASE_SECONDS + 1))
+    )
+    await test_session.commit()
+    assert await deletion_jobs.resume_pending() == 1
+    await deletion_jobs.wait_for_jobs()
+
+    finished = (
+        await test_session.execute(
+            select(UserDeletionJob.status, UserDeletionJob.attempts, UserDeletionJob.deleted_counts)
+            .where(UserDeletionJob.id == job_id)
+        )
+    ).one()
+    assert finished.status == "completed"
+    assert finished.attempts == 2
+    assert finished.deleted_counts == {
+        "notifications_sender_nullified": 3,
+        "post_likes": 1,
+        "follower_counts_adjusted": 1,
+        "following_counts_adjusted": 1,
+        "user_follows": 2,
+        "users": 1,
+    }
+    counts = (
+        await test_session.execute(
+            select(User.follower_count, User.following_count).where(User.id == admin_user.id)
+        )
+    ).one()
+    assert tuple(counts) == (0, 0)
+    assert await test_session.scalar(select(func.count()).select_from(post_likes)) == 0
+
+
+@pytest.mark.asyncio
+async def test_posts_step_removes_interactions_added_after_earlier_steps(
+    test_session: AsyncSession,
+    admin_user: User,
+    deletion_jobs,
+):
+    target = User(
+        email="late-likes@example.com",
+        username="latelikes",
+        full_name="Late Likes",
+        password="hashed",
+        role=UserRole.USER,
+        is_active=False,
+    )
+    test_session.add(target)
+    await test_session.commit()
+    await test_session.refresh(target)
+    target_id = target.id
+    post = Post(title="Late Post", slug="late-post", content="content", author_id=target_id)
+    test_session.add(post)
+    await test_session.commit()
+    comment = Comment(content="late comment", post_id=post.id, author_id=admin_user.id)
+    test_session.add(comment)
+    await test_session.commit()
+    test_session.add(
+        Comment(content="late reply", post_id=post.id, author_id=admin_user.id, parent_id=comment.id)
+    )
+    await test_session.execute(insert(post_likes).values(user_id=admin_user.id, post_id=post.id))
+    await test_session.execute(insert(post_bookmarks).values(user_id=admin_user.id, post_id=post.id))
+
+    # The like, bookmark and comments arrived after their own steps had run.
+    posts_step = [step.name for step in DELETION_STEPS].index("posts")
+    job = UserDeletionJob(
+        user_id=target_id,
+        requested_by_id=admin_user.id,
+        status="pending",
+        step_index=posts_step,
+        attempts=0,
+        deleted_user={"id": target_id, "uuid": target.uuid},
+        deleted_counts={},
+        file_paths=[],
+    )
+    test_session.add(job)
+    await test_session.commit()
+
+    await deletion_jobs.run(job.id)
+
+    finished = (
+        await test_session.execute(
+            select(UserDeletionJob.status, UserDeletionJob.deleted_counts).where(UserDeletionJob.id == job.id)
+        )
+    ).one()
+    assert finished.status == "completed"
+    assert finished.deleted_counts == {
+        "post_likes": 1,
+        "post_bookmarks": 1,
+        "comments": 2,
+        "posts": 1,
+        "users": 1,
+    }
+    assert await test_session.scalar(select(func.count()).select_from(Comment)) == 0
+    assert await test_session.scalar(select(func.count()).select_from(post_bookmarks)) == 0
+
+
 @pytest.mark.asyncio
 async def test_admin_cannot_permanently_delete_admin_account(
     client_admin, test_session: AsyncSession
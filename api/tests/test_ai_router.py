@@ -6,8 +6,8 @@ from routers.v1.ai import router as ai_router
 from services.ai.generator import AIGeneratorService
 from services.ai.blog_agent import BlogAgentService
 from services.post import PostService
-from services.user.auth import get_current_active_user
-from database.connection import get_db_session
+from services.user.auth import AuthService, get_current_active_background_user, get_current_active_user
+from database.connection import get_background_db_session, get_db_session
 
 
 class DummyUser:
@@ -28,7 +28,9 @@ def app():
         yield None
 
     app.dependency_overrides[get_current_active_user] = _fake_user
+    app.dependency_overrides[get_current_active_background_user] = _fake_user
     app.dependency_overrides[get_db_session] = _fake_db
+    app.dependency_overrides[get_background_db_session] = _fake_db
     return app
 
 
@@ -255,8 +257,9 @@ async def test_generate_blog_publish_persists_quality_metadata(app, monkeypatch)
 
     captured = {}
 
-    async def fake_create_post(session, post_data, author_id):
+    async def fake_create_post(session, post_data, author_id, regenerate_slug_on_conflict=False):
         captured["post_data"] = post_data
+        captured["regenerate_slug_on_conflict"] = regenerate_slug_on_conflict
 
         class _CreatedPost:
             uuid = "post-uuid-123"
@@ -281,9 +284,42 @@ async def test_generate_blog_publish_persists_quality_metadata(app, monkeypatch)
     assert resp.status_code == status.HTTP_200_OK
     data = resp.json()
     assert data["post_id"] == "post-uuid-123"
+    assert captured["regenerate_slug_on_conflict"] is True
 
     persisted = captured["post_data"].content_blocks
     assert "ai_generation" in persisted
     assert persisted["ai_generation"]["generator"] == "blog-agent"
     assert "quality_report" in persisted["ai_generation"]
     assert "phase_metrics" in persisted["ai_generation"]
+
+
+@pytest.mark.asyncio
+async def test_generate_blog_authenticates_on_the_background_session(
+    test_session, author_user, monkeypatch
+):
+    from core.config import settings
+
+    async def background_session():
+        yield test_session
+
+    async def no_interactive_session():
+        raise AssertionError("generate_blog must not check out an interactive connection")
+        yield
+
+    async def fake_blog_generate(self, **kwargs):
+        raise ValueError("Quality validation failed after retry")
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(BlogAgentService, "generate", fake_blog_generate, raising=True)
+    app = FastAPI()
+    app.include_router(ai_router, prefix="/v1")
+    app.dependency_overrides[get_db_session] = no_interactive_session
+    app.dependency_overrides[get_background_db_session] = background_session
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        resp = await ac.post(
+            "/v1/ai/generate/blog",
+            json={"topic": "Build an AI article writer", "save_draft": False, "publish_post": False},
+            headers={"Authorization": f"Bearer {AuthService._issue_jwt(author_user)}"},
+        )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -137,3 +137,56 @@ async def test_password_reset_request_stores_hashed_token_and_confirms_with_raw_
         )
     ).scalars().all()
     assert all(token.used for token in stored_tokens)
+
+
+@pytest.mark.asyncio
+async def test_authenticated_user_is_served_from_cache_until_invalidated(
+    client_super_admin,
+    author_user: User,
+    test_engine,
+    monkeypatch,
+):
+    from fastapi.security import HTTPAuthorizationCredentials
+    from sqlalchemy.orm import sessionmaker
+
+    from core.config import settings
+    from services.user.auth import get_current_user
+    from services.user.auth_cache import AuthUserCache
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer",
+        credentials=AuthService._issue_jwt(author_user),
+    )
+    request_session = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with request_session() as session:
+        user = await get_current_user(credentials, session)
+        assert user.id == author_user.id
+
+    snapshot = AuthUserCache._entries[author_user.uuid][1]
+    assert "password" not in snapshot
+    assert AuthUserCache._decode(AuthUserCache._encode(snapshot)) == snapshot
+
+    async def fail_lookup(*args, **kwargs):
+        raise AssertionError("cached user should not hit the database")
+
+    original_lookup = AuthService.get_user_by_email
+    monkeypatch.setattr(AuthService, "get_user_by_email", fail_lookup)
+    async with request_session() as session:
+        cached = await get_current_user(credentials, session)
+        assert cached.id == author_user.id
+        assert cached.role == UserRole.USER
+        assert cached in session
+    monkeypatch.setattr(AuthService, "get_user_by_email", original_lookup)
+
+    response = await client_super_admin.patch(
+        f"/v1/admin/users/{author_user.uuid}/status",
+        json={"is_active": False},
+    )
+    assert response.status_code == 200, response.text
+    assert author_user.uuid not in AuthUserCache._entries
+
+    async with request_session() as session:
+        refreshed = await get_current_user(credentials, session)
+        assert refreshed.is_active is False
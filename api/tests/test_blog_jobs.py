@@ -0,0 +1,228 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models import AIDraft, BlogGenerationJob
+from schemas.ai import BlogPost, BlogSection
+from services.ai.blog_agent import BlogAgentService
+from services.ai.blog_jobs import BlogGenerationJobService
+from services.ai.drafts import AIDraftService
+
+
+@pytest.fixture
+def blog_jobs(test_session: AsyncSession, monkeypatch):
+    """Run blog generation jobs against the test database."""
+    monkeypatch.setattr(
+        BlogGenerationJobService,
+        "SESSION_FACTORY",
+        async_sessionmaker(test_session.bind, expire_on_commit=False),
+    )
+    monkeypatch.setattr(BlogGenerationJobService, "EVENT_POLL_SECONDS", 0.05)
+    return BlogGenerationJobService
+
+
+def _blog_post() -> BlogPost:
+    return BlogPost(
+        title="How to Queue Long Running AI Generations",
+        slug="how-to-queue-long-running-ai-generations",
+        summary=(
+            "A walkthrough of moving slow, multi-phase AI generations off the "
+            "request path and onto a bounded job queue with visible progress."
+        ),
+        sections=[
+            BlogSection(heading="Introduction", body_markdown=" ".join(["word"] * 200)),
+            BlogSection(heading="Queueing Work", body_markdown=" ".join(["word"] * 220)),
+            BlogSection(heading="Reporting Progress", body_markdown=" ".join(["word"] * 230)),
+            BlogSection(heading="Conclusion and Next Steps", body_markdown=" ".join(["word"] * 210)),
+        ],
+        tags=["ai-writing", "job-queues", "content-ops"],
+        seo_title="How to Queue Long Running AI Generations",
+        seo_description=(
+            "Learn how to run slow AI blog generations as queued jobs that report "
+            "their progress and survive clients that disconnect."
+        ),
+    )
+
+
+async def _wait_for_phase(client, job_id: str, phase: str) -> None:
+    for _ in range(200):
+        body = (await client.get(f"/v1/ai/generate/blog/jobs/{job_id}")).json()
+        if body["phase"] == phase:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {phase}: {body}")
+
+
+@pytest.mark.asyncio
+async def test_blog_job_reports_phases_and_streams_result(
+    client_author, test_session: AsyncSession, author_user, blog_jobs, monkeypatch
+):
+    release = asyncio.Event()
+    calls = []
+
+    async def fake_generate(self, **kwargs):
+        calls.append(kwargs["editorial_skip_after_s"])
+        for phase in ("research", "outline", "draft"):
+            await kwargs["on_phase"](phase)
+        await release.wait()
+        await kwargs["on_phase"]("editorial")
+        return _blog_post(), 1.5, False, None
+
+    monkeypatch.setattr(BlogAgentService, "generate", fake_generate, raising=True)
+    payload = {"topic": "Queue long running AI generations", "save_draft": True}
+
+    submitted = await client_author.post("/v1/ai/generate/blog/jobs", json=payload)
+    assert submitted.status_code == 202, submitted.text
+    job_id = submitted.json()["job_id"]
+    assert submitted.json()["status"] == "queued"
+
+    await _wait_for_phase(client_author, job_id, "draft")
+    running = (await client_author.get(f"/v1/ai/generate/blog/jobs/{job_id}")).json()
+    assert running["status"] == "running"
+    assert [entry["phase"] for entry in running["progress"]] == ["research", "outline", "draft"]
+
+    second = await client_author.post("/v1/ai/generate/blog/jobs", json=payload)
+    assert second.status_code == 202
+    too_many = await client_author.post("/v1/ai/generate/blog/jobs", json=payload)
+    assert too_many.status_code == 429
+
+    stream = asyncio.create_task(client_author.get(f"/v1/ai/generate/blog/jobs/{job_id}/events"))
+    await asyncio.sleep(0.1)
+    release.set()
+    response = await stream
+    await blog_jobs.wait_for_jobs()
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in response.text.strip().split("\n\n")
+        if block.startswith("event: ")
+    ]
+    assert events[0][0] == "progress"
+    assert events[0][1]["phase"] == "draft"
+    final_event, final = events[-1]
+    assert final_event == "completed"
+    assert [entry["phase"] for entry in final["progress"]] == [
+        "research", "outline", "draft", "editorial", "saving",
+    ]
+    assert final["result"]["blog_post"]["slug"] == "how-to-queue-long-running-ai-generations"
+    assert final["result"]["draft_id"]
+    assert calls == [blog_jobs.EDITORIAL_SKIP_AFTER_S] * 2
+
+    drafts = (
+        await test_session.execute(select(AIDraft.uuid).where(AIDraft.user_id == author_user.id))
+    ).scalars().all()
+    assert final["result"]["draft_id"] in drafts
+
+    missing = await client_author.get("/v1/ai/generate/blog/jobs/not-a-job")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_resume_requeues_queued_jobs_and_fails_abandoned_ones(
+    client_author, test_session: AsyncSession, author_user, blog_jobs, monkeypatch
+):
+    async def rejected_generate(self, **kwargs):
+        await kwargs["on_phase"]("research")
+        raise ValueError("Quality validation failed after retry")
+
+    monkeypatch.setattr(BlogAgentService, "generate", rejected_generate, raising=True)
+    request = {"topic": "Resume queued blog generations", "save_draft": False}
+    queued = BlogGenerationJob(user_id=author_user.id, status="queued", progress=[], request=request)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    lapsed = now - timedelta(seconds=blog_jobs.LEASE_SECONDS + 1)
+    abandoned = BlogGenerationJob(
+        user_id=author_user.id,
+        status="running",
+        phase="draft",
+        progress=[],
+        request=request,
+        started_at=lapsed,
+        heartbeat_at=lapsed,
+    )
+    # Another worker is still checking in on this one.
+    alive = BlogGenerationJob(
+        user_id=author_user.id,
+        status="running",
+        phase="draft",
+        progress=[],
+        request=request,
+        started_at=lapsed,
+        heartbeat_at=now,
+    )
+    test_session.add_all([queued, abandoned, alive])
+    await test_session.commit()
+
+    assert await blog_jobs.resume_pending() == 1
+    await blog_jobs.wait_for_jobs()
+    assert await test_session.scalar(
+        select(BlogGenerationJob.status).where(BlogGenerationJob.id == alive.id)
+    ) == "running"
+
+    # Its worker dies: the next sweep fails it.
+    await test_session.execute(
+        update(BlogGenerationJob).where(BlogGenerationJob.id == alive.id).values(heartbeat_at=lapsed)
+    )
+    await test_session.commit()
+    assert await blog_jobs.fail_abandoned() == 1
+    await blog_jobs.shutdown()
+
+    rows = {
+        row.uuid: row
+        for row in (
+            await test_session.execute(
+                select(
+                    BlogGenerationJob.uuid,
+                    BlogGenerationJob.status,
+                    BlogGenerationJob.error,
+                    BlogGenerationJob.error_status,
+                    BlogGenerationJob.finished_at,
+                )
+            )
+        ).all()
+    }
+    assert rows[queued.uuid].status == "failed"
+    assert rows[queued.uuid].error_status == 400
+    assert rows[queued.uuid].error == "Quality validation failed after retry"
+    for job in (abandoned, alive):
+        assert rows[job.uuid].status == "failed"
+        assert rows[job.uuid].error == "Generation was interrupted"
+    assert all(row.finished_at is not None for row in rows.values())
+
+
+@pytest.mark.asyncio
+async def test_job_stopped_while_saving_is_failed_not_requeued(
+    client_author, test_session: AsyncSession, author_user, blog_jobs, monkeypatch
+):
+    saving = asyncio.Event()
+
+    async def fake_generate(self, **kwargs):
+        return _blog_post(), 1.0, False, None
+
+    async def stalled_create_draft(*args, **kwargs):
+        saving.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(BlogAgentService, "generate", fake_generate, raising=True)
+    monkeypatch.setattr(AIDraftService, "create_draft", stalled_create_draft, raising=True)
+
+    submitted = await client_author.post(
+        "/v1/ai/generate/blog/jobs", json={"topic": "Stop while saving", "save_draft": True}
+    )
+    assert submitted.status_code == 202, submitted.text
+    await asyncio.wait_for(saving.wait(), 5)
+    await blog_jobs.shutdown()
+
+    job = (
+        await test_session.execute(
+            select(BlogGenerationJob.status, BlogGenerationJob.error).where(
+                BlogGenerationJob.uuid == submitted.json()["job_id"]
+            )
+        )
+    ).one()
+    assert job.status == "failed"
+    assert job.error.startswith("Generation was interrupted while saving")
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from models import Post
+from services.post.content import ContentDigest, ContentProcessor
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+
+
+def test_digest_prefers_blocks_and_falls_back_to_html():
+    blocks = {"blocks": [
+        {"type": "header", "data": {"text": "Scaling Postgres"}},
+        {"type": "paragraph", "data": {"text": "Replicas &amp; <b>connection</b> pools"}},
+        {"type": "list", "data": {"items": ["one", {"content": "two", "items": ["three"]}]}},
+    ]}
+    digest = ContentProcessor.digest("<p>ignored</p>", blocks)
+    assert digest.plain_text == "Scaling Postgres Replicas & connection pools one two three"
+    assert digest.first_paragraph == "Replicas & connection pools"
+    assert digest.word_count == 9
+    assert digest.keywords == {"replicas", "connection", "pools"}
+    assert digest.reading_time == 1
+
+    html = ContentProcessor.digest("<h2>Intro</h2><p> </p><p>Second   paragraph</p>", None)
+    assert html.first_paragraph == "Second paragraph"
+    assert html.plain_text == "Intro Second paragraph"
+
+
+def test_digest_is_cached_by_content_hash(monkeypatch):
+    calls = []
+    original = ContentProcessor._parse
+
+    def counting_parse(*args):
+        calls.append(args[0])
+        return original(*args)
+
+    monkeypatch.setattr(ContentProcessor, "_parse", counting_parse)
+    first = ContentProcessor.digest("<p>Same body</p>", None)
+    second = ContentProcessor.digest("<p>Same body</p>", None)
+    ContentProcessor.digest("<p>Other body</p>", None)
+
+    assert first is second
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_post_writes_store_digest_and_reads_reuse_it(client_author, test_session, monkeypatch):
+    response = await client_author.post("/v1/posts/", data={
+        "title": "Digest Post",
+        "content": "<p>Kubernetes operators reconcile state</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+    })
+    assert response.status_code == 201, response.text
+    post_uuid = response.json()["uuid"]
+
+    async def stored_digest():
+        # Column-only reads keep the shared session's identity map untouched.
+        result = await test_session.execute(
+            select(Post.content, Post.content_blocks, Post.content_hash, Post.content_metadata)
+            .where(Post.uuid == post_uuid)
+        )
+        return result.one()
+
+    row = await stored_digest()
+    assert row.content_hash == ContentProcessor.content_hash(row.content, row.content_blocks)
+    assert row.content_metadata["keywords"] == ["kubernetes", "operators", "reconcile", "state"]
+
+    updated = await client_author.put(f"/v1/posts/{post_uuid}", data={
+        "content": "<p>Terraform modules compose</p>",
+    })
+    assert updated.status_code == 200, updated.text
+    updated_row = await stored_digest()
+    assert updated_row.content_hash != row.content_hash
+    assert updated_row.content_metadata["first_paragraph"] == "Terraform modules compose"
+
+    def fail_parse(*args):
+        raise AssertionError("stored digest should be used")
+
+    ContentProcessor.reset()
+    monkeypatch.setattr(ContentProcessor, "_parse", fail_parse)
+    post = Post(
+        content=updated_row.content,
+        content_hash=updated_row.content_hash,
+        content_metadata=updated_row.content_metadata,
+    )
+    digest = ContentProcessor.digest_for_post(post)
+    assert digest.keywords == {"terraform", "modules", "compose"}
+
+
+def test_apply_to_post_rewrites_metadata_from_older_versions():
+    post = Post(title="Old", slug="old", content="<p>Unchanged body text</p>", content_blocks=None)
+    ContentProcessor.apply_to_post(post)
+    assert post.content_metadata["version"] == ContentDigest.METADATA_VERSION
+
+    # Same body, but stored by an older digest format.
+    post.content_metadata = {"version": ContentDigest.METADATA_VERSION - 1, "word_count": 0}
+    ContentProcessor.apply_to_post(post)
+    assert post.content_metadata["version"] == ContentDigest.METADATA_VERSION
+    assert post.content_metadata["word_count"] == 3
+    assert ContentProcessor.digest_for_post(post).first_paragraph == "Unchanged body text"
+
+
+def test_html_metrics_come_from_one_scan():
+    html = (
+        "<h1>Guide</h1><p>First <em>para</em>graph here</p>"
+        "<img src='a.png'><h3>Deep &amp; dive</h3><p>More</p><figure><img src='b.png'/></figure>"
+    )
+    digest = ContentProcessor.digest(html, None)
+    assert digest.heading_outline == [
+        {"level": 1, "text": "Guide"},
+        {"level": 3, "text": "Deep & dive"},
+    ]
+    assert digest.image_count == 2
+    assert digest.first_paragraph == "First para graph here"
+    assert digest.word_count == 9
+
+    long_body = "<p>" + "word " * 401 + "</p>"
+    assert ContentProcessor.digest(long_body, None).reading_time == 3
+
+
+@pytest.mark.asyncio
+async def test_reading_time_and_metrics_are_computed_server_side(client_author):
+    blocks = {"blocks": [
+        {"type": "header", "data": {"text": "Setup", "level": 2}},
+        {"type": "paragraph", "data": {"text": "word " * 250}},
+        {"type": "image", "data": {"caption": "Diagram"}},
+    ]}
+    response = await client_author.post("/v1/posts/", data={
+        "title": "Metrics Post",
+        "content": "<p>fallback</p>",
+        "content_blocks": json.dumps(blocks),
+        "reading_time": "42",
+        "is_published": "false",
+    })
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["word_count"] == 252
+    assert body["reading_time"] == 2
+    assert body["image_count"] == 1
+    assert body["heading_outline"] == [{"level": 2, "text": "Setup"}]
+
+
+@pytest.mark.asyncio
+async def test_backfill_script_fills_legacy_posts(test_session, author_user):
+    from scripts.backfill_post_content_metrics import backfill
+
+    test_session.add_all([
+        Post(title="Legacy", slug="legacy", content="<h2>Old</h2><p>legacy body text</p>", author_id=author_user.id),
+        Post(title="Legacy 2", slug="legacy_2", content="<p>more</p>", author_id=author_user.id),
+    ])
+    await test_session.commit()
+
+    report = await backfill(test_session, batch_size=1, dry_run=False)
+    assert report == {"checked": 2, "updated": 2}
+
+    rows = (await test_session.execute(
+        select(Post.slug, Post.word_count, Post.reading_time, Post.heading_outline).order_by(Post.id)
+    )).all()
+    assert [tuple(row) for row in rows] == [
+        ("legacy", 4, 1, [{"level": 2, "text": "Old"}]),
+        ("legacy_2", 1, 1, []),
+    ]
+    assert await backfill(test_session, batch_size=10, dry_run=True) == {"checked": 2, "updated": 0}
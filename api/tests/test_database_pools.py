@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import text
+
+from database import connection
+
+
+@pytest.mark.asyncio
+async def test_registered_workload_engine_reports_pool_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(connection, "_engines", dict(connection._engines))
+    monkeypatch.setattr(connection, "_sessionmakers", dict(connection._sessionmakers))
+
+    engine = connection.create_engine_for(
+        connection.ENGINE_ANALYTICS,
+        f"sqlite+aiosqlite:///{tmp_path / 'analytics.sqlite3'}",
+    )
+    connection.register_engine(connection.ENGINE_ANALYTICS, engine)
+    try:
+        async with connection.get_sessionmaker(connection.ENGINE_ANALYTICS)() as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            during = connection.pool_stats()[connection.ENGINE_ANALYTICS]
+            assert during["checked_out"] == 1
+
+        stats = connection.pool_stats()[connection.ENGINE_ANALYTICS]
+        assert stats["pool_class"] == "MeteredQueuePool"
+        assert stats["size"] == connection.POOL_SIZES[connection.ENGINE_ANALYTICS][0]
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 1
+        assert stats["checkout_timeouts"] == 0
+    finally:
+        await engine.dispose()
+
+
+def test_replica_falls_back_to_interactive_engine_without_replica_url(monkeypatch):
+    monkeypatch.setattr(connection.settings, "DATABASE_REPLICA_URL", "")
+    monkeypatch.setattr(connection, "_engines", dict(connection._engines))
+    monkeypatch.setattr(connection, "_sessionmakers", dict(connection._sessionmakers))
+    connection._engines.pop(connection.ENGINE_REPLICA, None)
+
+    assert connection.get_engine(connection.ENGINE_REPLICA) is connection.engine
+    assert connection.get_sessionmaker(connection.ENGINE_REPLICA) is connection.AsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_pool_health_endpoint_lists_interactive_pool(client_author):
+    response = await client_author.get("/health/pools")
+    assert response.status_code == 200, response.text
+    assert "interactive" in response.json()["pools"]
@@ -0,0 +1,65 @@
+import pytest
+
+from models.user import User, UserRole
+from services.loader import EntityLoader
+
+
+async def _create_users(session, count):
+    users = [
+        User(
+            email=f"loader{index}@example.com",
+            username=f"loader{index}",
+            full_name=f"Loader {index}",
+            password="hashed",
+            role=UserRole.USER,
+            is_active=True,
+        )
+        for index in range(count)
+    ]
+    session.add_all(users)
+    await session.commit()
+    for user in users:
+        await session.refresh(user)
+    return users
+
+
+@pytest.mark.asyncio
+async def test_loader_is_scoped_to_the_session(test_session):
+    assert EntityLoader.for_session(test_session) is EntityLoader.for_session(test_session)
+
+
+@pytest.mark.asyncio
+async def test_load_many_coalesces_into_one_query_and_memoizes(test_session):
+    users = await _create_users(test_session, 3)
+    loader = EntityLoader.for_session(test_session)
+
+    found = await loader.load_many(User, "id", [user.id for user in users] + [users[0].id])
+    assert set(found) == {user.id for user in users}
+    assert loader.query_count == 1
+
+    # Rows are indexed under every key column, so uuid lookups are hits too.
+    assert await loader.load(User, "uuid", users[1].uuid) is found[users[1].id]
+    assert await loader.load(User, "id", users[2].id) is found[users[2].id]
+    assert loader.query_count == 1
+
+
+@pytest.mark.asyncio
+async def test_primed_keys_join_the_next_batch(test_session):
+    first, second, third = await _create_users(test_session, 3)
+    loader = EntityLoader.for_session(test_session)
+
+    loader.prime_keys(User, "id", [second.id, third.id])
+    assert (await loader.load(User, "id", first.id)).id == first.id
+    assert loader.query_count == 1
+
+    assert (await loader.load(User, "id", third.id)).id == third.id
+    assert loader.query_count == 1
+
+
+@pytest.mark.asyncio
+async def test_misses_are_not_memoized(test_session):
+    loader = EntityLoader.for_session(test_session)
+    assert await loader.load(User, "username", "latecomer") is None
+
+    (user,) = await _create_users(test_session, 1)
+    assert (await loader.load(User, "id", user.id)).id == user.id
@@ -0,0 +1,111 @@
+import io
+
+import pytest
+
+from services.image_derivatives import ImageDerivativeService
+from services.media_store import MediaStore
+
+PIL_Image = pytest.importorskip("PIL.Image")
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+
+
+@pytest.fixture
+def blob_root(tmp_path, monkeypatch):
+    root = tmp_path / "blobs"
+    monkeypatch.setattr(MediaStore, "ROOT", root)
+    monkeypatch.setattr(ImageDerivativeService, "WIDTHS", [300, 600])
+    monkeypatch.setattr(ImageDerivativeService, "FORMATS", ["webp"])
+    return root
+
+
+def _png(width=800, height=400):
+    buffer = io.BytesIO()
+    PIL_Image.new("RGB", (width, height), (200, 80, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def _upload(client, content):
+    response = await client.post(
+        "/v1/posts/upload-image",
+        files={"file": ("photo.png", content, "image/png")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["filename"]
+
+
+def _size(content):
+    with PIL_Image.open(io.BytesIO(content)) as image:
+        return image.size
+
+
+@pytest.mark.asyncio
+async def test_width_variants_are_negotiated_rendered_once_and_reused(client_author, blob_root, monkeypatch):
+    filename = await _upload(client_author, _png())
+
+    response = await client_author.get(
+        f"/v1/uploads/images/{filename}?folder=posts&w=250",
+        headers={"Accept": "image/avif,image/webp,*/*"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["vary"] == "Accept"
+    assert _size(response.content) == (300, 150)
+
+    render_once = ImageDerivativeService._render_once
+
+    async def no_render(*args):
+        raise AssertionError("derivative should be served from disk")
+
+    monkeypatch.setattr(ImageDerivativeService, "_render_once", no_render)
+    again = await client_author.get(
+        f"/v1/uploads/images/{filename}?folder=posts&w=300",
+        headers={"Accept": "image/webp"},
+    )
+    assert again.content == response.content
+
+    # No upscaling past the original; PNG without a negotiated format stays PNG.
+    monkeypatch.setattr(ImageDerivativeService, "_render_once", render_once)
+    monkeypatch.setattr(ImageDerivativeService, "WIDTHS", [300, 600, 1600])
+    large = await client_author.get(f"/v1/uploads/images/{filename}?folder=posts&w=1600")
+    assert large.headers["content-type"] == "image/png"
+    assert _size(large.content) == (800, 400)
+
+
+@pytest.mark.asyncio
+async def test_share_pages_use_exact_social_crop(client_author, client_public, blob_root):
+    filename = await _upload(client_author, _png(500, 500))
+    create = await client_author.post("/v1/posts/", data={
+        "title": "Social Crop Post",
+        "content": "<p>Body for a post with a square featured image.</p>",
+        "excerpt": VALID_EXCERPT,
+        "featured_image_path": f"uploads/posts/{filename}",
+        "is_published": "true",
+    })
+    assert create.status_code == 201, create.text
+
+    html = (await client_public.get(f"/share/posts/{create.json()['slug']}")).text
+    assert f"/uploads/images/{filename}?folder=posts&amp;w=social" in html
+
+    crop = await client_public.get(f"/v1/uploads/images/{filename}?folder=posts&w=social")
+    assert crop.status_code == 200, crop.text
+    assert crop.headers["content-type"] == "image/jpeg"
+    assert _size(crop.content) == (1200, 630)
+
+
+@pytest.mark.asyncio
+async def test_originals_served_when_derivatives_unavailable(client_author, blob_root, monkeypatch):
+    content = _png()
+    filename = await _upload(client_author, content)
+
+    invalid = await client_author.get(f"/v1/uploads/images/{filename}?folder=posts&w=wide")
+    assert invalid.status_code == 400
+
+    monkeypatch.setattr(ImageDerivativeService, "ENABLED", False)
+    response = await client_author.get(f"/v1/uploads/images/{filename}?folder=posts&w=300")
+    assert response.status_code == 200
+    assert response.content == content
+    assert not MediaStore.derived_dir(filename).exists()
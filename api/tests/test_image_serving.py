@@ -0,0 +1,136 @@
+import os
+from email.utils import formatdate
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from services.image_serving import ImageServer
+from services.media_store import MediaStore
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def blob_root(tmp_path, monkeypatch):
+    root = tmp_path / "blobs"
+    monkeypatch.setattr(MediaStore, "ROOT", root)
+    return root
+
+
+async def _upload(client):
+    response = await client.post(
+        "/v1/posts/upload-image",
+        files={"file": ("image.png", IMAGE_BYTES, "image/png")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["filename"]
+
+
+@pytest.mark.asyncio
+async def test_content_addressed_images_are_immutable_with_conditional_and_range_support(
+    client_author,
+    blob_root,
+):
+    filename = await _upload(client_author)
+    url = f"/v1/uploads/images/{filename}?folder=posts"
+
+    response = await client_author.get(url)
+    assert response.status_code == 200
+    assert response.content == IMAGE_BYTES
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    etag = response.headers["etag"]
+    assert etag == f'"{Path(filename).stem}"'
+
+    cached = await client_author.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    partial = await client_author.get(url, headers={"Range": "bytes=8-15"})
+    assert partial.status_code == 206
+    assert partial.content == IMAGE_BYTES[8:16]
+    assert partial.headers["content-range"] == f"bytes 8-15/{len(IMAGE_BYTES)}"
+
+    stale_range = await client_author.get(url, headers={"Range": "bytes=8-15", "If-Range": '"stale"'})
+    assert stale_range.status_code == 200
+    assert stale_range.content == IMAGE_BYTES
+
+
+@pytest.mark.asyncio
+async def test_legacy_images_revalidate_and_reuse_cached_stat(client_public, monkeypatch):
+    uploads_dir = Path("uploads/posts")
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    filename = f"{uuid4()}.jpg"
+    file_path = uploads_dir / filename
+    file_path.write_bytes(b"legacy image bytes")
+    url = f"/v1/uploads/images/{filename}?folder=posts"
+
+    try:
+        response = await client_public.get(url)
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == f"public, max-age={ImageServer.CACHE_MAX_AGE_SECONDS}"
+        assert response.headers["last-modified"]
+
+        stat_calls = []
+        real_stat = os.stat
+
+        def counting_stat(path, *args, **kwargs):
+            stat_calls.append(str(path))
+            return real_stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", counting_stat)
+        not_modified = await client_public.get(
+            url, headers={"If-Modified-Since": formatdate(usegmt=True)}
+        )
+        monkeypatch.setattr(os, "stat", real_stat)
+        assert not_modified.status_code == 304
+        assert str(file_path) not in stat_calls
+
+        modified = await client_public.get(
+            url, headers={"If-Modified-Since": formatdate(0, usegmt=True)}
+        )
+        assert modified.status_code == 200
+    finally:
+        file_path.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_image_deleted_within_the_stat_ttl_is_not_found(client_public):
+    uploads_dir = Path("uploads/posts")
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    filename = f"{uuid4()}.jpg"
+    file_path = uploads_dir / filename
+    file_path.write_bytes(b"legacy image bytes")
+    url = f"/v1/uploads/images/{filename}?folder=posts"
+
+    try:
+        assert (await client_public.get(url)).status_code == 200
+        # Removed behind the cache's back, as another worker would.
+        os.remove(file_path)
+        response = await client_public.get(url)
+        assert response.status_code == 404
+        assert ImageServer.stat(file_path) is None
+    finally:
+        file_path.unlink(missing_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_offload_headers_hand_the_body_to_the_proxy(client_author, blob_root, tmp_path, monkeypatch):
+    filename = await _upload(client_author)
+    url = f"/v1/uploads/images/{filename}?folder=posts"
+    monkeypatch.setattr(ImageServer, "UPLOADS_ROOT", tmp_path)
+
+    monkeypatch.setattr(ImageServer, "OFFLOAD_HEADER", "x-accel-redirect")
+    response = await client_author.get(url)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["x-accel-redirect"] == (
+        f"/internal-uploads/blobs/{filename[:2]}/{filename[2:4]}/{filename}"
+    )
+    assert response.headers["etag"] == f'"{Path(filename).stem}"'
+
+    monkeypatch.setattr(ImageServer, "OFFLOAD_HEADER", "x-sendfile")
+    response = await client_author.get(url)
+    assert response.headers["x-sendfile"] == str(MediaStore.blob_path(filename).resolve())
@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import update
+
+from models import Post
+from models.user import Media, MediaType
+from services.media_store import MediaStore
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"pixels" * 100
+
+
+@pytest.fixture
+def blob_root(tmp_path, monkeypatch):
+    root = tmp_path / "blobs"
+    monkeypatch.setattr(MediaStore, "ROOT", root)
+    monkeypatch.setattr(MediaStore, "REUSE_GRACE_SECONDS", 0)
+    return root
+
+
+async def _upload(client, content=IMAGE_BYTES, name="image.png"):
+    response = await client.post(
+        "/v1/posts/upload-image",
+        files={"file": (name, content, "image/png")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["file_path"]
+
+
+async def _create_post(client, title, featured_image_path):
+    response = await client.post("/v1/posts/", data={
+        "title": title,
+        "content": "<p>Body text for a post that shares its featured image.</p>",
+        "excerpt": VALID_EXCERPT,
+        "featured_image_path": featured_image_path,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["uuid"]
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_one_sharded_blob(client_author, blob_root):
+    first = await _upload(client_author)
+    second = await _upload(client_author, name="copy.PNG")
+
+    assert first == second
+    filename = first.rsplit("/", 1)[1]
+    assert first == f"uploads/posts/{filename}"
+    blobs = [path for path in blob_root.rglob("*") if path.is_file()]
+    assert blobs == [blob_root / filename[:2] / filename[2:4] / filename]
+
+    served = await client_author.get(f"/v1/uploads/images/{filename}?folder=posts")
+    assert served.status_code == 200, served.text
+    assert served.content == IMAGE_BYTES
+    assert served.headers["content-type"].startswith("image/png")
+
+
+@pytest.mark.asyncio
+async def test_replaced_image_is_deleted_only_after_its_last_reference(client_author, blob_root):
+    shared = await _upload(client_author)
+    replacement = await _upload(client_author, content=b"other image bytes")
+    first_uuid = await _create_post(client_author, "First Shared Image Post", shared)
+    second_uuid = await _create_post(client_author, "Second Shared Image Post", shared)
+    shared_blob = MediaStore.blob_path(MediaStore.blob_filename(shared))
+
+    response = await client_author.put(f"/v1/posts/{first_uuid}", data={"featured_image_path": replacement})
+    assert response.status_code == 200, response.text
+    assert shared_blob.exists()
+
+    response = await client_author.put(f"/v1/posts/{second_uuid}", data={"featured_image_path": replacement})
+    assert response.status_code == 200, response.text
+    assert not shared_blob.exists()
+    assert MediaStore.blob_path(MediaStore.blob_filename(replacement)).exists()
+
+
+@pytest.mark.asyncio
+async def test_reference_count_spans_posts_media_and_grace_period(
+    client_author,
+    test_session,
+    author_user,
+    blob_root,
+    monkeypatch,
+):
+    post_path = await _upload(client_author)
+    filename = MediaStore.blob_filename(post_path)
+    post_uuid = await _create_post(client_author, "Counted Image Post", post_path)
+    test_session.add(Media(
+        user_id=author_user.id,
+        file_path=MediaStore.logical_path("media", filename),
+        file_name="image.png",
+        file_type=MediaType.IMAGE,
+        file_size=len(IMAGE_BYTES),
+        mime_type="image/png",
+    ))
+    await test_session.commit()
+
+    assert await MediaStore.reference_count(test_session, filename) == 2
+    await test_session.execute(update(Post).where(Post.uuid == post_uuid).values(featured_image=None))
+    await test_session.commit()
+    assert await MediaStore.release(test_session, post_path) is False
+
+    await test_session.execute(update(Media).where(Media.user_id == author_user.id).values(file_path="gone"))
+    await test_session.commit()
+    monkeypatch.setattr(MediaStore, "REUSE_GRACE_SECONDS", 600)
+    # Unreferenced but just stored: left for the orphan sweep.
+    assert await MediaStore.release(test_session, post_path) is False
+
+    monkeypatch.setattr(MediaStore, "REUSE_GRACE_SECONDS", 0)
+    assert await MediaStore.release(test_session, post_path) is True
+    assert not MediaStore.blob_path(filename).exists()
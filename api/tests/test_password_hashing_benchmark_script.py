@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from services.user.auth import AuthService
+from services.user.password_hashing import PasswordHashPool
+
+
+SCRIPT_PATH = (
+    Path(__file__).resolve().parents[1] / "scripts" / "benchmark_password_hashing.py"
+)
+SPEC = importlib.util.spec_from_file_location("benchmark_password_hashing", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+def test_parse_modes_deduplicates_and_rejects_unknown():
+    assert MODULE.parse_modes("pool,inline,pool") == ["pool", "inline"]
+    with pytest.raises(ValueError):
+        MODULE.parse_modes("inline,threads")
+
+
+def test_summarize_latencies_reports_percentiles():
+    summary = MODULE.summarize_latencies([float(value) for value in range(1, 101)])
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50.5
+    assert summary["p99_ms"] == 99.01
+    assert summary["max_ms"] == 100.0
+    assert MODULE.summarize_latencies([])["p99_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_benchmark_runs_both_modes_with_cheap_hashes():
+    args = argparse.Namespace(
+        modes="inline,pool",
+        logins=4,
+        concurrency=2,
+        rounds=4,
+        probe_interval_ms=1.0,
+    )
+    results = await MODULE.run_benchmark(args)
+    assert [result["mode"] for result in results] == ["inline", "pool"]
+    assert all(result["login_statuses"] == {200: 4} for result in results)
+    assert results[1]["pool"]["completed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_hash_pool_verifies_off_loop_and_sheds_excess_load(monkeypatch):
+    hashed = await AuthService.get_password_hash_async("correct horse")
+    assert await AuthService.verify_password_async("correct horse", hashed)
+    assert not await AuthService.verify_password_async("wrong horse", hashed)
+
+    monkeypatch.setattr(PasswordHashPool, "MAX_WORKERS", 1)
+    monkeypatch.setattr(PasswordHashPool, "MAX_QUEUE", 0)
+    PasswordHashPool.shutdown()
+    PasswordHashPool.reset_metrics()
+
+    results = await asyncio.gather(
+        AuthService.verify_password_async("correct horse", hashed),
+        AuthService.verify_password_async("correct horse", hashed),
+        return_exceptions=True,
+    )
+    assert results[0] is True
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 503
+    assert PasswordHashPool.stats()["rejected"] == 1
+    PasswordHashPool.shutdown()
@@ -220,3 +220,69 @@ async def test_record_post_view_invalid_uuid_returns_not_counted(client_author):
     resp = await client_author.post(f"/v1/posts/{uuid4()}/view")
     assert resp.status_code == 200, resp.text
     assert resp.json()["counted"] is False
+
+
+@pytest.mark.asyncio
+async def test_post_detail_cache_is_shared_by_uuid_and_slug_and_invalidated(client_author):
+    from services.post.detail_cache import PostDetailCache
+
+    create = await client_author.post("/v1/posts/", data={
+        "title": "Cached Detail",
+        "content": "<p>Hot article</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+    })
+    assert create.status_code == 201, create.text
+    post = create.json()
+
+    by_slug = await client_author.get(f"/v1/posts/{post['slug']}")
+    assert by_slug.status_code == 200, by_slug.text
+    assert PostDetailCache.get(post["uuid"]) == by_slug.json()
+
+    by_uuid = await client_author.get(f"/v1/posts/{post['uuid']}")
+    assert by_uuid.json() == by_slug.json()
+
+    like = await client_author.post(f"/v1/posts/{post['uuid']}/like")
+    assert like.status_code == 200, like.text
+    assert PostDetailCache.get(post["slug"]) is None
+    liked = await client_author.get(f"/v1/posts/{post['slug']}")
+    assert len(liked.json()["liked_by"]) == 1
+
+    update = await client_author.put(f"/v1/posts/{post['uuid']}", data={"title": "Renamed Detail"})
+    assert update.status_code == 200, update.text
+    renamed = await client_author.get(f"/v1/posts/{post['uuid']}")
+    assert renamed.json()["title"] == "Renamed Detail"
+
+    missing = await client_author.get("/v1/posts/no-such-post")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_post_detail_read_racing_an_invalidation_is_not_cached(client_author, monkeypatch):
+    from services.post import PostService
+    from services.post.detail_cache import PostDetailCache
+
+    create = await client_author.post("/v1/posts/", data={
+        "title": "Racing Detail",
+        "content": "<p>Hot article</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+    })
+    assert create.status_code == 201, create.text
+    post = create.json()
+    original = PostService.get_post_by_identifier
+
+    async def load_during_a_write(session, identifier):
+        loaded = await original(session, identifier)
+        # A like or edit commits while this payload is being built.
+        PostDetailCache.invalidate(loaded.id)
+        return loaded
+
+    monkeypatch.setattr(PostService, "get_post_by_identifier", load_during_a_write)
+    response = await client_author.get(f"/v1/posts/{post['slug']}")
+    assert response.status_code == 200, response.text
+    assert PostDetailCache.get(post["slug"]) is None
+
+    monkeypatch.setattr(PostService, "get_post_by_identifier", original)
+    await client_author.get(f"/v1/posts/{post['slug']}")
+    assert PostDetailCache.get(post["slug"]) is not None
@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+
+from core.config import settings
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+
+
+async def _create_published_post(client, title: str) -> dict:
+    response = await client.post("/v1/posts/", data={
+        "title": title,
+        "content": "<p>Instrumented body</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_responses_carry_db_server_timing(client_author):
+    post = await _create_published_post(client_author, "Server Timing Post")
+
+    response = await client_author.get(f"/v1/posts/{post['slug']}")
+
+    assert response.status_code == 200, response.text
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    queries = int(timing.split('desc="')[1].split(" ")[0])
+    assert queries > 0
+
+
+@pytest.mark.asyncio
+async def test_post_detail_query_budget(client_author, assert_max_queries):
+    post = await _create_published_post(client_author, "Query Budget Post")
+
+    with assert_max_queries(6):
+        response = await client_author.get(f"/v1/posts/{post['slug']}")
+    assert response.status_code == 200, response.text
+
+    # The second read is served from the post detail cache.
+    with assert_max_queries(1):
+        response = await client_author.get(f"/v1/posts/{post['slug']}")
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged(client_author, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger="database.instrumentation"):
+        response = await client_author.get("/v1/posts/")
+
+    assert response.status_code == 200, response.text
+    assert any(record.message.startswith("Slow query") for record in caplog.records)
@@ -0,0 +1,94 @@
+import asyncio
+import ipaddress
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+import services.rate_limit as rate_limit_module
+from services.rate_limit import RateLimiter, RateLimitPolicy, rate_limited
+
+# ASGITransport connects from 127.0.0.1.
+TEST_PROXY = [ipaddress.ip_network("127.0.0.1/32")]
+
+
+@pytest.mark.asyncio
+async def test_login_is_throttled_per_address_and_refills(client_public, monkeypatch):
+    now = [1000.0]
+    RateLimiter._memory.clock = lambda: now[0]
+    credentials = {"email": "nobody@example.com", "password": "wrong-password"}
+
+    for _ in range(10):
+        response = await client_public.post("/v1/auth/login", json=credentials)
+        assert response.status_code == 401
+
+    throttled = await client_public.post("/v1/auth/login", json=credentials)
+    assert throttled.status_code == 429
+    # 10/minute refills one token every six seconds.
+    assert throttled.headers["Retry-After"] == "6"
+
+    # Forwarding headers from an untrusted peer do not make a new client.
+    for spoofed in ({"X-Forwarded-For": "203.0.113.9"}, {"X-Real-IP": "203.0.113.10"}):
+        assert (await client_public.post("/v1/auth/login", json=credentials, headers=spoofed)).status_code == 429
+
+    monkeypatch.setattr(rate_limit_module, "TRUSTED_PROXY_NETWORKS", TEST_PROXY)
+    behind_proxy = await client_public.post(
+        "/v1/auth/login", json=credentials, headers={"X-Forwarded-For": "203.0.113.9, 127.0.0.1"}
+    )
+    assert behind_proxy.status_code == 401
+
+    now[0] += 6
+    assert (await client_public.post("/v1/auth/login", json=credentials)).status_code == 401
+    assert (await client_public.post("/v1/auth/login", json=credentials)).status_code == 429
+
+    search = await client_public.get("/search", params={"q": "anything"})
+    assert search.status_code == 200
+    assert search.headers["X-RateLimit-Limit"] == "60"
+    assert search.headers["X-RateLimit-Remaining"] == "59"
+
+    stats = (await client_public.get("/health/rate-limits")).json()
+    assert stats["backend"] == "memory"
+    assert stats["policies"]["auth.login"] == {
+        "allowed": 12, "throttled": 4, "concurrency_rejected": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrency_caps_reject_while_in_flight_and_release_after(monkeypatch):
+    monkeypatch.setattr(rate_limit_module, "TRUSTED_PROXY_NETWORKS", TEST_PROXY)
+    policy = RateLimitPolicy(
+        name="test.slow", limit=100, period_seconds=60, concurrency=1, global_concurrency=2
+    )
+    started = asyncio.Event()
+    finish = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/slow", dependencies=[rate_limited(policy)])
+    async def slow():
+        started.set()
+        await finish.wait()
+        return {"ok": True}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await started.wait()
+
+        same_client = await client.get("/slow")
+        assert same_client.status_code == 429
+        assert same_client.headers["Retry-After"] == "1"
+
+        started.clear()
+        second = asyncio.create_task(client.get("/slow", headers={"X-Real-IP": "198.51.100.2"}))
+        await started.wait()
+        over_capacity = await client.get("/slow", headers={"X-Real-IP": "198.51.100.3"})
+        assert over_capacity.status_code == 503
+
+        finish.set()
+        assert (await first).status_code == 200
+        assert (await second).status_code == 200
+        assert RateLimiter.stats()["in_flight"] == {}
+        assert (await client.get("/slow")).status_code == 200
+
+    assert RateLimiter.stats()["policies"]["test.slow"] == {
+        "allowed": 3, "throttled": 0, "concurrency_rejected": 2,
+    }
@@ -0,0 +1,82 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database import connection
+from database.routing import READ_ONLY, STICKY_KEY, ReplicaRouter, RoutingSession
+from models import Category
+from models.base import Base as ModelsBase
+
+
+@pytest_asyncio.fixture
+async def primary_and_replica(tmp_path, monkeypatch):
+    """Two SQLite files standing in for the primary and a replica."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.sqlite3'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.sqlite3'}")
+    for engine, name in ((primary, "on-primary"), (replica, "on-replica")):
+        async with engine.begin() as conn:
+            await conn.run_sync(ModelsBase.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(Category(name=name, slug=name))
+            await session.commit()
+
+    monkeypatch.setattr(connection, "_engines", dict(connection._engines))
+    monkeypatch.setattr(connection, "_sessionmakers", dict(connection._sessionmakers))
+    connection.register_engine(connection.ENGINE_REPLICA, replica)
+
+    factory = async_sessionmaker(
+        bind=primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+    )
+    yield factory
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def _category_names(session: AsyncSession):
+    result = await session.execute(select(Category.name))
+    return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_reads_replica_until_it_writes(primary_and_replica):
+    async with primary_and_replica() as session:
+        await connection._enable_replica_reads(session)
+        assert session.info[READ_ONLY] is True
+        assert await _category_names(session) == {"on-replica"}
+
+        session.add(Category(name="written", slug="written"))
+        await session.flush()
+        assert await _category_names(session) == {"on-primary", "written"}
+        await session.commit()
+
+    async with primary_and_replica() as session:
+        assert await _category_names(session) == {"on-primary", "written"}
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(primary_and_replica):
+    async with primary_and_replica() as session:
+        await connection._enable_replica_reads(session)
+        ReplicaRouter.record_lag(ReplicaRouter.MAX_LAG_SECONDS + 1)
+        assert await _category_names(session) == {"on-primary"}
+
+
+@pytest.mark.asyncio
+async def test_recent_writer_is_pinned_to_primary(primary_and_replica):
+    writer = ReplicaRouter.sticky_key("Bearer writer-token")
+    ReplicaRouter.mark_write(writer)
+
+    async with primary_and_replica() as session:
+        session.info[STICKY_KEY] = writer
+        await connection._enable_replica_reads(session)
+        assert READ_ONLY not in session.info
+        assert await _category_names(session) == {"on-primary"}
+
+    async with primary_and_replica() as session:
+        session.info[STICKY_KEY] = ReplicaRouter.sticky_key("Bearer reader-token")
+        await connection._enable_replica_reads(session)
+        assert await _category_names(session) == {"on-replica"}
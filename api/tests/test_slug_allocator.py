@@ -0,0 +1,80 @@
+import pytest
+
+from models import Category, Tag
+from services.slug_allocator import SlugAllocator
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+
+
+@pytest.mark.asyncio
+async def test_allocate_picks_next_free_suffix_in_one_query(test_session, assert_max_queries):
+    test_session.add_all([
+        Tag(name="Data Science", slug="data_science"),
+        Tag(name="Data Science 2", slug="data_science_2"),
+        Tag(name="Data Sciences", slug="data_sciences"),
+        Tag(name="Wildcard", slug="dataxscience_3"),
+    ])
+    await test_session.commit()
+
+    with assert_max_queries(1):
+        slug = await SlugAllocator.allocate(test_session, "Data Science", Tag)
+    assert slug == "data_science_3"
+
+    assert await SlugAllocator.allocate(test_session, "Fresh Topic", Tag) == "fresh_topic"
+
+
+@pytest.mark.asyncio
+async def test_allocate_keeps_suffix_within_column_length(test_session):
+    base = "x" * 50
+    test_session.add(Tag(name="Long", slug=base))
+    await test_session.commit()
+
+    slug = await SlugAllocator.allocate(test_session, base, Tag, max_length=200)
+    assert slug == "x" * 48 + "_2"
+
+
+@pytest.mark.asyncio
+async def test_allocate_many_reserves_slugs_within_the_batch(test_session, assert_max_queries):
+    test_session.add(Category(name="Travel", slug="travel"))
+    await test_session.commit()
+
+    with assert_max_queries(1):
+        slugs = await SlugAllocator.allocate_many(
+            test_session, ["Travel", "Travel", "Food", "Food"], Category
+        )
+    assert slugs == ["travel_2", "travel_3", "food", "food_2"]
+
+
+@pytest.mark.asyncio
+async def test_commit_with_retry_reallocates_after_a_race(test_session):
+    slug = await SlugAllocator.allocate(test_session, "Racing", Category)
+    # Another writer takes the slug between allocation and insert.
+    test_session.add(Category(name="Racing Elsewhere", slug=slug))
+    await test_session.commit()
+
+    category = Category(name="Racing", slug=slug)
+    await SlugAllocator.commit_with_retry(test_session, category, "Racing")
+    assert category.slug == "racing_2"
+
+
+@pytest.mark.asyncio
+async def test_create_post_slug_conflicts(client_author):
+    data = {
+        "title": "Same Title",
+        "content": "<p>Body</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+    }
+    first = await client_author.post("/v1/posts/", data=data)
+    second = await client_author.post("/v1/posts/", data=data)
+    assert first.status_code == 201, first.text
+    assert second.status_code == 201, second.text
+    assert first.json()["slug"] == "same_title"
+    assert second.json()["slug"] == "same_title_2"
+
+    explicit = await client_author.post("/v1/posts/", data={**data, "slug": "same_title"})
+    assert explicit.status_code == 400, explicit.text
+    assert explicit.json()["detail"] == "Post with this slug already exists"
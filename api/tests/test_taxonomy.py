@@ -0,0 +1,152 @@
+import pytest
+from sqlalchemy import delete
+
+from models import Category, Tag
+from services.post import PostService
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+
+
+async def _seed_taxonomy(session):
+    parent = Category(name="Engineering", slug="engineering")
+    session.add(parent)
+    await session.flush()
+    child = Category(name="Backend", slug="backend", parent_id=parent.id)
+    empty = Category(name="Empty", slug="empty")
+    session.add_all([child, empty])
+    await session.flush()
+    python = Tag(name="Python", slug="python", category_id=parent.id)
+    sql = Tag(name="SQL", slug="sql", category_id=child.id)
+    session.add_all([python, sql])
+    await session.commit()
+    return parent, python, sql
+
+
+@pytest.mark.asyncio
+async def test_tags_grouped_rolls_subcategories_up_with_post_counts(
+        client_author, test_session, assert_max_queries
+):
+    parent, python, sql = await _seed_taxonomy(test_session)
+    for title, published in (("Published Tagged", "true"), ("Draft Tagged", "false")):
+        response = await client_author.post("/v1/posts/", data={
+            "title": title,
+            "content": "<p>Body</p>",
+            "excerpt": VALID_EXCERPT,
+            "is_published": published,
+            "tag_ids": f"{python.id},{sql.id}",
+        })
+        assert response.status_code == 201, response.text
+
+    with assert_max_queries(2):
+        response = await client_author.get("/v1/posts/tags/grouped/")
+    assert response.status_code == 200, response.text
+
+    groups = response.json()["groups"]
+    assert [group["category_name"] for group in groups] == ["Engineering"]
+    tags = {tag["slug"]: tag for tag in groups[0]["tags"]}
+    assert set(tags) == {"python", "sql"}
+    assert tags["python"]["post_count"] == 1
+    assert tags["sql"]["category_id"] != parent.id
+
+    with assert_max_queries(0):
+        cached = await client_author.get("/v1/posts/tags/grouped/")
+    assert cached.json() == response.json()
+
+
+@pytest.mark.asyncio
+async def test_tag_writes_invalidate_grouped_snapshot(client_author, test_session):
+    parent, _, _ = await _seed_taxonomy(test_session)
+    first = await client_author.get("/v1/posts/tags/grouped/")
+    assert len(first.json()["groups"][0]["tags"]) == 2
+
+    created = await client_author.post(
+        "/v1/posts/tags/", json={"name": "Rust", "category_id": parent.id}
+    )
+    assert created.status_code == 201, created.text
+
+    response = await client_author.get("/v1/posts/tags/grouped/")
+    slugs = {tag["slug"] for tag in response.json()["groups"][0]["tags"]}
+    assert slugs == {"python", "sql", created.json()["slug"]}
+
+    deleted = await client_author.delete(f"/v1/posts/tags/{created.json()['id']}")
+    assert deleted.status_code == 204, deleted.text
+    response = await client_author.get("/v1/posts/tags/grouped/")
+    assert len(response.json()["groups"][0]["tags"]) == 2
+
+
+def _tag_count(groups, slug):
+    for group in groups:
+        for tag in group["tags"]:
+            if tag["slug"] == slug:
+                return tag["post_count"]
+    raise AssertionError(f"tag {slug} not in groups")
+
+
+@pytest.mark.asyncio
+async def test_post_writes_adjust_snapshot_counts_without_reloading(
+        client_author, test_session, assert_max_queries
+):
+    parent, python, _ = await _seed_taxonomy(test_session)
+    await client_author.get("/v1/posts/tags/grouped/")
+
+    created = await client_author.post("/v1/posts/", data={
+        "title": "Counted Post",
+        "content": "<p>Body</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+        "category_id": str(parent.id),
+        "tag_ids": f"{python.id},999999",
+    })
+    assert created.status_code == 201, created.text
+    assert [tag["id"] for tag in created.json()["tags"]] == [python.id]
+
+    with assert_max_queries(0):
+        groups = (await client_author.get("/v1/posts/tags/grouped/")).json()["groups"]
+        categories = (await client_author.get("/v1/posts/categories/")).json()["categories"]
+        tags = (await client_author.get(f"/v1/posts/tags/?category_id={parent.id}")).json()["tags"]
+    assert _tag_count(groups, "python") == 1
+    engineering = next(c for c in categories if c["slug"] == "engineering")
+    assert engineering["post_count"] == 1
+    assert [child["slug"] for child in engineering["subcategories"]] == ["backend"]
+    assert [tag["slug"] for tag in tags] == ["python"]
+
+    deleted = await client_author.delete(f"/v1/posts/{created.json()['uuid']}")
+    assert deleted.status_code == 204, deleted.text
+
+    with assert_max_queries(0):
+        groups = (await client_author.get("/v1/posts/tags/grouped/")).json()["groups"]
+        categories = (await client_author.get("/v1/posts/categories/")).json()["categories"]
+    assert _tag_count(groups, "python") == 0
+    assert next(c for c in categories if c["slug"] == "engineering")["post_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tag_lookups_check_the_database_behind_a_stale_snapshot(client_author, test_session):
+    parent, python, _ = await _seed_taxonomy(test_session)
+    await client_author.get("/v1/posts/tags/grouped/")
+
+    # Written by another worker: this process's snapshot is not invalidated.
+    rust = Tag(name="Rust", slug="rust", category_id=parent.id)
+    test_session.add(rust)
+    await test_session.execute(delete(Tag).where(Tag.id == python.id))
+    await test_session.commit()
+
+    assert (await PostService.get_tag_by_slug(test_session, "rust")).id == rust.id
+    assert await PostService.get_tag_by_slug(test_session, "python") is None
+    tags = await PostService.get_tags_by_ids(test_session, [python.id, rust.id])
+    assert [tag.id for tag in tags] == [rust.id]
+
+    created = await client_author.post("/v1/posts/", data={
+        "title": "Fresh Tags",
+        "content": "<p>Body</p>",
+        "excerpt": VALID_EXCERPT,
+        "is_published": "true",
+        "tag_ids": f"{python.id},{rust.id}",
+    })
+    assert created.status_code == 201, created.text
+    assert [tag["slug"] for tag in created.json()["tags"]] == ["rust"]
+    groups = (await client_author.get("/v1/posts/tags/grouped/")).json()["groups"]
+    assert _tag_count(groups, "rust") == 1
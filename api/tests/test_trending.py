@@ -0,0 +1,115 @@
+import pytest
+
+from models import Post
+from services.post.post import PostService
+from services.post.trending import TrendingService
+
+
+async def _create_posts(session, author, count):
+    posts = []
+    for index in range(count):
+        post = Post(
+            title=f"Trending {index}",
+            slug=f"trending-{index}",
+            content="<p>Body</p>",
+            author_id=author.id,
+            is_published=True,
+        )
+        session.add(post)
+        posts.append(post)
+    await session.commit()
+    for post in posts:
+        await session.refresh(post)
+    return posts
+
+
+def test_recent_engagement_outranks_older_engagement():
+    now = 1_000_000.0
+    half_life = TrendingService.HALF_LIFE_SECONDS
+
+    for _ in range(10):
+        TrendingService.record_view(1, at=now - 3 * half_life)
+    for _ in range(3):
+        TrendingService.record_view(2, at=now)
+
+    assert TrendingService.score(1, at=now) == pytest.approx(10 / 8)
+    assert TrendingService.score(2, at=now) == pytest.approx(3)
+    assert TrendingService.top_ids(2, at=now) == [2, 1]
+
+
+def test_redecay_preserves_ordering_and_prunes_cold_posts():
+    now = 2_000_000.0
+    half_life = TrendingService.HALF_LIFE_SECONDS
+
+    TrendingService.record_like(1, at=now)
+    TrendingService.record_view(2, at=now)
+    TrendingService.record_view(3, at=now - 20 * half_life)
+
+    pruned = TrendingService.redecay(at=now + half_life)
+
+    assert pruned == 1
+    assert TrendingService.score(1, at=now + half_life) == pytest.approx(
+        TrendingService.LIKE_WEIGHT / 2
+    )
+    assert TrendingService.top_ids(10, at=now + half_life) == [1, 2]
+
+
+def test_unlike_reverses_like():
+    TrendingService.record_like(5)
+    TrendingService.record_like(5, liked=False)
+
+    assert TrendingService.score(5) == 0.0
+    assert TrendingService.top_ids(10) == []
+
+
+def test_unlike_removes_only_the_likes_decayed_weight():
+    now = 1_000_000.0
+    half_life = TrendingService.HALF_LIFE_SECONDS
+    TrendingService.record_view(7, at=now - half_life)
+    TrendingService.record_like(7, at=now - half_life, user_id=1)
+    TrendingService.record_like(7, at=now, user_id=2)
+
+    TrendingService.record_like(7, liked=False, at=now, user_id=1)
+    assert TrendingService.score(7, at=now) == pytest.approx(
+        TrendingService.VIEW_WEIGHT / 2 + TrendingService.LIKE_WEIGHT
+    )
+    # A like this worker never saw has nothing of its own to remove.
+    TrendingService.record_like(7, liked=False, at=now, user_id=3)
+    assert TrendingService.score(7, at=now) == pytest.approx(
+        TrendingService.VIEW_WEIGHT / 2 + TrendingService.LIKE_WEIGHT
+    )
+
+
+@pytest.mark.asyncio
+async def test_trending_endpoint_follows_engagement_events(
+    client_public, test_session, author_user, monkeypatch
+):
+    monkeypatch.setattr(TrendingService, "RANKING_TTL_SECONDS", 0)
+    cold, hot = await _create_posts(test_session, author_user, 2)
+
+    assert await PostService.record_view(test_session, cold.uuid, "reader-a")
+    assert await PostService.record_view(test_session, hot.uuid, "reader-a")
+    assert await PostService.record_view(test_session, hot.uuid, "reader-b")
+    await PostService.toggle_post_like(test_session, hot.uuid, author_user.id)
+
+    response = await client_public.get("/v1/posts/trending/")
+    assert response.status_code == 200, response.text
+    slugs = [post["slug"] for post in response.json()["posts"]]
+    assert slugs == [hot.slug, cold.slug]
+
+
+@pytest.mark.asyncio
+async def test_trending_skips_posts_that_are_no_longer_published(
+    client_public, test_session, author_user
+):
+    visible, hidden = await _create_posts(test_session, author_user, 2)
+    TrendingService._seeded = True
+    TrendingService.record_view(visible.id)
+    TrendingService.record_like(hidden.id)
+
+    hidden.is_published = False
+    await test_session.commit()
+
+    response = await client_public.get("/v1/posts/trending/")
+    assert response.status_code == 200, response.text
+    assert [post["slug"] for post in response.json()["posts"]] == [visible.slug]
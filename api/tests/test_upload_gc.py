@@ -0,0 +1,114 @@
+import hashlib
+import os
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+
+from models import Post
+from services.media_store import MediaStore
+from services.upload_gc import UploadGarbageCollector
+
+VALID_EXCERPT = (
+    "A publish-ready summary that captures the full article, highlights the "
+    "main takeaway, and gives readers a clear reason to keep reading on the site."
+)
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"referenced" * 50
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def uploads_root(tmp_path, monkeypatch):
+    root = tmp_path / "uploads"
+    monkeypatch.setattr(UploadGarbageCollector, "UPLOADS_ROOT", root)
+    monkeypatch.setattr(MediaStore, "ROOT", root / "blobs")
+    monkeypatch.setattr(MediaStore, "REUSE_GRACE_SECONDS", 0)
+    return root
+
+
+def _write(path, content=b"orphaned bytes", age=2 * DAY):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_orphans_are_reported_then_quarantined_then_deleted(client_author, test_session, uploads_root):
+    upload = await client_author.post(
+        "/v1/posts/upload-image",
+        files={"file": ("image.png", IMAGE_BYTES, "image/png")},
+    )
+    referenced = upload.json()["filename"]
+    create = await client_author.post("/v1/posts/", data={
+        "title": "Post Keeping Its Image",
+        "content": "<p>Body text for a post whose featured image must survive.</p>",
+        "excerpt": VALID_EXCERPT,
+        "featured_image_path": f"uploads/posts/{referenced}",
+    })
+    assert create.status_code == 201, create.text
+
+    orphan_blob_name = f"{hashlib.sha256(uuid4().bytes).hexdigest()}.png"
+    orphan_blob = _write(MediaStore.blob_path(orphan_blob_name))
+    orphan_legacy = _write(uploads_root / "posts" / f"{uuid4()}.jpg")
+    recent_legacy = _write(uploads_root / "media" / f"{uuid4()}.pdf", age=60)
+    staged = _write(MediaStore.ROOT / "incoming" / f"{uuid4().hex}.part")
+    stale_derived = MediaStore.derived_dir(f"{'0' * 64}.png")
+    _write(stale_derived / "w300.webp")
+
+    dry = await UploadGarbageCollector.collect(test_session, batch_size=2, dry_run=True, grace_seconds=DAY)
+    assert dry["orphans"] == 2
+    assert dry["orphan_bytes"] == 2 * len(b"orphaned bytes")
+    assert dry["skipped_recent"] == 1
+    assert dry["staged_removed"] == 1
+    assert dry["derived_removed"] == 1
+    assert dry["quarantined"] == 0
+    assert sorted(dry["orphan_samples"]) == sorted([str(orphan_blob), str(orphan_legacy)])
+    assert dry["scanned_files"] == 4
+    assert orphan_blob.exists() and orphan_legacy.exists() and staged.exists() and stale_derived.exists()
+
+    report = await UploadGarbageCollector.collect(test_session, batch_size=2, grace_seconds=DAY)
+    assert report["quarantined"] == 2
+    assert not orphan_blob.exists() and not orphan_legacy.exists()
+    assert not staged.exists() and not stale_derived.exists()
+    assert recent_legacy.exists()
+    assert MediaStore.blob_path(referenced).exists()
+    quarantined_legacy = uploads_root / ".quarantine" / "posts" / orphan_legacy.name
+    assert quarantined_legacy.exists()
+
+    # Not yet expired: kept in quarantine.
+    again = await UploadGarbageCollector.collect(test_session, grace_seconds=DAY)
+    assert again["pending_in_quarantine"] == 2
+    assert again["deleted"] == 0
+
+    expired = await UploadGarbageCollector.collect(test_session, grace_seconds=DAY, quarantine_seconds=0)
+    assert expired["deleted"] == 2
+    assert not quarantined_legacy.exists()
+    assert MediaStore.blob_path(referenced).exists()
+
+
+@pytest.mark.asyncio
+async def test_quarantined_files_referenced_again_are_restored(client_author, test_session, uploads_root):
+    create = await client_author.post("/v1/posts/", data={
+        "title": "Post Reclaiming An Image",
+        "content": "<p>Body text for a post that points at a quarantined file.</p>",
+        "excerpt": VALID_EXCERPT,
+    })
+    assert create.status_code == 201, create.text
+    name = f"{uuid4()}.jpg"
+    quarantined = _write(uploads_root / ".quarantine" / "posts" / name, age=30 * DAY)
+
+    await test_session.execute(
+        update(Post)
+        .where(Post.uuid == create.json()["uuid"])
+        .values(featured_image=f"uploads/posts/{name}")
+    )
+    await test_session.commit()
+
+    report = await UploadGarbageCollector.collect(test_session, grace_seconds=DAY, quarantine_seconds=DAY)
+    assert report["restored"] == 1
+    assert report["deleted"] == 0
+    assert not quarantined.exists()
+    assert (uploads_root / "posts" / name).read_bytes() == b"orphaned bytes"
@@ -0,0 +1,80 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from services.uploads import UPLOAD_POST_IMAGE, UploadPipeline
+
+
+class CountingReader(io.BytesIO):
+    """Records the largest single read the pipeline asks for."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.largest_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+@pytest.mark.asyncio
+async def test_save_streams_hashes_and_renames_into_place(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadPipeline, "CHUNK_SIZE", 1024)
+    data = b"\x89PNG" + b"x" * 10_000
+    reader = CountingReader(data)
+
+    stored = await UploadPipeline.save(
+        UploadFile(reader, filename="image.png"), UPLOAD_POST_IMAGE, tmp_path, ".png"
+    )
+
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert stored.path.endswith(".png")
+    assert open(stored.path, "rb").read() == data
+    assert reader.largest_read <= 1024
+    assert [path.name for path in tmp_path.iterdir()] == [stored.path.rsplit("/", 1)[1]]
+
+
+@pytest.mark.asyncio
+async def test_save_rejects_oversized_upload_mid_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadPipeline, "CHUNK_SIZE", 1024)
+    monkeypatch.setitem(UploadPipeline.LIMITS, UPLOAD_POST_IMAGE, 4096)
+    reader = CountingReader(b"x" * 100_000)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await UploadPipeline.save(UploadFile(reader, filename="big.png"), UPLOAD_POST_IMAGE, tmp_path, ".png")
+
+    assert exc_info.value.status_code == 413
+    # Reading stopped at the first chunk past the limit.
+    assert reader.tell() <= 4096 + 1024
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_save_rejects_empty_and_declared_oversized_uploads(tmp_path, monkeypatch):
+    with pytest.raises(HTTPException) as empty:
+        await UploadPipeline.save(UploadFile(io.BytesIO(b""), filename="e.png"), UPLOAD_POST_IMAGE, tmp_path, ".png")
+    assert empty.value.status_code == 400
+
+    monkeypatch.setitem(UploadPipeline.LIMITS, UPLOAD_POST_IMAGE, 10)
+    declared = UploadFile(io.BytesIO(b"x" * 5), filename="d.png", size=11)
+    with pytest.raises(HTTPException) as too_large:
+        await UploadPipeline.save(declared, UPLOAD_POST_IMAGE, tmp_path, ".png")
+    assert too_large.value.status_code == 413
+    assert declared.file.tell() == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_post_image_upload_route_enforces_limit(client_author, monkeypatch):
+    monkeypatch.setitem(UploadPipeline.LIMITS, UPLOAD_POST_IMAGE, 1024)
+
+    response = await client_author.post(
+        "/v1/posts/upload-image",
+        files={"file": ("big.png", b"x" * 4096, "image/png")},
+    )
+    assert response.status_code == 413, response.text
+    assert response.json()["detail"].startswith("File too large")
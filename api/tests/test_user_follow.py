@@ -0,0 +1,208 @@
+import pytest
+from array import array
+
+from sqlalchemy import delete, insert, select
+
+from models.base import user_follows
+from models.user import User, UserRole, UserSuggestion
+from services.user.follow_graph import FollowGraphCache
+from services.user.suggestions import FollowSuggestionService
+from services.user.user_follow import UserFollowService
+
+
+async def _create_users(session, count, prefix="reader"):
+    users = [
+        User(
+            email=f"{prefix}{index}@example.com",
+            username=f"{prefix}{index}",
+            full_name=f"{prefix.title()} {index}",
+            password="hashed",
+            role=UserRole.USER,
+            is_active=True,
+        )
+        for index in range(count)
+    ]
+    session.add_all(users)
+    await session.commit()
+    for user in users:
+        await session.refresh(user)
+    return users
+
+
+def test_large_accounts_use_sorted_arrays(monkeypatch):
+    monkeypatch.setattr(FollowGraphCache, "COMPACT_THRESHOLD", 4)
+
+    small = FollowGraphCache._compact([3, 1, 2])
+    large = FollowGraphCache._compact([9, 3, 7, 1, 5])
+
+    assert isinstance(small, frozenset)
+    assert isinstance(large, array)
+    assert list(large) == [1, 3, 5, 7, 9]
+    assert FollowGraphCache.contains(large, 7)
+    assert not FollowGraphCache.contains(large, 4)
+    assert not FollowGraphCache.contains(large, 10)
+
+
+@pytest.mark.asyncio
+async def test_follow_and_unfollow_invalidate_cached_sets(test_session):
+    alice, bob = await _create_users(test_session, 2)
+
+    assert not await UserFollowService.is_following(test_session, alice.id, bob.id)
+    assert await UserFollowService.count_followers(test_session, bob.id) == 0
+
+    followed = await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+    assert followed.success is True
+    assert followed.follower_count == 1
+    assert await UserFollowService.is_following(test_session, alice.id, bob.id)
+
+    unfollowed = await UserFollowService.unfollow_user(test_session, alice.id, bob.uuid)
+    assert unfollowed.success is True
+    assert unfollowed.follower_count == 0
+    assert not await UserFollowService.is_following(test_session, alice.id, bob.id)
+
+
+@pytest.mark.asyncio
+async def test_follow_writes_ignore_a_stale_cache(test_session):
+    alice, bob = await _create_users(test_session, 2)
+
+    # Cached as "not following", then followed through another worker.
+    assert not await UserFollowService.is_following(test_session, alice.id, bob.id)
+    await test_session.execute(insert(user_follows).values(follower_id=alice.id, followed_id=bob.id))
+    await test_session.commit()
+
+    repeated = await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+    assert repeated.success is False
+    assert repeated.is_following is True
+    assert await UserFollowService.is_following(test_session, alice.id, bob.id)
+
+    # Cached as "following", then unfollowed through another worker.
+    await test_session.execute(delete(user_follows))
+    await test_session.commit()
+    missing = await UserFollowService.unfollow_user(test_session, alice.id, bob.uuid)
+    assert missing.success is False
+    assert missing.is_following is False
+
+    followed = await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+    assert followed.success is True
+
+
+@pytest.mark.asyncio
+async def test_page_membership_is_a_single_lookup(test_session, monkeypatch):
+    viewer, *authors = await _create_users(test_session, 5)
+    for author in authors[:2]:
+        await UserFollowService.follow_user(test_session, viewer.id, author.uuid)
+
+    loads = []
+    original_load = FollowGraphCache._load
+
+    async def counting_load(session, direction, user_id):
+        loads.append((direction, user_id))
+        return await original_load(session, direction, user_id)
+
+    monkeypatch.setattr(FollowGraphCache, "_load", staticmethod(counting_load))
+
+    flags = await FollowGraphCache.following_flags(
+        test_session, viewer.id, [author.id for author in authors]
+    )
+
+    assert flags == {
+        authors[0].id: True,
+        authors[1].id: True,
+        authors[2].id: False,
+        authors[3].id: False,
+    }
+    assert loads == [(FollowGraphCache.FOLLOWING, viewer.id)]
+
+
+@pytest.mark.asyncio
+async def test_followers_page_reports_totals(test_session):
+    author, *readers = await _create_users(test_session, 4)
+    for reader in readers:
+        await UserFollowService.follow_user(test_session, reader.id, author.uuid)
+
+    page = await UserFollowService.get_followers(
+        test_session, author.uuid, readers[0].id, page=1, size=2
+    )
+
+    assert page.total == 3
+    assert len(page.followers) == 2
+    assert page.has_next is True
+
+
+@pytest.mark.asyncio
+async def test_follow_counts_are_denormalized_on_users(test_session):
+    alice, bob, carol = await _create_users(test_session, 3)
+
+    await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+    await UserFollowService.follow_user(test_session, carol.id, bob.uuid)
+    await UserFollowService.follow_user(test_session, alice.id, carol.uuid)
+    await UserFollowService.unfollow_user(test_session, alice.id, carol.uuid)
+
+    for user in (alice, bob, carol):
+        await test_session.refresh(user)
+
+    assert (bob.follower_count, bob.following_count) == (2, 0)
+    assert (alice.follower_count, alice.following_count) == (0, 1)
+    assert (carol.follower_count, carol.following_count) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_follow_counts_repairs_drift(test_session):
+    alice, bob = await _create_users(test_session, 2)
+    await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+
+    bob.follower_count = 7
+    await test_session.commit()
+
+    report = await UserFollowService.reconcile_follow_counts(test_session, dry_run=True)
+    assert [row["id"] for row in report["drifted"]] == [bob.id]
+    assert report["repaired"] == 0
+
+    report = await UserFollowService.reconcile_follow_counts(test_session)
+    assert report["repaired"] == 1
+
+    await test_session.refresh(bob)
+    assert bob.follower_count == 1
+
+
+@pytest.mark.asyncio
+async def test_suggestions_are_precomputed_from_co_follows(test_session):
+    alice, bob, carol, dave, erin = await _create_users(test_session, 5)
+    # Bob and Carol both follow Dave and Erin; Alice follows Dave only.
+    for follower in (bob, carol):
+        await UserFollowService.follow_user(test_session, follower.id, dave.uuid)
+        await UserFollowService.follow_user(test_session, follower.id, erin.uuid)
+    await UserFollowService.follow_user(test_session, alice.id, dave.uuid)
+
+    report = await FollowSuggestionService.rebuild_suggestions(test_session, top_k=3)
+    assert report["users"] == 5
+
+    rows = (
+        await test_session.execute(
+            select(UserSuggestion)
+            .where(UserSuggestion.user_id == alice.id)
+            .order_by(UserSuggestion.score.desc())
+        )
+    ).scalars().all()
+    assert rows[0].suggested_user_id == erin.id
+    assert rows[0].reason == "co_follow"
+    assert dave.id not in {row.suggested_user_id for row in rows}
+    assert alice.id not in {row.suggested_user_id for row in rows}
+
+    suggestions = await UserFollowService.get_suggested_users(test_session, alice.id, limit=2)
+    assert suggestions.users[0].uuid == erin.uuid
+
+
+@pytest.mark.asyncio
+async def test_suggestions_filter_new_follows_and_fall_back_to_popular(test_session):
+    alice, bob, carol = await _create_users(test_session, 3)
+    await UserFollowService.follow_user(test_session, carol.id, bob.uuid)
+    await FollowSuggestionService.rebuild_suggestions(test_session, top_k=1)
+
+    before = await UserFollowService.get_suggested_users(test_session, alice.id, limit=2)
+    assert [user.uuid for user in before.users] == [bob.uuid, carol.uuid]
+
+    await UserFollowService.follow_user(test_session, alice.id, bob.uuid)
+
+    after = await UserFollowService.get_suggested_users(test_session, alice.id, limit=2)
+    assert [user.uuid for user in after.users] == [carol.uuid]